@@ -40,13 +40,18 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from config.cors_config import CORSConfig
 from config.settings import settings
 from core.database import engine
-from core.enhanced_cache import init_cache, warm_cache
+from core.engine_registry import engine_registry
+from core.cache_manager import cache_manager
+from core.enhanced_cache import init_cache, shutdown_cache, warm_cache
 from core.error_handlers import (
     global_exception_handler,
     validation_exception_handler,
     StandardErrorHandler,
 )
+from core.lazy_routers import RouterGroup, RouterSpec, load_all, mount_router_group
+from core.request_context import RequestContextMiddleware
 from core.response_handlers import ResponseBuilder
+from core.startup_pipeline import StartupPipeline
 from utils.database_startup_manager import DatabaseStartupManager
 
 # ============================================================================
@@ -124,7 +129,6 @@ from routers import (
     upload,         # ✅ File upload
     handshake,      # ✅ Handshake protocol
     todos,          # ✅ Task management
-    template_builder,# ✅ Visual template builder
     webhooks,       # ✅ Webhook system
     workspaces,     # ✅ Workspaces (Session alias)
 )
@@ -140,6 +144,23 @@ from routers import (
 # Note: Individual fallback routers removed - we always use consolidated routers now
 # The consolidated routers are more maintainable and avoid duplication
 
+# Router groups that are rarely hit by regular users. With LAZY_ROUTERS their
+# modules (and everything they import) load on the first request under the
+# prefix instead of at startup; see core.lazy_routers.
+ROUTER_MANIFEST = {
+    "admin": RouterGroup("admin", "/api/v1/admin", (
+        RouterSpec("routers.consolidated.unified_admin_router", "/api/v1/admin", ("Administration & Control",)),
+        # Bridge router to satisfy AdminPanel frontend endpoints (kept for compatibility)
+        RouterSpec("routers.admin_panel_bridge"),
+    )),
+    "ai": RouterGroup("ai", "/api/v1/ai", (
+        RouterSpec("routers.ai", tags=("AI",)),  # /api/v1/ai/*
+    )),
+    "template_builder": RouterGroup("template_builder", "/api/v1/template-builder", (
+        RouterSpec("routers.template_builder", "/api/v1/template-builder", ("Template Builder",)),
+    )),
+}
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -168,120 +189,126 @@ async def lifespan(app: FastAPI):
             logger.error("CRITICAL: SECRET_KEY is not set for production. Set SECRET_KEY environment variable.")
             raise
 
-    # Initialize enhanced audit system
-    try:
+    # Startup runs as a dependency graph: independent steps overlap, and
+    # migrations / integrity checks / default data run on one leader worker
+    # (see core.startup_pipeline). Per-step timings are served at /api/v1/health.
+    testing = getattr(settings, "TESTING", False)
+    db_manager = DatabaseStartupManager()
+    app.state.db_startup_manager = db_manager
+    schema_fingerprint = db_manager.schema_fingerprint()
+    pipeline = StartupPipeline(redis=lambda: cache_manager.redis_client)
+
+    async def _init_audit_system():
         from core.enhanced_audit_system import EnhancedAuditSystem
         app.state.audit_system = EnhancedAuditSystem()
-        logger.info(f"[{startup_correlation_id}] ✅ Enhanced audit system initialized")
-    except Exception as e:
-        logger.warning(f"[{startup_correlation_id}] ⚠️ Enhanced audit system not available: {e}")
 
-    # Initialize distributed tracing
-    try:
+    async def _init_tracing():
         from core.distributed_tracing import init_tracing
         await init_tracing()
-        logger.info(f"[{startup_correlation_id}] ✅ Distributed tracing initialized")
-    except Exception as e:
-        logger.warning(f"[{startup_correlation_id}] ⚠️ Distributed tracing not available: {e}")
 
-    # Pre-warm database connection pool with health check
-    try:
-        # In TESTING mode with SQLite we defer heavy DB checks
-        if getattr(settings, "TESTING", False):
-            app.state.database_healthy = True
-        else:
-            async with engine.begin() as conn:
-                await conn.execute(text("SELECT 1"))
-            logger.info(f"[{startup_correlation_id}] ✅ Database connection pool initialized successfully")
-            app.state.database_healthy = True
-    except Exception as e:
-        logger.error(f"[{startup_correlation_id}] ❌ Database connection failed: {e}")
-        app.state.database_healthy = False
+    async def _init_metrics():
+        # Cache and connection-pool instruments are no-ops until this runs
+        from core.observability import observability_manager
+        return observability_manager.setup_metrics() is not None
 
-    # Automatic database repair & migrations on boot
-    try:
-        db_manager = DatabaseStartupManager()
-        app.state.db_startup_manager = db_manager
-
-        # Ensure database exists (PostgreSQL), run migrations, and apply schema repairs
-        if not getattr(settings, "TESTING", False):
-            await db_manager.check_database_exists()
-            if getattr(settings, "DB_AUTO_MIGRATE", True):
-                await db_manager.run_migrations()
-                # Apply new revision (safe no-op if already applied)
-                try:
-                    await db_manager.run_migrations()
-                except Exception:
-                    pass
-        # Avoid implicit table creation in production; rely on migrations
-        if settings.DEBUG or getattr(settings, "TESTING", False):
-            await db_manager.check_and_create_tables()
-        await db_manager.check_and_fix_columns()
-        await db_manager.check_data_integrity()
-        # Ensure default data like admin user exists
-        try:
-            await db_manager.create_default_data()
-        except Exception as _e:
-            logger.warning(f"Could not create default data: {_e}")
-
-        # Start light async optimization task
-        asyncio.create_task(db_manager.optimize_database())
-
-        # Expose concise startup report
-        app.state.db_startup_report = {
-            "started_at": db_manager.startup_time.isoformat(),
-            "operations": db_manager.operations_log[-50:],
-            "errors": db_manager.errors[-20:],
-        }
+    async def _ping_database():
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT 1"))
 
-        logger.info(f"[{startup_correlation_id}] ✅ Database auto-repair & migrations completed")
-    except Exception as e:
-        logger.error(f"[{startup_correlation_id}] ❌ Database auto-repair failed: {e}")
-        app.state.database_healthy = False
+    async def _load_schema_snapshot():
+        # "Not used" is not a failure: the steps after it build the schema
+        await db_manager.load_schema_snapshot()
 
-    # Initialize enhanced caching system with health check
-    try:
+    async def _init_cache():
         await init_cache()
-        logger.info(f"[{startup_correlation_id}] ✅ Enhanced multi-layer cache system initialized")
-        
         # Warm up cache with frequently accessed data
         asyncio.create_task(warm_cache())
-        
-        # Store cache health status
-        app.state.cache_healthy = True
-    except Exception as e:
-        logger.warning(f"[{startup_correlation_id}] ⚠️ Cache initialization failed, continuing without cache: {e}")
-        app.state.cache_healthy = False
 
-    # Initialize external service health checks
-    try:
+    async def _init_external_health():
         from core.external_service_health import ExternalServiceHealthChecker
         app.state.external_health_checker = ExternalServiceHealthChecker()
         await app.state.external_health_checker.initialize()
-        logger.info(f"[{startup_correlation_id}] ✅ External service health checker initialized")
-    except Exception as e:
-        logger.warning(f"[{startup_correlation_id}] ⚠️ External service health checker not available: {e}")
 
-    # Set up for high concurrency with enhanced monitoring
-    app.state.connection_semaphore = asyncio.Semaphore(200)
-    app.state.rate_limit_storage = {}
-    
-    # Initialize performance metrics collection
-    try:
+    async def _init_performance_collector():
         from core.performance_metrics import PerformanceMetricsCollector
         app.state.performance_collector = PerformanceMetricsCollector()
-        logger.info(f"[{startup_correlation_id}] ✅ Performance metrics collector initialized")
-    except Exception as e:
-        logger.warning(f"[{startup_correlation_id}] ⚠️ Performance metrics collector not available: {e}")
 
-    # Initialize security monitoring
-    try:
+    async def _init_security_monitor():
         from core.security_monitoring import SecurityMonitor
         app.state.security_monitor = SecurityMonitor()
         await app.state.security_monitor.start()
-        logger.info(f"[{startup_correlation_id}] ✅ Security monitoring initialized")
-    except Exception as e:
-        logger.warning(f"[{startup_correlation_id}] ⚠️ Security monitoring not available: {e}")
+
+    pipeline.add("audit_system", _init_audit_system)
+    pipeline.add("tracing", _init_tracing)
+    if settings.ENABLE_METRICS:
+        pipeline.add("metrics", _init_metrics)
+    pipeline.add("redis", cache_manager.init)
+    # Redis is optional: wait for it, but run without it
+    pipeline.add("cache", _init_cache, wait_for=("redis",))
+    pipeline.add("external_health", _init_external_health)
+    pipeline.add("performance_metrics", _init_performance_collector)
+    pipeline.add("security_monitor", _init_security_monitor)
+
+    # Automatic database repair & migrations on boot. Schema steps wait for
+    # Redis (their leader leases need it) but do not depend on it.
+    schema_steps: tuple = ()
+    if not testing:
+        # In TESTING mode with SQLite we defer heavy DB checks
+        pipeline.add("db_ping", _ping_database)
+        pipeline.add("db_prewarm", engine_registry.prewarm, after=("db_ping",))
+        pipeline.add("db_exists", db_manager.check_database_exists)
+        schema_steps = ("db_exists",)
+    # An empty dev/test database is built from the snapshot first; it stamps
+    # alembic_version, so the migrations that follow have nothing to do
+    schema_wait: tuple = ("redis",)
+    if settings.SCHEMA_SNAPSHOT:
+        pipeline.add(
+            "schema_snapshot", _load_schema_snapshot, after=schema_steps, wait_for=("redis",),
+            marker="schema_snapshot", fingerprint=schema_fingerprint,
+        )
+        schema_wait = ("redis", "schema_snapshot")
+    if not testing and getattr(settings, "DB_AUTO_MIGRATE", True):
+        pipeline.add(
+            "migrations", db_manager.run_migrations, after=schema_steps, wait_for=schema_wait,
+            marker="schema", fingerprint=schema_fingerprint,
+        )
+        schema_steps = ("migrations",)
+    # Avoid implicit table creation in production; rely on migrations
+    if settings.DEBUG or testing:
+        pipeline.add("tables", db_manager.check_and_create_tables, after=schema_steps, wait_for=schema_wait)
+        schema_steps = ("tables",)
+    pipeline.add("columns", db_manager.check_and_fix_columns, after=schema_steps)
+    pipeline.add(
+        "integrity", db_manager.check_data_integrity, after=("columns",), wait_for=("redis",),
+        marker="integrity", fingerprint=schema_fingerprint,
+    )
+    # Ensure default data like admin user exists
+    pipeline.add(
+        "default_data", db_manager.create_default_data, after=("columns",), wait_for=("redis",),
+        marker="default_data", fingerprint=schema_fingerprint,
+    )
+
+    app.state.startup_report = await pipeline.run()
+    app.state.database_healthy = testing or pipeline.succeeded("db_ping")
+    app.state.cache_healthy = pipeline.succeeded("cache")
+    logger.info(
+        f"[{startup_correlation_id}] ⏱️ Startup pipeline finished in "
+        f"{app.state.startup_report['total_ms']}ms"
+    )
+
+    # Start light async optimization task
+    asyncio.create_task(db_manager.optimize_database())
+
+    # Expose concise startup report
+    app.state.db_startup_report = {
+        "started_at": db_manager.startup_time.isoformat(),
+        "operations": db_manager.operations_log[-50:],
+        "errors": db_manager.errors[-20:],
+    }
+
+    # Set up for high concurrency with enhanced monitoring
+    app.state.connection_semaphore = asyncio.Semaphore(200)
+    app.state.rate_limit_storage = {}
 
     # Start lightweight periodic health maintenance
     async def _health_maintenance_loop():
@@ -339,6 +366,19 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"[{shutdown_correlation_id}] ❌ Error stopping performance metrics: {e}")
     
+    # Write plan usage counted since the last batch
+    try:
+        from services.plan_service import usage_buffer
+        await usage_buffer.stop()
+    except Exception as e:
+        logger.error(f"[{shutdown_correlation_id}] ❌ Error flushing usage counters: {e}")
+
+    # Flush pending cache invalidations and stop the invalidation bus
+    try:
+        await shutdown_cache()
+    except Exception as e:
+        logger.error(f"[{shutdown_correlation_id}] ❌ Error stopping cache invalidation bus: {e}")
+
     # Stop external health checker
     if hasattr(app.state, 'external_health_checker'):
         try:
@@ -701,6 +741,10 @@ async def _add_correlation_id(request: Request, call_next):
         pass
     return response
 
+# Request-scoped memo for user/plan/license lookups; added last so it wraps
+# every other middleware and the dependencies they run
+app.add_middleware(RequestContextMiddleware)
+
 # ============================================================================
 # 🚀 SMART ROUTER INCLUDES - CONSOLIDATED OR FALLBACK
 # ============================================================================
@@ -726,21 +770,8 @@ try:
 except Exception as e:
     logger.error(f"❌ IMAP router could not be mounted: {e}")
 
-# 🔄 ADMINISTRATION - UNIFIED
-try:
-    from routers.consolidated.unified_admin_router import router as unified_admin_router
-    app.include_router(unified_admin_router, prefix="/api/v1/admin", tags=["Administration & Control"])
-    logger.info("✅ CONSOLIDATED: 13 admin routers → 1 unified admin router")
-except Exception as e:
-    logger.error(f"❌ Unified admin router could not be mounted: {e}")
-
-# Bridge router to satisfy AdminPanel frontend endpoints (kept for compatibility)
-try:
-    from routers import admin_panel_bridge  # type: ignore
-    app.include_router(admin_panel_bridge.router)
-    logger.info("✅ AdminPanel bridge router mounted")
-except Exception as e:
-    logger.warning(f"AdminPanel bridge not mounted: {e}")
+# 🔄 ADMINISTRATION - UNIFIED (13 admin routers → 1) + AdminPanel bridge
+mount_router_group(app, ROUTER_MANIFEST["admin"], lazy=settings.LAZY_ROUTERS)
 
 # ✅ CORE SYSTEM UTILITIES (Always preserved)
 app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
@@ -783,12 +814,7 @@ except Exception as e:
     logger.error(f"❌ Unified infrastructure router could not be mounted: {e}")
 
 # ✅ AI & MACHINE LEARNING (Unified + legacy surfaces)
-try:
-    from routers import ai as ai_unified
-    app.include_router(ai_unified.router, tags=["AI"])  # /api/v1/ai/*
-    logger.info("✅ Mounted unified AI router at /api/v1/ai")
-except Exception as e:
-    logger.warning(f"⚠️ Unified AI router not available: {e}")
+mount_router_group(app, ROUTER_MANIFEST["ai"], lazy=settings.LAZY_ROUTERS)
 
 # Removed legacy AI surfaces in favor of unified /api/v1/ai/* router
 # Normalize chat path to /api/v1/chat/* (avoid double /chat/chat)
@@ -837,7 +863,7 @@ app.include_router(bootstrap.router, prefix="/api/v1/bootstrap", tags=["Core"])
 
 # ✅ ADVANCED FEATURES (Always preserved)
 app.include_router(todos.router, prefix="/api/v1/todos", tags=["Task Management"])
-app.include_router(template_builder.router, prefix="/api/v1/template-builder", tags=["Template Builder"])
+mount_router_group(app, ROUTER_MANIFEST["template_builder"], lazy=settings.LAZY_ROUTERS)
 # Mount templates for unit tests compatibility
 try:
 	from routers import templates as templates_router
@@ -849,6 +875,19 @@ except Exception as e:
 app.include_router(webhooks.router, prefix="/api/v1/webhooks", tags=["Webhooks"])
 app.include_router(workspaces.router, tags=["Workspaces"])
 
+# Lazy router groups are not in the route table until first used; the
+# OpenAPI schema (docs) loads them all so it stays complete
+_default_openapi = app.openapi
+
+
+def _openapi_with_lazy_routers() -> dict[str, Any]:
+    if app.openapi_schema is None:
+        load_all(app)
+    return _default_openapi()
+
+
+app.openapi = _openapi_with_lazy_routers
+
 # ============================================================================
 # 🧪 DEVELOPMENT CONVENIENCE: Proxy frontend to Vite dev server
 # ----------------------------------------------------------------------------
@@ -22,6 +22,7 @@ class RedisConfig:
     def __init__(self):
         self.redis_url = settings.REDIS_URL
         self.redis_client = None
+        self.binary_client = None
         self.cluster_nodes = []
         self.is_cluster = False
 
@@ -79,6 +80,28 @@ class RedisConfig:
             logger.error(f"Redis client creation failed: {e}")
             raise
 
+    async def create_binary_client(self) -> aioredis.Redis:
+        """
+        Create a client returning raw bytes (for binary-serialized cache values).
+
+        This is the one connection pool shared by every cache namespace, so
+        it is bounded by REDIS_MAX_CONNECTIONS.
+        """
+        config = self._parse_redis_config()
+        config["decode_responses"] = False
+        config["max_connections"] = settings.REDIS_MAX_CONNECTIONS
+
+        try:
+            self.binary_client = aioredis.from_url(
+                self.redis_url,
+                **{k: v for k, v in config.items() if v is not None},
+            )
+            await self.binary_client.ping()
+            return self.binary_client
+        except Exception as e:
+            logger.error(f"Redis binary client creation failed: {e}")
+            raise
+
     async def _configure_security(self):
         """Configure Redis security settings"""
         try:
@@ -337,6 +360,13 @@ async def get_redis_client() -> aioredis.Redis:
     return redis_config.redis_client
 
 
+async def get_binary_redis_client() -> aioredis.Redis:
+    """Get authenticated Redis client that does not decode responses"""
+    if not redis_config.binary_client:
+        await redis_config.create_binary_client()
+    return redis_config.binary_client
+
+
 async def init_redis():
     """Initialize Redis with authentication and security"""
     await redis_config.create_redis_client()
@@ -564,10 +564,7 @@ SGPT Security System
         min_risk_score: Optional[int] = None,
         limit: int = 1000,
     ) -> List[AuditEvent]:
-        """Query audit events with filters"""
-        if not self.db_session:
-            raise ValueError("Database session required for querying")
-        
+        """Query audit events with filters (on a read replica when no session is attached)"""
         query = select(AuditEventDB)
         
         filters = []
@@ -589,8 +586,14 @@ SGPT Security System
         
         query = query.order_by(AuditEventDB.timestamp.desc()).limit(limit)
         
-        result = await self.db_session.execute(query)
-        db_events = result.scalars().all()
+        if self.db_session:
+            result = await self.db_session.execute(query)
+            db_events = result.scalars().all()
+        else:
+            from core.database import read_session
+            async with read_session() as session:
+                result = await session.execute(query)
+                db_events = result.scalars().all()
         
         # Convert to AuditEvent objects
         events = []
@@ -0,0 +1,230 @@
+"""
+Cross-Worker Cache Invalidation Bus
+Redis pub/sub channel that keeps every worker's in-process L1 caches consistent
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+import weakref
+from typing import Any, Dict, Iterable, Optional
+
+import redis.asyncio as aioredis
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidationBus:
+    """
+    Batched invalidation messages over Redis pub/sub.
+
+    Caches register themselves and expose ``invalidate_local(keys, patterns,
+    tags, clear_all=False)``. A process invalidates its own L1 directly and
+    calls ``publish`` so every other worker does the same. Publishes are
+    coalesced for ``flush_interval`` seconds into a single message.
+    """
+
+    def __init__(
+        self,
+        channel: Optional[str] = None,
+        flush_interval: Optional[float] = None,
+        max_batch: int = 500,
+    ):
+        self.channel = channel or settings.CACHE_INVALIDATION_CHANNEL
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else settings.CACHE_INVALIDATION_FLUSH_MS / 1000
+        )
+        self.max_batch = max_batch
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._listeners: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._pending: Dict[str, set] = {"keys": set(), "patterns": set(), "tags": set()}
+        self._pending_clear_all = False
+        self._flush_event = asyncio.Event()
+
+        self.redis_client: Optional[aioredis.Redis] = None
+        self._listen_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'published_messages': 0,
+            'published_items': 0,
+            'received_messages': 0,
+            'resyncs': 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._listen_task is not None and not self._listen_task.done()
+
+    def register(self, cache: Any) -> None:
+        """Register a cache exposing ``invalidate_local``"""
+        self._listeners.add(cache)
+
+    async def start(self, redis_url: Optional[str] = None) -> bool:
+        """Connect and start the listener and flush loops (idempotent)"""
+        if self.running:
+            return True
+
+        try:
+            self.redis_client = aioredis.from_url(
+                redis_url or settings.REDIS_URL,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+            await self.redis_client.ping()
+        except Exception as e:
+            logger.warning(f"Cache invalidation bus unavailable: {e}")
+            self.redis_client = None
+            return False
+
+        self._flush_event = asyncio.Event()
+        self._listen_task = asyncio.create_task(self._listen_loop())
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"Cache invalidation bus listening on '{self.channel}'")
+        return True
+
+    async def stop(self) -> None:
+        """Flush pending invalidations and stop background tasks"""
+        await self.flush()
+        for task in (self._listen_task, self._flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._listen_task = self._flush_task = None
+        if self.redis_client:
+            try:
+                await self.redis_client.aclose()
+            except Exception:
+                pass
+            self.redis_client = None
+
+    def publish(
+        self,
+        keys: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        clear_all: bool = False,
+    ) -> None:
+        """Queue invalidations for other workers; no-op when the bus is down"""
+        if not self.running:
+            return
+
+        if clear_all:
+            self._pending_clear_all = True
+        self._pending["keys"].update(keys)
+        self._pending["patterns"].update(patterns)
+        self._pending["tags"].update(tags)
+        # Wake the flush loop, which waits ``flush_interval`` to coalesce more
+        self._flush_event.set()
+
+    async def flush(self) -> None:
+        """Publish every queued invalidation as one message"""
+        if not self.redis_client or not (self._pending_clear_all or any(self._pending.values())):
+            return
+
+        if self._pending_clear_all:
+            batch = {"keys": [], "patterns": [], "tags": [], "clear_all": True}
+        else:
+            batch = {k: sorted(v) for k, v in self._pending.items()}
+        self._pending = {"keys": set(), "patterns": set(), "tags": set()}
+        self._pending_clear_all = False
+        message = json.dumps({"origin": self.instance_id, **batch})
+        try:
+            await self.redis_client.publish(self.channel, message)
+            self.stats['published_messages'] += 1
+            self.stats['published_items'] += sum(
+                len(v) for v in batch.values() if isinstance(v, list)
+            )
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'running': self.running,
+            'channel': self.channel,
+            'listeners': len(self._listeners),
+            'pending': sum(len(v) for v in self._pending.values()),
+        }
+
+    def _dispatch(self, keys=(), patterns=(), tags=(), clear_all: bool = False) -> None:
+        for cache in list(self._listeners):
+            try:
+                cache.invalidate_local(keys=keys, patterns=patterns, tags=tags, clear_all=clear_all)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+
+    def _handle_message(self, data: str) -> None:
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") == self.instance_id:
+            return
+
+        self.stats['received_messages'] += 1
+        self._dispatch(
+            keys=payload.get("keys", ()),
+            patterns=payload.get("patterns", ()),
+            tags=payload.get("tags", ()),
+            clear_all=bool(payload.get("clear_all")),
+        )
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await self._flush_event.wait()
+                pending = sum(len(v) for v in self._pending.values())
+                if pending < self.max_batch and not self._pending_clear_all:
+                    await asyncio.sleep(self.flush_interval)
+                self._flush_event.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Cache invalidation flush loop error: {e}")
+
+    async def _listen_loop(self) -> None:
+        backoff = 1.0
+        first_subscription = True
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                if not first_subscription:
+                    # Messages may have been missed while disconnected
+                    self.stats['resyncs'] += 1
+                    self._dispatch(clear_all=True)
+                first_subscription = False
+                backoff = 1.0
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_message(message.get("data"))
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription lost: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+
+# Global invalidation bus shared by every cache in the process
+invalidation_bus = CacheInvalidationBus()
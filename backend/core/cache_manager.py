@@ -0,0 +1,386 @@
+"""
+Unified Cache Manager
+Named cache namespaces with per-namespace policies over one shared Redis connection pool
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, Optional
+
+import redis.asyncio as aioredis
+
+from config.redis_config import get_binary_redis_client
+from config.settings import settings
+from core.cache_invalidation import invalidation_bus
+from core.cache_serializer import CacheSerializer
+from core.cache_stampede import stampede_guard
+from core.cache_tags import scan_unlink, tag_index
+from core.l1_cache import BoundedL1Cache
+
+# Exported through the observability stack (OpenTelemetry -> Prometheus)
+# when it is installed
+try:
+    from core.observability import cache_metrics
+except ImportError:
+    cache_metrics = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Per-namespace cache policy (``l1_max_items=0`` disables the L1 tier)"""
+
+    ttl: int = 3600
+    l1_max_items: int = 1000
+    l1_max_bytes: int = 16 * 1024 * 1024
+    l1_ttl: float = 300
+    eviction: str = "lru"
+    codec: Optional[str] = None
+    compression: Optional[str] = None
+    legacy: str = "json"
+
+
+# Namespaces used by the existing cache front-ends
+DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+    # EnhancedCache / @cached / SGPTCache
+    "default": CachePolicy(
+        ttl=3600,
+        l1_max_items=settings.CACHE_L1_MAX_ITEMS,
+        l1_max_bytes=settings.CACHE_L1_MAX_BYTES,
+        l1_ttl=settings.CACHE_L1_MAX_TTL,
+    ),
+    # AnalyticsCacheService: Redis only, invalidated by tag
+    "analytics": CachePolicy(ttl=3600, l1_max_items=0),
+    # UltraFastCache L1 tiers; entries predating the envelope are raw msgpack
+    "ultrafast:hot": CachePolicy(ttl=3600, l1_max_items=10000, l1_ttl=3600, legacy="msgpack"),
+    "ultrafast:session": CachePolicy(ttl=3600, l1_max_items=5000, l1_ttl=300, legacy="msgpack"),
+    "ultrafast:query": CachePolicy(
+        ttl=3600, l1_max_items=20000, l1_ttl=600, eviction="fifo", legacy="msgpack"
+    ),
+    # AdminCacheService: hot copy of the admin-database metrics cache
+    "admin": CachePolicy(ttl=300, l1_max_items=200, l1_ttl=60),
+    # PlanService / LicenseService: short-lived user plan and license lookups
+    "plans": CachePolicy(
+        ttl=max(1, settings.PLAN_CACHE_TTL),
+        l1_max_items=5000,
+        l1_ttl=max(1, settings.PLAN_CACHE_TTL),
+    ),
+}
+
+
+class CacheNamespace:
+    """
+    One named cache: bounded L1 plus L2 (Redis) on the manager's shared pool.
+
+    Keys are stored as given, so existing key schemes and tag indexes keep
+    working; the namespace only decides TTL, L1 size/eviction and encoding.
+    """
+
+    def __init__(self, manager: "CacheManager", name: str, policy: CachePolicy):
+        self.manager = manager
+        self.name = name
+        self.policy = policy
+
+        self.l1: Optional[BoundedL1Cache] = None
+        if policy.l1_max_items > 0:
+            self.l1 = BoundedL1Cache(
+                maxsize=policy.l1_max_items,
+                max_bytes=policy.l1_max_bytes,
+                default_ttl=policy.l1_ttl,
+                eviction=policy.eviction,
+            )
+            # Other workers drop their L1 copies when this one invalidates
+            invalidation_bus.register(self)
+
+        self.serializer = CacheSerializer(
+            codec=policy.codec, compression=policy.compression, legacy=policy.legacy
+        )
+
+        self.stats = {
+            'l1_hits': 0,
+            'l1_misses': 0,
+            'l2_hits': 0,
+            'l2_misses': 0,
+            'total_requests': 0,
+            'sets': 0,
+            'errors': 0,
+        }
+
+    @property
+    def redis_client(self) -> Optional[aioredis.Redis]:
+        return self.manager.redis_client
+
+    @property
+    def default_ttl(self) -> int:
+        return self.policy.ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value (L1 -> L2 -> None)"""
+        started = time.perf_counter()
+        self.stats['total_requests'] += 1
+
+        if self.l1 is not None:
+            value = self.l1.get(key, _MISSING)
+            if value is not _MISSING:
+                self.stats['l1_hits'] += 1
+                self.observe_lookup("l1_hit", started)
+                return value
+            self.stats['l1_misses'] += 1
+
+        redis_client = self.redis_client
+        if redis_client:
+            try:
+                redis_started = time.perf_counter()
+                if self.l1 is None:
+                    raw, remaining_ttl = await redis_client.get(key), None
+                else:
+                    # Value and remaining TTL in one round trip so the
+                    # promoted L1 copy expires no later than the Redis key
+                    pipe = redis_client.pipeline(transaction=False)
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    raw, remaining_ttl = await pipe.execute()
+                self.observe_redis("get", redis_started, len(raw) if raw else None)
+                if raw:
+                    self.stats['l2_hits'] += 1
+                    value = self.serializer.loads(raw)
+                    if self.l1 is not None and remaining_ttl is not None and remaining_ttl != -2:
+                        # -1 means the key has no expiry; fall back to the L1 cap
+                        self.l1.set(key, value, remaining_ttl if remaining_ttl > 0 else None)
+                    self.observe_lookup("l2_hit", started)
+                    return value
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Cache namespace '{self.name}' get error: {e}")
+
+        self.stats['l2_misses'] += 1
+        self.observe_lookup("miss", started)
+        return None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        """Set a value in L1 and L2, indexing ``tags`` in the same round trip"""
+        ttl = ttl or self.policy.ttl
+        tags = tuple(tags)
+        self.stats['sets'] += 1
+
+        if self.l1 is not None:
+            self.l1.set(key, value, ttl, tags=tags)
+            # Other workers re-read the new value instead of serving their old copy
+            invalidation_bus.publish(keys=[key])
+
+        redis_client = self.redis_client
+        if not redis_client:
+            return self.l1 is not None
+
+        try:
+            serialized = self.serializer.dumps(value)
+            redis_started = time.perf_counter()
+            if tags:
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.setex(key, ttl, serialized)
+                tag_index.stage(pipe, key, tags, ttl)
+                await pipe.execute()
+            else:
+                await redis_client.setex(key, ttl, serialized)
+            self.observe_redis("set", redis_started, len(serialized))
+            return True
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Cache namespace '{self.name}' set error: {e}")
+            return False
+
+    async def delete(self, key: str) -> None:
+        """Delete a key from L2 and from every worker's L1"""
+        if self.l1 is not None:
+            self.l1.pop(key, None)
+            invalidation_bus.publish(keys=[key])
+
+        if self.redis_client:
+            try:
+                await self.redis_client.delete(key)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Cache namespace '{self.name}' delete error: {e}")
+
+    async def clear_pattern(self, pattern: str) -> int:
+        """
+        Clear keys matching ``pattern`` in L2 and in every worker's L1.
+
+        This walks the whole keyspace (incrementally, via SCAN); prefer
+        ``invalidate_tags`` for anything on a hot path.
+        """
+        if self.l1 is not None:
+            self.l1.invalidate_pattern(pattern)
+            invalidation_bus.publish(patterns=[pattern])
+
+        if not self.redis_client:
+            return 0
+        try:
+            return await scan_unlink(self.redis_client, pattern)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Cache namespace '{self.name}' pattern clear error: {e}")
+            return 0
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of the tags from L2 and every worker's L1"""
+        if self.l1 is not None:
+            self.l1.invalidate_tags(tags)
+            invalidation_bus.publish(tags=tags)
+
+        if not self.redis_client:
+            return 0
+        try:
+            return await tag_index.invalidate(self.redis_client, tags)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Cache namespace '{self.name}' tag invalidation error: {e}")
+            return 0
+
+    def invalidate_local(
+        self,
+        keys: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        clear_all: bool = False,
+    ) -> None:
+        """Apply an invalidation to this worker's L1 only"""
+        if self.l1 is None:
+            return
+        if clear_all:
+            self.l1.clear()
+            return
+        for key in keys:
+            self.l1.pop(key, None)
+        for pattern in patterns:
+            self.l1.invalidate_pattern(pattern)
+        self.l1.invalidate_tags(tags)
+
+    def observe_lookup(self, result: str, started: float) -> None:
+        """Record a lookup outcome (l1_hit, l2_hit, miss) and its latency"""
+        if cache_metrics is not None:
+            cache_metrics.record_lookup(self.name, result, time.perf_counter() - started)
+
+    def observe_redis(self, op: str, started: float, size: Optional[int] = None) -> None:
+        """Record a Redis round trip and, when known, the value size"""
+        if cache_metrics is not None:
+            cache_metrics.record_redis(self.name, op, time.perf_counter() - started, size)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats['total_requests']
+        stats: Dict[str, Any] = {
+            **self.stats,
+            'ttl': self.policy.ttl,
+            'codec': self.serializer.codec,
+            'compression': self.serializer.compression,
+        }
+        if total:
+            stats['l1_hit_rate'] = f"{self.stats['l1_hits'] / total * 100:.1f}%"
+            stats['l2_hit_rate'] = f"{self.stats['l2_hits'] / total * 100:.1f}%"
+            stats['overall_hit_rate'] = (
+                f"{(self.stats['l1_hits'] + self.stats['l2_hits']) / total * 100:.1f}%"
+            )
+        if self.l1 is not None:
+            l1_stats = self.l1.get_stats()
+            stats.update({
+                'l1_size': l1_stats['size'],
+                'l1_bytes': l1_stats['bytes'],
+                'l1_max_items': l1_stats['maxsize'],
+                'l1_max_bytes': l1_stats['max_bytes'],
+                'l1_eviction': l1_stats['eviction'],
+                'l1_evictions': l1_stats['evictions'],
+                'l1_expirations': l1_stats['expirations'],
+                'l1_rejections': l1_stats['rejections'],
+            })
+        return stats
+
+
+class CacheManager:
+    """
+    Registry of cache namespaces sharing one Redis client.
+
+    ``namespace(name)`` returns the same ``CacheNamespace`` for the life of
+    the process; its policy comes from ``DEFAULT_POLICIES`` unless one is
+    passed when the namespace is first created.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, CachePolicy]] = None):
+        self.policies: Dict[str, CachePolicy] = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.redis_client: Optional[aioredis.Redis] = None
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self._init_lock: Optional[asyncio.Lock] = None
+
+    def namespace(self, name: str, policy: Optional[CachePolicy] = None, **overrides) -> CacheNamespace:
+        """Get or create a namespace; ``policy``/``overrides`` apply on creation only"""
+        ns = self._namespaces.get(name)
+        if ns is None:
+            policy = policy or self.policies.get(name, CachePolicy())
+            if overrides:
+                policy = replace(policy, **overrides)
+            self.policies[name] = policy
+            ns = self._namespaces[name] = CacheNamespace(self, name, policy)
+        return ns
+
+    def get_namespaces(self) -> Dict[str, CacheNamespace]:
+        """Namespaces created so far, by name"""
+        return dict(self._namespaces)
+
+    async def init(self) -> bool:
+        """Connect the shared pool and start the invalidation bus (idempotent)"""
+        if self.redis_client is not None:
+            return True
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+
+        async with self._init_lock:
+            if self.redis_client is None:
+                try:
+                    self.redis_client = await get_binary_redis_client()
+                    logger.info("Cache manager Redis pool established")
+                except Exception as e:
+                    logger.warning(f"Redis unavailable for caching: {e}")
+                    self.redis_client = None
+                    return False
+                await invalidation_bus.start()
+        return True
+
+    async def close(self) -> None:
+        """Flush pending invalidations and stop the invalidation bus"""
+        await invalidation_bus.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Stats for every namespace, the shared pool and the coordination layers"""
+        return {
+            'redis': self._pool_stats(),
+            'namespaces': {name: ns.get_stats() for name, ns in sorted(self._namespaces.items())},
+            'invalidation_bus': invalidation_bus.get_stats(),
+            'stampede': stampede_guard.get_stats(),
+        }
+
+    def _pool_stats(self) -> Dict[str, Any]:
+        if self.redis_client is None:
+            return {'connected': False}
+        pool = self.redis_client.connection_pool
+        available = len(getattr(pool, '_available_connections', ()))
+        in_use = len(getattr(pool, '_in_use_connections', ()))
+        return {
+            'connected': True,
+            'max_connections': pool.max_connections,
+            'open_connections': available + in_use,
+            'in_use_connections': in_use,
+        }
+
+
+# Global cache manager shared by every cache front-end
+cache_manager = CacheManager()
@@ -0,0 +1,205 @@
+"""
+Cache Serializer
+Versioned binary envelope (msgpack/orjson + optional compression) shared by Redis-backed caches
+"""
+
+import json
+import logging
+import uuid
+import zlib
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Union
+
+import msgpack
+import orjson
+
+from config.settings import settings
+
+# Optional zstd compression (falls back to zlib)
+try:
+    import zstandard as zstd
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstd = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 0xC1 is reserved ("never used") in msgpack and never valid in UTF-8, so it
+# cannot start a legacy JSON or msgpack value.
+MAGIC = 0xC1
+ENVELOPE_VERSION = 1
+
+CODEC_MSGPACK = ord("m")
+CODEC_ORJSON = ord("j")
+COMPRESSION_NONE = ord("n")
+COMPRESSION_ZLIB = ord("d")
+COMPRESSION_ZSTD = ord("z")
+
+_CODECS = {"msgpack": CODEC_MSGPACK, "orjson": CODEC_ORJSON}
+_COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+# msgpack extension types so values round-trip with their Python types
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_TIME = 3
+_EXT_DECIMAL = 4
+_EXT_UUID = 5
+_EXT_SET = 6
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, dt_time):
+        return msgpack.ExtType(_EXT_TIME, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(_EXT_UUID, obj.bytes)
+    if isinstance(obj, (set, frozenset)):
+        return msgpack.ExtType(_EXT_SET, _pack(list(obj)))
+    # Same fallback the json.dumps(default=str) call sites relied on
+    return str(obj)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_TIME:
+        return dt_time.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == _EXT_SET:
+        return set(_unpack(data))
+    return msgpack.ExtType(code, data)
+
+
+def _pack(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True, default=_msgpack_default, datetime=False)
+
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, ext_hook=_msgpack_ext_hook, strict_map_key=False)
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _legacy_json(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+def _legacy_msgpack(data: Union[bytes, str]) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+LEGACY_DECODERS: Dict[str, Callable[[Union[bytes, str]], Any]] = {
+    "json": _legacy_json,
+    "msgpack": _legacy_msgpack,
+}
+
+
+class CacheSerializer:
+    """
+    Encodes cache values as ``MAGIC | version | codec | compression | payload``.
+
+    Payloads above ``compression_threshold`` bytes are compressed (zstd when
+    installed, zlib otherwise). Values without the header were written before
+    the envelope existed and are decoded with the ``legacy`` decoder, so old
+    entries keep reading until they expire.
+    """
+
+    def __init__(
+        self,
+        codec: Optional[str] = None,
+        compression: Optional[str] = None,
+        compression_threshold: Optional[int] = None,
+        legacy: str = "json",
+    ):
+        codec = codec or settings.CACHE_SERIALIZER_CODEC
+        compression = compression or settings.CACHE_COMPRESSION
+        if codec not in _CODECS:
+            raise ValueError(f"Unknown cache codec: {codec}")
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            compression = "zlib"
+
+        self.codec = codec
+        self.compression = compression
+        self.compression_threshold = (
+            compression_threshold if compression_threshold is not None
+            else settings.CACHE_COMPRESSION_THRESHOLD
+        )
+        self.legacy_decoder = LEGACY_DECODERS[legacy]
+
+        self._codec_id = _CODECS[codec]
+        self._compression_id = _COMPRESSIONS[compression]
+        self._zstd_compressor = zstd.ZstdCompressor(level=3) if compression == "zstd" else None
+        self._zstd_decompressor = zstd.ZstdDecompressor() if ZSTD_AVAILABLE else None
+
+    def dumps(self, value: Any) -> bytes:
+        if self._codec_id == CODEC_MSGPACK:
+            payload = _pack(value)
+        else:
+            payload = orjson.dumps(value, default=_orjson_default, option=_ORJSON_OPTIONS)
+
+        compression = COMPRESSION_NONE
+        if self._compression_id != COMPRESSION_NONE and len(payload) >= self.compression_threshold:
+            if self._compression_id == COMPRESSION_ZSTD:
+                payload = self._zstd_compressor.compress(payload)
+            else:
+                payload = zlib.compress(payload, 6)
+            compression = self._compression_id
+
+        return bytes((MAGIC, ENVELOPE_VERSION, self._codec_id, compression)) + payload
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, str) or not data or data[0] != MAGIC:
+            return self.legacy_decoder(data)
+
+        version, codec, compression = data[1], data[2], data[3]
+        if version != ENVELOPE_VERSION:
+            raise ValueError(f"Unsupported cache envelope version: {version}")
+
+        payload = data[4:]
+        if compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+            payload = self._zstd_decompressor.decompress(payload)
+        elif compression == COMPRESSION_ZLIB:
+            payload = zlib.decompress(payload)
+
+        if codec == CODEC_MSGPACK:
+            return _unpack(payload)
+        if codec == CODEC_ORJSON:
+            return orjson.loads(payload)
+        raise ValueError(f"Unknown cache codec id: {codec}")
+
+
+def dumps_text(value: Any) -> str:
+    """JSON text for Redis clients using decode_responses=True (no envelope)"""
+    return orjson.dumps(value, default=_orjson_default, option=_ORJSON_OPTIONS).decode()
+
+
+def loads_text(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data)
+
+
+# Default serializer for JSON-era caches; UltraFastCache reads legacy msgpack
+cache_serializer = CacheSerializer()
@@ -0,0 +1,240 @@
+"""
+Cache Stampede Protection
+Single-flight coalescing, Redis lease locks and stale-while-revalidate for cache decorators
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from core.redis_leases import RELEASE_LEASE_SCRIPT
+
+# Exported through the observability stack (OpenTelemetry -> Prometheus)
+# when it is installed
+try:
+    from core.observability import cache_metrics
+except ImportError:
+    cache_metrics = None
+
+logger = logging.getLogger(__name__)
+
+# Marker for values wrapped with freshness metadata
+_ENVELOPE_MARKER = "__swr__"
+
+# Lease outcome when Redis is unreachable: recompute without coordination
+_NO_COORDINATION = ""
+
+
+def wrap_entry(value: Any, ttl: int, compute_seconds: float) -> Dict[str, Any]:
+    """Wrap a value with its freshness deadline and recompute cost"""
+    return {
+        _ENVELOPE_MARKER: 1,
+        "v": value,
+        "fresh_until": time.time() + ttl,
+        "delta": round(compute_seconds, 6),
+    }
+
+
+def unwrap_entry(entry: Any) -> Tuple[Any, Optional[float], float]:
+    """Return (value, fresh_until, delta); legacy plain values have no deadline"""
+    if isinstance(entry, dict) and entry.get(_ENVELOPE_MARKER) == 1:
+        return entry.get("v"), entry.get("fresh_until"), entry.get("delta") or 0.0
+    return entry, None, 0.0
+
+
+def should_refresh_early(fresh_until: float, delta: float, beta: float, now: Optional[float] = None) -> bool:
+    """
+    Probabilistic early expiration (XFetch).
+
+    The closer an entry is to its deadline, and the more expensive it was
+    to compute, the more likely a reader refreshes it ahead of time. With
+    many readers this spreads recomputation out instead of every request
+    missing at the same instant.
+    """
+    if beta <= 0 or delta <= 0:
+        return False
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(random.random() or 1e-12) >= fresh_until
+
+
+class StampedeGuard:
+    """
+    Coordinates recomputation of one cache key.
+
+    - Within a process, concurrent misses share a single in-flight call.
+    - Across processes, the recomputing worker holds a short Redis lease;
+      others poll the cache for the fresh value instead of recomputing.
+    - With ``stale_ttl`` an expired entry is served while one background
+      task refreshes it; with ``beta`` entries are refreshed early.
+    """
+
+    def __init__(
+        self,
+        lease_prefix: str = "cache:lease:",
+        lease_ttl: float = 30.0,
+        wait_timeout: float = 5.0,
+        poll_interval: float = 0.05,
+    ):
+        self.lease_prefix = lease_prefix
+        self.lease_ttl = lease_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background: set = set()
+
+        self.stats = {
+            'coalesced': 0,
+            'lease_waits': 0,
+            'lease_timeouts': 0,
+            'stale_served': 0,
+            'early_refreshes': 0,
+            'recomputes': 0,
+        }
+
+    async def fetch(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        load: Callable[[str], Awaitable[Any]],
+        store: Callable[[str, Any, int], Awaitable[None]],
+        ttl: int,
+        stale_ttl: int = 0,
+        beta: float = 0.0,
+        redis_client: Any = None,
+        name: Optional[str] = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key`` or compute it exactly once.
+
+        ``load(key)`` returns the stored entry or None; ``store(key, entry,
+        ttl)`` persists an entry for ``ttl`` seconds. Entries are stored for
+        ``ttl + stale_ttl`` seconds and are fresh for the first ``ttl``.
+        ``name`` labels the hit/stale/miss metrics (usually the function).
+        """
+        started = time.perf_counter()
+        entry = await load(key)
+        if entry is not None:
+            value, fresh_until, delta = unwrap_entry(entry)
+            if fresh_until is None:
+                self._observe(name, "hit", started)
+                return value
+
+            now = time.time()
+            if now < fresh_until:
+                if should_refresh_early(fresh_until, delta, beta, now):
+                    self.stats['early_refreshes'] += 1
+                    self._refresh_in_background(key, compute, load, store, ttl, stale_ttl, redis_client)
+                self._observe(name, "hit", started)
+                return value
+
+            if stale_ttl > 0:
+                self.stats['stale_served'] += 1
+                self._refresh_in_background(key, compute, load, store, ttl, stale_ttl, redis_client)
+                self._observe(name, "stale", started)
+                return value
+
+        value = await self._single_flight(
+            key, lambda: self._recompute(key, compute, load, store, ttl, stale_ttl, redis_client)
+        )
+        self._observe(name, "miss", started)
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'inflight': len(self._inflight)}
+
+    def _observe(self, name: Optional[str], result: str, started: float) -> None:
+        if name is not None and cache_metrics is not None:
+            cache_metrics.record_function(name, result, time.perf_counter() - started)
+
+    async def _single_flight(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _recompute(self, key, compute, load, store, ttl, stale_ttl, redis_client) -> Any:
+        token = await self._acquire_lease(redis_client, key)
+        if token is None:
+            # Another process is recomputing; wait for its result
+            self.stats['lease_waits'] += 1
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                entry = await load(key)
+                if entry is not None:
+                    value, fresh_until, _ = unwrap_entry(entry)
+                    if fresh_until is None or fresh_until > time.time():
+                        return value
+            self.stats['lease_timeouts'] += 1
+
+        try:
+            self.stats['recomputes'] += 1
+            start = time.perf_counter()
+            value = await compute()
+            elapsed = time.perf_counter() - start
+            if value is not None:
+                await store(key, wrap_entry(value, ttl, elapsed), ttl + stale_ttl)
+            return value
+        finally:
+            if token:
+                await self._release_lease(redis_client, key, token)
+
+    def _refresh_in_background(self, key, compute, load, store, ttl, stale_ttl, redis_client) -> None:
+        if key in self._inflight:
+            return
+
+        async def _refresh():
+            try:
+                await self._single_flight(
+                    key, lambda: self._recompute(key, compute, load, store, ttl, stale_ttl, redis_client)
+                )
+            except Exception as e:
+                logger.warning(f"Background cache refresh failed for {key}: {e}")
+
+        task = asyncio.create_task(_refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _acquire_lease(self, redis_client, key: str) -> Optional[str]:
+        """Return a lease token, None if another process holds it, or '' without Redis"""
+        if redis_client is None:
+            return _NO_COORDINATION
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(
+                f"{self.lease_prefix}{key}", token, nx=True, px=int(self.lease_ttl * 1000)
+            )
+            return token if acquired else None
+        except Exception as e:
+            logger.debug(f"Cache lease unavailable for {key}: {e}")
+            return _NO_COORDINATION
+
+    async def _release_lease(self, redis_client, key: str, token: str) -> None:
+        try:
+            await redis_client.eval(RELEASE_LEASE_SCRIPT, 1, f"{self.lease_prefix}{key}", token)
+        except Exception as e:
+            logger.debug(f"Cache lease release failed for {key}: {e}")
+
+
+# Shared guard for the cache decorators
+stampede_guard = StampedeGuard()
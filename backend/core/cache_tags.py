@@ -0,0 +1,221 @@
+"""
+Redis Tag Indexes for Cache Invalidation
+Tag sets maintained at write time so scoped invalidation never scans the keyspace
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import re
+import time
+from typing import Callable, Iterable, List, Optional
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Key families used by SGPTCache / @cached / AnalyticsCacheService
+_ENTITY_SEGMENT = re.compile(r"(?:^|:)(user|campaign)_id[:=]([^:]+)")
+_ENTITY_ID_KEY = re.compile(r"^(user|campaign)[a-z_]*:id:([^:]+)")
+_ANALYTICS_KEY = re.compile(r"^analytics:([A-Za-z0-9_]+):")
+
+# AnalyticsCacheService key prefix segment -> invalidation scope
+_ANALYTICS_SCOPES = {
+    "campaign": "campaign_stats",
+    "user": "user_stats",
+    "email": "email_stats",
+    "webhook": "webhook_stats",
+    "system": "system_stats",
+    "performance": "performance",
+    "realtime": "realtime",
+}
+
+
+def entity_tags(params: dict) -> List[str]:
+    """Tags for well-known entity ids in cache key parameters (user_id, campaign_id)"""
+    tags = []
+    for entity in ("user", "campaign"):
+        value = params.get(f"{entity}_id")
+        if value is not None:
+            tags.append(f"{entity}:{value}")
+    return tags
+
+
+def default_tag_deriver(key: str) -> List[str]:
+    """
+    Derive tags from an existing key name.
+
+    Used to backfill tag sets for keys written before tagging existed; it
+    mirrors the tags the write paths attach today.
+    """
+    tags = set()
+    match = _ENTITY_ID_KEY.match(key)
+    if match:
+        tags.add(f"{match.group(1)}:{match.group(2)}")
+    for entity, value in _ENTITY_SEGMENT.findall(key):
+        if value != "None":
+            tags.add(f"{entity}:{value}")
+
+    match = _ANALYTICS_KEY.match(key)
+    if match:
+        scope = _ANALYTICS_SCOPES.get(match.group(1))
+        if scope is None:
+            # @cache_analytics_result keys: analytics:<function>:<hash>
+            tags.add(f"analytics:fn:{match.group(1)}")
+            return sorted(tags)
+        tags.add(f"analytics:{scope}")
+        for entity, value in _ENTITY_SEGMENT.findall(key):
+            if entity == "user" and value != "None":
+                tags.add(f"analytics:{scope}:user:{value}")
+    return sorted(tags)
+
+
+# Add one member to a tag set, drop members that have expired and make the
+# set expire with its longest-lived member ("inf" members keep it forever)
+# KEYS: tag set; ARGV: member, expires at (ms or 'inf'), now (ms)
+TAG_ADD_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+local last = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')[2]
+if last == 'inf' then
+    redis.call('PERSIST', KEYS[1])
+else
+    redis.call('PEXPIREAT', KEYS[1], last)
+end
+"""
+
+
+class RedisTagIndex:
+    """
+    Tag -> key sets stored in Redis.
+
+    Each tag is a sorted set of keys scored by when they expire. Writers
+    stage TAG_ADD_LUA in the same pipeline as the value write; it drops
+    members that have already expired, so a hot tag holds only live keys,
+    and the set expires with its longest-lived member. Invalidation walks
+    one tag with ``ZSCAN`` and
+    ``UNLINK``s members in pipelined batches, so cost is O(tagged keys) and
+    never blocks Redis the way ``KEYS`` does on a large keyspace.
+    """
+
+    def __init__(self, prefix: str = "cache:tag:", batch_size: int = 500):
+        self.prefix = prefix
+        self.batch_size = batch_size
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.prefix}{tag}"
+
+    def stage(self, pipe, key: str, tags: Iterable[str], ttl: Optional[int] = None) -> None:
+        """Add tag-set writes for ``key`` (expiring in ``ttl`` seconds, None for never) to a pipeline"""
+        now = int(time.time() * 1000)
+        expires_at = now + ttl * 1000 if ttl else "inf"
+        for tag in tags:
+            pipe.eval(TAG_ADD_LUA, 1, self.tag_key(tag), key, expires_at, now)
+
+    async def invalidate(self, redis_client: aioredis.Redis, tags: Iterable[str]) -> int:
+        """UNLINK every key carrying any of ``tags``; returns keys removed"""
+        removed = 0
+        for tag in tags:
+            tag_key = self.tag_key(tag)
+            batch: List[str] = []
+            async for member, _ in redis_client.zscan_iter(tag_key, count=self.batch_size):
+                batch.append(member)
+                if len(batch) >= self.batch_size:
+                    removed += await self._unlink(redis_client, batch)
+                    batch = []
+            if batch:
+                removed += await self._unlink(redis_client, batch)
+            await redis_client.unlink(tag_key)
+        return removed
+
+    async def backfill(
+        self,
+        redis_client: aioredis.Redis,
+        pattern: str,
+        derive: Callable[[str], Iterable[str]] = default_tag_deriver,
+    ) -> int:
+        """Index existing keys matching ``pattern`` (SCAN-based, one-off migration)"""
+        indexed = 0
+        pending: List[tuple] = []
+        async for key in redis_client.scan_iter(match=pattern, count=self.batch_size):
+            if isinstance(key, bytes):
+                key = key.decode()
+            if key.startswith(self.prefix):
+                continue
+            tags = list(derive(key))
+            if not tags:
+                continue
+            pending.append((key, tags))
+            if len(pending) >= self.batch_size:
+                indexed += await self._backfill_batch(redis_client, pending)
+                pending = []
+        if pending:
+            indexed += await self._backfill_batch(redis_client, pending)
+        return indexed
+
+    async def _backfill_batch(self, redis_client: aioredis.Redis, entries: List[tuple]) -> int:
+        # Members are scored by the key's remaining TTL, like on a normal write
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, _ in entries:
+                pipe.pttl(key)
+            ttls = await pipe.execute()
+        indexed = 0
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for (key, tags), pttl in zip(entries, ttls):
+                if pttl == -2:
+                    continue  # Gone since the scan
+                self.stage(pipe, key, tags, math.ceil(pttl / 1000) if pttl > 0 else None)
+                indexed += 1
+            await pipe.execute()
+        return indexed
+
+    async def _unlink(self, redis_client: aioredis.Redis, keys: List[str]) -> int:
+        return int(await redis_client.unlink(*keys) or 0)
+
+
+async def scan_unlink(redis_client: aioredis.Redis, pattern: str, batch_size: int = 500) -> int:
+    """Incremental replacement for KEYS+DEL: SCAN the keyspace and UNLINK in batches"""
+    removed = 0
+    batch: List[str] = []
+    async for key in redis_client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            removed += await redis_client.unlink(*batch)
+            batch = []
+    if batch:
+        removed += await redis_client.unlink(*batch)
+    return removed
+
+
+# Shared tag index used by the cache layer
+tag_index = RedisTagIndex()
+
+
+async def _backfill_main(redis_url: str, patterns: List[str]) -> None:
+    client = aioredis.from_url(redis_url, decode_responses=True)
+    try:
+        for pattern in patterns:
+            indexed = await tag_index.backfill(client, pattern)
+            print(f"{pattern}: indexed {indexed} keys")
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    # One-off migration: python -m core.cache_tags --pattern 'user:*' --pattern 'analytics:*'
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description="Backfill cache tag indexes for existing keys")
+    parser.add_argument("--redis-url", default=settings.REDIS_URL)
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        default=None,
+        help="SCAN pattern to index (repeatable); defaults to the known cache key families",
+    )
+    args = parser.parse_args()
+    asyncio.run(_backfill_main(
+        args.redis_url,
+        args.pattern or ["user:*", "campaign*", "*user_id:*", "analytics:*"],
+    ))
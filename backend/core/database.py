@@ -1,16 +1,18 @@
 import logging
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
+from fastapi import Request
+from sqlalchemy import bindparam, column, text, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from config.settings import settings
+from core.engine_registry import engine_registry
+from core.query_profiler import query_profiler
+from core.read_replicas import client_identity, replica_router
 
 logger = logging.getLogger(__name__)
 
@@ -24,48 +26,15 @@ if is_sqlite and not getattr(settings, "TESTING", False):
         "Set TESTING=true to use SQLite for tests, or use PostgreSQL."
     )
 
-# Engine configuration - conditional per driver
-if is_postgres:
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=settings.DEBUG,
-        pool_size=getattr(settings, "DATABASE_POOL_SIZE", 50),  # Increased for high concurrency
-        max_overflow=getattr(settings, "DATABASE_MAX_OVERFLOW", 200),  # Increased for high concurrency
-        pool_timeout=getattr(settings, "DATABASE_POOL_TIMEOUT", 30),  # Increased for high concurrency
-        pool_pre_ping=True,
-        pool_recycle=900,
-        connect_args={
-            "server_settings": {
-                "application_name": "SGPT_HighConcurrency",
-                "jit": "off",
-                "random_page_cost": "1.1",
-                # Note: The following settings require server restart and are removed:
-                # effective_cache_size, shared_buffers, work_mem, maintenance_work_mem,
-                # max_connections, max_worker_processes, max_parallel_workers_per_gather, max_parallel_workers
-                # These should be set in postgresql.conf instead
-            },
-            "command_timeout": getattr(settings, "CONNECTION_TIMEOUT", 30),
-        },
-        logging_name="sqlalchemy.engine",
-    )
-else:
-    # SQLite (testing): simpler engine without PG-specific args
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=settings.DEBUG,
-        pool_pre_ping=True,
-        logging_name="sqlalchemy.engine",
-    )
-
-# PERFORMANCE FIX: Optimized async session configuration
-async_session = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    # Optimize session handling for performance
-    autoflush=False,  # Manual control over flushes
-    autocommit=False,  # Explicit transaction control
-)
+# Engine and session factory come from the shared registry so every module
+# in the process uses the same tuned "oltp" pool (see core.engine_registry)
+engine = engine_registry.engine("oltp")
+async_session = engine_registry.sessionmaker("oltp")
+# Writes through the primary pin the client's reads to it (read-your-writes)
+replica_router.watch_writes(engine)
+# Statement fingerprints and N+1 suspects for every engine in the process
+if settings.QUERY_PROFILER_ENABLED:
+    query_profiler.attach()
 
 # Import Base from models to ensure all models use the same Base
 from models.base import Base
@@ -175,6 +144,36 @@ async def get_db():
                 logger.warning(f"Slow database operation: {duration:.2f}s")
 
 
+async def get_read_db(request: Request):
+    """
+    Session for read-only endpoints: a read replica when one is configured
+    and caught up, the primary for clients that wrote in the last few seconds.
+    """
+    pool = await replica_router.route(client_identity(request.scope))
+    async with read_session(pool) as session:
+        yield session
+
+
+@asynccontextmanager
+async def read_session(pool: Optional[str] = None):
+    """Read-only session outside a request; ``pool`` defaults to the router's choice"""
+    start_time = time.time()
+    if pool is None:
+        pool = await replica_router.route()
+    async with engine_registry.sessionmaker(pool)() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Database error on {pool}: {e}")
+            raise
+        finally:
+            await session.close()
+            duration = time.time() - start_time
+            if duration > 1.0:
+                logger.warning(f"Slow read on {pool}: {duration:.2f}s")
+
+
 # PERFORMANCE FIX: Bulk operations utility
 class BulkOperations:
     """Optimized bulk database operations"""
@@ -193,20 +192,87 @@ class BulkOperations:
         session: AsyncSession, email_updates: list
     ):
         """Bulk update email statuses efficiently"""
-        from sqlalchemy import update
-
         from models.base import CampaignEmail
 
-        for update_data in email_updates:
-            stmt = (
-                update(CampaignEmail)
-                .where(CampaignEmail.id == update_data["id"])
-                .values(**{k: v for k, v in update_data.items() if k != "id"})
-            )
-            await session.execute(stmt)
-
+        await BulkOperations.bulk_update(
+            session,
+            CampaignEmail,
+            [
+                (update_data["id"], {k: v for k, v in update_data.items() if k != "id"})
+                for update_data in email_updates
+            ],
+        )
         await session.commit()
 
+    @staticmethod
+    async def bulk_update(
+        session,
+        model,
+        rows: Iterable[Tuple[Any, Dict[str, Any]]],
+        chunk_size: Optional[int] = None,
+        strategy: str = "auto",
+    ) -> None:
+        """
+        Apply per-row changes with a few set-based UPDATEs instead of one per row.
+
+        ``rows`` are ``(primary key, {column: value})`` pairs for an ORM model or
+        Core table. Rows changing the same columns are sent together, up to
+        ``chunk_size`` (BULK_UPDATE_CHUNK_SIZE) rows per statement:
+
+        - ``"values"``: ``UPDATE t SET ... FROM (VALUES ...) WHERE t.pk = v.pk``,
+          one statement per chunk (the PostgreSQL default)
+        - ``"executemany"``: one bound-parameter UPDATE executed for the whole
+          chunk (the default elsewhere)
+
+        Works on an AsyncSession or AsyncConnection and does not commit.
+        """
+        table = getattr(model, "__table__", model)
+        pk_columns = list(table.primary_key.columns)
+        if len(pk_columns) != 1:
+            raise ValueError(f"bulk_update needs a single-column primary key, {table.name} has {len(pk_columns)}")
+        pk = pk_columns[0]
+        chunk_size = chunk_size or settings.BULK_UPDATE_CHUNK_SIZE
+        if strategy == "auto":
+            dialect = getattr(session, "dialect", None) or session.get_bind().dialect
+            strategy = "values" if dialect.name == "postgresql" else "executemany"
+        if strategy not in ("values", "executemany"):
+            raise ValueError(f"Unknown bulk_update strategy: {strategy}")
+
+        groups: Dict[Tuple[str, ...], List[Tuple[Any, Dict[str, Any]]]] = {}
+        for key, changes in rows:
+            if changes:
+                groups.setdefault(tuple(sorted(changes)), []).append((key, changes))
+
+        for names, group in groups.items():
+            unknown = [name for name in names if name not in table.c]
+            if unknown:
+                raise ValueError(f"Unknown columns for {table.name}: {unknown}")
+
+            for start in range(0, len(group), chunk_size):
+                chunk = group[start:start + chunk_size]
+                if strategy == "values":
+                    data = values(
+                        column("bulk_pk", pk.type),
+                        *(column(name, table.c[name].type) for name in names),
+                        name="bulk_rows",
+                    ).data([(key, *(changes[name] for name in names)) for key, changes in chunk])
+                    await session.execute(
+                        update(table)
+                        .where(pk == data.c.bulk_pk)
+                        .values({name: data.c[name] for name in names})
+                    )
+                else:
+                    # Bind names must not clash with the SET column names
+                    await session.execute(
+                        update(table)
+                        .where(pk == bindparam("b_pk"))
+                        .values({name: bindparam(f"b_{name}") for name in names}),
+                        [
+                            {"b_pk": key, **{f"b_{name}": changes[name] for name in names}}
+                            for key, changes in chunk
+                        ],
+                    )
+
     @staticmethod
     async def bulk_insert_leads(session: AsyncSession, leads_data: list):
         """Bulk insert leads efficiently"""
@@ -0,0 +1,314 @@
+"""
+Engine Registry
+Named, per-process async engine pools (OLTP, replicas, reporting, admin) with shared pre-warm and wait metrics
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config.settings import settings
+
+try:
+    from core.observability import db_pool_metrics
+except ImportError:  # OpenTelemetry not installed
+    db_pool_metrics = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection settings for one named engine"""
+
+    name: str
+    url: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    # Connections opened by prewarm() when no count is given
+    prewarm: int = 0
+    application_name: str = "SGPT_Backend"
+    command_timeout: Optional[float] = None
+    server_settings: Dict[str, str] = field(default_factory=dict)
+    echo: bool = False
+
+
+@dataclass
+class PoolWaitStats:
+    """Checkout wait times of one pool since the process started"""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that times every checkout: the wait for a free connection,
+    plus the connect itself when the pool has to grow.
+    """
+
+    pool_name = "default"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._record(time.perf_counter() - started, timed_out=True)
+            raise
+        self._record(time.perf_counter() - started)
+        return connection
+
+    def _record(self, seconds: float, timed_out: bool = False) -> None:
+        self.wait_stats.record(seconds, timed_out)
+        if db_pool_metrics is not None:
+            db_pool_metrics.record_checkout(self.pool_name, seconds, timed_out)
+
+    def recreate(self):
+        # dispose() swaps in a new pool; keep the name and the running totals
+        pool = super().recreate()
+        pool.pool_name = self.pool_name
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+class EngineRegistry:
+    """
+    One engine per pool name per process, created on first use.
+
+    Every module that talks to a database goes through here, so a worker
+    holds exactly one pool per name and pool sizes come from settings.
+    """
+
+    def __init__(self):
+        self._configs: Dict[str, PoolConfig] = {}
+        self._engines: Dict[str, AsyncEngine] = {}
+        self._sessions: Dict[str, async_sessionmaker] = {}
+
+    def register(self, config: PoolConfig) -> None:
+        if config.name in self._engines:
+            raise ValueError(f"Engine '{config.name}' is already in use")
+        self._configs[config.name] = config
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._configs
+
+    def config(self, name: str) -> PoolConfig:
+        try:
+            return self._configs[name]
+        except KeyError:
+            raise KeyError(f"No database pool named '{name}'") from None
+
+    def engine(self, name: str = "oltp") -> AsyncEngine:
+        engine = self._engines.get(name)
+        if engine is None:
+            engine = self._engines[name] = self._create_engine(self.config(name))
+        return engine
+
+    def sessionmaker(self, name: str = "oltp") -> async_sessionmaker:
+        factory = self._sessions.get(name)
+        if factory is None:
+            factory = self._sessions[name] = async_sessionmaker(
+                self.engine(name),
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+                autocommit=False,
+            )
+        return factory
+
+    @staticmethod
+    def _create_engine(config: PoolConfig) -> AsyncEngine:
+        if config.url.startswith("sqlite") and _is_memory_sqlite(config.url):
+            # In-memory SQLite lives in one connection, so keep SQLAlchemy's default
+            # single-connection pool; there is nothing to size or pre-warm
+            return create_async_engine(
+                config.url,
+                echo=config.echo,
+                pool_pre_ping=True,
+                logging_name=f"sqlalchemy.{config.name}",
+            )
+
+        # File SQLite (testing) gets the sized pool too; SQLAlchemy 2.0 would
+        # otherwise use NullPool, which keeps nothing open for prewarm()
+        connect_args: Dict[str, Any] = {}
+        if config.url.startswith("postgresql+asyncpg"):
+            connect_args["server_settings"] = {
+                "application_name": config.application_name,
+                **config.server_settings,
+            }
+            if config.command_timeout is not None:
+                connect_args["command_timeout"] = config.command_timeout
+
+        engine = create_async_engine(
+            config.url,
+            echo=config.echo,
+            poolclass=TimedQueuePool,
+            pool_size=config.pool_size,
+            max_overflow=config.max_overflow,
+            pool_timeout=config.pool_timeout,
+            pool_pre_ping=True,
+            pool_recycle=config.pool_recycle,
+            connect_args=connect_args,
+            logging_name=f"sqlalchemy.{config.name}",
+        )
+        engine.sync_engine.pool.pool_name = config.name
+        return engine
+
+    async def prewarm(self, name: str = "oltp", connections: Optional[int] = None) -> int:
+        """Open ``connections`` at once so the pool keeps them ready; returns how many opened"""
+        config = self.config(name)
+        wanted = min(config.prewarm if connections is None else connections, config.pool_size)
+        if wanted <= 0:
+            return 0
+        engine = self.engine(name)
+
+        async def _open(stack: AsyncExitStack) -> None:
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+        # Held together, otherwise the pool would hand back the same connection
+        async with AsyncExitStack() as stack:
+            results = await asyncio.gather(
+                *(_open(stack) for _ in range(wanted)), return_exceptions=True
+            )
+        opened = sum(1 for result in results if not isinstance(result, BaseException))
+        if opened < wanted:
+            failure = next(r for r in results if isinstance(r, BaseException))
+            logger.warning(f"Pre-warmed {opened}/{wanted} '{name}' connections: {failure}")
+        else:
+            logger.info(f"Pre-warmed {opened} '{name}' database connections")
+        return opened
+
+    def pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Size, usage and checkout wait times of every pool created so far"""
+        report = {}
+        for name, engine in self._engines.items():
+            pool = engine.sync_engine.pool
+            entry: Dict[str, Any] = {"class": type(pool).__name__}
+            if isinstance(pool, TimedQueuePool):
+                entry.update(
+                    size=pool.size(),
+                    max_overflow=self._configs[name].max_overflow,
+                    checked_out=pool.checkedout(),
+                    idle=pool.checkedin(),
+                    overflow=pool.overflow(),
+                    **pool.wait_stats.as_dict(),
+                )
+            report[name] = entry
+        return report
+
+    async def dispose(self, name: Optional[str] = None) -> None:
+        names: List[str] = [name] if name else list(self._engines)
+        for engine_name in names:
+            engine = self._engines.get(engine_name)
+            if engine is not None:
+                await engine.dispose()
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+
+
+def _default_pools() -> List[PoolConfig]:
+    return [
+        PoolConfig(
+            name="oltp",
+            url=settings.DATABASE_URL,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=900,
+            prewarm=settings.DATABASE_PREWARM_CONNECTIONS,
+            application_name="SGPT_HighConcurrency",
+            command_timeout=settings.CONNECTION_TIMEOUT,
+            # Server-wide settings (shared_buffers, work_mem...) belong in postgresql.conf
+            server_settings={"jit": "off", "random_page_cost": "1.1"},
+            echo=settings.DEBUG,
+        ),
+        PoolConfig(
+            name="reporting",
+            url=settings.REPORTING_DATABASE_URL or settings.DATABASE_URL,
+            pool_size=settings.REPORTING_POOL_SIZE,
+            max_overflow=settings.REPORTING_MAX_OVERFLOW,
+            pool_timeout=60,
+            application_name="SGPT_Reporting",
+            command_timeout=300,
+            server_settings={"jit": "off"},
+        ),
+        PoolConfig(
+            name="admin",
+            url=settings.ADMIN_DATABASE_URL,
+            pool_size=settings.ADMIN_DB_POOL_SIZE,
+            max_overflow=settings.ADMIN_DB_MAX_OVERFLOW,
+            pool_timeout=20,
+            application_name="SGPT_Admin_Panel",
+            command_timeout=60,  # Longer timeout for admin queries
+            server_settings={"jit": "off", "random_page_cost": "1.1", "effective_cache_size": "512MB"},
+            echo=bool(os.getenv("DEBUG_ADMIN_DB", False)),
+        ),
+    ] + [
+        PoolConfig(
+            name=name,
+            url=url,
+            pool_size=settings.REPLICA_POOL_SIZE,
+            max_overflow=settings.REPLICA_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=900,
+            application_name="SGPT_ReadReplica",
+            command_timeout=settings.CONNECTION_TIMEOUT,
+            server_settings={"jit": "off", "default_transaction_read_only": "on"},
+        )
+        for name, url in replica_urls().items()
+    ]
+
+
+def replica_urls() -> Dict[str, str]:
+    """Pool names ("replica_0", ...) of the READ_REPLICA_URLS entries"""
+    urls = [url.strip() for url in settings.READ_REPLICA_URLS.split(",") if url.strip()]
+    return {f"replica_{i}": url for i, url in enumerate(urls)}
+
+
+# Global registry
+engine_registry = EngineRegistry()
+for _config in _default_pools():
+    engine_registry.register(_config)
@@ -4,17 +4,19 @@ Implements L1 (memory) + L2 (Redis) caching for optimal performance
 """
 
 import asyncio
-import json
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, Optional, Union
 from functools import wraps
 
 import redis.asyncio as aioredis
-from cachetools import TTLCache
 
-from config.settings import settings
+from core.cache_manager import cache_manager
+from core.cache_stampede import stampede_guard
+from core.cache_tags import entity_tags
+from core.l1_snapshot import l1_snapshot
+from core.l1_cache import BoundedL1Cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,39 +27,31 @@ class EnhancedCache:
     L1: In-memory cache (hot data, sub-millisecond access)
     L2: Redis cache (shared data, millisecond access)
     L3: Database (cold data, ~50ms access)
+
+    Thin front-end over a ``cache_manager`` namespace, which owns the
+    bounded L1, the shared Redis pool and the serializer.
     """
     
-    def __init__(self):
-        # L1 Cache: In-memory for hot data (max 1000 items, 5 min TTL)
-        self.l1_cache = TTLCache(maxsize=1000, ttl=300)  # 5 minutes
-        
-        # L2 Cache: Redis for shared data
-        self.redis_client: Optional[aioredis.Redis] = None
-        self.default_ttl = 3600  # 1 hour
-        
-        # Cache statistics
-        self.stats = {
-            'l1_hits': 0,
-            'l1_misses': 0,
-            'l2_hits': 0,
-            'l2_misses': 0,
-            'total_requests': 0
-        }
+    def __init__(self, namespace: str = "default"):
+        self.namespace = cache_manager.namespace(namespace)
+        self.stats = self.namespace.stats
+
+    @property
+    def l1_cache(self) -> BoundedL1Cache:
+        return self.namespace.l1
+
+    @property
+    def redis_client(self) -> Optional[aioredis.Redis]:
+        return self.namespace.redis_client
+
+    @property
+    def default_ttl(self) -> int:
+        return self.namespace.default_ttl
         
     async def init_redis(self):
-        """Initialize Redis connection for L2 cache"""
-        try:
-            self.redis_client = aioredis.from_url(
-                settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=20
-            )
-            await self.redis_client.ping()
+        """Initialize the shared Redis pool for the L2 cache"""
+        if await cache_manager.init():
             logger.info("Enhanced cache Redis connection established")
-        except Exception as e:
-            logger.warning(f"Redis unavailable for caching: {e}")
-            self.redis_client = None
     
     def _generate_key(self, prefix: str, **kwargs) -> str:
         """Generate cache key from prefix and parameters"""
@@ -68,106 +62,78 @@ class EnhancedCache:
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache (L1 -> L2 -> None)"""
-        self.stats['total_requests'] += 1
-        
-        # Try L1 cache first
-        if key in self.l1_cache:
-            self.stats['l1_hits'] += 1
-            logger.debug(f"L1 cache HIT: {key}")
-            return self.l1_cache[key]
-        
-        self.stats['l1_misses'] += 1
-        
-        # Try L2 cache (Redis)
-        if self.redis_client:
-            try:
-                value = await self.redis_client.get(key)
-                if value:
-                    self.stats['l2_hits'] += 1
-                    logger.debug(f"L2 cache HIT: {key}")
-                    # Promote to L1 cache
-                    deserialized = json.loads(value)
-                    self.l1_cache[key] = deserialized
-                    return deserialized
-            except Exception as e:
-                logger.error(f"Redis cache error: {e}")
-        
-        self.stats['l2_misses'] += 1
-        logger.debug(f"Cache MISS: {key}")
-        return None
+        return await self.namespace.get(key)
     
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
         """Set value in both L1 and L2 caches"""
-        ttl = ttl or self.default_ttl
-        
-        # Set in L1 cache (limited TTL for memory management)
-        l1_ttl = min(ttl, 300)  # Max 5 minutes in L1
-        self.l1_cache[key] = value
-        
-        # Set in L2 cache (Redis)
-        if self.redis_client:
-            try:
-                serialized = json.dumps(value, default=str)
-                await self.redis_client.setex(key, ttl, serialized)
-                logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
-            except Exception as e:
-                logger.error(f"Redis cache set error: {e}")
+        await self.namespace.set(key, value, ttl, tags=tags)
     
     async def delete(self, key: str) -> None:
         """Delete from both caches"""
-        # Remove from L1
-        self.l1_cache.pop(key, None)
-        
-        # Remove from L2
-        if self.redis_client:
-            try:
-                await self.redis_client.delete(key)
-                logger.debug(f"Cache DELETE: {key}")
-            except Exception as e:
-                logger.error(f"Redis cache delete error: {e}")
+        await self.namespace.delete(key)
     
     async def clear_pattern(self, pattern: str) -> None:
-        """Clear all keys matching pattern (L2 only, L1 expires naturally)"""
-        if self.redis_client:
-            try:
-                keys = await self.redis_client.keys(pattern)
-                if keys:
-                    await self.redis_client.delete(*keys)
-                    logger.info(f"Cleared {len(keys)} cache keys matching: {pattern}")
-            except Exception as e:
-                logger.error(f"Cache pattern clear error: {e}")
+        """
+        Clear all keys matching pattern in L2 and in every worker's L1.
+
+        This walks the whole keyspace (incrementally, via SCAN); prefer
+        ``invalidate_tags`` for anything on a hot path.
+        """
+        removed = await self.namespace.clear_pattern(pattern)
+        if removed:
+            logger.info(f"Cleared {removed} cache keys matching: {pattern}")
     
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry carrying any of the tags from L2 and every worker's L1"""
+        removed = await self.namespace.invalidate_tags(*tags)
+        logger.debug(f"Invalidated {removed} cache keys for tags: {', '.join(tags)}")
+
+    def invalidate_local(
+        self,
+        keys: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        clear_all: bool = False,
+    ) -> None:
+        """Apply an invalidation received from another worker (L1 only)"""
+        self.namespace.invalidate_local(keys, patterns, tags, clear_all)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
-        total = self.stats['total_requests']
-        if total == 0:
-            return self.stats
-        
-        l1_hit_rate = (self.stats['l1_hits'] / total) * 100
-        l2_hit_rate = (self.stats['l2_hits'] / total) * 100
-        overall_hit_rate = ((self.stats['l1_hits'] + self.stats['l2_hits']) / total) * 100
-        
-        return {
-            **self.stats,
-            'l1_hit_rate': f"{l1_hit_rate:.1f}%",
-            'l2_hit_rate': f"{l2_hit_rate:.1f}%",
-            'overall_hit_rate': f"{overall_hit_rate:.1f}%",
-            'l1_size': len(self.l1_cache)
-        }
+        return self.namespace.get_stats()
 
 
 # Global cache instance
 cache = EnhancedCache()
 
 
-def cached(prefix: str, ttl: int = 3600, key_params: list = None):
+def cached(
+    prefix: str,
+    ttl: int = 3600,
+    key_params: list = None,
+    stale_ttl: int = 0,
+    refresh_beta: float = 0.0,
+):
     """
     Decorator for caching function results
     
+    Concurrent misses for the same key are coalesced in-process and
+    guarded by a Redis lease across processes, so only one caller
+    recomputes an expired entry.
+    
     Args:
         prefix: Cache key prefix
         ttl: Time to live in seconds
         key_params: List of parameter names to include in cache key
+        stale_ttl: Seconds an expired result may still be served while it
+            is refreshed in the background (0 disables stale-while-revalidate)
+        refresh_beta: Probabilistic early-refresh factor (0 disables, 1 is typical)
     """
     def decorator(func):
         @wraps(func)
@@ -179,22 +145,30 @@ def cached(prefix: str, ttl: int = 3600, key_params: list = None):
                 key_data = kwargs
             
             cache_key = cache._generate_key(prefix, **key_data)
+            # Tag by any user/campaign id in the key
+            tags = entity_tags(key_data)
             
-            # Try to get from cache
-            cached_result = await cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
+            async def compute():
+                start_time = time.time()
+                result = await func(*args, **kwargs)
+                execution_time = time.time() - start_time
+                logger.debug(f"Function {func.__name__} executed in {execution_time:.3f}s, result cached")
+                return result
             
-            # Cache the result
-            await cache.set(cache_key, result, ttl)
+            async def store(key, entry, entry_ttl):
+                await cache.set(key, entry, entry_ttl, tags=tags)
             
-            logger.debug(f"Function {func.__name__} executed in {execution_time:.3f}s, result cached")
-            return result
+            return await stampede_guard.fetch(
+                cache_key,
+                compute,
+                load=cache.get,
+                store=store,
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                beta=refresh_beta,
+                redis_client=cache.redis_client,
+                name=f"{func.__module__}.{func.__qualname__}",
+            )
             
         return wrapper
     return decorator
@@ -208,7 +182,7 @@ class SGPTCache:
     async def cache_user_data(user_id: str, data: dict, ttl: int = 1800):
         """Cache user data (30 min TTL)"""
         key = cache._generate_key("user", id=user_id)
-        await cache.set(key, data, ttl)
+        await cache.set(key, data, ttl, tags=[f"user:{user_id}"])
     
     @staticmethod
     async def get_user_data(user_id: str) -> Optional[dict]:
@@ -220,7 +194,7 @@ class SGPTCache:
     async def cache_campaign_stats(campaign_id: str, stats: dict, ttl: int = 600):
         """Cache campaign statistics (10 min TTL)"""
         key = cache._generate_key("campaign_stats", id=campaign_id)
-        await cache.set(key, stats, ttl)
+        await cache.set(key, stats, ttl, tags=[f"campaign:{campaign_id}"])
     
     @staticmethod
     async def get_campaign_stats(campaign_id: str) -> Optional[dict]:
@@ -231,22 +205,29 @@ class SGPTCache:
     @staticmethod
     async def invalidate_user_cache(user_id: str):
         """Invalidate all cache entries for a user"""
-        await cache.clear_pattern(f"user:id:{user_id}*")
-        await cache.clear_pattern(f"*:user_id:{user_id}*")
+        await cache.invalidate_tags(f"user:{user_id}")
     
     @staticmethod
     async def invalidate_campaign_cache(campaign_id: str):
         """Invalidate all cache entries for a campaign"""
-        await cache.clear_pattern(f"campaign*:id:{campaign_id}*")
+        await cache.invalidate_tags(f"campaign:{campaign_id}")
 
 
 # Initialize cache on startup
 async def init_cache():
     """Initialize the cache system"""
     await cache.init_redis()
+    # Start warm from the last L1 snapshot instead of hitting the database
+    await l1_snapshot.start()
     logger.info("Enhanced cache system initialized")
 
 
+async def shutdown_cache():
+    """Write a final L1 snapshot, flush pending invalidations and stop the bus"""
+    await l1_snapshot.stop()
+    await cache_manager.close()
+
+
 # Cache warming functions
 async def warm_cache():
     """Warm up cache with frequently accessed data"""
@@ -263,4 +244,4 @@ async def warm_cache():
 
 
 # Export main components
-__all__ = ['cache', 'cached', 'SGPTCache', 'init_cache', 'warm_cache'] 
\ No newline at end of file
+__all__ = ['cache', 'cached', 'SGPTCache', 'init_cache', 'shutdown_cache', 'warm_cache'] 
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Bounded In-Process L1 Cache
+LRU cache with per-entry expiry and item/byte budgets for the multi-layer caches
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Cheap recursive size estimate in bytes (bounded depth, no cycle tracking)"""
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class BoundedL1Cache:
+    """
+    LRU cache bounded by entry count and approximate byte size.
+
+    Every entry carries its own expiry so an L1 copy never outlives the
+    L2 (Redis) TTL it was written or promoted with. Entries larger than
+    ``max_entry_bytes`` are not admitted, so one oversized payload cannot
+    flush the whole hot set. Entries may be tagged (e.g. ``user:42``) and
+    dropped together with ``invalidate_tags``.
+
+    ``eviction`` is ``"lru"`` (reads refresh recency) or ``"fifo"`` (oldest
+    write is evicted first; reads never reorder, which is cheaper for
+    scan-like access patterns).
+    """
+
+    EVICTION_POLICIES = ("lru", "fifo")
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 300,
+        max_entry_bytes: Optional[int] = None,
+        eviction: str = "lru",
+    ):
+        if eviction not in self.EVICTION_POLICIES:
+            raise ValueError(f"Unknown L1 eviction policy: {eviction}")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.max_entry_bytes = max_entry_bytes or max(1, max_bytes // 8)
+        self.eviction = eviction
+
+        # key -> (value, expires_at, size, tags)
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int, tuple]]" = OrderedDict()
+        self._tag_index: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._last_purge = time.monotonic()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'rejections': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live value and mark it most-recently used"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return default
+
+        value, expires_at = entry[0], entry[1]
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return default
+
+        if self.eviction == "lru":
+            self._data.move_to_end(key)
+        self.stats['hits'] += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        """Store a value; returns False when the entry is not admitted"""
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0:
+            self.pop(key)
+            return False
+
+        size = estimate_size(value) if size is None else size
+        if size > self.max_entry_bytes:
+            self.pop(key)
+            self.stats['rejections'] += 1
+            return False
+
+        if key in self._data:
+            self._remove(key)
+
+        tags = tuple(tags)
+        self._data[key] = (value, time.monotonic() + ttl, size, tags)
+        self._bytes += size
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self._enforce_limits()
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value (expired or not)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        self._remove(key)
+        return entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._tag_index.clear()
+        self._bytes = 0
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of ``tags``"""
+        removed = 0
+        for tag in tags:
+            for key in list(self._tag_index.get(tag, ())):
+                if key in self._data:
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Drop every string key matching a Redis-style glob pattern"""
+        matched = [k for k in self._data if isinstance(k, str) and fnmatchcase(k, pattern)]
+        for key in matched:
+            self._remove(key)
+        return len(matched)
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        now = time.monotonic()
+        expired = [k for k, entry in self._data.items() if entry[1] <= now]
+        for key in expired:
+            self._remove(key)
+        self.stats['expirations'] += len(expired)
+        return len(expired)
+
+    def hottest(self, limit: Optional[int] = None) -> List[Tuple[Hashable, Any, float, tuple]]:
+        """Live entries, most recently used first: (key, value, remaining_ttl, tags)"""
+        now = time.monotonic()
+        entries = []
+        for key in reversed(self._data):
+            value, expires_at, _, tags = self._data[key]
+            if expires_at > now:
+                entries.append((key, value, expires_at - now, tags))
+                if limit is not None and len(entries) >= limit:
+                    break
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'size': len(self._data),
+            'bytes': self._bytes,
+            'maxsize': self.maxsize,
+            'max_bytes': self.max_bytes,
+            'eviction': self.eviction,
+            'hit_rate': round(self.stats['hits'] / lookups * 100, 2) if lookups else 0.0,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size, tags = self._data.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _enforce_limits(self) -> None:
+        if len(self._data) <= self.maxsize and self._bytes <= self.max_bytes:
+            return
+
+        # Expired entries go first so live data is not evicted needlessly;
+        # the full sweep is O(n) so it runs at most once per second
+        now = time.monotonic()
+        if now - self._last_purge >= 1.0:
+            self._last_purge = now
+            self.purge_expired()
+        while self._data and (len(self._data) > self.maxsize or self._bytes > self.max_bytes):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.stats['evictions'] += 1
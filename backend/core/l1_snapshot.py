@@ -0,0 +1,205 @@
+"""
+L1 Warm-Start Snapshot
+Periodic on-disk snapshot of the hottest L1 entries, memory-mapped on worker boot
+"""
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from core.cache_manager import CacheManager, cache_manager
+from core.cache_serializer import ENVELOPE_VERSION, CacheSerializer
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"L1SN"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# magic, format version, created_at (epoch seconds), fingerprint length
+_HEADER = struct.Struct("<4sHdH")
+
+
+class L1SnapshotStore:
+    """
+    Writes the hottest entries of every L1 namespace to one file and
+    restores them when a worker boots.
+
+    A snapshot is ignored when its format, serializer envelope or
+    ``CACHE_L1_SNAPSHOT_VERSION`` differ from the running code, or when
+    it is older than ``max_age``. Entries keep their absolute expiry, so a
+    restored copy never outlives the TTL it had in the writing worker.
+    """
+
+    def __init__(
+        self,
+        manager: CacheManager = cache_manager,
+        path: Optional[str] = None,
+        interval: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+        version: Optional[str] = None,
+    ):
+        self.manager = manager
+        self.path = settings.CACHE_L1_SNAPSHOT_PATH if path is None else path
+        self.interval = settings.CACHE_L1_SNAPSHOT_INTERVAL if interval is None else interval
+        self.max_entries = settings.CACHE_L1_SNAPSHOT_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_age = settings.CACHE_L1_SNAPSHOT_MAX_AGE if max_age is None else max_age
+        version = settings.CACHE_L1_SNAPSHOT_VERSION if version is None else version
+        self.fingerprint = f"{SNAPSHOT_FORMAT_VERSION}:{ENVELOPE_VERSION}:{version}".encode()
+
+        # Values are written with the same encoding as L2 entries
+        self.serializer = CacheSerializer(codec="msgpack")
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'writes': 0,
+            'entries_written': 0,
+            'restored': 0,
+            'rejected': 0,
+            'last_write': None,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def collect(self) -> Dict[str, List[list]]:
+        """Hottest live entries per namespace, split by namespace size"""
+        namespaces = {
+            name: ns for name, ns in self.manager.get_namespaces().items()
+            if ns.l1 is not None and len(ns.l1)
+        }
+        total = sum(len(ns.l1) for ns in namespaces.values())
+        now = time.time()
+        collected: Dict[str, List[list]] = {}
+        for name, ns in namespaces.items():
+            limit = max(1, self.max_entries * len(ns.l1) // total)
+            collected[name] = [
+                [key, value, now + remaining, list(tags)]
+                for key, value, remaining, tags in ns.l1.hottest(limit)
+                if isinstance(key, str)
+            ]
+        return collected
+
+    def write(self, entries: Optional[Dict[str, List[list]]] = None) -> int:
+        """Write a snapshot atomically (temp file + rename); returns entries written"""
+        if not self.enabled:
+            return 0
+        entries = self.collect() if entries is None else entries
+        payload = self.serializer.dumps(entries)
+        header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, time.time(), len(self.fingerprint))
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(self.fingerprint)
+            f.write(payload)
+        # Workers share the path; rename keeps readers from seeing a partial file
+        os.replace(tmp_path, self.path)
+
+        written = sum(len(v) for v in entries.values())
+        self.stats['writes'] += 1
+        self.stats['entries_written'] = written
+        self.stats['last_write'] = time.time()
+        return written
+
+    def restore(self) -> int:
+        """Load a compatible snapshot into the L1 namespaces; returns entries restored"""
+        if not self.enabled or not os.path.exists(self.path):
+            return 0
+
+        try:
+            entries = self._read()
+        except Exception as e:
+            logger.warning(f"L1 snapshot {self.path} unreadable: {e}")
+            entries = None
+        if entries is None:
+            self.stats['rejected'] += 1
+            return 0
+
+        now = time.time()
+        restored = 0
+        for name, items in entries.items():
+            if name not in self.manager.policies:
+                continue
+            l1 = self.manager.namespace(name).l1
+            if l1 is None:
+                continue
+            # Coldest first so the hottest entries end up most recently used
+            for key, value, expires_at, tags in reversed(items):
+                remaining = expires_at - now
+                if remaining > 0 and l1.set(key, value, remaining, tags=tags):
+                    restored += 1
+
+        self.stats['restored'] = restored
+        return restored
+
+    async def start(self) -> int:
+        """Restore the last snapshot, then write one every ``interval`` seconds"""
+        if not self.enabled:
+            return 0
+        restored = self.restore()
+        if restored:
+            logger.info(f"Restored {restored} L1 cache entries from {self.path}")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._write_loop())
+        return restored
+
+    async def stop(self) -> None:
+        """Stop the write loop and write a final snapshot"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self.enabled:
+            try:
+                await asyncio.to_thread(self.write, self.collect())
+            except Exception as e:
+                logger.warning(f"Final L1 snapshot failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'enabled': self.enabled, 'path': self.path}
+
+    def _read(self) -> Optional[Dict[str, List[list]]]:
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, fmt, created_at, fp_len = _HEADER.unpack_from(mapped, 0)
+                if magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT_VERSION:
+                    return None
+                fp_end = _HEADER.size + fp_len
+                if mapped[_HEADER.size:fp_end] != self.fingerprint:
+                    logger.info("L1 snapshot written by a different version; ignoring")
+                    return None
+                if time.time() - created_at > self.max_age:
+                    return None
+                # Decode straight from the mapping; the view is released before unmapping
+                with memoryview(mapped)[fp_end:] as payload:
+                    return self.serializer.loads(payload)
+
+    async def _write_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                # Collect on the loop (L1 is not thread-safe); encode and write off it
+                entries = self.collect()
+                await asyncio.to_thread(self.write, entries)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"L1 snapshot write failed: {e}")
+
+
+# Global snapshot store for the cache manager namespaces
+l1_snapshot = L1SnapshotStore()
@@ -0,0 +1,137 @@
+"""
+Lazy Router Mounting
+Router groups registered from a manifest and imported on their first request
+"""
+
+import importlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+# Path without root_path (Starlette >= 0.33); older versions keep them apart
+try:
+    from starlette._utils import get_route_path
+except ImportError:
+    def get_route_path(scope: Scope) -> str:
+        return scope["path"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """One ``include_router`` call: module path, include prefix and tags"""
+
+    module: str
+    prefix: str = ""
+    tags: Tuple[str, ...] = ()
+    attr: str = "router"
+
+
+@dataclass
+class RouterGroup:
+    """Routers served under one path prefix, loaded together"""
+
+    name: str
+    path_prefix: str
+    routers: Tuple[RouterSpec, ...] = field(default_factory=tuple)
+
+
+class LazyRouterMount(BaseRoute):
+    """
+    Placeholder route for a ``RouterGroup``.
+
+    It matches every HTTP/WebSocket request under the group prefix. The
+    first such request imports the group's modules, swaps the placeholder
+    for the real routes at the same position (so route precedence is the
+    same as eager mounting) and re-dispatches. A group that fails to import
+    is dropped and logged, like a router that could not be mounted eagerly.
+    """
+
+    def __init__(self, app: FastAPI, group: RouterGroup):
+        self.app = app
+        self.group = group
+        self.name = f"lazy:{group.name}"
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = get_route_path(scope)
+        prefix = self.group.path_prefix
+        if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
+
+    def load(self) -> None:
+        """Replace this placeholder with the group's routes (no-op once loaded)"""
+        routes = self.app.router.routes
+        if self not in routes:
+            return
+        started = time.perf_counter()
+        try:
+            new_routes = include_group(self.app, self.group)
+        except Exception as e:
+            routes.remove(self)
+            logger.error(f"❌ Router group '{self.group.name}' could not be mounted: {e}")
+            return
+        index = routes.index(self)
+        routes[index:index + 1] = new_routes
+        # Regenerate the OpenAPI schema with the new routes
+        self.app.openapi_schema = None
+        logger.info(
+            f"✅ Router group '{self.group.name}' loaded on first use "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+
+def include_group(app: FastAPI, group: RouterGroup) -> List[BaseRoute]:
+    """``include_router`` every router of the group; returns the routes added"""
+    routes = app.router.routes
+    before = len(routes)
+    try:
+        for spec in group.routers:
+            module = importlib.import_module(spec.module)
+            app.include_router(
+                getattr(module, spec.attr), prefix=spec.prefix, tags=list(spec.tags) or None
+            )
+    except Exception:
+        del routes[before:]
+        raise
+    added = routes[before:]
+    del routes[before:]
+    return added
+
+
+def mount_router_group(app: FastAPI, group: RouterGroup, lazy: bool) -> None:
+    """Mount a group now, or register a placeholder that loads it on first request"""
+    if lazy:
+        app.router.routes.append(LazyRouterMount(app, group))
+        return
+    try:
+        app.router.routes.extend(include_group(app, group))
+        logger.info(f"✅ Router group '{group.name}' mounted at {group.path_prefix}")
+    except Exception as e:
+        logger.error(f"❌ Router group '{group.name}' could not be mounted: {e}")
+
+
+def pending_groups(app: FastAPI) -> List[LazyRouterMount]:
+    return [route for route in app.router.routes if isinstance(route, LazyRouterMount)]
+
+
+def load_all(app: FastAPI) -> None:
+    """Import every pending group (OpenAPI generation needs the full route table)"""
+    for mount in pending_groups(app):
+        mount.load()
+
@@ -10,27 +10,23 @@ from typing import Any
 
 import structlog
 
-# OpenTelemetry imports - TEMPORARILY COMMENTED OUT FOR QUICK START
+# Exporters and instrumentors other than Prometheus are optional
+# (requirements-production.txt) and imported where they are used
 from opentelemetry import metrics, trace
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
-    OTLPMetricExporter,
-)
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
-    OTLPSpanExporter,
-)
 from opentelemetry.exporter.prometheus import PrometheusMetricReader
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.metrics.view import (
+    ExplicitBucketHistogramAggregation,
+    View,
+)
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
 from config.settings import settings
+from core.query_profiler import endpoint_of
+from core.request_context import current_request_context
 
 # Global observability components - TEMPORARILY DISABLED
 tracer: trace.Tracer | None = None
@@ -127,6 +123,8 @@ class ObservabilityManager:
 
             # Setup span processor based on exporter type
             if settings.OTEL_TRACES_EXPORTER == "jaeger":
+                from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+
                 span_processor = BatchSpanProcessor(
                     JaegerExporter(
                         agent_host_name="localhost",
@@ -134,6 +132,10 @@ class ObservabilityManager:
                     )
                 )
             elif settings.OTEL_TRACES_EXPORTER == "otlp":
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                    OTLPSpanExporter,
+                )
+
                 span_processor = BatchSpanProcessor(
                     OTLPSpanExporter(
                         endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT
@@ -188,6 +190,10 @@ class ObservabilityManager:
                     pass
                 metric_reader = PrometheusMetricReader()
             elif settings.OTEL_METRICS_EXPORTER == "otlp":
+                from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
+                    OTLPMetricExporter,
+                )
+
                 metric_reader = PeriodicExportingMetricReader(
                     OTLPMetricExporter(
                         endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT
@@ -205,7 +211,9 @@ class ObservabilityManager:
 
             # Create meter provider
             self.meter_provider = MeterProvider(
-                resource=resource, metric_readers=[metric_reader]
+                resource=resource,
+                metric_readers=[metric_reader],
+                views=_cache_metric_views() + _database_metric_views(),
             )
 
             # Set global meter provider
@@ -229,6 +237,8 @@ class ObservabilityManager:
             return
 
         try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
             FastAPIInstrumentor.instrument_app(app)
         except Exception as e:
             print(f"Failed to instrument FastAPI: {e}")
@@ -241,6 +251,10 @@ class ObservabilityManager:
             return
 
         try:
+            from opentelemetry.instrumentation.sqlalchemy import (
+                SQLAlchemyInstrumentor,
+            )
+
             SQLAlchemyInstrumentor().instrument(engine=engine)
         except Exception as e:
             print(f"Failed to instrument SQLAlchemy: {e}")
@@ -253,6 +267,8 @@ class ObservabilityManager:
             return
 
         try:
+            from opentelemetry.instrumentation.requests import RequestsInstrumentor
+
             RequestsInstrumentor().instrument()
         except Exception as e:
             print(f"Failed to instrument requests: {e}")
@@ -263,6 +279,8 @@ class ObservabilityManager:
             return
 
         try:
+            from opentelemetry.instrumentation.logging import LoggingInstrumentor
+
             LoggingInstrumentor().instrument(
                 set_logging_format=True, log_level=logging.INFO
             )
@@ -323,6 +341,163 @@ class ObservabilityManager:
 observability_manager = ObservabilityManager()
 
 
+# Cache lookups span ~50µs (L1) to seconds (recompute); sizes bytes to MBs
+CACHE_LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+CACHE_SIZE_BUCKETS = (
+    128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)
+
+
+def _cache_metric_views() -> list[View]:
+    """Histogram buckets for the cache instruments"""
+    return [
+        View(
+            instrument_name="cache.*duration",
+            aggregation=ExplicitBucketHistogramAggregation(CACHE_LATENCY_BUCKETS),
+        ),
+        View(
+            instrument_name="cache.value.size",
+            aggregation=ExplicitBucketHistogramAggregation(CACHE_SIZE_BUCKETS),
+        ),
+    ]
+
+
+def _endpoint() -> str:
+    context = current_request_context()
+    return endpoint_of(context.scope if context is not None else None)
+
+
+class CacheMetrics:
+    """
+    OpenTelemetry instruments for the cache layer, exported via Prometheus.
+
+    Instruments are created on first use once ``setup_metrics`` has set
+    the global meter (app lifespan, behind ENABLE_METRICS); before that
+    every call is a no-op. Recordings carry the route template of the
+    current request as ``endpoint``, or "background" outside one.
+    """
+
+    def __init__(self):
+        self._instruments: dict[str, Any] | None = None
+
+    def _get(self) -> dict[str, Any] | None:
+        if self._instruments is None and meter is not None:
+            self._instruments = {
+                "lookups": meter.create_counter(
+                    "cache.lookups",
+                    description="Cache namespace lookups by result (l1_hit, l2_hit, miss)",
+                ),
+                "lookup_duration": meter.create_histogram(
+                    "cache.lookup.duration",
+                    unit="s",
+                    description="Cache namespace lookup latency",
+                ),
+                "redis_duration": meter.create_histogram(
+                    "cache.redis.duration",
+                    unit="s",
+                    description="Redis round-trip time for cache operations",
+                ),
+                "value_size": meter.create_histogram(
+                    "cache.value.size",
+                    unit="By",
+                    description="Serialized cache value size",
+                ),
+                "function_calls": meter.create_counter(
+                    "cache.function.calls",
+                    description="Cached function calls by result (hit, stale, miss)",
+                ),
+                "function_duration": meter.create_histogram(
+                    "cache.function.duration",
+                    unit="s",
+                    description="Cached function latency including recomputation",
+                ),
+            }
+        return self._instruments
+
+    def record_lookup(self, namespace: str, result: str, seconds: float) -> None:
+        instruments = self._get()
+        if instruments is None:
+            return
+        attributes = {"namespace": namespace, "result": result, "endpoint": _endpoint()}
+        instruments["lookups"].add(1, attributes)
+        instruments["lookup_duration"].record(seconds, attributes)
+
+    def record_redis(
+        self, namespace: str, op: str, seconds: float, size: int | None = None
+    ) -> None:
+        instruments = self._get()
+        if instruments is None:
+            return
+        attributes = {"namespace": namespace, "op": op, "endpoint": _endpoint()}
+        instruments["redis_duration"].record(seconds, attributes)
+        if size is not None:
+            instruments["value_size"].record(size, attributes)
+
+    def record_function(self, function: str, result: str, seconds: float) -> None:
+        instruments = self._get()
+        if instruments is None:
+            return
+        attributes = {"function": function, "result": result, "endpoint": _endpoint()}
+        instruments["function_calls"].add(1, attributes)
+        instruments["function_duration"].record(seconds, attributes)
+
+
+# Global cache instrumentation
+cache_metrics = CacheMetrics()
+
+
+def _database_metric_views() -> list[View]:
+    """Histogram buckets for the connection pool instruments"""
+    return [
+        View(
+            instrument_name="db.pool.wait.duration",
+            aggregation=ExplicitBucketHistogramAggregation(CACHE_LATENCY_BUCKETS),
+        ),
+    ]
+
+
+class DatabasePoolMetrics:
+    """
+    OpenTelemetry instruments for the named connection pools
+    (core.engine_registry), exported via Prometheus. No-op until
+    ``setup_metrics`` has set the global meter.
+    """
+
+    def __init__(self):
+        self._instruments: dict[str, Any] | None = None
+
+    def _get(self) -> dict[str, Any] | None:
+        if self._instruments is None and meter is not None:
+            self._instruments = {
+                "wait_duration": meter.create_histogram(
+                    "db.pool.wait.duration",
+                    unit="s",
+                    description="Time a checkout waited for a pooled connection",
+                ),
+                "timeouts": meter.create_counter(
+                    "db.pool.timeouts",
+                    description="Checkouts that gave up after pool_timeout",
+                ),
+            }
+        return self._instruments
+
+    def record_checkout(self, pool: str, seconds: float, timed_out: bool = False) -> None:
+        instruments = self._get()
+        if instruments is None:
+            return
+        attributes = {"pool": pool}
+        instruments["wait_duration"].record(seconds, attributes)
+        if timed_out:
+            instruments["timeouts"].add(1, attributes)
+
+
+# Global connection pool instrumentation
+db_pool_metrics = DatabasePoolMetrics()
+
+
 def get_logger() -> structlog.BoundLogger:
     """Get the global structured logger"""
     if logger is None:
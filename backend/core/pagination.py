@@ -0,0 +1,296 @@
+"""
+Keyset Pagination
+Opaque signed cursors over a stable sort key, with planner-estimated totals instead of COUNT(*)
+
+Cursors are additive: listings keep their response body and offset
+parameter, accept ``cursor`` in place of the offset, and return the next
+page's cursor in the X-Next-Cursor header (``Page.headers``).
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import and_, literal, or_, tuple_
+from sqlalchemy.sql import Select
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_LIMIT = 50
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+ESTIMATED_TOTAL_HEADER = "X-Estimated-Total"
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not issued by this listing, or was tampered with"""
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    Columns a listing is ordered by, most significant first.
+
+    The last column must make the key unique (usually the primary key),
+    otherwise rows sharing a key value are skipped or repeated across
+    pages. Key columns must not be NULL. ``name`` ties cursors to the
+    listing: a cursor from one listing is rejected by another.
+    """
+
+    name: str
+    columns: Tuple[Any, ...]
+    descending: Tuple[bool, ...]
+
+    @classmethod
+    def of(cls, name: str, *columns: Any, descending: bool = False) -> "SortKey":
+        return cls(name, tuple(columns), (descending,) * len(columns))
+
+    def order_by(self) -> List[Any]:
+        return [c.desc() if desc else c.asc() for c, desc in zip(self.columns, self.descending)]
+
+    def after(self, values: Sequence[Any]):
+        """WHERE clause selecting the rows that sort after ``values``"""
+        if len(set(self.descending)) == 1:
+            # Row-value comparison lets the planner walk a composite index
+            left = tuple_(*self.columns)
+            right = tuple_(*(literal(v, c.type) for c, v in zip(self.columns, values)))
+            return left < right if self.descending[0] else left > right
+        clauses = []
+        for i, (column, desc) in enumerate(zip(self.columns, self.descending)):
+            equal = [c == v for c, v in zip(self.columns[:i], values[:i])]
+            clauses.append(and_(*equal, column < values[i] if desc else column > values[i]))
+        return or_(*clauses)
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+    limit: int
+    estimated_total: Optional[int] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def headers(self) -> Dict[str, str]:
+        """Response headers announcing the next page and the estimated total"""
+        headers = {}
+        if self.next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = self.next_cursor
+        if self.estimated_total is not None:
+            headers[ESTIMATED_TOTAL_HEADER] = str(self.estimated_total)
+        return headers
+
+
+# ---------------------------------------------------------------------------
+# Cursor codec
+# ---------------------------------------------------------------------------
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"$u": str(value)}
+    if isinstance(value, Decimal):
+        return {"$n": str(value)}
+    if hasattr(value, "value"):  # Enum members
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _json_object(obj: dict) -> Any:
+    if len(obj) == 1:
+        (tag, raw), = obj.items()
+        if tag == "$dt":
+            return datetime.fromisoformat(raw)
+        if tag == "$d":
+            return date.fromisoformat(raw)
+        if tag == "$u":
+            return UUID(raw)
+        if tag == "$n":
+            return Decimal(raw)
+    return obj
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _unb64(token: str) -> bytes:
+    return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+
+
+def _signature(listing: str, payload: bytes) -> bytes:
+    key = hashlib.sha256(f"{settings.SECRET_KEY}:pagination:{listing}".encode()).digest()
+    return hmac.new(key, payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(listing: str, values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), default=_json_default, separators=(",", ":")).encode()
+    return f"{_b64(payload)}.{_b64(_signature(listing, payload))}"
+
+
+def decode_cursor(listing: str, cursor: str) -> List[Any]:
+    try:
+        body, sig = cursor.split(".", 1)
+        payload = _unb64(body)
+        if not hmac.compare_digest(_unb64(sig), _signature(listing, payload)):
+            raise InvalidCursor("Cursor signature mismatch")
+        values = json.loads(payload, object_hook=_json_object)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(values, list):
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+
+# ---------------------------------------------------------------------------
+# Paginators
+# ---------------------------------------------------------------------------
+
+def _key_of(key: SortKey, row: Any) -> List[Any]:
+    mapping = getattr(row, "_mapping", None)
+    values = []
+    for column in key.columns:
+        name = column.key
+        if mapping is not None and name in mapping:
+            values.append(mapping[name])
+        elif isinstance(row, dict):
+            values.append(row[name])
+        else:
+            values.append(getattr(row, name))
+    return values
+
+
+def _cursor_values(key: SortKey, cursor: str) -> List[Any]:
+    values = decode_cursor(key.name, cursor)
+    if len(values) != len(key.columns):
+        raise InvalidCursor("Cursor does not match the listing order")
+    return values
+
+
+def _keyset_statement(stmt: Select, key: SortKey, cursor: Optional[str], limit: int, offset: int) -> Select:
+    if cursor:
+        stmt = stmt.where(key.after(_cursor_values(key, cursor)))
+    elif offset:
+        stmt = stmt.offset(offset)
+    return stmt.order_by(*key.order_by()).limit(limit + 1)
+
+
+def _page(rows: List[Any], key: SortKey, limit: int, row_key: Optional[Callable[[Any], Sequence[Any]]] = None) -> Page:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more and rows:
+        last = row_key(rows[-1]) if row_key else _key_of(key, rows[-1])
+        next_cursor = encode_cursor(key.name, last)
+    return Page(items=rows, next_cursor=next_cursor, limit=limit)
+
+
+async def paginate(
+    session,
+    stmt: Select,
+    key: SortKey,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    scalars: bool = False,
+    estimate: bool = False,
+    offset: int = 0,
+) -> Page:
+    """
+    One page of ``stmt`` after ``cursor``, ordered by ``key``.
+
+    Fetches ``limit + 1`` rows to learn whether another page follows, so
+    the cost of a page does not depend on how deep it is. ``offset``
+    serves legacy callers and is ignored when a cursor is given. With
+    ``estimate`` the page carries the planner's row estimate for the
+    unpaginated statement instead of an exact COUNT(*).
+    """
+    result = await session.execute(_keyset_statement(stmt, key, cursor, limit, offset))
+    rows = list(result.scalars().all() if scalars else result.all())
+    page = _page(rows, key, limit)
+    if estimate:
+        page.estimated_total = await estimated_count(session, stmt)
+    return page
+
+
+def paginate_query(
+    query, key: SortKey, cursor: Optional[str] = None, limit: int = DEFAULT_LIMIT, offset: int = 0
+) -> Page:
+    """``paginate`` for a synchronous ORM ``Query`` (admin database)"""
+    if cursor:
+        query = query.filter(key.after(_cursor_values(key, cursor)))
+    elif offset:
+        query = query.offset(offset)
+    rows = query.order_by(*key.order_by()).limit(limit + 1).all()
+    return _page(rows, key, limit)
+
+
+def paginate_items(
+    items: Sequence[T],
+    listing: str,
+    sort_key: Callable[[T], Tuple[Any, ...]],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    descending: bool = False,
+    offset: int = 0,
+) -> Page:
+    """
+    Keyset page over an in-memory collection, with the same cursors as
+    the database listings. ``sort_key`` must be unique per item.
+    """
+    ordered = sorted(items, key=sort_key, reverse=descending)
+    if cursor:
+        after = tuple(decode_cursor(listing, cursor))
+        if descending:
+            ordered = [item for item in ordered if sort_key(item) < after]
+        else:
+            ordered = [item for item in ordered if sort_key(item) > after]
+    elif offset:
+        ordered = ordered[offset:]
+    page = _page(ordered[: limit + 1], SortKey(listing, (), ()), limit, row_key=sort_key)
+    page.estimated_total = len(items)
+    return page
+
+
+async def estimated_count(session, stmt: Select) -> Optional[int]:
+    """
+    Planner row estimate for ``stmt`` from pg statistics (EXPLAIN, no
+    execution). None on other databases or when the statement cannot be
+    rendered with inline literals.
+    """
+    bind = session.get_bind()
+    dialect = bind.dialect
+    if dialect.name != "postgresql":
+        return None
+    try:
+        sql = str(stmt.order_by(None).limit(None).compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        # Sent as is: re-parsing with text() would read ":word" inside a
+        # literal as a bind parameter, and "%" as a format marker
+        conn = await session.connection()
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {sql}", execution_options={"no_parameters": True}
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug(f"Row estimate unavailable: {e}")
+        return None
@@ -0,0 +1,229 @@
+"""
+Query Profiler
+Per-endpoint statement statistics keyed by literal-free fingerprints, with N+1 detection
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.settings import settings
+from core.request_context import current_request_context
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND = "background"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+")
+_CAST = re.compile(r"\?::[\w\[\]]+")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    ``statement`` with literals and bind markers replaced by ``?``.
+
+    IN lists and multi-row VALUES collapse to ``(...)``, so the same query
+    with a different number of parameters shares one fingerprint.
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _CAST.sub("?", normalized)
+    normalized = _LIST.sub("(...)", normalized)
+    normalized = _ROWS.sub("(...)", normalized)
+    return _SPACE.sub(" ", normalized).strip()
+
+
+def endpoint_of(scope: Optional[Dict[str, Any]]) -> str:
+    """Route template of the request (``GET /api/v1/users/{id}``), or "background" outside one"""
+    if not scope:
+        return BACKGROUND
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class StatementStats:
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self, samples: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Recent durations for the p95; the count and total cover every execution
+        self.recent: Deque[float] = deque(maxlen=samples)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def p95(self) -> float:
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+
+
+class QueryProfiler:
+    """
+    Aggregates every statement executed through the attached engines.
+
+    Statistics are kept per (endpoint, fingerprint). While serving a request
+    the profiler also counts executions per fingerprint on the request
+    context; a fingerprint reaching ``n_plus_one_threshold`` in one request
+    is recorded (and logged once per request) as an N+1 suspect.
+    """
+
+    def __init__(
+        self,
+        n_plus_one_threshold: int = 10,
+        slow_threshold: Optional[float] = None,
+        max_fingerprints: int = 2000,
+        samples: int = 256,
+    ):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_threshold = slow_threshold
+        self.max_fingerprints = max_fingerprints
+        self.samples = samples
+        self._attached: List[Any] = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.statements: Dict[Tuple[str, str], StatementStats] = {}
+        self.n_plus_one: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.totals = {"count": 0, "total": 0.0, "under_1ms": 0, "untracked": 0}
+        self.started_at = datetime.now(timezone.utc)
+
+    def attach(self, target: Any = Engine) -> None:
+        """Profile ``target`` (an engine, or the Engine class for every engine)"""
+        if any(attached is target for attached in self._attached):
+            return
+        event.listen(target, "before_cursor_execute", self._before_execute)
+        event.listen(target, "after_cursor_execute", self._after_execute)
+        event.listen(target, "handle_error", self._handle_error)
+        self._attached.append(target)
+
+    def detach(self) -> None:
+        for target in self._attached:
+            event.remove(target, "before_cursor_execute", self._before_execute)
+            event.remove(target, "after_cursor_execute", self._after_execute)
+            event.remove(target, "handle_error", self._handle_error)
+        self._attached = []
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get("query_profiler_start")
+        if not starts:
+            return
+        self.record(statement, time.perf_counter() - starts.pop())
+
+    def _handle_error(self, context) -> None:
+        # A failed statement gets no after_cursor_execute; drop its start so
+        # the next statement on this connection is not timed against it
+        if context.connection is None:
+            return
+        starts = context.connection.info.get("query_profiler_start")
+        if starts:
+            starts.pop()
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        request = current_request_context()
+        endpoint = endpoint_of(request.scope) if request is not None else BACKGROUND
+
+        self.totals["count"] += 1
+        self.totals["total"] += seconds
+        if seconds < 0.001:
+            self.totals["under_1ms"] += 1
+
+        stats = self.statements.get((endpoint, key))
+        if stats is None:
+            if len(self.statements) >= self.max_fingerprints:
+                self.totals["untracked"] += 1
+                return
+            stats = self.statements[(endpoint, key)] = StatementStats(self.samples)
+        stats.add(seconds)
+
+        if self.slow_threshold is not None and seconds >= self.slow_threshold:
+            logger.warning(f"Slow query ({seconds * 1000:.0f}ms) on {endpoint}: {key[:300]}")
+
+        if request is not None:
+            # Keyed by profiler too: several profilers can watch one request
+            counter = (id(self), key)
+            executions = request.queries[counter] = request.queries.get(counter, 0) + 1
+            if executions >= self.n_plus_one_threshold:
+                self._flag_n_plus_one(endpoint, key, executions)
+
+    def _flag_n_plus_one(self, endpoint: str, key: str, executions: int) -> None:
+        suspect = self.n_plus_one.get((endpoint, key))
+        if suspect is None:
+            suspect = self.n_plus_one[(endpoint, key)] = {"requests": 0, "max_per_request": 0}
+        if executions == self.n_plus_one_threshold:
+            suspect["requests"] += 1
+            suspect["last_seen"] = datetime.now(timezone.utc).isoformat()
+            logger.warning(
+                f"Possible N+1 on {endpoint}: same statement run {executions}+ times: {key[:300]}"
+            )
+        suspect["max_per_request"] = max(suspect["max_per_request"], executions)
+
+    def report(self, endpoint: Optional[str] = None, limit: int = 20, sort: str = "total") -> Dict[str, Any]:
+        """Worst fingerprints by ``sort`` (total, count, p95 or max), optionally for one endpoint"""
+        rows = []
+        for (stats_endpoint, key), stats in self.statements.items():
+            if endpoint and stats_endpoint != endpoint:
+                continue
+            rows.append({
+                "endpoint": stats_endpoint,
+                "fingerprint": key,
+                "count": stats.count,
+                "total_ms": round(stats.total * 1000, 3),
+                "mean_ms": round(stats.total / stats.count * 1000, 3),
+                "p95_ms": round(stats.p95() * 1000, 3),
+                "max_ms": round(stats.max * 1000, 3),
+            })
+        sort_key = {"total": "total_ms", "count": "count", "p95": "p95_ms", "max": "max_ms"}[sort]
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+
+        suspects = [
+            {"endpoint": suspect_endpoint, "fingerprint": key, **suspect}
+            for (suspect_endpoint, key), suspect in self.n_plus_one.items()
+            if not endpoint or suspect_endpoint == endpoint
+        ]
+        suspects.sort(key=lambda row: (row["requests"], row["max_per_request"]), reverse=True)
+
+        count = self.totals["count"]
+        return {
+            "since": self.started_at.isoformat(),
+            "totals": {
+                "statements": count,
+                "total_ms": round(self.totals["total"] * 1000, 3),
+                "mean_ms": round(self.totals["total"] / count * 1000, 3) if count else 0.0,
+                "under_1ms": self.totals["under_1ms"],
+                "fingerprints": len(self.statements),
+                "untracked": self.totals["untracked"],
+            },
+            "statements": rows[:limit],
+            "n_plus_one": suspects[:limit],
+        }
+
+
+# Global profiler; core.database attaches it to every engine when enabled
+query_profiler = QueryProfiler(
+    n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    slow_threshold=settings.SLOW_QUERY_THRESHOLD if settings.LOG_SLOW_QUERIES else None,
+)
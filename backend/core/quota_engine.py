@@ -0,0 +1,257 @@
+"""
+Quota Engine
+One Redis round trip for a request's whole tree of rate and concurrency limits
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+
+from redis import asyncio as aioredis
+
+from core.rate_limit import RateLimitResult
+
+logger = logging.getLogger(__name__)
+
+RATE = "rate"
+CONCURRENCY = "concurrency"
+
+# Every limit is checked first and state changes only when all of them
+# pass, so a request denied by one level uses up nothing at the others.
+# Rate limits are GCRA (see core.rate_limit.GCRA_LUA); concurrency limits
+# are a sorted set of leases scored by expiry, so a worker that dies
+# mid-request frees its slot after the lease TTL.
+# KEYS: one state key per limit
+# ARGV: cost, lease id, then per limit: kind ('r' or 'c'), limit,
+#       window ms (lease TTL ms for 'c')
+# Returns {allowed, then per limit: allowed, remaining, retry_after_ms, reset_after_ms}
+QUOTA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local cost = tonumber(ARGV[1])
+local allowed = 1
+local results = {}
+local new_tats = {}
+for i = 1, #KEYS do
+    local base = 2 + (i - 1) * 3
+    local limit = tonumber(ARGV[base + 2])
+    local window = tonumber(ARGV[base + 3])
+    if ARGV[base + 1] == 'r' then
+        local emission = window / limit
+        local tat = tonumber(redis.call('GET', KEYS[i]))
+        if not tat or tat < now then
+            tat = now
+        end
+        local new_tat = tat + emission * cost
+        if new_tat - now > window then
+            allowed = 0
+            results[i] = {0, math.max(0, math.floor((window - (tat - now)) / emission)),
+                          math.ceil(new_tat - now - window), math.ceil(tat - now)}
+        else
+            new_tats[i] = new_tat
+            results[i] = {1, math.floor((window - (new_tat - now)) / emission), 0, math.ceil(new_tat - now)}
+        end
+    else
+        redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+        local active = redis.call('ZCARD', KEYS[i])
+        if active >= limit then
+            allowed = 0
+            local first = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+            results[i] = {0, 0, 1000, math.ceil(tonumber(first[2]) - now)}
+        else
+            results[i] = {1, limit - active - 1, 0, 0}
+        end
+    end
+end
+if allowed == 1 then
+    for i = 1, #KEYS do
+        local base = 2 + (i - 1) * 3
+        if ARGV[base + 1] == 'r' then
+            redis.call('SET', KEYS[i], string.format('%.3f', new_tats[i]), 'PX', math.ceil(new_tats[i] - now))
+        else
+            local ttl = tonumber(ARGV[base + 3])
+            redis.call('ZADD', KEYS[i], now + ttl, ARGV[2])
+            redis.call('PEXPIRE', KEYS[i], ttl)
+        end
+    end
+end
+local reply = {allowed}
+for i = 1, #KEYS do
+    for j = 1, 4 do
+        reply[#reply + 1] = results[i][j]
+    end
+end
+return reply
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """
+    One node of a request's limit tree.
+
+    ``scope`` names the level (global, plan, user, api_key, endpoint) and
+    ``key`` the identity within it. A rate limit allows ``limit`` requests
+    per ``window`` seconds; a concurrency limit allows ``limit`` requests
+    in flight, each holding its slot for at most ``window`` seconds.
+    """
+
+    scope: str
+    key: str
+    limit: int
+    window: int = 60
+    kind: str = RATE
+
+    @property
+    def redis_key(self) -> str:
+        return f"quota:{self.kind}:{self.scope}:{self.key}"
+
+
+@dataclass
+class QuotaDecision:
+    """Result of evaluating a limit tree; results are in tree order"""
+
+    allowed: bool
+    results: list[tuple[Limit, RateLimitResult]]
+    lease: str | None = None
+
+    @property
+    def denied(self) -> tuple[Limit, RateLimitResult] | None:
+        """The limit to report: the denied one that frees up last"""
+        denied = [item for item in self.results if not item[1].allowed]
+        return max(denied, key=lambda item: item[1].retry_after) if denied else None
+
+    @property
+    def tightest(self) -> tuple[Limit, RateLimitResult] | None:
+        """The limit with the fewest requests left"""
+        return min(self.results, key=lambda item: item[1].remaining) if self.results else None
+
+    def result_for(self, scope: str) -> RateLimitResult | None:
+        for limit, result in self.results:
+            if limit.scope == scope:
+                return result
+        return None
+
+
+class QuotaEngine:
+    """Evaluates limit trees atomically with one EVALSHA per request"""
+
+    def __init__(self, redis_client: aioredis.Redis):
+        self.redis = redis_client
+        self._script = redis_client.register_script(QUOTA_LUA)
+
+    async def evaluate(self, limits: Iterable[Limit], cost: int = 1) -> QuotaDecision:
+        """
+        Check every limit and, only if all pass, take one unit of each.
+        Redis errors propagate so the caller can fall back.
+        """
+        limits = [limit for limit in limits if limit.limit > 0]
+        if not limits:
+            return QuotaDecision(True, [])
+
+        lease = uuid.uuid4().hex if any(l.kind == CONCURRENCY for l in limits) else ""
+        args: list = [cost, lease]
+        for limit in limits:
+            args += ["c" if limit.kind == CONCURRENCY else "r", limit.limit, limit.window * 1000]
+
+        reply = [int(v) for v in await self._script(keys=[l.redis_key for l in limits], args=args)]
+        results = []
+        for i, limit in enumerate(limits):
+            allowed, remaining, retry_after_ms, reset_after_ms = reply[1 + i * 4 : 5 + i * 4]
+            results.append((
+                limit,
+                RateLimitResult(
+                    bool(allowed), limit.limit, remaining, retry_after_ms / 1000, reset_after_ms / 1000
+                ),
+            ))
+        allowed = bool(reply[0])
+        return QuotaDecision(allowed, results, lease if allowed and lease else None)
+
+    async def release(self, decision: QuotaDecision) -> None:
+        """Give back the concurrency slots taken by an allowed decision"""
+        if not decision.lease:
+            return
+        keys = [limit.redis_key for limit, _ in decision.results if limit.kind == CONCURRENCY]
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.zrem(key, decision.lease)
+                await pipe.execute()
+        except Exception as e:
+            # The lease expires on its own
+            logger.warning(f"Could not release concurrency lease: {e}")
+
+
+class CounterBuffer:
+    """
+    Usage counters added in memory and written in batches.
+
+    ``add`` is a dict update; every ``interval`` seconds the accumulated
+    deltas go to ``flush`` in one call (one transaction for the caller).
+    Deltas of a failed flush are kept for the next one. ``pending`` lets
+    readers add what this process has not written yet.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[dict[Hashable, int]], Awaitable[None]],
+        interval: float = 5.0,
+    ):
+        self._flush = flush
+        self.interval = interval
+        self._deltas: dict[Hashable, int] = {}
+        self._writing: dict[Hashable, int] = {}
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self.stats = {"added": 0, "flushes": 0, "flushed_rows": 0, "errors": 0}
+
+    def add(self, key: Hashable, amount: int) -> None:
+        self._deltas[key] = self._deltas.get(key, 0) + amount
+        self.stats["added"] += 1
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            except RuntimeError:
+                pass  # No loop: flushed by the next flush()/stop()
+
+    def pending(self, key: Hashable) -> int:
+        return self._deltas.get(key, 0) + self._writing.get(key, 0)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            deltas, self._deltas = self._deltas, {}
+            if not deltas:
+                return
+            self._writing = deltas
+            try:
+                await self._flush(deltas)
+                self.stats["flushes"] += 1
+                self.stats["flushed_rows"] += len(deltas)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Usage counter flush failed, retrying later: {e}")
+                for key, amount in deltas.items():
+                    self._deltas[key] = self._deltas.get(key, 0) + amount
+            finally:
+                self._writing = {}
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+            if not self._deltas:
+                # Idle: the next add starts a new loop
+                return
+
+    async def stop(self) -> None:
+        """Cancel the loop and write what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self.flush()
@@ -4,7 +4,11 @@ Handles rate limiting for clients with variable thread counts (20-1000+ threads)
 """
 
 import logging
+import math
+import sys
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 
 from redis import asyncio as aioredis
@@ -13,12 +17,135 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# GCRA (generic cell rate algorithm): one number per key, the theoretical
+# arrival time (TAT) of the next request in ms. ``limit`` requests per
+# ``window`` means one request every ``window / limit`` (the emission
+# interval) with bursts of up to ``limit``.
+# KEYS: state key; ARGV: emission interval (ms), window (ms), cost
+# Returns {allowed, remaining, retry_after_ms, reset_after_ms}
+GCRA_LUA = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + emission * tonumber(ARGV[3])
+if new_tat - now > window then
+    local retry_after = math.ceil(new_tat - now - window)
+    local remaining = math.max(0, math.floor((window - (tat - now)) / emission))
+    return {0, remaining, retry_after, math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((window - (new_tat - now)) / emission), 0, math.ceil(new_tat - now)}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit check; times are in seconds"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0  # until this request would be allowed
+    reset_after: float = 0.0  # until the full limit is available again
+
+    def headers(self, window: int) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "X-RateLimit-Window": str(window),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+def gcra(
+    tat: float | None, now: float, limit: int, window: float, cost: int = 1
+) -> tuple[RateLimitResult, float | None]:
+    """
+    The GCRA decision in Python, same arithmetic as ``GCRA_LUA`` (any time
+    unit). Returns the result and the new TAT, None when denied (keep the old).
+    """
+    emission = window / limit
+    if tat is None or tat < now:
+        tat = now
+    new_tat = tat + emission * cost
+    if new_tat - now > window:
+        remaining = max(0, math.floor((window - (tat - now)) / emission))
+        return RateLimitResult(False, limit, remaining, new_tat - now - window, tat - now), None
+    remaining = math.floor((window - (new_tat - now)) / emission)
+    return RateLimitResult(True, limit, remaining, 0.0, new_tat - now), new_tat
+
+
+class LocalRateLimiter:
+    """
+    In-process GCRA limiter for when Redis is unavailable.
+
+    Each key holds one float (its TAT) in an LRU-ordered dict, so a check
+    is O(1) whatever the limit. The table is capped at ``max_keys`` and an
+    estimated ``max_bytes``; least recently used keys go first, and an
+    evicted key starts again with its full allowance.
+    """
+
+    # Dict slot, float and LRU links per entry, roughly
+    ENTRY_OVERHEAD = 120
+
+    def __init__(self, max_keys: int = 100000, max_bytes: int = 16 * 1024 * 1024):
+        self.max_keys = max_keys
+        self.max_bytes = max_bytes
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def _entry_size(self, key: str) -> int:
+        return sys.getsizeof(key) + self.ENTRY_OVERHEAD
+
+    def check(
+        self, key: str, limit: int, window: float = 60, cost: int = 1, now: float | None = None
+    ) -> RateLimitResult:
+        now = time.monotonic() if now is None else now
+        tat = self._tats.get(key)
+        result, new_tat = gcra(tat, now, limit, window, cost)
+        if tat is None:
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                self.bytes += self._entry_size(key)
+                self._evict()
+        else:
+            if new_tat is not None:
+                self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+        return result
+
+    def _evict(self) -> None:
+        while self._tats and (len(self._tats) > self.max_keys or self.bytes > self.max_bytes):
+            key, _ = self._tats.popitem(last=False)
+            self.bytes -= self._entry_size(key)
+            self.evictions += 1
+
+    def clear(self) -> int:
+        """Drop every key (Redis is back in charge); returns how many there were"""
+        count = len(self._tats)
+        self._tats.clear()
+        self.bytes = 0
+        return count
+
 
 class RateLimiter:
     """Redis-based rate limiter with dynamic scaling for high-concurrency clients"""
 
     def __init__(self, redis_client: aioredis.Redis):
         self.redis = redis_client
+        self._gcra = redis_client.register_script(GCRA_LUA) if redis_client else None
         self.default_limit = settings.RATE_LIMIT_PER_MINUTE
 
         # Dynamic rate limits based on client tier
@@ -29,6 +156,40 @@ class RateLimiter:
             "extreme": 600,  # 600 requests per minute for 500+ threads
         }
 
+    @staticmethod
+    def _state_key(key: str) -> str:
+        return f"rate_limit:gcra:{key}"
+
+    @staticmethod
+    def _result(limit: int, reply) -> RateLimitResult:
+        allowed, remaining, retry_after_ms, reset_after_ms = (int(v) for v in reply)
+        return RateLimitResult(
+            bool(allowed), limit, remaining, retry_after_ms / 1000, reset_after_ms / 1000
+        )
+
+    def _script_args(self, key: str, limit: int, window: int, cost: int) -> dict[str, list]:
+        return {
+            "keys": [self._state_key(key)],
+            "args": [window * 1000 / limit, window * 1000, cost],
+        }
+
+    async def check(
+        self, key: str, limit: int | None = None, window: int = 60, cost: int = 1
+    ) -> RateLimitResult:
+        """
+        Atomic GCRA check in one round trip; also reports when the limit
+        resets and, when denied, when to retry. Allows on Redis errors.
+        """
+        limit = limit or self.default_limit
+        if not self._gcra:
+            return RateLimitResult(True, limit, limit)
+        try:
+            reply = await self._gcra(**self._script_args(key, limit, window, cost))
+            return self._result(limit, reply)
+        except Exception as e:
+            logger.error(f"Rate limiting error for key {key}: {e}")
+            return RateLimitResult(True, limit, limit)
+
     async def is_allowed(
         self, key: str, limit: int | None = None, window: int = 60
     ) -> tuple[bool, int]:
@@ -46,38 +207,8 @@ class RateLimiter:
         if not self.redis:
             return True, 999  # Allow all if Redis unavailable
 
-        limit = limit or self.default_limit
-        current_time = int(time.time())
-        pipe = self.redis.pipeline()
-
-        try:
-            # Use sliding window log approach for accuracy
-            window_start = current_time - window
-
-            # Remove old entries
-            await pipe.zremrangebyscore(f"rate_limit:{key}", 0, window_start)
-
-            # Count current requests
-            current_requests = await pipe.zcard(f"rate_limit:{key}")
-
-            if current_requests < limit:
-                # Add current request
-                await pipe.zadd(
-                    f"rate_limit:{key}", {str(current_time): current_time}
-                )
-                await pipe.expire(
-                    f"rate_limit:{key}", window + 10
-                )  # Extra TTL buffer
-
-                remaining = limit - current_requests - 1
-                return True, max(0, remaining)
-            else:
-                remaining = 0
-                return False, remaining
-
-        except Exception as e:
-            logger.error(f"Rate limiting error for key {key}: {e}")
-            return True, 999  # Allow on error to prevent blocking
+        result = await self.check(key, limit, window)
+        return result.allowed, result.remaining
 
     async def get_client_tier_limit(self, session_id: str) -> int:
         """Get rate limit based on client session tier"""
@@ -113,31 +244,24 @@ class RateLimiter:
             return None
 
     async def get_usage_stats(
-        self, key: str, window: int = 60
+        self, key: str, window: int = 60, limit: int | None = None
     ) -> dict[str, Any]:
         """Get current usage statistics for a key"""
+        limit = limit or self.default_limit
         try:
-            current_time = int(time.time())
-            window_start = current_time - window
-
-            # Get requests in current window
-            requests = await self.redis.zrangebyscore(
-                f"rate_limit:{key}",
-                window_start,
-                current_time,
-                withscores=True,
-            )
+            current_time = time.time()
+            tat = await self.redis.get(self._state_key(key))
+            # Requests still counted against the window
+            backlog = max(0.0, float(tat) / 1000 - current_time) if tat else 0.0
+            current_requests = min(limit, math.ceil(backlog * limit / window))
 
             return {
-                "current_requests": len(requests),
-                "window_start": window_start,
-                "window_end": current_time,
-                "requests_per_second": len(requests) / window
-                if requests
-                else 0,
-                "last_request": max([score for _, score in requests])
-                if requests
-                else None,
+                "current_requests": current_requests,
+                "remaining": limit - current_requests,
+                "window_start": int(current_time) - window,
+                "window_end": int(current_time),
+                "requests_per_second": current_requests / window,
+                "reset_after": backlog,
             }
         except Exception as e:
             logger.error(f"Error getting usage stats for {key}: {e}")
@@ -146,25 +270,29 @@ class RateLimiter:
     async def reset_limit(self, key: str):
         """Reset rate limit for a key"""
         try:
-            await self.redis.delete(f"rate_limit:{key}")
-            await self.redis.delete(f"custom_limit:{key}")
+            await self.redis.delete(self._state_key(key), f"custom_limit:{key}")
             logger.info(f"Reset rate limit for {key}")
         except Exception as e:
             logger.error(f"Failed to reset rate limit for {key}: {e}")
 
     async def bulk_check(
-        self, keys: list, limit: int | None = None
+        self, keys: list, limit: int | None = None, window: int = 60
     ) -> dict[str, tuple[bool, int]]:
-        """Check rate limits for multiple keys efficiently"""
-        results = {}
-
-        # Use pipeline for efficiency
-        pipe = self.redis.pipeline()
+        """Check rate limits for multiple keys in one pipelined round trip"""
+        if not self._gcra:
+            return dict.fromkeys(keys, (True, 999))
 
+        limit = limit or self.default_limit
         try:
-            for key in keys:
-                results[key] = await self.is_allowed(key, limit)
-
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    await self._gcra(**self._script_args(key, limit, window, 1), client=pipe)
+                replies = await pipe.execute()
+
+            results = {}
+            for key, reply in zip(keys, replies):
+                result = self._result(limit, reply)
+                results[key] = (result.allowed, result.remaining)
             return results
 
         except Exception as e:
@@ -193,9 +321,9 @@ class CircuitBreaker:
 
         try:
             result = await func(*args, **kwargs)
-            if self.state == "half-open":
-                self.state = "closed"
-                self.failure_count = 0
+            # Only consecutive failures open the breaker
+            self.state = "closed"
+            self.failure_count = 0
             return result
 
         except Exception as e:
@@ -0,0 +1,194 @@
+"""
+Read Replicas
+Routes read-only sessions to lag-checked replicas, pinning recent writers to the primary
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import Scope
+
+from config.settings import settings
+from core.engine_registry import EngineRegistry, engine_registry, replica_urls
+from core.request_context import current_request_context
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "oltp"
+
+# Replay delay; zero while the replica has replayed everything it received,
+# otherwise an idle primary would look like growing lag
+_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "MERGE", "COPY")
+_MAX_LOCAL_PINS = 10000
+
+
+def client_identity(scope: Optional[Scope]) -> Optional[str]:
+    """Stable key of the caller: its bearer token, or its address when anonymous"""
+    if not scope:
+        return None
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            return hashlib.sha256(value).hexdigest()[:32]
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else None
+
+
+def _shared_redis():
+    try:
+        from core.cache_manager import cache_manager
+        return cache_manager.redis_client
+    except Exception:
+        return None
+
+
+class ReplicaRouter:
+    """
+    Picks the pool a read-only session should use.
+
+    Replicas are used round-robin while their replay lag (checked at most
+    every ``check_interval`` seconds, with one check in flight per replica)
+    stays within ``max_lag``. A client that wrote through the primary is
+    pinned to it for ``pin_seconds`` so it reads its own writes; pins are
+    kept locally and in Redis, so other workers honour them too. Without
+    replicas every read goes to the primary.
+    """
+
+    def __init__(
+        self,
+        registry: EngineRegistry,
+        replicas: Sequence[str],
+        max_lag: float = 5.0,
+        check_interval: float = 2.0,
+        pin_seconds: float = 10.0,
+    ):
+        self.registry = registry
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.pin_seconds = pin_seconds
+        self.stats = {"replica": 0, "primary_pinned": 0, "primary_lagging": 0}
+
+        self._lag: Dict[str, Tuple[float, float]] = {}
+        self._lag_locks: Dict[str, asyncio.Lock] = {}
+        self._pins: Dict[str, float] = {}
+        self._next = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def route(self, identity: Optional[str] = None) -> str:
+        """Pool name for a read-only session of ``identity``"""
+        if not self.replicas:
+            return PRIMARY
+        if identity and await self.is_pinned(identity):
+            self.stats["primary_pinned"] += 1
+            return PRIMARY
+        count = len(self.replicas)
+        for offset in range(count):
+            name = self.replicas[(self._next + offset) % count]
+            if await self.lag(name) <= self.max_lag:
+                self._next = (self._next + offset + 1) % count
+                self.stats["replica"] += 1
+                return name
+        self.stats["primary_lagging"] += 1
+        return PRIMARY
+
+    async def lag(self, name: str) -> float:
+        """Replay lag of a replica in seconds (``inf`` when unreachable)"""
+        cached = self._lag.get(name)
+        if cached is not None and time.monotonic() - cached[1] < self.check_interval:
+            return cached[0]
+        lock = self._lag_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            cached = self._lag.get(name)
+            if cached is not None and time.monotonic() - cached[1] < self.check_interval:
+                return cached[0]
+            lag = await self._measure_lag(self.registry.engine(name))
+            self._lag[name] = (lag, time.monotonic())
+            if lag > self.max_lag:
+                logger.warning(f"Read replica {name} is {lag:.1f}s behind; reading from the primary")
+            return lag
+
+    async def _measure_lag(self, engine: AsyncEngine) -> float:
+        if engine.dialect.name != "postgresql":
+            return 0.0
+        try:
+            async with engine.connect() as conn:
+                value = (await conn.execute(_LAG_SQL)).scalar()
+        except Exception as e:
+            logger.warning(f"Replica lag check failed: {e}")
+            return math.inf
+        return float(value or 0.0)
+
+    def pin(self, identity: str) -> None:
+        """Send ``identity``'s reads to the primary for the next ``pin_seconds``"""
+        now = time.monotonic()
+        # Repeated writes within one window do not need to renew the pin
+        if self._pins.get(identity, 0.0) - now > self.pin_seconds / 2:
+            return
+        self._pins[identity] = now + self.pin_seconds
+        if len(self._pins) > _MAX_LOCAL_PINS:
+            self._pins = {key: expires for key, expires in self._pins.items() if expires > now}
+
+        redis = _shared_redis()
+        if redis is not None:
+            try:
+                task = asyncio.get_running_loop().create_task(self._pin_shared(redis, identity))
+            except RuntimeError:
+                return
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _pin_shared(self, redis, identity: str) -> None:
+        try:
+            await redis.set(f"ryw:{identity}", 1, px=int(self.pin_seconds * 1000))
+        except Exception as e:
+            logger.debug(f"Could not share read-your-writes pin: {e}")
+
+    async def is_pinned(self, identity: str) -> bool:
+        expires = self._pins.get(identity)
+        if expires is not None:
+            if expires > time.monotonic():
+                return True
+            self._pins.pop(identity, None)
+        redis = _shared_redis()
+        if redis is None:
+            return False
+        try:
+            return bool(await redis.exists(f"ryw:{identity}"))
+        except Exception:
+            return False
+
+    def watch_writes(self, engine: AsyncEngine) -> None:
+        """Pin the current request's client whenever it writes through ``engine``"""
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_execute)
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not self.replicas:
+            return
+        if context is None or not (context.isinsert or context.isupdate or context.isdelete):
+            if not statement.lstrip()[:6].upper().startswith(_WRITE_PREFIXES):
+                return
+        request = current_request_context()
+        identity = client_identity(request.scope) if request is not None else None
+        if identity:
+            self.pin(identity)
+
+
+# Global router over the READ_REPLICA_URLS pools
+replica_router = ReplicaRouter(
+    engine_registry,
+    list(replica_urls()),
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL,
+    pin_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
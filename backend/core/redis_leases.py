@@ -0,0 +1,20 @@
+"""
+Redis Leases
+Owner-checked release and renewal of SET NX lease keys (cache stampede locks, startup leader)
+"""
+
+# Compare-and-delete so a worker never releases a lease it no longer owns
+RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Extend the lease only while this worker still owns it
+RENEW_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
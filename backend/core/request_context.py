@@ -0,0 +1,106 @@
+"""
+Request Context
+Per-request memoization of lookups (current user, plan, license) shared across dependencies
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class RequestContext:
+    """
+    Results of lookups already made while serving one request.
+
+    Every dependency, decorator and service that asks for the same key
+    during the request shares one call; concurrent callers await the
+    in-flight result instead of issuing their own query. Failures are not
+    remembered, so a later caller retries.
+    """
+
+    __slots__ = ("_memo", "stats", "scope", "queries")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self._memo: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+        # ASGI scope of the request, for code below the dependency layer
+        self.scope = scope
+        # Executions per statement fingerprint (core.query_profiler)
+        self.queries: Dict[Hashable, int] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._memo
+
+    async def memoize(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._memo.get(key)
+        if future is not None:
+            self.stats['hits'] += 1
+            return await asyncio.shield(future)
+
+        self.stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._memo[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            self._memo.pop(key, None)
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure does not log a warning
+            future.exception()
+            raise
+        future.set_result(value)
+        return value
+
+    def forget(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._memo.pop(key, None)
+
+
+_current_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def current_request_context() -> Optional[RequestContext]:
+    return _current_context.get()
+
+
+@contextmanager
+def request_scope(scope: Optional[Scope] = None) -> Iterator[RequestContext]:
+    """Make a fresh ``RequestContext`` current for the enclosed code"""
+    context = RequestContext(scope)
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+async def memoize(key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """``loader()`` at most once per request; called directly outside a request scope"""
+    context = _current_context.get()
+    if context is None:
+        return await loader()
+    return await context.memoize(key, loader)
+
+
+def forget(*keys: Hashable) -> None:
+    """Drop memoized results, e.g. after the request changed the underlying rows"""
+    context = _current_context.get()
+    if context is not None:
+        context.forget(*keys)
+
+
+class RequestContextMiddleware:
+    """Opens a request scope around every HTTP request (pure ASGI, no extra task)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_scope(scope):
+            await self.app(scope, receive, send)
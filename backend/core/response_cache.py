@@ -0,0 +1,205 @@
+"""
+Precompiled Response Cache
+Serialized, pre-compressed response bytes with content-hash ETags and conditional GET handling
+"""
+
+import gzip
+import hashlib
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Optional brotli variant (gzip is always available)
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+
+def content_etag(body: bytes) -> str:
+    """
+    Validator derived from the body hash.
+
+    It is weak because compression middleware may send the same entity
+    gzip- or brotli-encoded; weak comparison still answers If-None-Match.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """304 response carrying the validator and caching headers, no body"""
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Content codings the client accepts (``q=0`` entries are refused)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:] in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding)
+    return accepted
+
+
+class PrecompiledResponse:
+    """
+    A response body serialized and compressed once, at precompile time.
+
+    Serving it is a dict lookup, an encoding choice and a ``Response``
+    around existing bytes: no JSON encoding and no compression per hit.
+    """
+
+    __slots__ = (
+        "body", "gzip_body", "br_body", "etag", "media_type",
+        "status_code", "headers", "created_at",
+    )
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str = "application/json",
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        min_compression_size: int = 500,
+        compression_level: int = 6,
+    ):
+        self.body = body
+        self.media_type = media_type
+        self.status_code = status_code
+        self.etag = content_etag(body)
+        self.headers = {**(headers or {}), "ETag": self.etag, "Vary": "Accept-Encoding"}
+        self.created_at = time.time()
+
+        self.gzip_body: Optional[bytes] = None
+        self.br_body: Optional[bytes] = None
+        if len(body) >= min_compression_size:
+            # Keep a variant only when it is actually smaller
+            compressed = gzip.compress(body, compresslevel=compression_level, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+            if BROTLI_AVAILABLE:
+                compressed = brotli.compress(body, quality=compression_level)
+                if len(compressed) < len(body):
+                    self.br_body = compressed
+
+    @classmethod
+    def from_json(cls, data: Any, **kwargs) -> "PrecompiledResponse":
+        return cls(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS), **kwargs)
+
+    def select(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Best stored variant for an Accept-Encoding header: (body, coding)"""
+        if self.br_body is None and self.gzip_body is None:
+            return self.body, None
+        accepted = accepted_encodings(accept_encoding)
+        if self.br_body is not None and "br" in accepted:
+            return self.br_body, "br"
+        if self.gzip_body is not None and ("gzip" in accepted or "*" in accepted):
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+    def to_response(self, request: Request, extra_headers: Optional[Dict[str, str]] = None) -> Response:
+        """Full response, or 304 when the client already holds this entity"""
+        headers = {**self.headers, **(extra_headers or {})}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return not_modified(self.etag, headers)
+
+        body, coding = self.select(request.headers.get("accept-encoding", ""))
+        if coding:
+            headers["Content-Encoding"] = coding
+        return Response(
+            content=body,
+            status_code=self.status_code,
+            headers=headers,
+            media_type=self.media_type,
+        )
+
+
+class ResponseCache:
+    """Path -> ``PrecompiledResponse`` table for the L0 tier"""
+
+    def __init__(self, min_compression_size: int = 500, compression_level: int = 6):
+        self.min_compression_size = min_compression_size
+        self.compression_level = compression_level
+        self._entries: Dict[str, PrecompiledResponse] = {}
+        self.stats = {'hits': 0, 'not_modified': 0, 'misses': 0}
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, path: str, data: Any, headers: Optional[Dict[str, str]] = None) -> PrecompiledResponse:
+        """Serialize and compress ``data`` once and store it for ``path``"""
+        entry = PrecompiledResponse.from_json(
+            data,
+            headers=headers,
+            min_compression_size=self.min_compression_size,
+            compression_level=self.compression_level,
+        )
+        self._entries[path] = entry
+        return entry
+
+    def get(self, path: str) -> Optional[PrecompiledResponse]:
+        entry = self._entries.get(path)
+        if entry is None:
+            self.stats['misses'] += 1
+        return entry
+
+    def respond(
+        self,
+        path: str,
+        request: Request,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[Response]:
+        """Response for ``path`` built from stored bytes, or None if not cached"""
+        entry = self.get(path)
+        if entry is None:
+            return None
+        response = entry.to_response(request, extra_headers)
+        if response.status_code == 304:
+            self.stats['not_modified'] += 1
+        else:
+            self.stats['hits'] += 1
+        return response
+
+    def invalidate(self, paths: Iterable[str] = ()) -> None:
+        for path in paths:
+            self._entries.pop(path, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'bytes': sum(len(e.body) for e in self._entries.values()),
+            'brotli': BROTLI_AVAILABLE,
+        }
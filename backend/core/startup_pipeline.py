@@ -0,0 +1,237 @@
+"""
+Startup Pipeline
+Concurrent, dependency-ordered boot steps with leader-only markers and a boot-time budget
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.settings import settings
+from core.redis_leases import RELEASE_LEASE_SCRIPT, RENEW_LEASE_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StartupStep:
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    after: Tuple[str, ...] = ()
+    # Waited for, but this step runs even if they fail
+    wait_for: Tuple[str, ...] = ()
+    # Steps with a marker run on one worker; the others reuse its result
+    marker: Optional[str] = None
+    fingerprint: str = ""
+    timeout: Optional[float] = None
+
+
+class StartupPipeline:
+    """
+    Runs startup steps concurrently, each as soon as the steps it comes
+    ``after`` have finished.
+
+    A step whose ``after`` dependencies failed or timed out is skipped and
+    reported as failed; ``wait_for`` steps are only waited for. A step
+    returning ``False`` is reported as failed; anything still running when
+    the boot budget is spent is cancelled and reported as ``timeout``.
+
+    A step with a ``marker`` runs under a Redis lease. The worker holding
+    the lease runs it and records ``fingerprint`` under the marker; other
+    workers wait for the marker instead of repeating the work, and later
+    boots skip the step while the marker still matches. Without Redis the
+    step simply runs in every worker. The leader's run is never cancelled
+    by the budget (it is reported as ``timeout`` but carries on), and its
+    lease is renewed every ``lease_ttl / 3`` seconds until the run returns,
+    so no other worker can start the same work meanwhile.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[float] = None,
+        redis: Optional[Callable[[], Any]] = None,
+        key_prefix: str = "startup:",
+        marker_ttl: Optional[int] = None,
+        poll_interval: float = 0.5,
+        lease_ttl: float = 30.0,
+    ):
+        self.budget = settings.STARTUP_BUDGET_SECONDS if budget is None else budget
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.marker_ttl = settings.STARTUP_MARKER_TTL if marker_ttl is None else marker_ttl
+        self.poll_interval = poll_interval
+        self.lease_ttl = lease_ttl
+
+        self.steps: Dict[str, StartupStep] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._started: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self._total_ms: Optional[float] = None
+        # Leader runs that outlived the budget, kept referenced until done
+        self._leader_tasks: set = set()
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Any]],
+        after: Tuple[str, ...] = (),
+        marker: Optional[str] = None,
+        fingerprint: str = "",
+        timeout: Optional[float] = None,
+        wait_for: Tuple[str, ...] = (),
+    ) -> None:
+        """Register a step; everything it runs ``after`` must already be registered"""
+        if name in self.steps:
+            raise ValueError(f"Duplicate startup step: {name}")
+        missing = [dep for dep in (*after, *wait_for) if dep not in self.steps]
+        if missing:
+            raise ValueError(f"Startup step {name} depends on unknown steps: {missing}")
+        self.steps[name] = StartupStep(
+            name, run, tuple(after), tuple(wait_for), marker, fingerprint, timeout
+        )
+
+    def succeeded(self, name: str) -> bool:
+        return self.results.get(name, {}).get("status") in ("ok", "cached")
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every step and return the report"""
+        loop = asyncio.get_running_loop()
+        self._started = time.perf_counter()
+        self._deadline = loop.time() + self.budget
+
+        tasks: Dict[str, asyncio.Task] = {}
+        # Registration order is a valid topological order (see add())
+        for step in self.steps.values():
+            deps = [tasks[dep] for dep in (*step.after, *step.wait_for)]
+            tasks[step.name] = asyncio.create_task(self._run_step(step, deps))
+        await asyncio.gather(*tasks.values())
+
+        self._total_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        return self.get_report()
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            "worker": os.getpid(),
+            "total_ms": self._total_ms,
+            "budget_s": self.budget,
+            "steps": dict(self.results),
+        }
+
+    async def _run_step(self, step: StartupStep, deps: list) -> None:
+        await asyncio.gather(*deps)
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        remaining = self._deadline - loop.time()
+        timeout = remaining if step.timeout is None else min(step.timeout, remaining)
+
+        error = None
+        failed_deps = [
+            dep for dep in step.after
+            if self.results.get(dep, {}).get("status") in ("failed", "timeout")
+        ]
+        if failed_deps:
+            status, error = "failed", f"skipped: {', '.join(failed_deps)} did not complete"
+        elif timeout <= 0:
+            status = "timeout"
+        else:
+            try:
+                status = await asyncio.wait_for(self._execute(step), timeout)
+            except asyncio.TimeoutError:
+                status = "timeout"
+            except ImportError as e:
+                # Optional subsystem not installed in this deployment
+                status, error = "unavailable", str(e)
+            except Exception as e:
+                status, error = "failed", str(e)
+
+        result: Dict[str, Any] = {
+            "status": status,
+            "start_ms": round((started - self._started) * 1000, 1),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        if error:
+            result["error"] = error
+        if status in ("failed", "timeout"):
+            logger.warning(f"Startup step {step.name} {status}{f': {error}' if error else ''}")
+        self.results[step.name] = result
+
+    async def _execute(self, step: StartupStep) -> str:
+        redis = self.redis() if (step.marker and self.redis) else None
+        if redis is not None:
+            try:
+                lease = await self._wait_for_turn(step, redis)
+            except Exception as e:
+                logger.warning(f"Startup marker for {step.name} unavailable, running locally: {e}")
+                redis = None
+            else:
+                if lease is None:
+                    return "cached"
+
+        if redis is None:
+            return "failed" if await step.run() is False else "ok"
+
+        # Shielded: cancelling the wait must not release the lease while
+        # the step (possibly in a worker thread) is still running
+        task = asyncio.create_task(self._lead(step, redis, *lease))
+        self._leader_tasks.add(task)
+        task.add_done_callback(self._leader_done)
+        return await asyncio.shield(task)
+
+    def _leader_done(self, task: asyncio.Task) -> None:
+        self._leader_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Startup leader run failed: {task.exception()}")
+
+    async def _lead(self, step: StartupStep, redis: Any, lease_key: str, token: str) -> str:
+        heartbeat = asyncio.create_task(self._renew_lease(step, redis, lease_key, token))
+        try:
+            if await step.run() is False:
+                return "failed"
+            try:
+                await redis.set(self._marker_key(step), step.fingerprint, ex=self.marker_ttl or None)
+            except Exception as e:
+                logger.warning(f"Could not record startup marker for {step.name}: {e}")
+            return "ok"
+        finally:
+            heartbeat.cancel()
+            try:
+                await redis.eval(RELEASE_LEASE_SCRIPT, 1, lease_key, token)
+            except Exception as e:
+                logger.debug(f"Startup lease release failed for {step.name}: {e}")
+
+    async def _renew_lease(self, step: StartupStep, redis: Any, lease_key: str, token: str) -> None:
+        ttl_ms = math.ceil(self.lease_ttl * 1000)
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                if not await redis.eval(RENEW_LEASE_SCRIPT, 1, lease_key, token, ttl_ms):
+                    logger.warning(f"Startup lease for {step.name} was lost")
+                    return
+            except Exception as e:
+                logger.debug(f"Startup lease renewal failed for {step.name}: {e}")
+
+    def _marker_key(self, step: StartupStep) -> str:
+        return f"{self.key_prefix}{step.marker}"
+
+    async def _wait_for_turn(
+        self, step: StartupStep, redis: Any
+    ) -> Optional[Tuple[str, str]]:
+        """The (lease key, token) to run the step under, or None once the marker matches"""
+        marker_key = self._marker_key(step)
+        lease_key = f"{marker_key}:leader"
+        fingerprint = step.fingerprint.encode()
+
+        while True:
+            if await redis.get(marker_key) == fingerprint:
+                return None
+            token = uuid.uuid4().hex
+            # Renewed while the step runs; if the leader dies another worker takes over
+            if await redis.set(lease_key, token, nx=True, px=math.ceil(self.lease_ttl * 1000)):
+                return lease_key, token
+            await asyncio.sleep(self.poll_interval)
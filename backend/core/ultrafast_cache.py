@@ -9,13 +9,19 @@ import time
 import hashlib
 import pickle
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Union, Callable
+from typing import Any, Dict, Iterable, Optional, Union, Callable
 from functools import wraps
 import logging
 
 import redis.asyncio as aioredis
-from cachetools import TTLCache, LRUCache
 import msgpack
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core.cache_invalidation import invalidation_bus
+from core.cache_manager import cache_manager
+from core.cache_stampede import stampede_guard
+from core.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,18 +38,22 @@ class UltraFastCache:
     def __init__(self):
         # L0 Cache: Pre-compiled responses for ultra-common endpoints
         self.l0_precompiled = {}  # Instant responses
+        # Same responses as serialized, pre-compressed bytes with ETags
+        self.l0_responses = ResponseCache()
         
-        # L1 Cache: Hot data in memory (10,000 items, no TTL - manual invalidation)
-        self.l1_hot_cache = LRUCache(maxsize=10000)
-        
-        # L1 Cache: Fast TTL cache for session data (5,000 items, 5 min TTL)
-        self.l1_session_cache = TTLCache(maxsize=5000, ttl=300)
-        
-        # L1 Cache: Query result cache (20,000 items, 10 min TTL)
-        self.l1_query_cache = TTLCache(maxsize=20000, ttl=600)
-        
-        # Redis connection for L2 cache
-        self.redis_client: Optional[aioredis.Redis] = None
+        # L1 tiers are cache manager namespaces (policies in DEFAULT_POLICIES):
+        # hot (10,000 items), session (5,000 items, 5 min) and query
+        # (20,000 items, 10 min). All share one Redis pool and serializer format.
+        self.namespaces = {
+            cache_type: cache_manager.namespace(f"ultrafast:{cache_type}")
+            for cache_type in ("hot", "session", "query")
+        }
+        self.l1_hot_cache = self.namespaces["hot"].l1
+        self.l1_session_cache = self.namespaces["session"].l1
+        self.l1_query_cache = self.namespaces["query"].l1
+
+        # Entries written before the shared envelope are raw msgpack
+        self.serializer = self.namespaces["hot"].serializer
         
         # Performance tracking
         self.stats = {
@@ -58,25 +68,15 @@ class UltraFastCache:
         
         # Background tasks
         self.background_tasks = set()
+
+    @property
+    def redis_client(self) -> Optional[aioredis.Redis]:
+        return cache_manager.redis_client
         
     async def init_redis(self):
-        """Initialize Redis with optimized settings for speed"""
-        try:
-            self.redis_client = aioredis.from_url(
-                "redis://localhost:6379",
-                encoding="utf-8",
-                decode_responses=False,  # Use binary for faster serialization
-                max_connections=50,      # Increased connection pool
-                retry_on_timeout=True,
-                socket_keepalive=True,
-                socket_keepalive_options={},
-                health_check_interval=30
-            )
-            await self.redis_client.ping()
-            logger.info("Ultra-fast Redis cache initialized with optimized settings")
-        except Exception as e:
-            logger.warning(f"Redis unavailable for ultra-fast caching: {e}")
-            self.redis_client = None
+        """Initialize the shared binary Redis pool"""
+        if await cache_manager.init():
+            logger.info("Ultra-fast Redis cache initialized on the shared cache pool")
     
     def precompile_common_responses(self):
         """Pre-compile responses for ultra-common endpoints"""
@@ -105,6 +105,9 @@ class UltraFastCache:
             "target_response_time": "< 1ms"
         }
         
+        for path, data in self.l0_precompiled.items():
+            self.l0_responses.put(path, data)
+        
         logger.info(f"Pre-compiled {len(self.l0_precompiled)} common responses")
     
     def _generate_fast_key(self, endpoint: str, params: dict = None) -> str:
@@ -132,19 +135,31 @@ class UltraFastCache:
         
         return None
     
+    def get_precompiled_response(
+        self,
+        endpoint: str,
+        request: Request,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[Response]:
+        """Pre-compiled response bytes (L0), honouring If-None-Match and Accept-Encoding"""
+        start_time = time.perf_counter()
+        response = self.l0_responses.respond(endpoint, request, extra_headers)
+        if response is None:
+            return None
+        
+        self.stats['l0_hits'] += 1
+        self.stats['total_requests'] += 1
+        if (time.perf_counter() - start_time) * 1000 < 1.0:
+            self.stats['sub_1ms_responses'] += 1
+        return response
+    
     async def get_fast(self, key: str, cache_type: str = "hot") -> Optional[Any]:
         """Get from appropriate L1 cache with sub-millisecond access"""
         start_time = time.perf_counter()
         
         try:
-            if cache_type == "hot":
-                result = self.l1_hot_cache.get(key)
-            elif cache_type == "session":
-                result = self.l1_session_cache.get(key)
-            elif cache_type == "query":
-                result = self.l1_query_cache.get(key)
-            else:
-                result = None
+            namespace = self.namespaces.get(cache_type)
+            result = namespace.l1.get(key) if namespace else None
             
             if result is not None:
                 self.stats['l1_hits'] += 1
@@ -165,17 +180,14 @@ class UltraFastCache:
     async def set_fast(self, key: str, value: Any, cache_type: str = "hot", ttl: int = None):
         """Set in appropriate L1 cache"""
         try:
-            if cache_type == "hot":
-                self.l1_hot_cache[key] = value
-            elif cache_type == "session":
-                self.l1_session_cache[key] = value
-            elif cache_type == "query":
-                self.l1_query_cache[key] = value
+            namespace = self.namespaces.get(cache_type)
+            if namespace:
+                namespace.l1.set(key, value, ttl)
                 
         except Exception as e:
             logger.error(f"L1 cache set error: {e}")
     
-    async def get_redis(self, key: str) -> Optional[Any]:
+    async def get_redis(self, key: str, cache_type: str = "hot") -> Optional[Any]:
         """Get from Redis (L2 cache) with fast binary serialization"""
         if not self.redis_client:
             return None
@@ -184,9 +196,11 @@ class UltraFastCache:
         
         try:
             result_bytes = await self.redis_client.get(key)
+            self.namespaces.get(cache_type, self.namespaces["hot"]).observe_redis(
+                "get", start_time, len(result_bytes) if result_bytes else None
+            )
             if result_bytes:
-                # Use msgpack for faster deserialization
-                result = msgpack.unpackb(result_bytes, raw=False)
+                result = self.serializer.loads(result_bytes)
                 
                 self.stats['l2_hits'] += 1
                 self.stats['total_requests'] += 1
@@ -203,45 +217,79 @@ class UltraFastCache:
             logger.error(f"Redis get error: {e}")
             return None
     
-    async def set_redis(self, key: str, value: Any, ttl: int = 3600):
+    async def set_redis(self, key: str, value: Any, ttl: int = 3600, cache_type: str = "hot"):
         """Set in Redis with fast binary serialization"""
         if not self.redis_client:
             return
             
         try:
-            # Use msgpack for faster serialization
-            value_bytes = msgpack.packb(value, use_bin_type=True)
+            value_bytes = self.serializer.dumps(value)
+            start_time = time.perf_counter()
             await self.redis_client.setex(key, ttl, value_bytes)
+            self.namespaces.get(cache_type, self.namespaces["hot"]).observe_redis(
+                "set", start_time, len(value_bytes)
+            )
             
         except Exception as e:
             logger.error(f"Redis set error: {e}")
     
     async def get_multilevel(self, key: str, cache_type: str = "hot") -> Optional[Any]:
         """Get from multiple cache levels with fallback"""
+        start_time = time.perf_counter()
+        namespace = self.namespaces.get(cache_type, self.namespaces["hot"])
+        
         # Try L1 first (fastest)
         result = await self.get_fast(key, cache_type)
         if result is not None:
+            namespace.observe_lookup("l1_hit", start_time)
             return result
         
         # Try L2 (Redis) 
-        result = await self.get_redis(key)
+        result = await self.get_redis(key, cache_type)
         if result is not None:
             # Promote to L1 for next time
             await self.set_fast(key, result, cache_type)
+            namespace.observe_lookup("l2_hit", start_time)
             return result
         
         # Cache miss
         self.stats['misses'] += 1
         self.stats['total_requests'] += 1
+        namespace.observe_lookup("miss", start_time)
         return None
     
     async def set_multilevel(self, key: str, value: Any, cache_type: str = "hot", ttl: int = 3600):
         """Set in multiple cache levels"""
-        # Set in L1 cache
-        await self.set_fast(key, value, cache_type)
+        # Set in L1 cache (never outliving the Redis copy)
+        await self.set_fast(key, value, cache_type, ttl)
         
         # Set in L2 cache (Redis)
-        await self.set_redis(key, value, ttl)
+        await self.set_redis(key, value, ttl, cache_type)
+
+        # Stale L1 copies in other workers re-read the new value from Redis
+        invalidation_bus.publish(keys=[key])
+
+    async def delete_multilevel(self, key: str):
+        """Delete from every cache level in this and all other workers"""
+        self.invalidate_local(keys=[key])
+        invalidation_bus.publish(keys=[key])
+
+        if self.redis_client:
+            try:
+                await self.redis_client.delete(key)
+            except Exception as e:
+                logger.error(f"Redis delete error: {e}")
+
+    def invalidate_local(
+        self,
+        keys: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        clear_all: bool = False,
+    ):
+        """Apply an invalidation to the L1 tiers"""
+        for namespace in self.namespaces.values():
+            namespace.invalidate_local(keys, patterns, tags, clear_all)
     
     def warm_common_data(self):
         """Pre-warm cache with common data patterns"""
@@ -260,6 +308,9 @@ class UltraFastCache:
         }
         
         for key, value in common_responses.items():
+            # Already restored from the L1 snapshot
+            if key in self.l1_hot_cache:
+                continue
             asyncio.create_task(self.set_multilevel(key, value))
     
     def get_performance_stats(self) -> dict:
@@ -281,6 +332,7 @@ class UltraFastCache:
             'l2_hit_rate_percent': round(l2_hit_rate, 2),
             'miss_rate_percent': round(miss_rate, 2),
             'sub_1ms_rate_percent': round(sub_1ms_rate, 2),
+            'l0_responses': self.l0_responses.get_stats(),
             'cache_levels': {
                 'L0': f"Pre-compiled ({self.stats['l0_hits']} hits)",
                 'L1': f"Memory ({self.stats['l1_hits']} hits)", 
@@ -293,14 +345,26 @@ class UltraFastCache:
 ultrafast_cache = UltraFastCache()
 
 
-def ultra_cache(cache_type: str = "hot", ttl: int = 3600, use_precompiled: bool = True):
+def ultra_cache(
+    cache_type: str = "hot",
+    ttl: int = 3600,
+    use_precompiled: bool = True,
+    stale_ttl: int = 0,
+    refresh_beta: float = 0.0,
+):
     """
     Decorator for ultra-fast endpoint caching
     
+    Misses are recomputed once: concurrent callers are coalesced in-process
+    and across workers via a Redis lease.
+    
     Args:
         cache_type: Type of L1 cache to use ("hot", "session", "query")
         ttl: Redis TTL in seconds
         use_precompiled: Whether to check for pre-compiled responses first
+        stale_ttl: Seconds an expired result may still be served while it
+            is refreshed in the background (0 disables stale-while-revalidate)
+        refresh_beta: Probabilistic early-refresh factor (0 disables, 1 is typical)
     """
     def decorator(func: Callable):
         @wraps(func)
@@ -315,28 +379,38 @@ def ultra_cache(cache_type: str = "hot", ttl: int = 3600, use_precompiled: bool
                 if precompiled:
                     return precompiled
             
-            # Try multi-level cache
-            cached_result = await ultrafast_cache.get_multilevel(cache_key, cache_type)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            start_time = time.perf_counter()
-            result = await func(*args, **kwargs)
-            execution_time = (time.perf_counter() - start_time) * 1000
+            async def compute():
+                start_time = time.perf_counter()
+                result = await func(*args, **kwargs)
+                execution_time = (time.perf_counter() - start_time) * 1000
+                
+                # Add performance metadata
+                if isinstance(result, dict):
+                    result['_cache_info'] = {
+                        'cached': False,
+                        'execution_time_ms': round(execution_time, 3),
+                        'cache_level': 'none'
+                    }
+                return result
             
-            # Add performance metadata
-            if isinstance(result, dict):
-                result['_cache_info'] = {
-                    'cached': False,
-                    'execution_time_ms': round(execution_time, 3),
-                    'cache_level': 'none'
-                }
+            async def load(key):
+                return await ultrafast_cache.get_multilevel(key, cache_type)
             
-            # Cache the result
-            await ultrafast_cache.set_multilevel(cache_key, result, cache_type, ttl)
+            async def store(key, entry, entry_ttl):
+                await ultrafast_cache.set_multilevel(key, entry, cache_type, entry_ttl)
             
-            return result
+            # Multi-level cache lookup, recomputing at most once per key
+            return await stampede_guard.fetch(
+                cache_key,
+                compute,
+                load=load,
+                store=store,
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                beta=refresh_beta,
+                redis_client=ultrafast_cache.redis_client,
+                name=f"{func.__module__}.{func.__qualname__}",
+            )
         
         return wrapper
     return decorator
@@ -8,13 +8,12 @@ import logging
 from typing import Optional, Dict, Any
 from contextlib import asynccontextmanager
 
-import asyncpg
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import StaticPool
-from sqlalchemy import text, event
-from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy import text
 
-from config.database_config import settings
+from config.settings import settings
+from core.engine_registry import engine_registry
+from core.query_profiler import query_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +21,7 @@ logger = logging.getLogger(__name__)
 class UltraFastDatabase:
     """
     Ultra-fast database configuration with:
-    - Large connection pools (100+ connections)
+    - The shared OLTP connection pool (core.engine_registry)
     - Connection pre-warming
     - Prepared statement caching
     - Query optimization
@@ -30,12 +29,11 @@ class UltraFastDatabase:
     """
     
     def __init__(self):
-        self.engine: Optional[Engine] = None
+        self.engine: Optional[AsyncEngine] = None
         self.session_factory: Optional[async_sessionmaker] = None
-        self.connection_pool_size = 100
-        self.max_overflow = 50
-        self.pool_pre_ping = True
-        self.pool_recycle = 3600  # 1 hour
+        pool = engine_registry.config("oltp")
+        self.connection_pool_size = pool.pool_size
+        self.max_overflow = pool.max_overflow
         
         # Performance tracking
         self.query_cache = {}
@@ -48,67 +46,13 @@ class UltraFastDatabase:
         }
     
     async def init_ultrafast_engine(self):
-        """Initialize ultra-fast database engine"""
+        """Attach to the shared OLTP pool and pre-warm it"""
         
-        # Ultra-fast PostgreSQL connection string with optimizations
-        connection_params = {
-            "application_name": "sgpt_ultrafast",
-            "server_settings": {
-                # Connection optimizations
-                "jit": "off",                    # Disable JIT for faster connection
-                "shared_preload_libraries": "",  # Minimal libraries
-                "max_connections": "200",        # Support high concurrency
-                
-                # Query optimizations  
-                "effective_cache_size": "4GB",
-                "shared_buffers": "1GB",
-                "work_mem": "32MB",
-                "maintenance_work_mem": "256MB",
-                
-                # Checkpoint optimizations
-                "checkpoint_segments": "32",
-                "checkpoint_completion_target": "0.9",
-                "wal_buffers": "64MB",
-                
-                # Logging optimizations (disable for speed)
-                "log_statement": "none",
-                "log_duration": "off",
-                "log_min_duration_statement": "-1"
-            }
-        }
-        
-        # Build optimized connection URL
-        base_url = settings.DATABASE_URL
-        
-        self.engine = create_async_engine(
-            base_url,
-            # Connection pool settings for high performance
-            pool_size=self.connection_pool_size,
-            max_overflow=self.max_overflow,
-            pool_pre_ping=self.pool_pre_ping,
-            pool_recycle=self.pool_recycle,
-            
-            # Engine optimizations
-            echo=False,  # Disable SQL logging for speed
-            future=True,
-            
-            # AsyncPG optimizations
-            connect_args={
-                "server_settings": connection_params["server_settings"],
-                "command_timeout": 5.0,      # Fast timeout
-                "prepared_statement_cache_size": 1000,  # Large prepared statement cache
-                "connection_class": asyncpg.Connection,
-            }
-        )
-        
-        # Create optimized session factory
-        self.session_factory = async_sessionmaker(
-            self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False,  # Keep objects usable after commit
-            autoflush=False,         # Manual flushing for control
-            autocommit=False
-        )
+        # Same engine as core.database: a second 100+50 pool per worker only
+        # multiplied server connections. Pool sizing and connection settings
+        # live in core.engine_registry.
+        self.engine = engine_registry.engine("oltp")
+        self.session_factory = engine_registry.sessionmaker("oltp")
         
         logger.info("Ultra-fast database engine initialized")
         
@@ -121,46 +65,25 @@ class UltraFastDatabase:
     async def _prewarm_connections(self):
         """Pre-warm the connection pool for instant access"""
         try:
-            # Create multiple connections to fill the pool
-            connections = []
-            for _ in range(min(10, self.connection_pool_size // 2)):
-                async with self.engine.begin() as conn:
-                    # Execute simple query to initialize connection
-                    await conn.execute(text("SELECT 1"))
-                    connections.append(conn)
-            
-            logger.info(f"Pre-warmed {len(connections)} database connections")
-            
+            opened = await engine_registry.prewarm("oltp")
+            self.connection_stats['total_connections'] = opened
         except Exception as e:
             logger.warning(f"Connection pre-warming failed: {e}")
     
     def _setup_query_optimizations(self):
         """Set up query-level optimizations"""
-        
-        @event.listens_for(self.engine.sync_engine, "before_cursor_execute")
-        def receive_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-            """Track query start time"""
-            context._query_start_time = asyncio.get_event_loop().time()
-        
-        @event.listens_for(self.engine.sync_engine, "after_cursor_execute")
-        def receive_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-            """Track query performance"""
-            if hasattr(context, '_query_start_time'):
-                query_time = asyncio.get_event_loop().time() - context._query_start_time
-                
-                # Update stats
-                if query_time < 0.001:  # Sub-1ms queries
-                    self.connection_stats['fast_queries'] += 1
-                else:
-                    self.connection_stats['slow_queries'] += 1
-                
-                # Update average
-                total_queries = self.connection_stats['fast_queries'] + self.connection_stats['slow_queries']
-                if total_queries > 0:
-                    current_avg = self.connection_stats['avg_query_time']
-                    self.connection_stats['avg_query_time'] = (
-                        (current_avg * (total_queries - 1) + query_time) / total_queries
-                    )
+        # Per-statement timings come from the shared profiler (core.query_profiler)
+        if settings.QUERY_PROFILER_ENABLED:
+            query_profiler.attach()
+    
+    def _refresh_query_stats(self):
+        """Fast/slow counts and average query time from the profiler totals"""
+        totals = query_profiler.totals
+        self.connection_stats['fast_queries'] = totals['under_1ms']
+        self.connection_stats['slow_queries'] = totals['count'] - totals['under_1ms']
+        self.connection_stats['avg_query_time'] = (
+            totals['total'] / totals['count'] if totals['count'] else 0.0
+        )
     
     @asynccontextmanager
     async def get_ultrafast_session(self):
@@ -216,6 +139,7 @@ class UltraFastDatabase:
                 await session.execute(text("SELECT 1"))
             
             response_time = (asyncio.get_event_loop().time() - start_time) * 1000
+            self._refresh_query_stats()
             
             return {
                 "database_healthy": True,
@@ -223,6 +147,7 @@ class UltraFastDatabase:
                 "sub_1ms": response_time < 1.0,
                 "connection_stats": self.connection_stats.copy(),
                 "pool_size": self.connection_pool_size,
+                "pool": engine_registry.pool_metrics().get("oltp", {}),
                 "cache_size": len(self.query_cache)
             }
             
@@ -235,6 +160,7 @@ class UltraFastDatabase:
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get database performance statistics"""
+        self._refresh_query_stats()
         total_queries = self.connection_stats['fast_queries'] + self.connection_stats['slow_queries']
         
         return {
@@ -262,9 +188,9 @@ class UltraFastDatabase:
         }
     
     async def close(self):
-        """Close database connections"""
+        """Release pooled connections (the engine itself is shared and stays usable)"""
         if self.engine:
-            await self.engine.dispose()
+            await engine_registry.dispose("oltp")
             logger.info("Ultra-fast database connections closed")
 
 
@@ -16,6 +16,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response as StarletteResponse
 
 from core.enhanced_cache import cache
+from core.response_cache import content_etag, etag_matches, not_modified
 from prometheus_client import Counter, Histogram
 
 logger = logging.getLogger(__name__)
@@ -36,13 +37,15 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         compress_responses: bool = True,
         min_compression_size: int = 1000,
         monitor_performance: bool = True,
-        cache_control_max_age: int = 300
+        cache_control_max_age: int = 300,
+        max_etag_body_size: int = 512 * 1024
     ):
         super().__init__(app)
         self.compress_responses = compress_responses
         self.min_compression_size = min_compression_size
         self.monitor_performance = monitor_performance
         self.cache_control_max_age = cache_control_max_age
+        self.max_etag_body_size = max_etag_body_size
         
         # Performance tracking
         self.request_times = []
@@ -85,11 +88,9 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         if self._should_cache_response(request, response):
             response.headers["Cache-Control"] = f"max-age={self.cache_control_max_age}, public"
             try:
-                body = getattr(response, "body", None)
-                if isinstance(body, (bytes, bytearray)) and len(body) <= 512 * 1024:
-                    response.headers["ETag"] = f'W/"{len(body):x}-{response.status_code}"'
-            except Exception:
-                pass
+                response = await self._apply_etag(request, response)
+            except Exception as e:
+                logger.debug(f"ETag handling skipped for {request.url.path}: {e}")
         
         # Performance monitoring
         if self.monitor_performance:
@@ -111,6 +112,39 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         
         return response
     
+    async def _apply_etag(self, request: Request, response: Response) -> Response:
+        """
+        Add a content-hash ETag and answer a matching If-None-Match with 304.
+
+        Only responses with a known Content-Length up to ``max_etag_body_size``
+        are buffered for hashing; streams of unknown length pass through.
+        """
+        etag = response.headers.get("etag")
+        body = None
+        if etag is None:
+            length = response.headers.get("content-length")
+            if length is None or int(length) > self.max_etag_body_size:
+                return response
+            body = getattr(response, "body", None)
+            if body is None:
+                body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = content_etag(body)
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            headers = {
+                k: v for k, v in response.headers.items()
+                if k not in ("content-length", "content-type", "content-encoding", "etag")
+            }
+            return not_modified(etag, headers)
+
+        if body is not None and not hasattr(response, "body"):
+            # The body iterator was consumed for hashing; re-wrap the bytes
+            buffered = Response(content=body, status_code=response.status_code, background=response.background)
+            buffered.raw_headers = list(response.raw_headers)
+            response = buffered
+        response.headers["ETag"] = etag
+        return response
+    
     def _should_cache_response(self, request: Request, response: Response) -> bool:
         """Determine if response should be cached"""
         # Cache GET requests with successful status codes
@@ -3,9 +3,12 @@ Comprehensive Rate Limiting Middleware
 Implements consistent rate limiting across all API endpoints with Redis backend
 """
 
+import hashlib
 import logging
+import math
 import time
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
 from typing import Any
 
 from fastapi import Request, Response
@@ -14,7 +17,9 @@ from starlette.responses import JSONResponse
 
 from config.redis_config import get_redis_client
 from config.settings import settings
-from core.rate_limit import get_rate_limiter
+from core.auth_utils import decode_token
+from core.quota_engine import CONCURRENCY, Limit, QuotaDecision, QuotaEngine
+from core.rate_limit import CircuitBreaker, LocalRateLimiter, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +28,15 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
     """
     Production-ready rate limiting middleware with Redis backend
     Supports per-endpoint, per-IP, and per-user rate limiting
+
+    Each request is checked against a tree of limits (global, plan, user,
+    IP, API key, endpoint) by QuotaEngine in one Redis call.
     """
 
     def __init__(self, app):
         super().__init__(app)
         self.rate_limiter = None
+        self.quota_engine: QuotaEngine | None = None
         self.fallback_enabled = True
 
         # Endpoint-specific rate limits (requests per minute)
@@ -71,9 +80,31 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
             "admin": 1000,  # Highest limit for admin users
         }
 
-        # Fallback limits (when Redis is unavailable)
-        self.fallback_limits = {}
+        # Plan-level limits per user by plan code (requests per minute)
+        self.plan_limits = {
+            "basic": 600,
+            "premium": 1800,
+            "deluxe": 6000,
+            "default": 600,
+        }
+
+        # Per API key (X-API-Key) limit (requests per minute)
+        self.api_key_limit = 1200
+
+        # user id -> (expires (monotonic), plan code); LRU-bounded
+        self._plan_codes: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.plan_code_cache_size = 10000
+
+        # Fallback limits (when Redis is unavailable): bounded, LRU-evicted.
+        # The breaker stops every request from waiting on a dead Redis; once
+        # a probe succeeds Redis takes over again and the local state is dropped.
+        self.fallback_limiter = LocalRateLimiter(
+            max_keys=settings.RATE_LIMIT_FALLBACK_MAX_KEYS,
+            max_bytes=settings.RATE_LIMIT_FALLBACK_MAX_BYTES,
+        )
         self.fallback_window = 60  # seconds
+        self.fallback_active = False
+        self.redis_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
 
     async def init_rate_limiter(self):
         """Initialize Redis-based rate limiter"""
@@ -81,6 +112,7 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
             try:
                 redis_client = await get_redis_client()
                 self.rate_limiter = get_rate_limiter(redis_client)
+                self.quota_engine = QuotaEngine(redis_client) if redis_client else None
                 logger.info("Redis-based rate limiter initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize Redis rate limiter: {e}")
@@ -103,6 +135,126 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
 
         return client_ip
 
+    def get_user_id(self, request: Request) -> str | None:
+        """Subject of a valid bearer token, None when anonymous"""
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer "):
+            return None
+        try:
+            subject = decode_token(auth_header[7:]).get("sub")
+        except ValueError:
+            return None
+        return str(subject) if subject else None
+
+    async def get_plan_code(self, user_id: str) -> str:
+        """
+        Plan code of a user. Kept in this worker for RATE_LIMIT_PLAN_CODE_TTL
+        seconds; on a miss it comes from the shared plan cache (see PlanService).
+        """
+        now = time.monotonic()
+        cached = self._plan_codes.get(user_id)
+        if cached is not None and cached[0] > now:
+            self._plan_codes.move_to_end(user_id)
+            return cached[1]
+
+        from core.database import async_session
+        from services.plan_service import PlanService
+
+        try:
+            async with async_session() as db:
+                plan = await PlanService(db).get_user_plan(user_id)
+        except Exception as e:
+            logger.debug(f"Plan lookup for rate limiting failed: {e}")
+            # Not cached: the next request tries again
+            return "default"
+        code = str(plan.code) if plan else "default"
+        self._plan_codes[user_id] = (now + settings.RATE_LIMIT_PLAN_CODE_TTL, code)
+        self._plan_codes.move_to_end(user_id)
+        while len(self._plan_codes) > self.plan_code_cache_size:
+            self._plan_codes.popitem(last=False)
+        return code
+
+    def build_limits(
+        self,
+        request: Request,
+        client_ip: str,
+        endpoint_pattern: str,
+        user_type: str,
+        user_id: str | None,
+        plan_code: str | None,
+    ) -> list[Limit]:
+        """The limit tree for a request, broadest level first"""
+        limits = [
+            Limit("global", "all", settings.GLOBAL_RATE_LIMIT_PER_MINUTE),
+        ]
+        if user_id:
+            limits += [
+                Limit(
+                    "plan",
+                    f"{plan_code}:{user_id}",
+                    self.plan_limits.get(plan_code, self.plan_limits["default"]),
+                ),
+                Limit(
+                    "user",
+                    user_id,
+                    settings.CONCURRENT_REQUESTS_PER_USER,
+                    settings.CONCURRENCY_LEASE_SECONDS,
+                    CONCURRENCY,
+                ),
+            ]
+        limits.append(
+            Limit("ip", client_ip, self.ip_limits.get(user_type, self.ip_limits["default"]))
+        )
+        api_key = request.headers.get("X-API-Key")
+        if api_key:
+            limits.append(
+                Limit("api_key", hashlib.sha256(api_key.encode()).hexdigest()[:32], self.api_key_limit)
+            )
+        limits.append(
+            Limit(
+                "endpoint",
+                f"{client_ip}:{endpoint_pattern}",
+                self.get_rate_limit_for_endpoint(endpoint_pattern, user_type),
+            )
+        )
+        return limits
+
+    async def _evaluate_redis(self, limits: list[Limit]) -> QuotaDecision:
+        if not self.quota_engine:
+            redis_client = await get_redis_client()
+            if redis_client is None:
+                # Counted by the breaker, so reconnects are not tried on every request
+                raise ConnectionError("Redis client unavailable")
+            self.rate_limiter = get_rate_limiter(redis_client)
+            self.quota_engine = QuotaEngine(redis_client)
+        return await self.quota_engine.evaluate(limits)
+
+    async def evaluate_limits(self, limits: list[Limit]) -> QuotaDecision:
+        """One Redis call for the whole tree; in-memory limits while Redis is down"""
+        try:
+            decision = await self.redis_breaker.call(self._evaluate_redis, limits)
+        except Exception as e:
+            if not self.fallback_active:
+                self.fallback_active = True
+                logger.error(f"Redis rate limiting unavailable, using in-memory limits: {e}")
+            return self.evaluate_limits_locally(limits)
+
+        if self.fallback_active:
+            # Redis counts are authoritative again
+            self.fallback_active = False
+            dropped = self.fallback_limiter.clear()
+            logger.info(f"Redis rate limiting recovered; dropped {dropped} in-memory keys")
+        return decision
+
+    def evaluate_limits_locally(self, limits: list[Limit]) -> QuotaDecision:
+        """Per-worker rate limits; concurrency needs shared state and is skipped"""
+        results = [
+            (limit, self.fallback_limiter.check(f"{limit.scope}:{limit.key}", limit.limit, limit.window))
+            for limit in limits
+            if limit.kind != CONCURRENCY and limit.limit > 0
+        ]
+        return QuotaDecision(all(r.allowed for _, r in results), results)
+
     def get_endpoint_pattern(self, path: str) -> str:
         """Map request path to rate limit pattern"""
         # Remove query parameters
@@ -159,17 +311,8 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
             await self.init_rate_limiter()
 
             if self.rate_limiter:
-                allowed, remaining = await self.rate_limiter.is_allowed(
-                    key, limit, window
-                )
-
-                headers = {
-                    "X-RateLimit-Limit": str(limit),
-                    "X-RateLimit-Remaining": str(remaining),
-                    "X-RateLimit-Window": str(window),
-                }
-
-                return allowed, remaining, headers
+                result = await self.rate_limiter.check(key, limit, window)
+                return result.allowed, result.remaining, result.headers(window)
             else:
                 # Fallback to in-memory limiting
                 return await self.check_rate_limit_fallback(key, limit, window)
@@ -182,42 +325,10 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
         self, key: str, limit: int, window: int = 60
     ) -> tuple[bool, int, dict[str, Any]]:
         """Fallback in-memory rate limiting when Redis is unavailable"""
-        current_time = time.time()
-
-        if key not in self.fallback_limits:
-            self.fallback_limits[key] = []
-
-        # Clean old entries
-        self.fallback_limits[key] = [
-            req_time
-            for req_time in self.fallback_limits[key]
-            if current_time - req_time < window
-        ]
-
-        requests = self.fallback_limits[key]
-        remaining = max(0, limit - len(requests))
-
-        if len(requests) < limit:
-            self.fallback_limits[key].append(current_time)
-
-            headers = {
-                "X-RateLimit-Limit": str(limit),
-                "X-RateLimit-Remaining": str(remaining - 1),
-                "X-RateLimit-Window": str(window),
-                "X-RateLimit-Backend": "fallback",
-            }
-
-            return True, remaining - 1, headers
-        else:
-            headers = {
-                "X-RateLimit-Limit": str(limit),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Window": str(window),
-                "X-RateLimit-Backend": "fallback",
-                "Retry-After": str(window),
-            }
-
-            return False, 0, headers
+        result = self.fallback_limiter.check(key, limit, window)
+        headers = result.headers(window)
+        headers["X-RateLimit-Backend"] = "fallback"
+        return result.allowed, result.remaining, headers
 
     async def log_rate_limit_violation(
         self, request: Request, client_ip: str, endpoint: str, limit: int
@@ -265,89 +376,96 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
         client_ip = self.get_client_identifier(request)
         endpoint_pattern = self.get_endpoint_pattern(request.url.path)
         user_type = self.get_user_type(request)
+        user_id = self.get_user_id(request)
+        plan_code = await self.get_plan_code(user_id) if user_id else None
 
-        # Get rate limits
-        endpoint_limit = self.get_rate_limit_for_endpoint(
-            endpoint_pattern, user_type
-        )
-        ip_limit = self.ip_limits.get(user_type, self.ip_limits["default"])
-
-        # Create rate limiting keys
-        endpoint_key = f"endpoint:{client_ip}:{endpoint_pattern}"
-        ip_key = f"ip:{client_ip}"
-
-        # Check endpoint-specific rate limit
-        (
-            endpoint_allowed,
-            endpoint_remaining,
-            endpoint_headers,
-        ) = await self.check_rate_limit_redis(endpoint_key, endpoint_limit)
-
-        # Check IP-based rate limit
-        (
-            ip_allowed,
-            ip_remaining,
-            ip_headers,
-        ) = await self.check_rate_limit_redis(ip_key, ip_limit)
-
-        # Determine if request should be allowed
-        if not endpoint_allowed:
-            await self.log_rate_limit_violation(
-                request, client_ip, endpoint_pattern, endpoint_limit
-            )
-
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "error": "Rate limit exceeded",
-                    "message": f"Too many requests to {endpoint_pattern}",
-                    "limit": endpoint_limit,
-                    "window": 60,
-                    "retry_after": 60,
-                },
-                headers=endpoint_headers,
+        decision = await self.evaluate_limits(
+            self.build_limits(
+                request, client_ip, endpoint_pattern, user_type, user_id, plan_code
             )
+        )
 
-        if not ip_allowed:
+        denied = decision.denied
+        if denied:
+            limit, result = denied
             await self.log_rate_limit_violation(
-                request, client_ip, "ip_limit", ip_limit
+                request,
+                client_ip,
+                endpoint_pattern if limit.scope == "endpoint" else f"{limit.scope}_limit",
+                limit.limit,
             )
 
+            messages = {
+                "endpoint": f"Too many requests to {endpoint_pattern}",
+                "ip": "Too many requests from your IP address",
+                "user": "Too many concurrent requests",
+            }
             return JSONResponse(
                 status_code=429,
                 content={
                     "error": "Rate limit exceeded",
-                    "message": "Too many requests from your IP address",
-                    "limit": ip_limit,
-                    "window": 60,
-                    "retry_after": 60,
+                    "message": messages.get(limit.scope, f"{limit.scope.replace('_', ' ').capitalize()} rate limit exceeded"),
+                    "scope": limit.scope,
+                    "limit": limit.limit,
+                    "window": limit.window,
+                    "retry_after": max(1, math.ceil(result.retry_after)),
                 },
-                headers=ip_headers,
+                headers=result.headers(limit.window),
             )
 
-        # Process request
-        response = await call_next(request)
+        # Process request; the concurrency slot is held until the body is sent
+        try:
+            response = await call_next(request)
+        except BaseException:
+            if decision.lease:
+                await self.quota_engine.release(decision)
+            raise
+        if decision.lease:
+            response.body_iterator = self._release_after(response.body_iterator, decision)
 
         # Add rate limit headers to response
-        min_remaining = min(endpoint_remaining, ip_remaining)
-        response.headers.update(
-            {
-                "X-RateLimit-Limit-Endpoint": str(endpoint_limit),
-                "X-RateLimit-Remaining-Endpoint": str(endpoint_remaining),
-                "X-RateLimit-Limit-IP": str(ip_limit),
-                "X-RateLimit-Remaining-IP": str(ip_remaining),
-                "X-RateLimit-Remaining": str(min_remaining),
-            }
-        )
+        headers = {}
+        endpoint_result = decision.result_for("endpoint")
+        if endpoint_result:
+            headers["X-RateLimit-Limit-Endpoint"] = str(endpoint_result.limit)
+            headers["X-RateLimit-Remaining-Endpoint"] = str(endpoint_result.remaining)
+        ip_result = decision.result_for("ip")
+        if ip_result:
+            headers["X-RateLimit-Limit-IP"] = str(ip_result.limit)
+            headers["X-RateLimit-Remaining-IP"] = str(ip_result.remaining)
+        tightest = decision.tightest
+        if tightest:
+            limit, result = tightest
+            headers.update({
+                "X-RateLimit-Limit": str(result.limit),
+                "X-RateLimit-Remaining": str(result.remaining),
+                "X-RateLimit-Reset": str(max(math.ceil(r.reset_after) for _, r in decision.results)),
+                "X-RateLimit-Scope": limit.scope,
+            })
+        response.headers.update(headers)
 
         return response
 
+    async def _release_after(
+        self, body: AsyncIterator[bytes], decision: QuotaDecision
+    ) -> AsyncIterator[bytes]:
+        """``body``, then the decision's concurrency lease is given back"""
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            await self.quota_engine.release(decision)
+
     def get_stats(self) -> dict[str, Any]:
         """Get rate limiting statistics"""
         return {
             "middleware": "EnhancedRateLimitingMiddleware",
-            "backend": "redis" if self.rate_limiter else "fallback",
+            "backend": "fallback" if self.fallback_active or not self.quota_engine else "redis",
             "endpoint_patterns": len(self.endpoint_limits),
-            "fallback_cache_size": len(self.fallback_limits),
+            "fallback_cache_size": len(self.fallback_limiter),
+            "fallback_cache_bytes": self.fallback_limiter.bytes,
+            "fallback_evictions": self.fallback_limiter.evictions,
+            "redis_breaker": self.redis_breaker.state,
             "ip_limit_tiers": len(self.ip_limits),
+            "plan_limit_tiers": len(self.plan_limits),
         }
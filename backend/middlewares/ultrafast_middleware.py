@@ -71,16 +71,16 @@ class UltraFastMiddleware(BaseHTTPMiddleware):
         start_time = time.perf_counter()
         
         # Pre-compile response check for hot paths
-        if self.enable_precompiled and request.url.path in self.hot_paths:
-            precompiled = ultrafast_cache.get_precompiled(request.url.path)
-            if precompiled:
+        if self.enable_precompiled and request.method in ("GET", "HEAD") and request.url.path in self.hot_paths:
+            # Stored bytes: no serialization or compression on the hit path
+            headers = await self._get_performance_headers(start_time)
+            headers["X-Cache-Level"] = "L0_precompiled"
+            response = ultrafast_cache.get_precompiled_response(request.url.path, request, headers)
+            if response is not None:
                 response_time = (time.perf_counter() - start_time) * 1000
-                return await self._create_optimized_response(
-                    precompiled, 
-                    request, 
-                    response_time,
-                    cache_level="L0_precompiled"
-                )
+                response.headers["X-Response-Time-Ms"] = str(round(response_time, 4))
+                await self._track_performance(response_time)
+                return response
         
         # Add ultra-fast headers to request
         request.state.start_time = start_time
@@ -0,0 +1,2423 @@
+-- schema-hash: 16b48e1ccae40536
+-- Generated by utils/schema_snapshot.py; do not edit.
+
+CREATE TABLE login_activity (
+	id VARCHAR NOT NULL, 
+	user_id VARCHAR, 
+	fingerprint VARCHAR(255), 
+	success BOOLEAN, 
+	ip_address VARCHAR(45), 
+	user_agent TEXT, 
+	location VARCHAR(255), 
+	device_type VARCHAR(50), 
+	browser VARCHAR(100), 
+	os VARCHAR(100), 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE users (
+	id VARCHAR(36) NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	username VARCHAR(255), 
+	password_hash TEXT NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	is_admin BOOLEAN NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_users_username ON users (username);
+
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+
+CREATE INDEX ix_users_id ON users (id);
+
+CREATE TABLE thread_pools (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	max_workers INTEGER, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE domains (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	is_verified BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (name)
+);
+
+CREATE TABLE chat_templates (
+	id INTEGER NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	category VARCHAR(50) NOT NULL, 
+	trigger_keywords JSON, 
+	title VARCHAR(255) NOT NULL, 
+	content TEXT NOT NULL, 
+	variables JSON, 
+	user_plans JSON, 
+	page_urls JSON, 
+	is_active BOOLEAN, 
+	sort_order INTEGER, 
+	usage_count INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE chat_analytics (
+	id INTEGER NOT NULL, 
+	date DATETIME NOT NULL, 
+	period_type VARCHAR(20), 
+	total_chats INTEGER, 
+	resolved_chats INTEGER, 
+	escalated_chats INTEGER, 
+	abandoned_chats INTEGER, 
+	avg_response_time INTEGER, 
+	avg_resolution_time INTEGER, 
+	bot_response_rate INTEGER, 
+	bot_success_rate INTEGER, 
+	new_users INTEGER, 
+	returning_users INTEGER, 
+	guest_users INTEGER, 
+	plan_breakdown JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE system_smtp_config (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	smtp_host VARCHAR(255) NOT NULL, 
+	smtp_port INTEGER NOT NULL, 
+	smtp_username VARCHAR(255) NOT NULL, 
+	smtp_password TEXT NOT NULL, 
+	use_tls BOOLEAN NOT NULL, 
+	use_ssl BOOLEAN NOT NULL, 
+	from_email VARCHAR(255) NOT NULL, 
+	from_name VARCHAR(100), 
+	is_active BOOLEAN NOT NULL, 
+	is_verified BOOLEAN NOT NULL, 
+	last_verified_at DATETIME, 
+	daily_limit INTEGER NOT NULL, 
+	emails_sent_today INTEGER NOT NULL, 
+	last_reset_date DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	reply_to_email VARCHAR(255), 
+	custom_headers TEXT, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_system_smtp_config_id ON system_smtp_config (id);
+
+CREATE TABLE plans (
+	id INTEGER NOT NULL, 
+	name VARCHAR(50) NOT NULL, 
+	code VARCHAR(20) NOT NULL, 
+	price_per_month FLOAT, 
+	features JSON, 
+	is_active BOOLEAN, 
+	is_trial_plan BOOLEAN, 
+	trial_duration_minutes INTEGER, 
+	trial_price_usd FLOAT, 
+	trial_price_btc VARCHAR(20), 
+	trial_min_threads INTEGER, 
+	trial_max_extensions INTEGER, 
+	trial_extension_minutes INTEGER, 
+	max_threads INTEGER, 
+	max_concurrent_campaigns INTEGER, 
+	max_ai_calls_daily INTEGER, 
+	max_ai_tokens_monthly BIGINT, 
+	allowed_ai_models JSON, 
+	allowed_functions JSON, 
+	has_premium_support BOOLEAN, 
+	update_frequency VARCHAR(20), 
+	duration_days INTEGER, 
+	max_workspaces INTEGER, 
+	max_concurrent_sessions INTEGER, 
+	database_tier_label VARCHAR(20), 
+	marketing_blurb TEXT, 
+	sort_order INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (name), 
+	UNIQUE (code)
+);
+
+CREATE TABLE plan_status (
+	id INTEGER NOT NULL, 
+	plan_code VARCHAR(20) NOT NULL, 
+	total_seats INTEGER, 
+	sold_seats INTEGER, 
+	is_active BOOLEAN, 
+	last_updated DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (plan_code)
+);
+
+CREATE TABLE trial_configurations (
+	id INTEGER NOT NULL, 
+	config_name VARCHAR(50) NOT NULL, 
+	is_active BOOLEAN, 
+	duration_minutes INTEGER, 
+	min_threads INTEGER, 
+	max_threads INTEGER, 
+	max_campaigns INTEGER, 
+	price_usd FLOAT, 
+	price_btc VARCHAR(20), 
+	max_extensions INTEGER, 
+	extension_minutes INTEGER, 
+	extension_price_usd FLOAT, 
+	allowed_features JSON, 
+	created_by_admin_id VARCHAR(36), 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (config_name)
+);
+
+CREATE TABLE debug_client_events (
+	id VARCHAR(36) NOT NULL, 
+	trace_id VARCHAR(255) NOT NULL, 
+	event_type VARCHAR(100) NOT NULL, 
+	user_agent TEXT, 
+	url TEXT, 
+	ip_address VARCHAR(45), 
+	data JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_debug_client_events_event_type ON debug_client_events (event_type);
+
+CREATE INDEX ix_debug_client_events_trace_id ON debug_client_events (trace_id);
+
+CREATE TABLE imap_test_metrics (
+	id INTEGER NOT NULL, 
+	test_id VARCHAR(255) NOT NULL, 
+	state VARCHAR(50) NOT NULL, 
+	start_time DATETIME, 
+	stop_time DATETIME, 
+	attempts INTEGER NOT NULL, 
+	successes INTEGER NOT NULL, 
+	failures INTEGER NOT NULL, 
+	total_latency_ms FLOAT NOT NULL, 
+	avg_latency_ms FLOAT NOT NULL, 
+	min_latency_ms FLOAT, 
+	max_latency_ms FLOAT, 
+	stop_reason VARCHAR(255), 
+	error_rate FLOAT NOT NULL, 
+	success_rate FLOAT NOT NULL, 
+	server VARCHAR(255), 
+	port INTEGER, 
+	email VARCHAR(255), 
+	created_at DATETIME NOT NULL, 
+	updated_at DATETIME NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_imap_test_metrics_test_id ON imap_test_metrics (test_id);
+
+CREATE INDEX ix_imap_test_metrics_id ON imap_test_metrics (id);
+
+CREATE TABLE imap_test_configs (
+	id INTEGER NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	server VARCHAR(255) NOT NULL, 
+	port INTEGER NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	password VARCHAR(255) NOT NULL, 
+	max_duration_seconds INTEGER NOT NULL, 
+	max_attempts INTEGER NOT NULL, 
+	max_error_rate FLOAT NOT NULL, 
+	min_success_rate FLOAT NOT NULL, 
+	interval_seconds FLOAT NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	created_at DATETIME NOT NULL, 
+	updated_at DATETIME NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_imap_test_configs_id ON imap_test_configs (id);
+
+CREATE TABLE socks_connection_logs (
+	id INTEGER NOT NULL, 
+	timestamp DATETIME NOT NULL, 
+	latency FLOAT, 
+	success BOOLEAN NOT NULL, 
+	error TEXT, 
+	created_at DATETIME NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_socks_connection_logs_id ON socks_connection_logs (id);
+
+CREATE TABLE socks_test_metrics (
+	id INTEGER NOT NULL, 
+	test_id VARCHAR(255) NOT NULL, 
+	state VARCHAR(50) NOT NULL, 
+	start_time DATETIME, 
+	stop_time DATETIME, 
+	attempts INTEGER NOT NULL, 
+	successes INTEGER NOT NULL, 
+	failures INTEGER NOT NULL, 
+	total_latency_ms FLOAT NOT NULL, 
+	avg_latency_ms FLOAT NOT NULL, 
+	min_latency_ms FLOAT, 
+	max_latency_ms FLOAT, 
+	stop_reason VARCHAR(255), 
+	error_rate FLOAT NOT NULL, 
+	success_rate FLOAT NOT NULL, 
+	proxy_host VARCHAR(255), 
+	proxy_port INTEGER, 
+	target_host VARCHAR(255), 
+	target_port INTEGER, 
+	created_at DATETIME NOT NULL, 
+	updated_at DATETIME NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_socks_test_metrics_id ON socks_test_metrics (id);
+
+CREATE UNIQUE INDEX ix_socks_test_metrics_test_id ON socks_test_metrics (test_id);
+
+CREATE TABLE socks_test_configs (
+	id INTEGER NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	proxy_host VARCHAR(255) NOT NULL, 
+	proxy_port INTEGER NOT NULL, 
+	target_host VARCHAR(255) NOT NULL, 
+	target_port INTEGER NOT NULL, 
+	max_duration_seconds INTEGER NOT NULL, 
+	max_attempts INTEGER NOT NULL, 
+	max_error_rate FLOAT NOT NULL, 
+	min_success_rate FLOAT NOT NULL, 
+	interval_seconds FLOAT NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	created_at DATETIME NOT NULL, 
+	updated_at DATETIME NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_socks_test_configs_id ON socks_test_configs (id);
+
+CREATE TABLE bounce_rules (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	description TEXT, 
+	is_active BOOLEAN NOT NULL, 
+	smtp_code_pattern VARCHAR(50), 
+	message_pattern VARCHAR(255), 
+	domain_pattern VARCHAR(255), 
+	bounce_type VARCHAR(20) NOT NULL, 
+	bounce_reason VARCHAR(50), 
+	auto_suppress BOOLEAN NOT NULL, 
+	suppress_after_count INTEGER, 
+	suppression_duration_days INTEGER, 
+	priority INTEGER NOT NULL, 
+	rule_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_bounce_rules_id ON bounce_rules (id);
+
+CREATE TABLE email_preferences (
+	id VARCHAR(36) NOT NULL, 
+	email_address VARCHAR(255) NOT NULL, 
+	domain VARCHAR(255) NOT NULL, 
+	is_subscribed BOOLEAN NOT NULL, 
+	is_suppressed BOOLEAN NOT NULL, 
+	consent_preferences JSON, 
+	max_emails_per_week INTEGER, 
+	preferred_send_time VARCHAR(20), 
+	preferred_send_days JSON, 
+	language_preference VARCHAR(10), 
+	timezone VARCHAR(50), 
+	allow_tracking BOOLEAN NOT NULL, 
+	allow_personalization BOOLEAN NOT NULL, 
+	last_engagement_date DATETIME, 
+	engagement_score INTEGER NOT NULL, 
+	subscription_source VARCHAR(100), 
+	subscription_date DATETIME, 
+	custom_fields JSON, 
+	notes TEXT, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_email_preferences_id ON email_preferences (id);
+
+CREATE UNIQUE INDEX ix_email_preferences_email_address ON email_preferences (email_address);
+
+CREATE INDEX ix_email_preferences_domain ON email_preferences (domain);
+
+CREATE TABLE preference_centers (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	is_default BOOLEAN NOT NULL, 
+	title VARCHAR(200), 
+	description TEXT, 
+	brand_color VARCHAR(7), 
+	logo_url VARCHAR(500), 
+	available_consent_types JSON, 
+	allow_frequency_control BOOLEAN NOT NULL, 
+	allow_time_preferences BOOLEAN NOT NULL, 
+	allow_complete_unsubscribe BOOLEAN NOT NULL, 
+	custom_questions JSON, 
+	privacy_policy_url VARCHAR(500), 
+	terms_url VARCHAR(500), 
+	company_address TEXT, 
+	config JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_preference_centers_id ON preference_centers (id);
+
+CREATE TABLE unsubscribe_reason_categories (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	display_name VARCHAR(200) NOT NULL, 
+	description TEXT, 
+	sort_order INTEGER NOT NULL, 
+	category_group VARCHAR(50), 
+	is_active BOOLEAN NOT NULL, 
+	usage_count INTEGER NOT NULL, 
+	requires_text_input BOOLEAN NOT NULL, 
+	is_feedback_request BOOLEAN NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (name)
+);
+
+CREATE INDEX ix_unsubscribe_reason_categories_id ON unsubscribe_reason_categories (id);
+
+CREATE TABLE global_suppression_list (
+	id VARCHAR(36) NOT NULL, 
+	email_address VARCHAR(255) NOT NULL, 
+	domain VARCHAR(255) NOT NULL, 
+	reason VARCHAR(50) NOT NULL, 
+	source_type VARCHAR(50) NOT NULL, 
+	source_id UUID, 
+	is_active BOOLEAN NOT NULL, 
+	notes TEXT, 
+	list_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_global_suppression_list_domain ON global_suppression_list (domain);
+
+CREATE UNIQUE INDEX ix_global_suppression_list_email_address ON global_suppression_list (email_address);
+
+CREATE INDEX ix_global_suppression_list_id ON global_suppression_list (id);
+
+CREATE TABLE automation_workflows (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(200) NOT NULL, 
+	description TEXT, 
+	trigger_type VARCHAR(30) NOT NULL, 
+	trigger_config JSON NOT NULL, 
+	status VARCHAR(20) NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	max_executions INTEGER, 
+	execution_window_start VARCHAR(5), 
+	execution_window_end VARCHAR(5), 
+	timezone VARCHAR(50) NOT NULL, 
+	target_segments JSON, 
+	exclusion_criteria JSON, 
+	total_entries INTEGER NOT NULL, 
+	completed_executions INTEGER NOT NULL, 
+	failed_executions INTEGER NOT NULL, 
+	last_executed_at DATETIME, 
+	next_execution_at DATETIME, 
+	tags JSON, 
+	workflow_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_automation_workflows_id ON automation_workflows (id);
+
+CREATE TABLE automation_templates (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(200) NOT NULL, 
+	description TEXT, 
+	category VARCHAR(50) NOT NULL, 
+	workflow_config JSON NOT NULL, 
+	actions_config JSON NOT NULL, 
+	tags JSON, 
+	difficulty_level VARCHAR(20) NOT NULL, 
+	estimated_setup_time INTEGER, 
+	usage_count INTEGER NOT NULL, 
+	rating FLOAT, 
+	is_active BOOLEAN NOT NULL, 
+	is_featured BOOLEAN NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_automation_templates_id ON automation_templates (id);
+
+CREATE TABLE contact_journeys (
+	id VARCHAR(36) NOT NULL, 
+	contact_email VARCHAR(255) NOT NULL, 
+	journey_stage VARCHAR(50) NOT NULL, 
+	engagement_score INTEGER NOT NULL, 
+	active_workflows JSON, 
+	completed_workflows JSON, 
+	total_emails_received INTEGER NOT NULL, 
+	total_emails_opened INTEGER NOT NULL, 
+	total_emails_clicked INTEGER NOT NULL, 
+	last_engagement_date DATETIME, 
+	first_engagement_date DATETIME, 
+	preferred_content_type VARCHAR(50), 
+	segments JSON, 
+	tags JSON, 
+	custom_fields JSON, 
+	best_send_time VARCHAR(5), 
+	best_send_day VARCHAR(10), 
+	timezone VARCHAR(50), 
+	lifecycle_stage VARCHAR(50), 
+	conversion_events JSON, 
+	revenue_attributed FLOAT NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_contact_journeys_contact_email ON contact_journeys (contact_email);
+
+CREATE INDEX ix_contact_journeys_id ON contact_journeys (id);
+
+CREATE TABLE bulk_check_jobs (
+	id INTEGER NOT NULL, 
+	session_id VARCHAR(255) NOT NULL, 
+	celery_task_id VARCHAR(255) NOT NULL, 
+	job_type VARCHAR(20) NOT NULL, 
+	status VARCHAR(20), 
+	total_combos INTEGER NOT NULL, 
+	max_threads INTEGER, 
+	timeout_seconds INTEGER, 
+	proxy_enabled BOOLEAN, 
+	inbox_test_enabled BOOLEAN, 
+	started_at DATETIME, 
+	completed_at DATETIME, 
+	execution_duration FLOAT, 
+	valid_count INTEGER, 
+	invalid_count INTEGER, 
+	error_count INTEGER, 
+	success_rate FLOAT, 
+	average_speed FLOAT, 
+	performance_tier VARCHAR(20), 
+	total_errors INTEGER, 
+	auth_errors INTEGER, 
+	connection_errors INTEGER, 
+	timeout_errors INTEGER, 
+	proxy_errors INTEGER, 
+	proxies_used INTEGER, 
+	proxy_success_rate FLOAT, 
+	config_snapshot JSON, 
+	error_samples JSON, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_bulk_check_jobs_celery_task_id ON bulk_check_jobs (celery_task_id);
+
+CREATE INDEX idx_bulk_jobs_status_created ON bulk_check_jobs (status, created_at);
+
+CREATE INDEX ix_bulk_check_jobs_session_id ON bulk_check_jobs (session_id);
+
+CREATE INDEX idx_bulk_jobs_performance ON bulk_check_jobs (performance_tier, success_rate);
+
+CREATE INDEX ix_bulk_check_jobs_id ON bulk_check_jobs (id);
+
+CREATE INDEX idx_bulk_jobs_session_type ON bulk_check_jobs (session_id, job_type);
+
+CREATE TABLE bulk_check_performance_snapshots (
+	id INTEGER NOT NULL, 
+	snapshot_time DATETIME NOT NULL, 
+	time_window VARCHAR(10) NOT NULL, 
+	smtp_total_jobs INTEGER, 
+	smtp_successful_jobs INTEGER, 
+	smtp_avg_success_rate FLOAT, 
+	smtp_avg_speed FLOAT, 
+	smtp_total_checks INTEGER, 
+	smtp_valid_checks INTEGER, 
+	imap_total_jobs INTEGER, 
+	imap_successful_jobs INTEGER, 
+	imap_avg_success_rate FLOAT, 
+	imap_avg_speed FLOAT, 
+	imap_total_checks INTEGER, 
+	imap_valid_checks INTEGER, 
+	total_active_sessions INTEGER, 
+	proxy_utilization_rate FLOAT, 
+	avg_job_duration FLOAT, 
+	overall_error_rate FLOAT, 
+	auth_error_rate FLOAT, 
+	connection_error_rate FLOAT, 
+	proxy_error_rate FLOAT, 
+	excellent_jobs_pct FLOAT, 
+	good_jobs_pct FLOAT, 
+	fair_jobs_pct FLOAT, 
+	poor_jobs_pct FLOAT, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX idx_perf_snapshot_time_window ON bulk_check_performance_snapshots (snapshot_time, time_window);
+
+CREATE INDEX ix_bulk_check_performance_snapshots_snapshot_time ON bulk_check_performance_snapshots (snapshot_time);
+
+CREATE INDEX ix_bulk_check_performance_snapshots_id ON bulk_check_performance_snapshots (id);
+
+CREATE TABLE session_analytics (
+	id INTEGER NOT NULL, 
+	session_id VARCHAR(255) NOT NULL, 
+	first_activity DATETIME, 
+	last_activity DATETIME, 
+	total_jobs INTEGER, 
+	successful_jobs INTEGER, 
+	total_checks_performed INTEGER, 
+	total_valid_credentials INTEGER, 
+	total_invalid_credentials INTEGER, 
+	total_errors INTEGER, 
+	best_success_rate FLOAT, 
+	avg_success_rate FLOAT, 
+	best_speed FLOAT, 
+	avg_speed FLOAT, 
+	preferred_job_type VARCHAR(20), 
+	avg_batch_size INTEGER, 
+	proxy_usage_rate FLOAT, 
+	most_active_hour INTEGER, 
+	most_active_day INTEGER, 
+	avg_session_duration FLOAT, 
+	data_quality_score FLOAT, 
+	efficiency_score FLOAT, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_session_analytics_session_id ON session_analytics (session_id);
+
+CREATE INDEX ix_session_analytics_id ON session_analytics (id);
+
+CREATE TABLE error_pattern_analysis (
+	id INTEGER NOT NULL, 
+	analysis_date DATETIME NOT NULL, 
+	error_category VARCHAR(50) NOT NULL, 
+	error_pattern TEXT NOT NULL, 
+	frequency INTEGER, 
+	job_type VARCHAR(20), 
+	session_count INTEGER, 
+	success_rate_impact FLOAT, 
+	speed_impact FLOAT, 
+	suggested_fix TEXT, 
+	confidence_score FLOAT, 
+	is_resolved BOOLEAN, 
+	resolution_date DATETIME, 
+	resolution_notes TEXT, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_error_pattern_analysis_analysis_date ON error_pattern_analysis (analysis_date);
+
+CREATE INDEX ix_error_pattern_analysis_id ON error_pattern_analysis (id);
+
+CREATE TABLE proxy_performance_analytics (
+	id INTEGER NOT NULL, 
+	analysis_date DATETIME NOT NULL, 
+	proxy_host VARCHAR(255) NOT NULL, 
+	proxy_port INTEGER NOT NULL, 
+	proxy_type VARCHAR(20), 
+	total_connections INTEGER, 
+	successful_connections INTEGER, 
+	failed_connections INTEGER, 
+	success_rate FLOAT, 
+	avg_connection_time FLOAT, 
+	avg_response_time FLOAT, 
+	uptime_percentage FLOAT, 
+	estimated_location VARCHAR(100), 
+	network_provider VARCHAR(100), 
+	reliability_score FLOAT, 
+	speed_score FLOAT, 
+	overall_score FLOAT, 
+	recommended_for_job_type VARCHAR(20), 
+	max_concurrent_recommended INTEGER, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_proxy_performance_analytics_id ON proxy_performance_analytics (id);
+
+CREATE INDEX ix_proxy_performance_analytics_analysis_date ON proxy_performance_analytics (analysis_date);
+
+CREATE INDEX idx_proxy_analytics_performance ON proxy_performance_analytics (overall_score, analysis_date);
+
+CREATE INDEX idx_proxy_analytics_host_port ON proxy_performance_analytics (proxy_host, proxy_port);
+
+CREATE TABLE template_block_types (
+	id UUID NOT NULL, 
+	type_name VARCHAR(50) NOT NULL, 
+	display_name VARCHAR(100) NOT NULL, 
+	description TEXT, 
+	category VARCHAR(50) NOT NULL, 
+	default_config JSON NOT NULL, 
+	config_schema JSON NOT NULL, 
+	available_styles JSON NOT NULL, 
+	default_styles JSON NOT NULL, 
+	icon VARCHAR(50), 
+	preview_image TEXT, 
+	thumbnail TEXT, 
+	supports_responsive BOOLEAN, 
+	supports_conditions BOOLEAN, 
+	min_height INTEGER, 
+	max_height INTEGER, 
+	is_active BOOLEAN, 
+	is_premium BOOLEAN, 
+	plan_requirements JSON, 
+	usage_count INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (type_name)
+);
+
+CREATE TABLE template_themes (
+	id UUID NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	description TEXT, 
+	category VARCHAR(50) NOT NULL, 
+	primary_color VARCHAR(20) NOT NULL, 
+	secondary_color VARCHAR(20) NOT NULL, 
+	accent_color VARCHAR(20) NOT NULL, 
+	background_color VARCHAR(20) NOT NULL, 
+	text_color VARCHAR(20) NOT NULL, 
+	heading_font VARCHAR(100) NOT NULL, 
+	body_font VARCHAR(100) NOT NULL, 
+	font_sizes JSON NOT NULL, 
+	button_styles JSON NOT NULL, 
+	link_styles JSON NOT NULL, 
+	border_styles JSON NOT NULL, 
+	spacing_config JSON NOT NULL, 
+	preview_image TEXT, 
+	thumbnail TEXT, 
+	custom_css TEXT, 
+	is_active BOOLEAN, 
+	is_premium BOOLEAN, 
+	is_featured BOOLEAN, 
+	usage_count INTEGER, 
+	rating FLOAT, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE integration_providers (
+	id UUID NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	display_name VARCHAR(100) NOT NULL, 
+	description TEXT, 
+	category VARCHAR(50) NOT NULL, 
+	auth_type VARCHAR(30) NOT NULL, 
+	auth_config JSON NOT NULL, 
+	api_base_url VARCHAR(255), 
+	api_version VARCHAR(20), 
+	supported_actions JSON NOT NULL, 
+	supported_data_types JSON NOT NULL, 
+	webhook_support BOOLEAN, 
+	real_time_sync BOOLEAN, 
+	config_schema JSON NOT NULL, 
+	required_fields JSON NOT NULL, 
+	logo_url VARCHAR(255), 
+	documentation_url VARCHAR(255), 
+	setup_instructions TEXT, 
+	is_active BOOLEAN, 
+	is_premium BOOLEAN, 
+	plan_requirements JSON, 
+	usage_count INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (name)
+);
+
+CREATE TABLE integration_templates (
+	id UUID NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	category VARCHAR(50) NOT NULL, 
+	use_case VARCHAR(100) NOT NULL, 
+	provider_requirements JSON NOT NULL, 
+	field_mappings JSON NOT NULL, 
+	sync_settings JSON NOT NULL, 
+	webhook_events JSON, 
+	difficulty_level VARCHAR(20) NOT NULL, 
+	estimated_setup_time INTEGER, 
+	tags JSON, 
+	icon VARCHAR(255), 
+	documentation_url VARCHAR(255), 
+	tutorial_url VARCHAR(255), 
+	usage_count INTEGER, 
+	rating FLOAT, 
+	is_active BOOLEAN, 
+	is_featured BOOLEAN, 
+	is_premium BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE blacklist_checks (
+	id INTEGER NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	domain VARCHAR(255) NOT NULL, 
+	target VARCHAR(255) NOT NULL, 
+	target_type VARCHAR(50) NOT NULL, 
+	is_blacklisted BOOLEAN, 
+	result VARCHAR(50) NOT NULL, 
+	checked_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	expires_at DATETIME, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_blacklist_checks_id ON blacklist_checks (id);
+
+CREATE TABLE server_performance_logs (
+	id INTEGER NOT NULL, 
+	server VARCHAR(255), 
+	cpu_usage VARCHAR(10), 
+	memory_usage VARCHAR(10), 
+	disk_usage VARCHAR(10), 
+	timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_server_performance_logs_id ON server_performance_logs (id);
+
+CREATE TABLE landing_features (
+	id UUID NOT NULL, 
+	title VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	icon VARCHAR(50), 
+	tech_stack VARCHAR(255), 
+	gradient VARCHAR(100), 
+	animation VARCHAR(50), 
+	is_active BOOLEAN, 
+	order_index INTEGER, 
+	created_at TIMESTAMP, 
+	updated_at TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE landing_pricing (
+	id UUID NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	price VARCHAR(50) NOT NULL, 
+	period VARCHAR(50), 
+	description TEXT, 
+	features JSON, 
+	icon VARCHAR(50), 
+	is_popular BOOLEAN, 
+	badge_text VARCHAR(50), 
+	cta_text VARCHAR(100), 
+	is_active BOOLEAN, 
+	order_index INTEGER, 
+	created_at TIMESTAMP, 
+	updated_at TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE landing_analytics (
+	id UUID NOT NULL, 
+	session_id VARCHAR(255) NOT NULL, 
+	event_type VARCHAR(50) NOT NULL, 
+	event_data JSON, 
+	page_path VARCHAR(255), 
+	referrer TEXT, 
+	user_agent TEXT, 
+	ip_address VARCHAR(45), 
+	country_code VARCHAR(2), 
+	device_type VARCHAR(50), 
+	browser VARCHAR(50), 
+	os VARCHAR(50), 
+	created_at TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE todos (
+	id INTEGER NOT NULL, 
+	title VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	completed BOOLEAN, 
+	user_id VARCHAR(36) NOT NULL, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_todos_id ON todos (id);
+
+CREATE INDEX ix_todos_user_id ON todos (user_id);
+
+CREATE INDEX ix_todos_completed ON todos (completed);
+
+CREATE INDEX ix_todos_title ON todos (title);
+
+CREATE TABLE campaigns (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	status VARCHAR(50) NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	subject VARCHAR(500), 
+	message_type VARCHAR(10), 
+	batch_size INTEGER, 
+	delay_seconds INTEGER, 
+	retries INTEGER, 
+	timeout INTEGER, 
+	thread_pool_id VARCHAR(36), 
+	total_emails INTEGER, 
+	sent_emails INTEGER, 
+	failed_emails INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(thread_pool_id) REFERENCES thread_pools (id)
+);
+
+CREATE INDEX idx_campaigns_created_at ON campaigns (created_at);
+
+CREATE INDEX idx_campaigns_name ON campaigns (name);
+
+CREATE INDEX idx_campaigns_user_id ON campaigns (user_id);
+
+CREATE INDEX idx_campaigns_user_created ON campaigns (user_id, created_at);
+
+CREATE INDEX idx_campaigns_status ON campaigns (status);
+
+CREATE INDEX ix_campaigns_id ON campaigns (id);
+
+CREATE INDEX idx_campaigns_thread_pool_id ON campaigns (thread_pool_id);
+
+CREATE INDEX idx_campaigns_user_status ON campaigns (user_id, status);
+
+CREATE TABLE smtp_accounts (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	host VARCHAR(255) NOT NULL, 
+	port INTEGER NOT NULL, 
+	username VARCHAR(255) NOT NULL, 
+	password TEXT NOT NULL, 
+	use_tls BOOLEAN, 
+	use_ssl BOOLEAN, 
+	user_id VARCHAR(36) NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	emails_sent INTEGER, 
+	last_used DATETIME, 
+	thread_pool_id VARCHAR(36), 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(thread_pool_id) REFERENCES thread_pools (id)
+);
+
+CREATE INDEX idx_smtp_active ON smtp_accounts (is_active);
+
+CREATE INDEX idx_smtp_user_active ON smtp_accounts (user_id, is_active);
+
+CREATE INDEX idx_smtp_thread_pool_id ON smtp_accounts (thread_pool_id);
+
+CREATE INDEX ix_smtp_accounts_id ON smtp_accounts (id);
+
+CREATE INDEX idx_smtp_host ON smtp_accounts (host);
+
+CREATE INDEX idx_smtp_last_used ON smtp_accounts (last_used);
+
+CREATE INDEX idx_smtp_user_id ON smtp_accounts (user_id);
+
+CREATE TABLE proxy_servers (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	host VARCHAR(255) NOT NULL, 
+	port INTEGER NOT NULL, 
+	username VARCHAR(255), 
+	password TEXT, 
+	proxy_type VARCHAR(20), 
+	user_id VARCHAR(36) NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	usage_count INTEGER, 
+	last_used DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE INDEX idx_proxy_user_id ON proxy_servers (user_id);
+
+CREATE INDEX idx_proxy_active ON proxy_servers (is_active);
+
+CREATE INDEX idx_proxy_user_active ON proxy_servers (user_id, is_active);
+
+CREATE INDEX ix_proxy_servers_id ON proxy_servers (id);
+
+CREATE INDEX idx_proxy_type ON proxy_servers (proxy_type);
+
+CREATE INDEX idx_proxy_usage ON proxy_servers (usage_count);
+
+CREATE TABLE lead_bases (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	user_id VARCHAR(36) NOT NULL, 
+	total_leads INTEGER, 
+	verified_leads INTEGER, 
+	last_updated DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE INDEX idx_lead_bases_updated ON lead_bases (last_updated);
+
+CREATE INDEX ix_lead_bases_id ON lead_bases (id);
+
+CREATE INDEX idx_lead_bases_name ON lead_bases (name);
+
+CREATE INDEX idx_lead_bases_user_id ON lead_bases (user_id);
+
+CREATE TABLE bulk_mail_jobs (
+	id VARCHAR(36) NOT NULL, 
+	user_id UUID NOT NULL, 
+	status VARCHAR(20), 
+	total INTEGER, 
+	sent INTEGER, 
+	failed INTEGER, 
+	created_at DATETIME, 
+	started_at DATETIME, 
+	completed_at DATETIME, 
+	paused_at DATETIME, 
+	retry_count INTEGER, 
+	last_error VARCHAR, 
+	partial_failures JSON, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE imap_accounts (
+	id VARCHAR(36) NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	password VARCHAR(255) NOT NULL, 
+	server VARCHAR(255) NOT NULL, 
+	port INTEGER, 
+	use_ssl BOOLEAN, 
+	user_id VARCHAR(36) NOT NULL, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	thread_pool_id VARCHAR(36), 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(thread_pool_id) REFERENCES thread_pools (id)
+);
+
+CREATE TABLE email_bases (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE import_logs (
+	id VARCHAR(36) NOT NULL, 
+	filename VARCHAR(255) NOT NULL, 
+	status VARCHAR(50), 
+	total_records INTEGER, 
+	processed_records INTEGER, 
+	failed_records INTEGER, 
+	error_message TEXT, 
+	user_id VARCHAR(36) NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE email_lists (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	user_id VARCHAR(36) NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	is_public BOOLEAN NOT NULL, 
+	tags JSON, 
+	custom_fields JSON, 
+	subscriber_count INTEGER NOT NULL, 
+	active_subscribers INTEGER NOT NULL, 
+	unsubscribed_count INTEGER NOT NULL, 
+	bounced_count INTEGER NOT NULL, 
+	growth_rate FLOAT NOT NULL, 
+	engagement_rate FLOAT NOT NULL, 
+	double_optin_required BOOLEAN NOT NULL, 
+	send_welcome_email BOOLEAN NOT NULL, 
+	welcome_email_template_id VARCHAR(36), 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE INDEX ix_email_lists_id ON email_lists (id);
+
+CREATE TABLE subscribers (
+	id VARCHAR(36) NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	first_name VARCHAR(100), 
+	last_name VARCHAR(100), 
+	phone VARCHAR(20), 
+	status VARCHAR(20) NOT NULL, 
+	email_verified BOOLEAN NOT NULL, 
+	verified_at DATETIME, 
+	engagement_score FLOAT NOT NULL, 
+	last_activity DATETIME, 
+	total_opens INTEGER NOT NULL, 
+	total_clicks INTEGER NOT NULL, 
+	total_complaints INTEGER NOT NULL, 
+	tags JSON, 
+	custom_fields JSON, 
+	source VARCHAR(100), 
+	country VARCHAR(2), 
+	region VARCHAR(100), 
+	city VARCHAR(100), 
+	timezone VARCHAR(50), 
+	unsubscribed_at DATETIME, 
+	unsubscribe_reason VARCHAR(255), 
+	bounce_count INTEGER NOT NULL, 
+	last_bounce_date DATETIME, 
+	bounce_type VARCHAR(20), 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE INDEX ix_subscribers_id ON subscribers (id);
+
+CREATE UNIQUE INDEX ix_subscribers_email ON subscribers (email);
+
+CREATE TABLE chats (
+	id INTEGER NOT NULL, 
+	session_id VARCHAR(100) NOT NULL, 
+	user_id UUID, 
+	guest_email VARCHAR(255), 
+	guest_name VARCHAR(100), 
+	subject VARCHAR(255), 
+	status VARCHAR(9), 
+	priority VARCHAR(6), 
+	assigned_admin_id UUID, 
+	page_url VARCHAR(500), 
+	user_agent TEXT, 
+	ip_address VARCHAR(45), 
+	timezone VARCHAR(50), 
+	user_plan VARCHAR(50), 
+	started_at DATETIME, 
+	last_activity DATETIME, 
+	resolved_at DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (session_id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(assigned_admin_id) REFERENCES users (id)
+);
+
+CREATE TABLE webhook_endpoints (
+	id VARCHAR(36) NOT NULL, 
+	url VARCHAR(500) NOT NULL, 
+	events JSON NOT NULL, 
+	secret VARCHAR(255), 
+	description TEXT, 
+	is_active BOOLEAN NOT NULL, 
+	retry_count INTEGER NOT NULL, 
+	timeout_seconds INTEGER NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	total_deliveries INTEGER, 
+	successful_deliveries INTEGER, 
+	failed_deliveries INTEGER, 
+	last_delivery_at DATETIME, 
+	average_delivery_time INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE INDEX idx_webhook_user_active ON webhook_endpoints (user_id, is_active);
+
+CREATE INDEX idx_webhook_created_at ON webhook_endpoints (created_at);
+
+CREATE INDEX idx_webhook_last_delivery ON webhook_endpoints (last_delivery_at);
+
+CREATE INDEX ix_webhook_endpoints_id ON webhook_endpoints (id);
+
+CREATE INDEX ix_webhook_endpoints_user_id ON webhook_endpoints (user_id);
+
+CREATE TABLE webhook_events (
+	id VARCHAR(36) NOT NULL, 
+	event_type VARCHAR(100) NOT NULL, 
+	timestamp DATETIME NOT NULL, 
+	data JSON NOT NULL, 
+	user_id VARCHAR(36), 
+	retry_count INTEGER NOT NULL, 
+	is_processed BOOLEAN NOT NULL, 
+	processing_started_at DATETIME, 
+	processing_completed_at DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE INDEX idx_webhook_event_processed ON webhook_events (is_processed, timestamp);
+
+CREATE INDEX idx_webhook_event_type_timestamp ON webhook_events (event_type, timestamp);
+
+CREATE INDEX ix_webhook_events_event_type ON webhook_events (event_type);
+
+CREATE INDEX idx_webhook_event_user ON webhook_events (user_id, timestamp);
+
+CREATE INDEX ix_webhook_events_id ON webhook_events (id);
+
+CREATE INDEX ix_webhook_events_timestamp ON webhook_events (timestamp);
+
+CREATE INDEX ix_webhook_events_user_id ON webhook_events (user_id);
+
+CREATE TABLE user_plans (
+	id INTEGER NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	plan_id INTEGER NOT NULL, 
+	assigned_at DATETIME, 
+	expires_at DATETIME, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(plan_id) REFERENCES plans (id)
+);
+
+CREATE TABLE team_plans (
+	id INTEGER NOT NULL, 
+	team_name VARCHAR(100) NOT NULL, 
+	owner_user_id VARCHAR(36) NOT NULL, 
+	plan_id INTEGER NOT NULL, 
+	max_seats INTEGER, 
+	current_seats INTEGER, 
+	price_per_seat FLOAT, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(owner_user_id) REFERENCES users (id), 
+	FOREIGN KEY(plan_id) REFERENCES plans (id)
+);
+
+CREATE TABLE usage_counters (
+	id INTEGER NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	counter_type VARCHAR(50) NOT NULL, 
+	current_count BIGINT, 
+	reset_at DATETIME NOT NULL, 
+	period_start DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE session_devices (
+	id INTEGER NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	fingerprint VARCHAR(128) NOT NULL, 
+	first_seen DATETIME, 
+	last_activity DATETIME, 
+	last_ip VARCHAR(45), 
+	user_agent VARCHAR(500), 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE trial_plans (
+	id INTEGER NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	plan_id INTEGER NOT NULL, 
+	started_at DATETIME, 
+	expires_at DATETIME NOT NULL, 
+	is_active BOOLEAN, 
+	is_expired BOOLEAN, 
+	extensions_used INTEGER, 
+	max_extensions_allowed INTEGER, 
+	threads_used INTEGER, 
+	campaigns_sent INTEGER, 
+	payment_request_id VARCHAR(36), 
+	is_paid BOOLEAN, 
+	payment_confirmed_at DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(plan_id) REFERENCES plans (id)
+);
+
+CREATE TABLE imap_login_logs (
+	id INTEGER NOT NULL, 
+	test_metrics_id INTEGER, 
+	timestamp DATETIME NOT NULL, 
+	success BOOLEAN NOT NULL, 
+	response TEXT, 
+	server VARCHAR(255), 
+	port INTEGER, 
+	email VARCHAR(255), 
+	latency_ms FLOAT, 
+	error_message TEXT, 
+	created_at DATETIME NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(test_metrics_id) REFERENCES imap_test_metrics (id)
+);
+
+CREATE INDEX ix_imap_login_logs_id ON imap_login_logs (id);
+
+CREATE TABLE socks_test_logs (
+	id INTEGER NOT NULL, 
+	test_metrics_id INTEGER, 
+	timestamp DATETIME NOT NULL, 
+	success BOOLEAN NOT NULL, 
+	response TEXT, 
+	proxy_host VARCHAR(255), 
+	proxy_port INTEGER, 
+	target_host VARCHAR(255), 
+	target_port INTEGER, 
+	latency_ms FLOAT, 
+	error_message TEXT, 
+	created_at DATETIME NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(test_metrics_id) REFERENCES socks_test_metrics (id)
+);
+
+CREATE INDEX ix_socks_test_logs_id ON socks_test_logs (id);
+
+CREATE TABLE licenses (
+	id INTEGER NOT NULL, 
+	license_key VARCHAR(255) NOT NULL, 
+	user_id VARCHAR(36), 
+	plan_id INTEGER, 
+	is_active BOOLEAN, 
+	is_trial BOOLEAN, 
+	starts_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	expires_at DATETIME, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	UNIQUE (license_key), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(plan_id) REFERENCES plans (id)
+);
+
+CREATE INDEX ix_licenses_id ON licenses (id);
+
+CREATE TABLE oauth_tokens (
+	id INTEGER NOT NULL, 
+	user_id VARCHAR(36), 
+	provider VARCHAR(50) NOT NULL, 
+	access_token TEXT NOT NULL, 
+	refresh_token TEXT, 
+	scope VARCHAR(500), 
+	expires_at DATETIME, 
+	token_expires_at DATETIME, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE INDEX ix_oauth_tokens_id ON oauth_tokens (id);
+
+CREATE TABLE landing_sections (
+	id UUID NOT NULL, 
+	section_type VARCHAR(50) NOT NULL, 
+	content JSON NOT NULL, 
+	is_active BOOLEAN, 
+	order_index INTEGER, 
+	created_at TIMESTAMP, 
+	updated_at TIMESTAMP, 
+	created_by UUID, 
+	updated_by UUID, 
+	PRIMARY KEY (id), 
+	UNIQUE (section_type), 
+	FOREIGN KEY(created_by) REFERENCES users (id), 
+	FOREIGN KEY(updated_by) REFERENCES users (id)
+);
+
+CREATE TABLE landing_leads (
+	id UUID NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	name VARCHAR(255), 
+	company VARCHAR(255), 
+	phone VARCHAR(50), 
+	message TEXT, 
+	source VARCHAR(50), 
+	utm_source VARCHAR(100), 
+	utm_medium VARCHAR(100), 
+	utm_campaign VARCHAR(100), 
+	ip_address VARCHAR(45), 
+	user_agent TEXT, 
+	referrer TEXT, 
+	created_at TIMESTAMP, 
+	converted_to_user BOOLEAN, 
+	converted_at TIMESTAMP, 
+	user_id UUID, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE lead_entries (
+	id VARCHAR(36) NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	first_name VARCHAR(100), 
+	last_name VARCHAR(100), 
+	company VARCHAR(255), 
+	user_id VARCHAR(36) NOT NULL, 
+	lead_base_id VARCHAR(36) NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	is_verified BOOLEAN, 
+	bounce_count INTEGER, 
+	last_contacted DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(lead_base_id) REFERENCES lead_bases (id)
+);
+
+CREATE INDEX idx_leads_active ON lead_entries (is_active);
+
+CREATE INDEX idx_leads_verified ON lead_entries (is_verified);
+
+CREATE INDEX idx_leads_user_base ON lead_entries (user_id, lead_base_id);
+
+CREATE INDEX idx_leads_email_active ON lead_entries (email, is_active);
+
+CREATE INDEX idx_leads_email ON lead_entries (email);
+
+CREATE INDEX idx_leads_last_contacted ON lead_entries (last_contacted);
+
+CREATE INDEX ix_lead_entries_id ON lead_entries (id);
+
+CREATE INDEX idx_leads_user_id ON lead_entries (user_id);
+
+CREATE INDEX idx_leads_company ON lead_entries (company);
+
+CREATE INDEX idx_leads_base_id ON lead_entries (lead_base_id);
+
+CREATE TABLE campaign_emails (
+	id VARCHAR(36) NOT NULL, 
+	campaign_id VARCHAR(36) NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	status VARCHAR(50) NOT NULL, 
+	sent_at DATETIME, 
+	opened_at DATETIME, 
+	clicked_at DATETIME, 
+	bounced_at DATETIME, 
+	error_message TEXT, 
+	retry_count INTEGER, 
+	smtp_account_id VARCHAR(36), 
+	proxy_server_id VARCHAR(36), 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id), 
+	FOREIGN KEY(smtp_account_id) REFERENCES smtp_accounts (id), 
+	FOREIGN KEY(proxy_server_id) REFERENCES proxy_servers (id)
+);
+
+CREATE INDEX idx_campaign_emails_proxy ON campaign_emails (proxy_server_id);
+
+CREATE INDEX idx_campaign_emails_campaign ON campaign_emails (campaign_id);
+
+CREATE INDEX idx_campaign_emails_email ON campaign_emails (email);
+
+CREATE INDEX idx_campaign_emails_sent_at ON campaign_emails (sent_at);
+
+CREATE INDEX idx_campaign_emails_smtp ON campaign_emails (smtp_account_id);
+
+CREATE INDEX ix_campaign_emails_id ON campaign_emails (id);
+
+CREATE INDEX idx_campaign_emails_opened ON campaign_emails (opened_at);
+
+CREATE INDEX idx_campaign_emails_status ON campaign_emails (status);
+
+CREATE INDEX idx_campaign_emails_campaign_status ON campaign_emails (campaign_id, status);
+
+CREATE INDEX idx_campaign_emails_clicked ON campaign_emails (clicked_at);
+
+CREATE TABLE sessions (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	user_id VARCHAR(36) NOT NULL, 
+	active_proxy_id VARCHAR(36), 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE, 
+	FOREIGN KEY(active_proxy_id) REFERENCES proxy_servers (id)
+);
+
+CREATE TABLE workspaces (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	user_id VARCHAR(36) NOT NULL, 
+	active_proxy_id VARCHAR(36), 
+	is_active BOOLEAN NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE, 
+	FOREIGN KEY(active_proxy_id) REFERENCES proxy_servers (id)
+);
+
+CREATE INDEX idx_workspaces_active ON workspaces (is_active);
+
+CREATE INDEX idx_workspaces_user_id ON workspaces (user_id);
+
+CREATE INDEX ix_workspaces_id ON workspaces (id);
+
+CREATE INDEX idx_workspaces_name ON workspaces (name);
+
+CREATE TABLE imap_folders (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	account_id VARCHAR(36) NOT NULL, 
+	total_count INTEGER, 
+	unread_count INTEGER, 
+	last_sync DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(account_id) REFERENCES imap_accounts (id)
+);
+
+CREATE TABLE list_subscriber_association (
+	list_id VARCHAR(36) NOT NULL, 
+	subscriber_id VARCHAR(36) NOT NULL, 
+	joined_at DATETIME, 
+	status VARCHAR(20), 
+	PRIMARY KEY (list_id, subscriber_id), 
+	FOREIGN KEY(list_id) REFERENCES email_lists (id), 
+	FOREIGN KEY(subscriber_id) REFERENCES subscribers (id)
+);
+
+CREATE TABLE segments (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	user_id VARCHAR(36) NOT NULL, 
+	email_list_id VARCHAR(36), 
+	is_active BOOLEAN NOT NULL, 
+	is_dynamic BOOLEAN NOT NULL, 
+	conditions JSON NOT NULL, 
+	subscriber_count INTEGER NOT NULL, 
+	last_calculated DATETIME, 
+	avg_engagement FLOAT NOT NULL, 
+	conversion_rate FLOAT NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(email_list_id) REFERENCES email_lists (id)
+);
+
+CREATE INDEX ix_segments_id ON segments (id);
+
+CREATE TABLE subscriber_activities (
+	id VARCHAR(36) NOT NULL, 
+	subscriber_id VARCHAR(36) NOT NULL, 
+	campaign_id VARCHAR(36), 
+	activity_type VARCHAR(50) NOT NULL, 
+	activity_data JSON, 
+	email_client VARCHAR(100), 
+	device_type VARCHAR(50), 
+	location JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(subscriber_id) REFERENCES subscribers (id) ON DELETE CASCADE, 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id) ON DELETE SET NULL
+);
+
+CREATE INDEX ix_subscriber_activities_id ON subscriber_activities (id);
+
+CREATE TABLE list_imports (
+	id VARCHAR(36) NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	email_list_id VARCHAR(36) NOT NULL, 
+	filename VARCHAR(255), 
+	total_records INTEGER NOT NULL, 
+	successful_imports INTEGER NOT NULL, 
+	failed_imports INTEGER NOT NULL, 
+	duplicate_count INTEGER NOT NULL, 
+	status VARCHAR(20) NOT NULL, 
+	error_message TEXT, 
+	file_path VARCHAR(500), 
+	mapping_config JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(email_list_id) REFERENCES email_lists (id)
+);
+
+CREATE INDEX ix_list_imports_id ON list_imports (id);
+
+CREATE TABLE chat_messages (
+	id INTEGER NOT NULL, 
+	chat_id INTEGER NOT NULL, 
+	message_type VARCHAR(6) NOT NULL, 
+	content TEXT NOT NULL, 
+	sender_id UUID, 
+	sender_name VARCHAR(100), 
+	is_read BOOLEAN, 
+	is_internal BOOLEAN, 
+	bot_response_id VARCHAR(100), 
+	bot_confidence INTEGER, 
+	created_at DATETIME, 
+	read_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(chat_id) REFERENCES chats (id), 
+	FOREIGN KEY(sender_id) REFERENCES users (id)
+);
+
+CREATE TABLE chat_bot_sessions (
+	id INTEGER NOT NULL, 
+	chat_id INTEGER NOT NULL, 
+	bot_name VARCHAR(100), 
+	bot_model VARCHAR(50), 
+	is_active BOOLEAN, 
+	context_messages JSON, 
+	user_data JSON, 
+	intent_analysis JSON, 
+	conversation_summary TEXT, 
+	resolved_issues JSON, 
+	escalation_triggers JSON, 
+	total_responses INTEGER, 
+	successful_responses INTEGER, 
+	escalations INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	last_response_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(chat_id) REFERENCES chats (id)
+);
+
+CREATE TABLE webhook_deliveries (
+	id VARCHAR(36) NOT NULL, 
+	webhook_id VARCHAR(36) NOT NULL, 
+	event_id VARCHAR(36) NOT NULL, 
+	url VARCHAR(500) NOT NULL, 
+	status_code INTEGER, 
+	response_body TEXT, 
+	delivery_time DATETIME, 
+	error_message TEXT, 
+	retry_count INTEGER NOT NULL, 
+	request_duration_ms INTEGER, 
+	payload_size_bytes INTEGER, 
+	response_size_bytes INTEGER, 
+	is_successful BOOLEAN NOT NULL, 
+	next_retry_at DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(webhook_id) REFERENCES webhook_endpoints (id), 
+	FOREIGN KEY(event_id) REFERENCES webhook_events (id)
+);
+
+CREATE INDEX ix_webhook_deliveries_event_id ON webhook_deliveries (event_id);
+
+CREATE INDEX idx_webhook_delivery_event ON webhook_deliveries (event_id, created_at);
+
+CREATE INDEX ix_webhook_deliveries_id ON webhook_deliveries (id);
+
+CREATE INDEX idx_webhook_delivery_status ON webhook_deliveries (is_successful, created_at);
+
+CREATE INDEX idx_webhook_delivery_retry ON webhook_deliveries (next_retry_at, retry_count);
+
+CREATE INDEX idx_webhook_delivery_status_code ON webhook_deliveries (status_code, created_at);
+
+CREATE INDEX idx_webhook_delivery_webhook ON webhook_deliveries (webhook_id, created_at);
+
+CREATE INDEX ix_webhook_deliveries_webhook_id ON webhook_deliveries (webhook_id);
+
+CREATE TABLE webhook_stats (
+	id VARCHAR(36) NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	webhook_id VARCHAR(36), 
+	period_start DATETIME NOT NULL, 
+	period_end DATETIME NOT NULL, 
+	period_type VARCHAR(20) NOT NULL, 
+	total_deliveries INTEGER NOT NULL, 
+	successful_deliveries INTEGER NOT NULL, 
+	failed_deliveries INTEGER NOT NULL, 
+	average_delivery_time_ms INTEGER NOT NULL, 
+	success_rate INTEGER NOT NULL, 
+	error_counts JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(webhook_id) REFERENCES webhook_endpoints (id)
+);
+
+CREATE INDEX ix_webhook_stats_period_start ON webhook_stats (period_start);
+
+CREATE INDEX idx_webhook_stats_user_period ON webhook_stats (user_id, period_start, period_end);
+
+CREATE INDEX idx_webhook_stats_webhook_period ON webhook_stats (webhook_id, period_start, period_end);
+
+CREATE INDEX ix_webhook_stats_id ON webhook_stats (id);
+
+CREATE INDEX idx_webhook_stats_period_type ON webhook_stats (period_type, period_start);
+
+CREATE INDEX ix_webhook_stats_webhook_id ON webhook_stats (webhook_id);
+
+CREATE INDEX ix_webhook_stats_period_end ON webhook_stats (period_end);
+
+CREATE INDEX ix_webhook_stats_user_id ON webhook_stats (user_id);
+
+CREATE TABLE team_members (
+	id INTEGER NOT NULL, 
+	team_plan_id INTEGER NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	role VARCHAR(20), 
+	invited_at DATETIME, 
+	joined_at DATETIME, 
+	is_active BOOLEAN, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(team_plan_id) REFERENCES team_plans (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE email_bounces (
+	id VARCHAR(36) NOT NULL, 
+	email_address VARCHAR(255) NOT NULL, 
+	campaign_id UUID, 
+	message_id VARCHAR(255), 
+	bounce_type VARCHAR(20) NOT NULL, 
+	bounce_reason VARCHAR(50), 
+	bounce_code VARCHAR(10), 
+	bounce_message TEXT, 
+	sent_at DATETIME, 
+	bounced_at DATETIME NOT NULL, 
+	smtp_account_id UUID, 
+	sending_ip VARCHAR(45), 
+	processed BOOLEAN NOT NULL, 
+	suppressed BOOLEAN NOT NULL, 
+	raw_bounce_data JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id), 
+	FOREIGN KEY(smtp_account_id) REFERENCES smtp_accounts (id)
+);
+
+CREATE INDEX ix_email_bounces_email_address ON email_bounces (email_address);
+
+CREATE INDEX ix_email_bounces_id ON email_bounces (id);
+
+CREATE TABLE deliverability_stats (
+	id VARCHAR(36) NOT NULL, 
+	date DATETIME NOT NULL, 
+	period_type VARCHAR(20) NOT NULL, 
+	campaign_id UUID, 
+	smtp_account_id UUID, 
+	domain VARCHAR(255), 
+	emails_sent INTEGER NOT NULL, 
+	emails_delivered INTEGER NOT NULL, 
+	total_bounces INTEGER NOT NULL, 
+	hard_bounces INTEGER NOT NULL, 
+	soft_bounces INTEGER NOT NULL, 
+	complaint_bounces INTEGER NOT NULL, 
+	emails_opened INTEGER NOT NULL, 
+	emails_clicked INTEGER NOT NULL, 
+	unsubscribes INTEGER NOT NULL, 
+	delivery_rate VARCHAR(10), 
+	bounce_rate VARCHAR(10), 
+	hard_bounce_rate VARCHAR(10), 
+	complaint_rate VARCHAR(10), 
+	open_rate VARCHAR(10), 
+	click_rate VARCHAR(10), 
+	unsubscribe_rate VARCHAR(10), 
+	stats_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id), 
+	FOREIGN KEY(smtp_account_id) REFERENCES smtp_accounts (id)
+);
+
+CREATE INDEX ix_deliverability_stats_id ON deliverability_stats (id);
+
+CREATE INDEX ix_deliverability_stats_date ON deliverability_stats (date);
+
+CREATE TABLE feedback_loops (
+	id VARCHAR(36) NOT NULL, 
+	isp_name VARCHAR(100) NOT NULL, 
+	feedback_type VARCHAR(50) NOT NULL, 
+	original_message_id VARCHAR(255), 
+	reported_email VARCHAR(255) NOT NULL, 
+	campaign_id UUID, 
+	sent_at DATETIME, 
+	reported_at DATETIME NOT NULL, 
+	processed BOOLEAN NOT NULL, 
+	action_taken VARCHAR(100), 
+	raw_feedback_data JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id)
+);
+
+CREATE INDEX ix_feedback_loops_id ON feedback_loops (id);
+
+CREATE INDEX ix_feedback_loops_reported_email ON feedback_loops (reported_email);
+
+CREATE TABLE unsubscribe_records (
+	id VARCHAR(36) NOT NULL, 
+	email_address VARCHAR(255) NOT NULL, 
+	domain VARCHAR(255) NOT NULL, 
+	method VARCHAR(20) NOT NULL, 
+	source_campaign_id UUID, 
+	source_email_id VARCHAR(255), 
+	user_agent VARCHAR(500), 
+	ip_address VARCHAR(45), 
+	referer VARCHAR(500), 
+	unsubscribed_at DATETIME NOT NULL, 
+	processed BOOLEAN NOT NULL, 
+	confirmed BOOLEAN NOT NULL, 
+	reason_category VARCHAR(50), 
+	reason_text TEXT, 
+	record_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(source_campaign_id) REFERENCES campaigns (id)
+);
+
+CREATE INDEX ix_unsubscribe_records_email_address ON unsubscribe_records (email_address);
+
+CREATE INDEX ix_unsubscribe_records_id ON unsubscribe_records (id);
+
+CREATE INDEX ix_unsubscribe_records_domain ON unsubscribe_records (domain);
+
+CREATE TABLE unsubscribe_tokens (
+	id VARCHAR(36) NOT NULL, 
+	token VARCHAR(255) NOT NULL, 
+	email_address VARCHAR(255) NOT NULL, 
+	campaign_id UUID, 
+	message_id VARCHAR(255), 
+	is_used BOOLEAN NOT NULL, 
+	used_at DATETIME, 
+	used_ip VARCHAR(45), 
+	expires_at DATETIME NOT NULL, 
+	unsubscribe_type VARCHAR(20) NOT NULL, 
+	unsubscribe_scope JSON, 
+	token_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id)
+);
+
+CREATE INDEX ix_unsubscribe_tokens_email_address ON unsubscribe_tokens (email_address);
+
+CREATE INDEX ix_unsubscribe_tokens_id ON unsubscribe_tokens (id);
+
+CREATE UNIQUE INDEX ix_unsubscribe_tokens_token ON unsubscribe_tokens (token);
+
+CREATE TABLE consent_logs (
+	id VARCHAR(36) NOT NULL, 
+	email_address VARCHAR(255) NOT NULL, 
+	action VARCHAR(50) NOT NULL, 
+	consent_type VARCHAR(50), 
+	old_value JSON, 
+	new_value JSON, 
+	source VARCHAR(50) NOT NULL, 
+	source_campaign_id UUID, 
+	source_url VARCHAR(500), 
+	ip_address VARCHAR(45), 
+	user_agent VARCHAR(500), 
+	processed_at DATETIME NOT NULL, 
+	consent_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(source_campaign_id) REFERENCES campaigns (id)
+);
+
+CREATE INDEX ix_consent_logs_id ON consent_logs (id);
+
+CREATE INDEX ix_consent_logs_email_address ON consent_logs (email_address);
+
+CREATE TABLE campaign_metrics (
+	id INTEGER NOT NULL, 
+	campaign_id UUID, 
+	metric_name VARCHAR(100) NOT NULL, 
+	metric_value VARCHAR(255), 
+	timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	sent_count INTEGER, 
+	delivered_count INTEGER, 
+	opened_count INTEGER, 
+	clicked_count INTEGER, 
+	bounced_count INTEGER, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id)
+);
+
+CREATE INDEX ix_campaign_metrics_id ON campaign_metrics (id);
+
+CREATE TABLE failed_sends (
+	id INTEGER NOT NULL, 
+	email VARCHAR(255) NOT NULL, 
+	lead_email VARCHAR(255) NOT NULL, 
+	message TEXT, 
+	error_message TEXT, 
+	campaign_id UUID, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(campaign_id) REFERENCES campaigns (id)
+);
+
+CREATE INDEX ix_failed_sends_id ON failed_sends (id);
+
+CREATE TABLE imap_messages (
+	id VARCHAR(36) NOT NULL, 
+	folder_id VARCHAR(36) NOT NULL, 
+	uid VARCHAR(50) NOT NULL, 
+	message_id VARCHAR(255), 
+	subject VARCHAR(500), 
+	sender VARCHAR(255), 
+	sender_name VARCHAR(255), 
+	preview TEXT, 
+	content TEXT, 
+	is_read BOOLEAN, 
+	is_starred BOOLEAN, 
+	priority INTEGER, 
+	received_at DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(folder_id) REFERENCES imap_folders (id)
+);
+
+CREATE TABLE segment_conditions (
+	id VARCHAR(36) NOT NULL, 
+	segment_id VARCHAR(36) NOT NULL, 
+	field VARCHAR(100) NOT NULL, 
+	operator VARCHAR(20) NOT NULL, 
+	value JSON, 
+	logical_operator VARCHAR(10) NOT NULL, 
+	condition_group INTEGER NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(segment_id) REFERENCES segments (id) ON DELETE CASCADE
+);
+
+CREATE INDEX ix_segment_conditions_id ON segment_conditions (id);
+
+CREATE TABLE check_logs (
+	id INTEGER NOT NULL, 
+	check_type VARCHAR(50) NOT NULL, 
+	input_params JSON NOT NULL, 
+	status VARCHAR(20) NOT NULL, 
+	response JSON, 
+	error_message TEXT, 
+	checked_at DATETIME, 
+	duration_ms FLOAT, 
+	user_id UUID, 
+	session_id UUID, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(session_id) REFERENCES sessions (id)
+);
+
+CREATE TABLE suppression_list (
+	id VARCHAR(36) NOT NULL, 
+	email_address VARCHAR(255) NOT NULL, 
+	domain VARCHAR(255) NOT NULL, 
+	reason VARCHAR(50) NOT NULL, 
+	suppression_type VARCHAR(20) NOT NULL, 
+	source_campaign_id UUID, 
+	source_bounce_id UUID, 
+	bounce_count INTEGER NOT NULL, 
+	hard_bounce_count INTEGER NOT NULL, 
+	soft_bounce_count INTEGER NOT NULL, 
+	last_bounce_date DATETIME, 
+	unsubscribed_at DATETIME, 
+	unsubscribe_method VARCHAR(50), 
+	is_active BOOLEAN NOT NULL, 
+	expires_at DATETIME, 
+	notes TEXT, 
+	bounce_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(source_campaign_id) REFERENCES campaigns (id), 
+	FOREIGN KEY(source_bounce_id) REFERENCES email_bounces (id)
+);
+
+CREATE INDEX ix_suppression_list_id ON suppression_list (id);
+
+CREATE UNIQUE INDEX ix_suppression_list_email_address ON suppression_list (email_address);
+
+CREATE INDEX ix_suppression_list_domain ON suppression_list (domain);
+
+CREATE TABLE template_layouts (
+	id UUID NOT NULL, 
+	session_id UUID NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	category VARCHAR(50) NOT NULL, 
+	layout_type VARCHAR(30) NOT NULL, 
+	grid_system VARCHAR(20) NOT NULL, 
+	layout_config JSON NOT NULL, 
+	container_settings JSON NOT NULL, 
+	mobile_config JSON, 
+	tablet_config JSON, 
+	background_color VARCHAR(20), 
+	background_image TEXT, 
+	custom_css TEXT, 
+	is_template BOOLEAN, 
+	is_public BOOLEAN, 
+	usage_count INTEGER, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(session_id) REFERENCES sessions (id) ON DELETE CASCADE
+);
+
+CREATE TABLE integrations (
+	id UUID NOT NULL, 
+	session_id UUID NOT NULL, 
+	provider_id UUID NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	description TEXT, 
+	auth_data JSON NOT NULL, 
+	auth_expires_at DATETIME, 
+	refresh_token TEXT, 
+	config JSON NOT NULL, 
+	field_mappings JSON NOT NULL, 
+	sync_settings JSON NOT NULL, 
+	status VARCHAR(20) NOT NULL, 
+	last_sync_at DATETIME, 
+	last_error TEXT, 
+	sync_frequency VARCHAR(20) NOT NULL, 
+	total_syncs INTEGER, 
+	successful_syncs INTEGER, 
+	failed_syncs INTEGER, 
+	last_sync_duration FLOAT, 
+	records_synced INTEGER, 
+	webhook_url VARCHAR(255), 
+	webhook_secret VARCHAR(255), 
+	webhook_events JSON, 
+	tags JSON, 
+	notes TEXT, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(session_id) REFERENCES sessions (id) ON DELETE CASCADE, 
+	FOREIGN KEY(provider_id) REFERENCES integration_providers (id) ON DELETE CASCADE
+);
+
+CREATE TABLE email_templates (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(255) NOT NULL, 
+	subject VARCHAR(500), 
+	content TEXT NOT NULL, 
+	user_id VARCHAR(36) NOT NULL, 
+	layout_id VARCHAR(36), 
+	is_active BOOLEAN NOT NULL, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(layout_id) REFERENCES template_layouts (id)
+);
+
+CREATE INDEX idx_templates_user_id ON email_templates (user_id);
+
+CREATE INDEX idx_templates_active ON email_templates (is_active);
+
+CREATE INDEX idx_templates_user_active ON email_templates (user_id, is_active);
+
+CREATE INDEX ix_email_templates_id ON email_templates (id);
+
+CREATE INDEX idx_templates_name ON email_templates (name);
+
+CREATE INDEX idx_templates_layout_id ON email_templates (layout_id);
+
+CREATE TABLE template_blocks (
+	id UUID NOT NULL, 
+	layout_id UUID NOT NULL, 
+	block_type VARCHAR(50) NOT NULL, 
+	block_name VARCHAR(255), 
+	row_position INTEGER NOT NULL, 
+	column_position INTEGER NOT NULL, 
+	column_span INTEGER NOT NULL, 
+	row_span INTEGER NOT NULL, 
+	sort_order INTEGER NOT NULL, 
+	content JSON NOT NULL, 
+	styling JSON NOT NULL, 
+	mobile_settings JSON, 
+	tablet_settings JSON, 
+	is_editable BOOLEAN, 
+	is_removable BOOLEAN, 
+	is_movable BOOLEAN, 
+	display_conditions JSON, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(layout_id) REFERENCES template_layouts (id) ON DELETE CASCADE
+);
+
+CREATE TABLE integration_sync_logs (
+	id UUID NOT NULL, 
+	integration_id UUID NOT NULL, 
+	sync_type VARCHAR(50) NOT NULL, 
+	sync_direction VARCHAR(20) NOT NULL, 
+	data_type VARCHAR(50) NOT NULL, 
+	status VARCHAR(20) NOT NULL, 
+	started_at DATETIME, 
+	completed_at DATETIME, 
+	duration FLOAT, 
+	records_processed INTEGER, 
+	records_created INTEGER, 
+	records_updated INTEGER, 
+	records_deleted INTEGER, 
+	records_failed INTEGER, 
+	error_message TEXT, 
+	error_details JSON, 
+	retry_count INTEGER, 
+	sync_summary JSON, 
+	processed_data JSON, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(integration_id) REFERENCES integrations (id) ON DELETE CASCADE
+);
+
+CREATE TABLE integration_field_maps (
+	id UUID NOT NULL, 
+	integration_id UUID NOT NULL, 
+	source_field VARCHAR(255) NOT NULL, 
+	target_field VARCHAR(255) NOT NULL, 
+	field_type VARCHAR(50) NOT NULL, 
+	sync_direction VARCHAR(20) NOT NULL, 
+	is_required BOOLEAN, 
+	is_unique BOOLEAN, 
+	transform_rules JSON, 
+	default_value VARCHAR(255), 
+	validation_rules JSON, 
+	is_active BOOLEAN, 
+	last_used_at DATETIME, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(integration_id) REFERENCES integrations (id) ON DELETE CASCADE
+);
+
+CREATE TABLE integration_webhooks (
+	id UUID NOT NULL, 
+	integration_id UUID NOT NULL, 
+	endpoint_url VARCHAR(255) NOT NULL, 
+	secret_key VARCHAR(255) NOT NULL, 
+	events JSON NOT NULL, 
+	http_method VARCHAR(10) NOT NULL, 
+	headers JSON, 
+	payload_format VARCHAR(20) NOT NULL, 
+	verify_ssl BOOLEAN, 
+	ip_whitelist JSON, 
+	is_active BOOLEAN, 
+	last_triggered_at DATETIME, 
+	total_triggers INTEGER, 
+	successful_triggers INTEGER, 
+	failed_triggers INTEGER, 
+	max_retries INTEGER, 
+	retry_delay INTEGER, 
+	timeout INTEGER, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(integration_id) REFERENCES integrations (id) ON DELETE CASCADE
+);
+
+CREATE TABLE integration_usage (
+	id UUID NOT NULL, 
+	integration_id UUID NOT NULL, 
+	date DATETIME NOT NULL, 
+	api_calls INTEGER, 
+	data_transferred INTEGER, 
+	records_processed INTEGER, 
+	sync_duration FLOAT, 
+	avg_response_time FLOAT, 
+	error_rate FLOAT, 
+	success_rate FLOAT, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(integration_id) REFERENCES integrations (id) ON DELETE CASCADE
+);
+
+CREATE TABLE imap_attachments (
+	id INTEGER NOT NULL, 
+	message_id UUID, 
+	filename VARCHAR(255), 
+	content_type VARCHAR(100), 
+	size INTEGER, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(message_id) REFERENCES imap_messages (id)
+);
+
+CREATE INDEX ix_imap_attachments_id ON imap_attachments (id);
+
+CREATE TABLE workflow_actions (
+	id VARCHAR(36) NOT NULL, 
+	workflow_id UUID NOT NULL, 
+	action_type VARCHAR(30) NOT NULL, 
+	action_config JSON NOT NULL, 
+	sequence_order INTEGER NOT NULL, 
+	parent_action_id UUID, 
+	delay_amount INTEGER, 
+	delay_type VARCHAR(20), 
+	conditions JSON, 
+	email_template_id UUID, 
+	subject_line VARCHAR(500), 
+	email_content TEXT, 
+	execution_count INTEGER NOT NULL, 
+	success_count INTEGER NOT NULL, 
+	failure_count INTEGER NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	notes TEXT, 
+	action_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(workflow_id) REFERENCES automation_workflows (id), 
+	FOREIGN KEY(parent_action_id) REFERENCES workflow_actions (id), 
+	FOREIGN KEY(email_template_id) REFERENCES email_templates (id)
+);
+
+CREATE INDEX ix_workflow_actions_id ON workflow_actions (id);
+
+CREATE TABLE template_builder_sessions (
+	id UUID NOT NULL, 
+	user_session_id UUID NOT NULL, 
+	template_id UUID, 
+	layout_id UUID, 
+	session_name VARCHAR(255), 
+	current_state JSON NOT NULL, 
+	auto_save_data JSON, 
+	last_activity DATETIME, 
+	changes_count INTEGER, 
+	is_active BOOLEAN, 
+	session_expired BOOLEAN, 
+	is_collaborative BOOLEAN, 
+	collaborators JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_session_id) REFERENCES sessions (id) ON DELETE CASCADE, 
+	FOREIGN KEY(template_id) REFERENCES email_templates (id) ON DELETE CASCADE, 
+	FOREIGN KEY(layout_id) REFERENCES template_layouts (id) ON DELETE CASCADE
+);
+
+CREATE TABLE integration_webhook_logs (
+	id UUID NOT NULL, 
+	webhook_id UUID NOT NULL, 
+	event_type VARCHAR(100) NOT NULL, 
+	payload JSON, 
+	headers JSON, 
+	source_ip VARCHAR(45), 
+	status_code INTEGER, 
+	response_time FLOAT, 
+	response_body TEXT, 
+	status VARCHAR(20) NOT NULL, 
+	error_message TEXT, 
+	processed BOOLEAN, 
+	processing_notes TEXT, 
+	triggered_at DATETIME, 
+	processed_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(webhook_id) REFERENCES integration_webhooks (id) ON DELETE CASCADE
+);
+
+CREATE TABLE workflow_executions (
+	id VARCHAR(36) NOT NULL, 
+	workflow_id UUID NOT NULL, 
+	contact_email VARCHAR(255) NOT NULL, 
+	status VARCHAR(20) NOT NULL, 
+	current_action_id UUID, 
+	next_action_id UUID, 
+	started_at DATETIME NOT NULL, 
+	completed_at DATETIME, 
+	next_execution_at DATETIME, 
+	actions_completed INTEGER NOT NULL, 
+	total_actions INTEGER NOT NULL, 
+	completion_percentage FLOAT NOT NULL, 
+	last_error TEXT, 
+	retry_count INTEGER NOT NULL, 
+	max_retries INTEGER NOT NULL, 
+	execution_context JSON, 
+	emails_sent INTEGER NOT NULL, 
+	emails_opened INTEGER NOT NULL, 
+	emails_clicked INTEGER NOT NULL, 
+	execution_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(workflow_id) REFERENCES automation_workflows (id), 
+	FOREIGN KEY(current_action_id) REFERENCES workflow_actions (id), 
+	FOREIGN KEY(next_action_id) REFERENCES workflow_actions (id)
+);
+
+CREATE INDEX ix_workflow_executions_contact_email ON workflow_executions (contact_email);
+
+CREATE INDEX ix_workflow_executions_id ON workflow_executions (id);
+
+CREATE TABLE automation_metrics (
+	id VARCHAR(36) NOT NULL, 
+	date DATETIME NOT NULL, 
+	period_type VARCHAR(20) NOT NULL, 
+	workflow_id UUID, 
+	action_id UUID, 
+	executions_started INTEGER NOT NULL, 
+	executions_completed INTEGER NOT NULL, 
+	executions_failed INTEGER NOT NULL, 
+	emails_sent INTEGER NOT NULL, 
+	emails_delivered INTEGER NOT NULL, 
+	emails_opened INTEGER NOT NULL, 
+	emails_clicked INTEGER NOT NULL, 
+	emails_bounced INTEGER NOT NULL, 
+	unsubscribes INTEGER NOT NULL, 
+	complaints INTEGER NOT NULL, 
+	conversions INTEGER NOT NULL, 
+	revenue_generated FLOAT NOT NULL, 
+	completion_rate FLOAT, 
+	open_rate FLOAT, 
+	click_rate FLOAT, 
+	conversion_rate FLOAT, 
+	metrics_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(workflow_id) REFERENCES automation_workflows (id), 
+	FOREIGN KEY(action_id) REFERENCES workflow_actions (id)
+);
+
+CREATE INDEX ix_automation_metrics_date ON automation_metrics (date);
+
+CREATE INDEX ix_automation_metrics_id ON automation_metrics (id);
+
+CREATE TABLE automation_rules (
+	id VARCHAR(36) NOT NULL, 
+	name VARCHAR(200) NOT NULL, 
+	description TEXT, 
+	workflow_id UUID, 
+	action_id UUID, 
+	rule_type VARCHAR(50) NOT NULL, 
+	conditions JSON NOT NULL, 
+	actions JSON NOT NULL, 
+	priority INTEGER NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	evaluation_count INTEGER NOT NULL, 
+	match_count INTEGER NOT NULL, 
+	last_matched_at DATETIME, 
+	trigger_metadata JSON, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(workflow_id) REFERENCES automation_workflows (id), 
+	FOREIGN KEY(action_id) REFERENCES workflow_actions (id)
+);
+
+CREATE INDEX ix_automation_rules_id ON automation_rules (id);
+
+CREATE TABLE workflow_triggers (
+	id VARCHAR(36) NOT NULL, 
+	workflow_id UUID NOT NULL, 
+	contact_email VARCHAR(255) NOT NULL, 
+	trigger_source VARCHAR(50) NOT NULL, 
+	trigger_event VARCHAR(100), 
+	trigger_data JSON, 
+	processed BOOLEAN NOT NULL, 
+	processed_at DATETIME, 
+	execution_id UUID, 
+	processing_error TEXT, 
+	request_id VARCHAR(100), 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(workflow_id) REFERENCES automation_workflows (id), 
+	FOREIGN KEY(execution_id) REFERENCES workflow_executions (id)
+);
+
+CREATE INDEX ix_workflow_triggers_id ON workflow_triggers (id);
+
+CREATE INDEX ix_workflow_triggers_contact_email ON workflow_triggers (contact_email);
+
+CREATE TABLE alembic_version (
+	version_num VARCHAR(32) NOT NULL,
+	CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)
+);
+
+INSERT INTO alembic_version (version_num) VALUES ('27dc46711a3a');
+
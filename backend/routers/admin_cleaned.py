@@ -7,11 +7,12 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_db, get_read_db
+from core.pagination import InvalidCursor, SortKey, paginate
 from models.base import User
 from routers.auth import get_current_admin_user, get_current_user
 # Import existing schemas or create basic ones if missing
@@ -31,6 +32,8 @@ except ImportError:
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+USER_SEARCH_ORDER = SortKey.of("admin.users.search", User.email, User.id)
+
 
 # ==================== CORE ADMIN FUNCTIONALITY ====================
 
@@ -64,7 +67,7 @@ async def admin_info() -> dict[str, Any]:
 
 @router.get("/users/count")
 async def get_user_count(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
 ) -> dict[str, Any]:
     """Get total user count and statistics"""
@@ -106,20 +109,27 @@ async def get_user_count(
 
 @router.get("/users/search")
 async def search_users(
+    response: Response,
     q: str = Query(..., min_length=2, description="Search query"),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
 ) -> dict[str, Any]:
     """Search users by email or username"""
     try:
         # Search by email (case-insensitive)
-        result = await db.execute(
+        page = await paginate(
+            db,
             select(User.id, User.email, User.created_at, User.is_active)
-            .where(User.email.ilike(f"%{q}%"))
-            .limit(limit)
+            .where(User.email.ilike(f"%{q}%")),
+            USER_SEARCH_ORDER,
+            cursor,
+            limit,
+            estimate=True,
         )
-        users = result.all()
+        users = page.items
+        response.headers.update(page.headers())
         
         return {
             "query": q,
@@ -135,6 +145,8 @@ async def search_users(
             ],
         }
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error searching users: {e}")
         raise HTTPException(
@@ -146,7 +158,7 @@ async def search_users(
 @router.get("/users/activity")
 async def get_user_activity(
     days: int = Query(7, ge=1, le=30, description="Number of days to look back"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
 ) -> dict[str, Any]:
     """Get user activity statistics for the last N days"""
@@ -2,7 +2,7 @@
 Admin Inter-Server Communication Router
 Endpoints for admin panel to communicate with main server and manage cached data
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
 from sqlalchemy.orm import Session
 from typing import Dict, Optional
 
@@ -13,6 +13,7 @@ from ..services.admin_cache_service import (
     get_cached_users, refresh_all_cache
 )
 from ..core.auth_utils import get_current_admin_user
+from ..core.pagination import NEXT_CURSOR_HEADER, InvalidCursor
 
 router = APIRouter()
 
@@ -20,21 +21,29 @@ router = APIRouter()
 
 @router.get("/users")
 async def get_users_from_main_server(
+    response: Response,
     page: int = 1,
     limit: int = 50,
     search: Optional[str] = None,
     use_cache: bool = True,
+    cursor: Optional[str] = None,
     current_admin = Depends(get_current_admin_user),
     admin_db: Session = Depends(get_admin_db)
 ):
     """
     Get users from main server with caching support
+
+    Cached pages carry an X-Next-Cursor header, which can be sent back
+    as ``cursor`` instead of ``page``.
     """
     try:
         if use_cache:
             # Try to get from cache first
-            cached_data = await get_cached_users(page, limit, search)
+            cached_data = await get_cached_users(page, limit, search, cursor)
+            next_cursor = cached_data.pop("next_cursor", None)
             if cached_data.get("users"):
+                if next_cursor:
+                    response.headers[NEXT_CURSOR_HEADER] = next_cursor
                 return {
                     "source": "cache",
                     "data": cached_data,
@@ -50,6 +59,8 @@ async def get_users_from_main_server(
             "data": fresh_data
         }
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get users: {str(e)}")
 
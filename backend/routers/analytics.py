@@ -13,7 +13,7 @@ from pydantic import BaseModel
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 from core.error_handlers import StandardErrorHandler
 from core.response_handlers import ResponseBuilder
 from models import Campaign, User, EmailBounce, Session as SessionModel
@@ -27,7 +27,7 @@ logger = logging.getLogger(__name__)
 async def get_analytics_overview(
     range: str = Query("7d", description="Time range: 24h, 7d, 30d, 90d"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """Get analytics overview data for specified time range"""
     try:
@@ -57,7 +57,7 @@ async def get_analytics_overview(
 async def get_analytics_trends(
     range: str = Query("7d", description="Time range: 24h, 7d, 30d, 90d"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """Get analytics trends over time"""
     try:
@@ -85,7 +85,7 @@ async def get_analytics_trends(
 async def get_analytics_campaigns(
     range: str = Query("7d", description="Time range: 24h, 7d, 30d, 90d"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """Get campaign performance analytics"""
     try:
@@ -241,7 +241,7 @@ async def analytics_info() -> Dict[str, Any]:
 
 @router.get("/dashboard", response_model=DashboardMetrics)
 async def get_dashboard_metrics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ) -> DashboardMetrics:
     """Get main dashboard metrics for the current user."""
@@ -289,7 +289,7 @@ async def get_campaign_analytics(
     limit: int = Query(10, ge=1, le=100),
     sort_by: str = Query("created_at", regex="^(created_at|emails_sent|open_rate|click_rate)$"),
     order: str = Query("desc", regex="^(asc|desc)$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ) -> List[CampaignAnalytics]:
     """Get detailed analytics for user campaigns."""
@@ -343,7 +343,7 @@ async def get_campaign_analytics(
 async def get_trend_data(
     metric: str = Query("emails_sent", regex="^(emails_sent|open_rate|click_rate|revenue)$"),
     period: str = Query("30d", regex="^(7d|30d|90d|1y)$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ) -> List[TimeSeriesData]:
     """Get trend data for various metrics over time."""
@@ -384,7 +384,7 @@ async def get_trend_data(
 
 @router.get("/benchmarks", response_model=List[PerformanceBenchmark])
 async def get_performance_benchmarks(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ) -> List[PerformanceBenchmark]:
     """Get performance benchmarks compared to industry standards."""
@@ -441,7 +441,7 @@ async def get_performance_benchmarks(
 
 @router.get("/summary")
 async def get_analytics_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ) -> Dict[str, Any]:
     """Return a minimal summary used by the frontend dashboard.
@@ -559,7 +559,7 @@ async def export_analytics_data(
     data_type: str = Query("campaigns", regex="^(campaigns|users|metrics)$"),
     start_date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
     end_date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
     """Export analytics data in various formats."""
@@ -599,7 +599,7 @@ async def export_analytics_data(
 
 @router.get("/admin/overview")
 async def get_admin_analytics_overview(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
 ) -> Dict[str, Any]:
     """Get system-wide analytics overview (Admin only)."""
@@ -640,7 +640,7 @@ async def get_admin_analytics_overview(
 async def get_user_activity_analytics(
     limit: int = Query(50, ge=1, le=500),
     sort_by: str = Query("last_activity", regex="^(last_activity|signup_date|campaigns_created|emails_sent)$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
 ) -> List[UserActivityAnalytics]:
     """Get user activity analytics (Admin only)."""
@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import settings
 from core.database import get_db
+from core.request_context import memoize
 from models import LoginActivity, User
 from schemas.auth import (
     LoginActivityResponse,
@@ -223,6 +224,11 @@ async def login_preflight(request: Request):
     return response
 
 
+async def _load_user(db: AsyncSession, query) -> User | None:
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
 async def get_current_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials | None = Security(security_optional),
@@ -294,12 +300,11 @@ async def get_current_user(
             else:
                 # Fall back to email lookup
                 query = select(User).where(User.email == user_sub)
-        result = await db.execute(query)
+        # Dependencies that resolve the user again in this request reuse the row
+        user = await memoize(("user", user_sub), lambda: _load_user(db, query))
     except (jwt.PyJWTError, ValidationError, ValueError):
         raise credentials_exception
 
-    user = result.scalar_one_or_none()
-
     if user is None:
         raise credentials_exception
 
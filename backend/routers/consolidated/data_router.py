@@ -21,6 +21,7 @@ from core.database import async_session
 from core.error_standardization import error_standardizer, create_not_found_error, create_duplicate_error
 from core.enhanced_audit_system import get_enhanced_audit_system, AuditEventType, AuditLevel
 from core.monitoring import performance_monitor
+from core.pagination import InvalidCursor, paginate_items
 from routers.consolidated.auth_router import get_current_user, UserProfile
 from models import LeadBase, LeadEntry, Domain, EmailBase
 
@@ -174,9 +175,11 @@ DOMAINS: Dict[str, DomainInfo] = {}
 
 @router.get("/leads", response_model=List[LeadBaseInfo])
 async def list_lead_bases(
+    response: Response,
     category: Optional[str] = None,
     search: Optional[str] = None,
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page, in place of skip"),
     limit: int = Query(100, ge=1, le=1000),
     current_user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -204,11 +207,13 @@ async def list_lead_bases(
             
             filtered_bases.append(base_info)
         
-        # Sort by creation date (newest first)
-        filtered_bases.sort(key=lambda x: x.created_at, reverse=True)
-        
-        # Apply pagination
-        paginated_bases = filtered_bases[skip:skip + limit]
+        # Newest first, one page after the cursor (or after skip)
+        page = paginate_items(
+            filtered_bases, "data.lead_bases", lambda x: (x.created_at, x.id), cursor, limit,
+            descending=True, offset=skip
+        )
+        paginated_bases = page.items
+        response.headers.update(page.headers())
         
         # Log access
         await audit_system.log_enhanced_event(
@@ -224,6 +229,8 @@ async def list_lead_bases(
         
         return paginated_bases
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing lead bases: {e}")
         error_response = error_standardizer.standardize_error(
@@ -524,10 +531,12 @@ async def upload_leads(
 @router.get("/leads/{base_id}/leads")
 async def list_leads(
     base_id: str,
+    response: Response,
     status: Optional[LeadStatus] = None,
     search: Optional[str] = None,
     company: Optional[str] = None,
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page, in place of skip"),
     limit: int = Query(100, ge=1, le=1000),
     current_user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -569,11 +578,13 @@ async def list_leads(
             
             filtered_leads.append(lead)
         
-        # Sort by creation date (newest first)
-        filtered_leads.sort(key=lambda x: x.created_at, reverse=True)
-        
-        # Apply pagination
-        paginated_leads = filtered_leads[skip:skip + limit]
+        # Newest first, one page after the cursor (or after skip)
+        page = paginate_items(
+            filtered_leads, f"data.leads.{base_id}", lambda x: (x.created_at, x.id), cursor, limit,
+            descending=True, offset=skip
+        )
+        paginated_leads = page.items
+        response.headers.update(page.headers())
         
         # Log access
         await audit_system.log_enhanced_event(
@@ -595,12 +606,14 @@ async def list_leads(
             "pagination": {
                 "skip": skip,
                 "limit": limit,
-                "has_more": len(filtered_leads) > skip + limit
+                "has_more": page.has_more
             }
         }
         
     except HTTPException:
         raise
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing leads: {e}")
         error_response = error_standardizer.standardize_error(
@@ -617,10 +630,12 @@ async def list_leads(
 
 @router.get("/domains")
 async def list_domains(
+    response: Response,
     session_id: str = Query(..., description="Session ID"),
     status: Optional[DomainStatus] = None,
     search: Optional[str] = None,
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page, in place of skip"),
     limit: int = Query(100, ge=1, le=1000),
     current_user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -641,11 +656,13 @@ async def list_domains(
             
             filtered_domains.append(domain_info)
         
-        # Sort by reputation score (highest first)
-        filtered_domains.sort(key=lambda x: x.reputation_score, reverse=True)
-        
-        # Apply pagination
-        paginated_domains = filtered_domains[skip:skip + limit]
+        # Highest reputation first, one page after the cursor (or after skip)
+        page = paginate_items(
+            filtered_domains, "data.domains", lambda x: (x.reputation_score, x.id), cursor, limit,
+            descending=True, offset=skip
+        )
+        paginated_domains = page.items
+        response.headers.update(page.headers())
         
         # Log access
         await audit_system.log_enhanced_event(
@@ -666,7 +683,7 @@ async def list_domains(
             "pagination": {
                 "skip": skip,
                 "limit": limit,
-                "has_more": len(filtered_domains) > skip + limit
+                "has_more": page.has_more
             },
             "statistics": {
                 "active_domains": len([d for d in DOMAINS.values() if d.status == DomainStatus.ACTIVE]),
@@ -675,6 +692,8 @@ async def list_domains(
             }
         }
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing domains: {e}")
         error_response = error_standardizer.standardize_error(
@@ -951,9 +970,11 @@ async def delete_domain(
 @router.get("/materials")
 async def list_materials(
     session_id: str,
+    response: Response,
     material_type: MaterialType = Query(..., description="Type of material"),
     search: Optional[str] = None,
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page, in place of skip"),
     limit: int = Query(100, ge=1, le=1000),
     current_user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -981,8 +1002,13 @@ async def list_materials(
             elif material_type == MaterialType.DOMAINS:
                 materials = [m for m in materials if search_lower in m.domain.lower()]
         
-        # Apply pagination
-        paginated_materials = materials[skip:skip + limit]
+        # Newest first, one page after the cursor (or after skip)
+        page = paginate_items(
+            materials, f"data.materials.{material_type.value}", lambda x: (x.created_at, x.id), cursor, limit,
+            descending=True, offset=skip
+        )
+        paginated_materials = page.items
+        response.headers.update(page.headers())
         
         # Log access
         await audit_system.log_enhanced_event(
@@ -1004,10 +1030,12 @@ async def list_materials(
             "pagination": {
                 "skip": skip,
                 "limit": limit,
-                "has_more": len(materials) > skip + limit
+                "has_more": page.has_more
             }
         }
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing materials: {e}")
         error_response = error_standardizer.standardize_error(
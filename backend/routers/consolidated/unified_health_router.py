@@ -3,10 +3,13 @@
 Consolidates all health/monitoring/status/security-testing endpoints into a single, organized router
 """
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
 import asyncio
 from typing import Dict, Any
 
+from core.engine_registry import engine_registry
+from core.read_replicas import replica_router
+
 # Single unified tag for Swagger cleanliness
 router = APIRouter(tags=["Monitoring & Analytics"])
 
@@ -15,11 +18,17 @@ router = APIRouter(tags=["Monitoring & Analytics"])
 # =============================================================================
 
 @router.get("/")
-async def health_overview() -> Dict[str, Any]:
+async def health_overview(request: Request) -> Dict[str, Any]:
 	"""
 	Unified Health & Monitoring Overview
 	"""
 	return {
+		# Per-step timings of this worker's startup pipeline
+		"startup": getattr(request.app.state, "startup_report", None),
+		# Size, usage and checkout wait times of each named database pool
+		"db_pools": engine_registry.pool_metrics(),
+		# Where get_read_db sessions went: replica, or primary (pinned / replicas lagging)
+		"read_routing": replica_router.stats,
 		"message": "Unified Health & Monitoring",
 		"description": "All health, readiness, monitoring, status, and security test endpoints",
 		"groups": {
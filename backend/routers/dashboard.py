@@ -9,7 +9,7 @@ from typing import Any, Dict
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from core.database import get_db
+from core.database import get_read_db
 from core.dependencies import get_current_user
 from models.base import User
 from services.dashboard_service import DashboardService
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Analytics"])
 
 
-def get_service(db=Depends(get_db)) -> DashboardService:
+def get_service(db=Depends(get_read_db)) -> DashboardService:
     return DashboardService(db)
 
 
@@ -6,6 +6,7 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Response,
     UploadFile,
 )
 from sqlalchemy import text
@@ -13,6 +14,7 @@ from sqlalchemy import text
 from core.database import get_db
 from core.email_validator import EmailValidator
 from core.logger import get_logger
+from core.pagination import InvalidCursor
 from core.smtp_checker import parse_smtp_list
 from schemas.common import SuccessResponse
 from schemas.jobs import Job, JobCreateRequest, JobLog, JobMode, JobStatus
@@ -57,15 +59,20 @@ async def create_job(
 
 @router.get("/", response_model=list[Job])
 async def list_jobs(
+    response: Response,
     limit: int = 50,
     offset: int = 0,
     status: JobStatus | None = None,
+    cursor: str | None = None,
     db=Depends(get_db),
 ):
-    """List jobs"""
+    """List jobs; the X-Next-Cursor header can be passed back as ``cursor`` instead of an offset"""
     try:
-        jobs = await job_service.list_jobs(db, limit, offset, status)
-        return jobs
+        page = await job_service.list_jobs(db, limit, offset, status, cursor)
+        response.headers.update(page.headers())
+        return page.items
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Job list error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
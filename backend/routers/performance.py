@@ -4,14 +4,18 @@ Handles system performance monitoring and testing
 """
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
+from core.cache_manager import cache_manager
 from core.database import get_db
-from routers.auth import get_current_user
+from core.l1_snapshot import l1_snapshot
+from core.query_profiler import query_profiler
+from routers.auth import get_current_admin_user, get_current_user
 
 router = APIRouter(tags=["Performance"])
 
@@ -60,6 +64,7 @@ async def performance_info() -> dict[str, Any]:
             "status": "/performance/status",
             "metrics": "/performance/metrics",
             "test": "/performance/test/quick",
+            "cache_stats": "/performance/cache/stats",
         },
     }
 
@@ -329,6 +334,38 @@ async def get_live_metrics(
         )
 
 
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: dict = Depends(get_current_user),
+) -> dict[str, Any]:
+    """Per-namespace cache statistics plus shared Redis pool usage"""
+    return {**cache_manager.get_stats(), "l1_snapshot": l1_snapshot.get_stats()}
+
+
+@router.get("/queries")
+async def get_query_profile(
+    endpoint: Optional[str] = Query(None, description="Route, e.g. 'GET /api/v1/admin/users/count'"),
+    sort: str = Query("total", pattern="^(total|count|p95|max)$"),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: dict = Depends(get_current_admin_user),
+) -> dict[str, Any]:
+    """Statement fingerprints with count/total/p95 per endpoint, plus N+1 suspects"""
+    return {
+        "enabled": settings.QUERY_PROFILER_ENABLED,
+        "n_plus_one_threshold": query_profiler.n_plus_one_threshold,
+        **query_profiler.report(endpoint=endpoint, limit=limit, sort=sort),
+    }
+
+
+@router.delete("/queries")
+async def reset_query_profile(
+    current_user: dict = Depends(get_current_admin_user),
+) -> dict[str, Any]:
+    """Start a fresh profiling window"""
+    query_profiler.reset()
+    return {"status": "reset", "since": query_profiler.started_at.isoformat()}
+
+
 @router.get("/stats")
 async def get_performance_stats(
     current_user: dict = Depends(get_current_user),
@@ -12,7 +12,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
 from routers.auth import get_current_user
 from schemas.campaigns import CampaignCreate  # Your existing schemas
-from services.plan_service import PlanService, get_plan_service
+from services.plan_service import (
+    PlanService,
+    get_plan_service,
+    invalidate_user_plan,
+)
 
 router = APIRouter(prefix="/api/v1", tags=["Admin"])
 
@@ -390,6 +394,7 @@ async def assign_plan_to_user(
 
     db.add(new_assignment)
     await db.commit()
+    await invalidate_user_plan(user_id)
 
     return {
         "message": f"Assigned {plan.name} plan to user {user_id}",
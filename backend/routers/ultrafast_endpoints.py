@@ -14,6 +14,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
+from core.cache_invalidation import invalidation_bus
 from core.ultrafast_cache import ultra_cache, ultrafast_cache
 from routers.auth import get_current_user_optional
 
@@ -203,10 +204,9 @@ async def ultrafast_cache_clear(
     if not current_user:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    # Clear L1 caches
-    ultrafast_cache.l1_hot_cache.clear()
-    ultrafast_cache.l1_session_cache.clear()
-    ultrafast_cache.l1_query_cache.clear()
+    # Clear L1 caches (here and in every other worker)
+    ultrafast_cache.invalidate_local(clear_all=True)
+    invalidation_bus.publish(clear_all=True)
     
     # Clear L2 cache (Redis) if available
     cleared_redis = False
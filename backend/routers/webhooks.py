@@ -17,11 +17,15 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request,
 from pydantic import BaseModel, HttpUrl, validator
 from sqlalchemy import select, text, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from core.database import get_db
+from core.database import BulkOperations, get_db
 from core.error_handlers import StandardErrorHandler
 from core.response_handlers import ResponseBuilder
 from models import User, WebhookDelivery, WebhookEndpoint, WebhookEvent, WebhookStats
+# The schemas below reuse the model names; delivery bookkeeping needs the tables
+from models.webhooks import WebhookDelivery as WebhookDeliveryModel
+from models.webhooks import WebhookEndpoint as WebhookEndpointModel
 from routers.auth import get_current_user, get_current_admin_user
 
 router = APIRouter()
@@ -457,101 +461,128 @@ async def get_webhook_stats(
 async def deliver_webhook(webhook_id: str, event: WebhookEvent, db: AsyncSession) -> bool:
     """Deliver a webhook event to the specified endpoint."""
     try:
-        query = select(WebhookEndpoint).where(WebhookEndpoint.id == webhook_id)
+        query = select(WebhookEndpointModel).where(WebhookEndpointModel.id == webhook_id)
         result = await db.execute(query)
         webhook = result.scalars().first()
 
         if not webhook or not webhook.is_active:
             return False
 
-        delivery_start = datetime.now()
-
-        # Prepare payload
-        payload = {
-            "id": str(event.id),
-            "event_type": event.event_type,
-            "timestamp": event.timestamp.isoformat(),
-            "data": event.data,
-        }
-
-        # Generate signature if secret is provided
-        headers = {"Content-Type": "application/json"}
-        if webhook.secret:
-            signature = generate_webhook_signature(
-                webhook.secret,
-                json.dumps(payload, default=str)
-            )
-            headers['X-Webhook-Signature'] = signature
-
-        # Make HTTP request
-        timeout = aiohttp.ClientTimeout(total=webhook.timeout_seconds)
-
-        status_code: Optional[int] = None
-        response_body: Optional[str] = None
-        error_message: Optional[str] = None
-        is_successful: bool = False
-        request_duration_ms: Optional[int] = None
-        payload_size_bytes: Optional[int] = len(json.dumps(payload).encode('utf-8'))
-        response_size_bytes: Optional[int] = None
-
-        try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    webhook.url,
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    status_code = response.status
-                    response_body = await response.text()
-                    response_size_bytes = len(response_body.encode('utf-8'))
-                    is_successful = 200 <= status_code < 300
-        except aiohttp.ClientError as e:
-            error_message = f"Client Error: {e}"
-        except asyncio.TimeoutError:
-            error_message = "Request timed out"
-        except Exception as e:
-            error_message = f"Unexpected error: {e}"
-
-        delivery_time = datetime.now()
-        request_duration_ms = int((delivery_time - delivery_start).total_seconds() * 1000)
-
-        delivery = WebhookDelivery(
-            webhook_id=webhook.id,
-            event_id=event.id,
-            url=str(webhook.url),
-            status_code=status_code,
-            response_body=response_body[:1000] if response_body else None,
-            delivery_time=delivery_time,
-            error_message=error_message,
-            retry_count=event.retry_count,
-            is_successful=is_successful,
-            request_duration_ms=request_duration_ms,
-            payload_size_bytes=payload_size_bytes,
-            response_size_bytes=response_size_bytes,
+        delivery, stats = await _send_webhook(webhook, event)
+        await _record_deliveries(db, [(webhook, delivery, stats)])
+        return delivery.is_successful
+
+    except Exception as e:
+        logger.error(f"Error delivering webhook {webhook_id}: {e}")
+        return False
+
+
+async def deliver_to_webhooks(webhooks: list, event: WebhookEvent, db: AsyncSession) -> None:
+    """Deliver an event to several endpoints concurrently and record them together."""
+    try:
+        results = await asyncio.gather(*(_send_webhook(webhook, event) for webhook in webhooks))
+        await _record_deliveries(
+            db, [(webhook, delivery, stats) for webhook, (delivery, stats) in zip(webhooks, results)]
         )
-        db.add(delivery)
-        await db.commit()
+    except Exception as e:
+        logger.error(f"Error delivering event {event.id}: {e}")
 
-        # Update webhook endpoint stats
-        if is_successful:
-            webhook.successful_deliveries += 1
-        else:
-            webhook.failed_deliveries += 1
-        webhook.total_deliveries += 1
-        webhook.last_delivery_at = delivery_time
 
-        # Recalculate average delivery time (simple average for now, could be moving average)
-        current_total_duration = (webhook.average_delivery_time * (webhook.total_deliveries - 1))
-        webhook.average_delivery_time = int((current_total_duration + request_duration_ms) / webhook.total_deliveries)
+async def _send_webhook(webhook, event: WebhookEvent):
+    """POST the event; returns the delivery record and the endpoint's updated stats."""
+    delivery_start = datetime.now()
 
-        await db.commit()
-        await db.refresh(webhook)
+    # Prepare payload
+    payload = {
+        "id": str(event.id),
+        "event_type": event.event_type,
+        "timestamp": event.timestamp.isoformat(),
+        "data": event.data,
+    }
 
-        return is_successful
+    # Generate signature if secret is provided
+    headers = {"Content-Type": "application/json"}
+    if webhook.secret:
+        signature = generate_webhook_signature(
+            webhook.secret,
+            json.dumps(payload, default=str)
+        )
+        headers['X-Webhook-Signature'] = signature
+
+    # Make HTTP request
+    timeout = aiohttp.ClientTimeout(total=webhook.timeout_seconds)
 
+    status_code: Optional[int] = None
+    response_body: Optional[str] = None
+    error_message: Optional[str] = None
+    is_successful: bool = False
+    request_duration_ms: Optional[int] = None
+    payload_size_bytes: Optional[int] = len(json.dumps(payload).encode('utf-8'))
+    response_size_bytes: Optional[int] = None
+
+    try:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.post(
+                webhook.url,
+                json=payload,
+                headers=headers
+            ) as response:
+                status_code = response.status
+                response_body = await response.text()
+                response_size_bytes = len(response_body.encode('utf-8'))
+                is_successful = 200 <= status_code < 300
+    except aiohttp.ClientError as e:
+        error_message = f"Client Error: {e}"
+    except asyncio.TimeoutError:
+        error_message = "Request timed out"
     except Exception as e:
-        logger.error(f"Error delivering webhook {webhook_id}: {e}")
-        return False
+        error_message = f"Unexpected error: {e}"
+
+    delivery_time = datetime.now()
+    request_duration_ms = int((delivery_time - delivery_start).total_seconds() * 1000)
+
+    delivery = WebhookDeliveryModel(
+        webhook_id=webhook.id,
+        event_id=event.id,
+        url=str(webhook.url),
+        status_code=status_code,
+        response_body=response_body[:1000] if response_body else None,
+        delivery_time=delivery_time,
+        error_message=error_message,
+        retry_count=event.retry_count,
+        is_successful=is_successful,
+        request_duration_ms=request_duration_ms,
+        payload_size_bytes=payload_size_bytes,
+        response_size_bytes=response_size_bytes,
+    )
+
+    # Endpoint stats, with the average delivery time kept as a simple running average
+    total_deliveries = (webhook.total_deliveries or 0) + 1
+    stats = {
+        "total_deliveries": total_deliveries,
+        "successful_deliveries": (webhook.successful_deliveries or 0) + int(is_successful),
+        "failed_deliveries": (webhook.failed_deliveries or 0) + int(not is_successful),
+        "last_delivery_at": delivery_time,
+        "average_delivery_time": int(
+            ((webhook.average_delivery_time or 0) * (total_deliveries - 1) + request_duration_ms)
+            / total_deliveries
+        ),
+    }
+    return delivery, stats
+
+
+async def _record_deliveries(db: AsyncSession, results) -> None:
+    """Insert the delivery records and update every endpoint's stats in one commit."""
+    db.add_all([delivery for _, delivery, _ in results])
+    await BulkOperations.bulk_update(
+        db, WebhookEndpointModel, [(webhook.id, stats) for webhook, _, stats in results]
+    )
+    await db.commit()
+
+    # Keep the loaded endpoints in step without marking them dirty
+    for webhook, _, stats in results:
+        for name, value in stats.items():
+            set_committed_value(webhook, name, value)
 
 
 async def test_webhook_endpoint(webhook_id: str, db: AsyncSession):
@@ -606,19 +637,19 @@ async def publish_webhook_event(
     await db.refresh(event)
 
     # Find matching webhooks
-    query = select(WebhookEndpoint).where(
-        WebhookEndpoint.is_active == True,
-        WebhookEndpoint.events.contains([event_type])
+    query = select(WebhookEndpointModel).where(
+        WebhookEndpointModel.is_active == True,
+        WebhookEndpointModel.events.contains([event_type])
     )
     if user_id:
-        query = query.where(WebhookEndpoint.user_id == user_id)
+        query = query.where(WebhookEndpointModel.user_id == user_id)
 
     result = await db.execute(query)
     matching_webhooks = result.scalars().all()
 
-    # Deliver to matching webhooks (in background)
-    for webhook in matching_webhooks:
-        asyncio.create_task(deliver_webhook(str(webhook.id), event, db))
+    # Deliver to matching webhooks (in background), recorded in one transaction
+    if matching_webhooks:
+        asyncio.create_task(deliver_to_webhooks(matching_webhooks, event, db))
 
     logger.info(f"Published event {event.id} to {len(matching_webhooks)} webhooks")
     return str(event.id)
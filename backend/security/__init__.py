@@ -2,8 +2,24 @@
 Security package for SGPT backend
 """
 
-from .advanced_security import AdvancedSecurityManager
-from .enhanced_auth import EnhancedAuth
-from .firewall import get_firewall
+from importlib import import_module
+
+# Loaded on first access, so importing one submodule (e.g. security.ip_index)
+# does not pull in the others and their optional dependencies
+_EXPORTS = {
+    "get_firewall": (".firewall", "get_firewall"),
+    "AdvancedSecurityManager": (".advanced_security", "AdvancedSecurityManager"),
+    "EnhancedAuth": (".enhanced_auth", "EnhancedAuthManager"),
+}
 
 __all__ = ["get_firewall", "AdvancedSecurityManager", "EnhancedAuth"]
+
+
+def __getattr__(name):
+    try:
+        module, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), attribute)
+    globals()[name] = value
+    return value
@@ -8,6 +8,7 @@ import ipaddress
 import json
 import logging
 import time
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -17,8 +18,53 @@ import geoip2.database
 import geoip2.errors
 import redis.asyncio as redis
 
+from core.cache_invalidation import invalidation_bus
+from .ip_index import EMPTY_INDEX, PrefixIndex
+
 logger = logging.getLogger(__name__)
 
+# Bus key and Redis counter announcing a change of rules or whitelist
+INDEX_INVALIDATION_KEY = "firewall:index"
+INDEX_VERSION_KEY = "firewall:index:version"
+
+# Distributed part of the verdict in one round trip: the blocked flag, the
+# per-IP minute counter and, past the threshold, an escalating auto-block.
+# KEYS: blocked flag, minute counter, offense counter
+# ARGV: increment (0 only reads the blocked flag), threshold, counter window,
+#       base block seconds, max block seconds, ip, now (ISO)
+# Returns {0, "", count} clean, {1, payload, 0} already blocked,
+# {2, payload, count} blocked by this call.
+VERDICT_LUA = """
+local blocked = redis.call('GET', KEYS[1])
+if blocked then
+    return {1, blocked, 0}
+end
+local increment = tonumber(ARGV[1])
+if increment == 0 then
+    return {0, '', 0}
+end
+local count = redis.call('INCRBY', KEYS[2], increment)
+if count == increment then
+    redis.call('EXPIRE', KEYS[2], tonumber(ARGV[3]))
+end
+if count <= tonumber(ARGV[2]) then
+    return {0, '', count}
+end
+local max_duration = tonumber(ARGV[5])
+local offenses = redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], max_duration)
+local duration = math.floor(math.min(tonumber(ARGV[4]) * 2 ^ (offenses - 1), max_duration))
+local threat = 'medium'
+if offenses == 2 then threat = 'high' elseif offenses > 2 then threat = 'critical' end
+local payload = cjson.encode({
+    ip_address = ARGV[6], reason = 'rate_limit', blocked_at = ARGV[7],
+    duration = duration, block_count = offenses, threat_level = threat,
+    details = {requests_per_minute = count}, auto_blocked = true
+})
+redis.call('SET', KEYS[1], payload, 'EX', duration)
+return {2, payload, count}
+"""
+
 
 class FirewallAction(Enum):
     ALLOW = "allow"
@@ -82,6 +128,9 @@ class FirewallStats:
     blocked_ips: int
     active_rules: int
     last_updated: datetime
+    # Distributed verdicts answered by the local clean-IP cache / by Redis
+    local_verdicts: int = 0
+    redis_verdicts: int = 0
 
 
 class AdvancedFirewall:
@@ -95,6 +144,9 @@ class AdvancedFirewall:
         enable_fail2ban: bool = False,
     ):
         self.redis = redis_client
+        self._verdict_script = (
+            redis_client.register_script(VERDICT_LUA) if redis_client is not None else None
+        )
         self.enable_iptables = enable_iptables
         self.enable_fail2ban = enable_fail2ban
 
@@ -111,6 +163,17 @@ class AdvancedFirewall:
         self.allowed_ips: set[str] = set()
         self.firewall_rules: dict[str, FirewallRule] = {}
         self.ip_reputation_cache: dict[str, tuple[int, datetime]] = {}
+        # Recently clean IPs: ip -> [expires (monotonic), requests not yet counted in Redis]
+        self._clean_ips: OrderedDict[str, list] = OrderedDict()
+
+        # Compiled matchers, rebuilt and swapped whole on every change
+        self._rule_index: PrefixIndex = EMPTY_INDEX
+        self._rules_expire_at: datetime | None = None
+        self._whitelist_index: PrefixIndex = EMPTY_INDEX
+        self._index_version: int | None = None
+        self._index_lock = asyncio.Lock()
+        self._reload_task: asyncio.Task | None = None
+        self._recompile_task: asyncio.Task | None = None
 
         # Statistics
         self.stats = FirewallStats(
@@ -133,6 +196,11 @@ class AdvancedFirewall:
             "rate_limit_threshold": 100,  # Requests per minute
             "brute_force_threshold": 10,  # Failed attempts
             "auto_escalation": True,  # Automatically escalate repeat offenders
+            # Skip Redis for an IP that was well under the rate limit this long ago;
+            # its requests are added to the Redis counter on the next check
+            "clean_cache_ttl": 1.0,
+            "clean_cache_fraction": 0.5,  # of rate_limit_threshold
+            "clean_cache_size": 100000,
             "whitelist_ranges": [  # Always allow these ranges
                 "127.0.0.0/8",  # Localhost
                 "10.0.0.0/8",  # Private networks
@@ -141,6 +209,8 @@ class AdvancedFirewall:
             ],
         }
 
+        self._rebuild_whitelist_index()
+
         # Background tasks
         self._cleanup_task: asyncio.Task | None = None
         self._sync_task: asyncio.Task | None = None
@@ -150,6 +220,7 @@ class AdvancedFirewall:
         """Start firewall services and background tasks"""
         await self._load_persistent_data()
         await self._initialize_system_integration()
+        invalidation_bus.register(self)
 
         # Start background tasks
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
@@ -213,49 +284,26 @@ class AdvancedFirewall:
                     f"Blocked: {blocked_ip.reason.value}",
                 )
 
-        # Check Redis for blocked IPs (distributed state)
-        redis_blocked = await self.redis.get(f"firewall:blocked:{ip_str}")
-        if redis_blocked:
-            block_data = json.loads(redis_blocked)
-            self.stats.blocked_requests += 1
-            return (
-                FirewallAction.BLOCK,
-                f"Blocked: {block_data.get('reason', 'Unknown')}",
-            )
-
-        # Check firewall rules
+        # Local checks: rules, geography, reputation
         action, reason = await self._check_firewall_rules(ip_str)
-        if action != FirewallAction.ALLOW:
+        if action == FirewallAction.ALLOW:
+            action, reason = await self._check_geographic_restrictions(ip_str)
+        if action == FirewallAction.ALLOW:
+            action, reason = await self._check_ip_reputation(ip_str)
+        if action in (FirewallAction.BLOCK, FirewallAction.DROP):
             if action == FirewallAction.BLOCK:
                 self.stats.blocked_requests += 1
             return action, reason
 
-        # Geographic filtering
-        geo_action, geo_reason = await self._check_geographic_restrictions(
-            ip_str
-        )
-        if geo_action != FirewallAction.ALLOW:
-            if geo_action == FirewallAction.BLOCK:
-                self.stats.blocked_requests += 1
-            return geo_action, geo_reason
-
-        # IP reputation check
-        reputation_action, reputation_reason = await self._check_ip_reputation(
-            ip_str
-        )
-        if reputation_action != FirewallAction.ALLOW:
-            if reputation_action == FirewallAction.BLOCK:
-                self.stats.blocked_requests += 1
-            return reputation_action, reputation_reason
-
-        # Rate limiting check
-        rate_action, rate_reason = await self._check_rate_limits(
-            ip_str, request_context
+        # Distributed state; monitored IPs are not rate counted
+        rate_action, rate_reason = await self._check_distributed_state(
+            ip_str, count=action == FirewallAction.ALLOW
         )
         if rate_action != FirewallAction.ALLOW:
-            if rate_action == FirewallAction.BLOCK:
-                self.stats.blocked_requests += 1
+            self.stats.blocked_requests += 1
             return rate_action, rate_reason
+        if action != FirewallAction.ALLOW:
+            return action, reason
 
         # Default allow
         self.stats.allowed_requests += 1
@@ -320,15 +368,23 @@ class AdvancedFirewall:
             auto_blocked=not manual,
         )
 
-        # Store in memory cache
-        self.blocked_ips[ip_str] = blocked_ip
-
         # Store in Redis for distributed access
         await self.redis.setex(
             f"firewall:blocked:{ip_str}",
             duration_seconds,
             json.dumps(asdict(blocked_ip), default=str),
         )
+        await self._record_block(blocked_ip, duration_seconds)
+
+        return True
+
+    async def _record_block(self, blocked_ip: BlockedIP, duration_seconds: int) -> None:
+        """Apply a block already stored in Redis to this worker and the host"""
+        ip_str = blocked_ip.ip_address
+
+        # Store in memory cache
+        self.blocked_ips[ip_str] = blocked_ip
+        self._clean_ips.pop(ip_str, None)
 
         # System-level blocking
         if self.enable_iptables:
@@ -341,11 +397,9 @@ class AdvancedFirewall:
         self.stats.blocked_ips = len(self.blocked_ips)
 
         logger.warning(
-            f"🚫 Blocked IP {ip_str} for {reason.value} (duration: {duration_seconds}s, threat: {threat_level.value})"
+            f"🚫 Blocked IP {ip_str} for {blocked_ip.reason.value} (duration: {duration_seconds}s, threat: {blocked_ip.threat_level.value})"
         )
 
-        return True
-
     async def unblock_ip(
         self, ip_address: str, reason: str = "Manual unblock"
     ) -> bool:
@@ -388,6 +442,7 @@ class AdvancedFirewall:
 
         # Store rule
         self.firewall_rules[rule.rule_id] = rule
+        await self._recompile_rules()
 
         # Persist to Redis
         await self.redis.hset(
@@ -395,6 +450,7 @@ class AdvancedFirewall:
             rule.rule_id,
             json.dumps(asdict(rule), default=str),
         )
+        await self._announce_index_change()
 
         # Update statistics
         self.stats.active_rules = len(self.firewall_rules)
@@ -411,9 +467,11 @@ class AdvancedFirewall:
         if rule_id in self.firewall_rules:
             rule = self.firewall_rules[rule_id]
             del self.firewall_rules[rule_id]
+            await self._recompile_rules()
 
             # Remove from Redis
             await self.redis.hdel("firewall:rules", rule_id)
+            await self._announce_index_change()
 
             # Update statistics
             self.stats.active_rules = len(self.firewall_rules)
@@ -434,9 +492,11 @@ class AdvancedFirewall:
             return False
 
         self.allowed_ips.add(ip_str)
+        self._rebuild_whitelist_index()
 
         # Persist to Redis
         await self.redis.sadd("firewall:whitelist", ip_str)
+        await self._announce_index_change()
 
         # Remove from blocked list if present
         if ip_str in self.blocked_ips:
@@ -451,7 +511,9 @@ class AdvancedFirewall:
 
         if ip_address in self.allowed_ips:
             self.allowed_ips.remove(ip_address)
+            self._rebuild_whitelist_index()
             await self.redis.srem("firewall:whitelist", ip_address)
+            await self._announce_index_change()
             logger.info(f"Removed IP from whitelist: {ip_address}")
             return True
 
@@ -490,55 +552,95 @@ class AdvancedFirewall:
 
     async def _is_whitelisted(self, ip_address: str) -> bool:
         """Check if IP is whitelisted"""
-
-        # Check in-memory cache
-        if ip_address in self.allowed_ips:
-            return True
-
-        # Check whitelist ranges
         try:
-            ip_obj = ipaddress.ip_address(ip_address)
-            for range_str in self.config["whitelist_ranges"]:
-                if ip_obj in ipaddress.ip_network(range_str):
-                    return True
+            return ip_address in self._whitelist_index
         except ValueError:
-            pass
-
-        return False
+            return False
 
     async def _check_firewall_rules(
         self, ip_address: str
     ) -> tuple[FirewallAction, str | None]:
         """Check IP against firewall rules"""
 
-        # Sort rules by priority (lower number = higher priority)
-        sorted_rules = sorted(
-            self.firewall_rules.values(), key=lambda r: r.priority
-        )
+        # Rules that expired since the index was built are passed over until
+        # the rebuild, off the event loop, swaps in a new index
+        accept = None
+        now = datetime.now()
+        if self._rules_expire_at and now > self._rules_expire_at:
+            if self._recompile_task is None or self._recompile_task.done():
+                self._recompile_task = asyncio.create_task(self._recompile_rules())
+            accept = lambda entry: not entry[2].expires_at or entry[2].expires_at > now
 
         try:
-            ip_obj = ipaddress.ip_address(ip_address)
-
-            for rule in sorted_rules:
-                # Check if rule has expired
-                if rule.expires_at and datetime.now() > rule.expires_at:
-                    continue
-
-                # Check if IP matches rule
-                try:
-                    if ip_obj in ipaddress.ip_network(rule.ip_range):
-                        return rule.action, f"Rule: {rule.name}"
-                except ValueError:
-                    logger.warning(
-                        f"Invalid IP range in rule {rule.rule_id}: {rule.ip_range}"
-                    )
-                    continue
-
+            match = self._rule_index.lookup(ip_address, accept)
         except ValueError:
             return FirewallAction.BLOCK, "Invalid IP address"
 
+        if match is not None:
+            rule = match[2]
+            return rule.action, f"Rule: {rule.name}"
         return FirewallAction.ALLOW, None
 
+    def _rebuild_rule_index(self, rules: list[FirewallRule] | None = None) -> None:
+        """
+        Compile the live rules (lower priority number wins, then the older
+        rule) and swap the index in; ``check_ip`` never sees a partial one.
+        """
+        if rules is None:
+            rules = list(self.firewall_rules.values())
+        now = datetime.now()
+        entries = []
+        expire_at = None
+        for seq, rule in enumerate(rules):
+            if rule.expires_at:
+                if now > rule.expires_at:
+                    continue
+                expire_at = min(expire_at or rule.expires_at, rule.expires_at)
+            try:
+                ipaddress.ip_network(rule.ip_range, strict=False)
+            except ValueError:
+                logger.warning(
+                    f"Invalid IP range in rule {rule.rule_id}: {rule.ip_range}"
+                )
+                continue
+            entries.append((rule.ip_range, (rule.priority, seq, rule)))
+
+        self._rule_index = PrefixIndex(entries, rank=lambda entry: entry[:2])
+        self._rules_expire_at = expire_at
+
+    async def _recompile_rules(self) -> None:
+        """Rebuild the rule index off the event loop (100k rules take about a second)"""
+        async with self._index_lock:
+            rules = list(self.firewall_rules.values())
+            await asyncio.to_thread(self._rebuild_rule_index, rules)
+
+    def _rebuild_whitelist_index(self) -> None:
+        """Compile whitelisted IPs and ``config["whitelist_ranges"]``; call after changing either"""
+        entries = [(ip, True) for ip in self.allowed_ips]
+        for range_str in self.config["whitelist_ranges"]:
+            try:
+                ipaddress.ip_network(range_str, strict=False)
+            except ValueError:
+                logger.warning(f"Invalid whitelist range: {range_str}")
+                continue
+            entries.append((range_str, True))
+        self._whitelist_index = PrefixIndex(entries)
+
+    async def _announce_index_change(self) -> None:
+        """Tell other workers to reload rules and whitelist"""
+        try:
+            self._index_version = await self.redis.incr(INDEX_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to bump firewall index version: {e}")
+        invalidation_bus.publish(keys=[INDEX_INVALIDATION_KEY])
+
+    def invalidate_local(self, keys=(), patterns=(), tags=(), clear_all: bool = False) -> None:
+        """Invalidation bus listener: reload when another worker changed the index"""
+        if not clear_all and INDEX_INVALIDATION_KEY not in keys:
+            return
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self._load_persistent_data())
+
     async def _check_geographic_restrictions(
         self, ip_address: str
     ) -> tuple[FirewallAction, str | None]:
@@ -601,33 +703,88 @@ class AdvancedFirewall:
         # For now, return allow
         return FirewallAction.ALLOW, None
 
-    async def _check_rate_limits(
-        self, ip_address: str, request_context: dict[str, any] | None
+    async def _check_distributed_state(
+        self, ip_address: str, count: bool = True
     ) -> tuple[FirewallAction, str | None]:
-        """Check rate limits"""
+        """
+        Blocked flag, rate counter and auto-block in one EVALSHA, or none
+        for an IP that was recently well under the limit. Fails open when
+        Redis is unavailable.
+        """
+        if self._verdict_script is None:
+            return FirewallAction.ALLOW, None
+
+        now = time.monotonic()
+        increment = 0
+        if count:
+            clean = self._clean_ips.get(ip_address)
+            if clean is not None:
+                if clean[0] > now:
+                    clean[1] += 1
+                    self.stats.local_verdicts += 1
+                    return FirewallAction.ALLOW, None
+                del self._clean_ips[ip_address]
+            increment = 1 + (clean[1] if clean is not None else 0)
 
         current_minute = int(time.time() // 60)
-        rate_key = f"firewall:rate:{ip_address}:{current_minute}"
-
-        # Get current count
-        current_count = await self.redis.incr(rate_key)
-        await self.redis.expire(rate_key, 60)  # Expire after 1 minute
-
-        if current_count > self.config["rate_limit_threshold"]:
-            # Auto-block for rate limit violation
-            await self.block_ip(
-                ip_address,
-                BlockReason.RATE_LIMIT,
-                duration_seconds=self.config["default_block_duration"],
-                threat_level=ThreatLevel.MEDIUM,
-                details={"requests_per_minute": current_count},
+        try:
+            code, payload, current_count = await self._verdict_script(
+                keys=[
+                    f"firewall:blocked:{ip_address}",
+                    f"firewall:rate:{ip_address}:{current_minute}",
+                    f"firewall:offenses:{ip_address}",
+                ],
+                args=[
+                    increment,
+                    self.config["rate_limit_threshold"],
+                    60,
+                    self.config["default_block_duration"],
+                    self.config["max_block_duration"],
+                    ip_address,
+                    datetime.now().isoformat(),
+                ],
             )
+        except Exception as e:
+            logger.warning(f"Firewall verdict unavailable for {ip_address}: {e}")
+            return FirewallAction.ALLOW, None
+        self.stats.redis_verdicts += 1
+
+        code, current_count = int(code), int(current_count)
+        if code == 0:
+            threshold = self.config["rate_limit_threshold"] * self.config["clean_cache_fraction"]
+            if count and current_count <= threshold:
+                self._clean_ips[ip_address] = [now + self.config["clean_cache_ttl"], 0]
+                if len(self._clean_ips) > self.config["clean_cache_size"]:
+                    self._clean_ips.popitem(last=False)
+            return FirewallAction.ALLOW, None
+
+        if isinstance(payload, bytes):
+            payload = payload.decode()
+        block_data = json.loads(payload)
+        if code == 1:
             return (
                 FirewallAction.BLOCK,
-                f"Rate limit exceeded: {current_count} requests/minute",
+                f"Blocked: {block_data.get('reason', 'Unknown')}",
             )
 
-        return FirewallAction.ALLOW, None
+        # Blocked by this request: mirror the block locally
+        blocked_at = datetime.fromisoformat(block_data["blocked_at"])
+        await self._record_block(
+            BlockedIP(
+                ip_address=ip_address,
+                reason=BlockReason.RATE_LIMIT,
+                blocked_at=blocked_at,
+                expires_at=blocked_at + timedelta(seconds=block_data["duration"]),
+                block_count=block_data["block_count"],
+                threat_level=ThreatLevel(block_data["threat_level"]),
+                details=block_data["details"],
+            ),
+            block_data["duration"],
+        )
+        return (
+            FirewallAction.BLOCK,
+            f"Rate limit exceeded: {current_count} requests/minute",
+        )
 
     async def _block_ip_iptables(self, ip_address: str):
         """Block IP using iptables"""
@@ -668,20 +825,27 @@ class AdvancedFirewall:
     async def _load_persistent_data(self):
         """Load persistent firewall data from Redis"""
         try:
+            version = await self.redis.get(INDEX_VERSION_KEY)
+
             # Load whitelist
             whitelist = await self.redis.smembers("firewall:whitelist")
-            self.allowed_ips = set(
+            allowed_ips = set(
                 ip.decode() if isinstance(ip, bytes) else ip
                 for ip in whitelist
             )
 
             # Load rules
+            firewall_rules = {}
             rules_data = await self.redis.hgetall("firewall:rules")
             for rule_id, rule_data in rules_data.items():
                 try:
                     if isinstance(rule_data, bytes):
                         rule_data = rule_data.decode()
                     rule_dict = json.loads(rule_data)
+                    # Stored as "block" or, by json.dumps(default=str), "FirewallAction.BLOCK"
+                    rule_dict["action"] = FirewallAction(
+                        str(rule_dict["action"]).split(".")[-1].lower()
+                    )
                     rule_dict["created_at"] = datetime.fromisoformat(
                         rule_dict["created_at"]
                     )
@@ -691,10 +855,17 @@ class AdvancedFirewall:
                         )
 
                     rule = FirewallRule(**rule_dict)
-                    self.firewall_rules[rule.rule_id] = rule
+                    firewall_rules[rule.rule_id] = rule
                 except Exception as e:
                     logger.error(f"Failed to load rule {rule_id}: {e}")
 
+            # Swap in the loaded state, then compile it
+            self.allowed_ips = allowed_ips
+            self.firewall_rules = firewall_rules
+            self._rebuild_whitelist_index()
+            await self._recompile_rules()
+            self._index_version = int(version) if version else None
+
             # Update statistics
             self.stats.active_rules = len(self.firewall_rules)
 
@@ -770,8 +941,10 @@ class AdvancedFirewall:
             try:
                 await asyncio.sleep(60)  # Run every minute
 
-                # Sync blocked IPs from Redis
-                # This ensures consistency across multiple instances
+                # Catch up on index changes whose bus message was missed
+                version = await self.redis.get(INDEX_VERSION_KEY)
+                if version and int(version) != self._index_version:
+                    await self._load_persistent_data()
 
             except asyncio.CancelledError:
                 break
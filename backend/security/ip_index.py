@@ -0,0 +1,101 @@
+"""
+IP Prefix Index
+Immutable, compiled IPv4/IPv6 prefix tables for firewall rule and whitelist matching
+"""
+
+import ipaddress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+IPAddress = Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+_BITS = {4: 32, 6: 128}
+
+
+class PrefixIndex:
+    """
+    Networks compiled into one hash table per prefix length and family.
+
+    A lookup shifts the address once per distinct prefix length and probes
+    that table, so its cost depends on how many prefix lengths are in use
+    (at most 33 for IPv4, 129 for IPv6), not on how many networks there
+    are. This is a level-compressed binary trie: each table is one level.
+
+    With ``rank`` the matching value with the lowest rank wins (priority
+    order); levels are probed cheapest-rank first and the probe stops once
+    no remaining level can beat the match. Without it the longest prefix
+    wins. Instances never change after construction; rebuild and swap the
+    reference to update.
+    """
+
+    __slots__ = ("_levels", "_ranked", "size")
+
+    def __init__(
+        self,
+        entries: Iterable[Tuple[str, Any]] = (),
+        rank: Optional[Callable[[Any], Any]] = None,
+    ):
+        tables: Dict[Tuple[int, int], Dict[int, Tuple[Any, Any]]] = {}
+        size = 0
+        for network, value in entries:
+            net = ipaddress.ip_network(network, strict=False)
+            bits = _BITS[net.version]
+            key = int(net.network_address) >> (bits - net.prefixlen)
+            order = rank(value) if rank else net.prefixlen
+            table = tables.setdefault((net.version, net.prefixlen), {})
+            current = table.get(key)
+            # Same network twice: keep the better-ranked value (first on a tie)
+            if current is None or (rank and order < current[0]):
+                if current is None:
+                    size += 1
+                table[key] = (order, value)
+
+        levels: Dict[int, List[Tuple[int, Dict[int, Tuple[Any, Any]], Any]]] = {4: [], 6: []}
+        for (version, prefixlen), table in tables.items():
+            best = min(order for order, _ in table.values())
+            levels[version].append((_BITS[version] - prefixlen, table, best))
+        for version in levels:
+            if rank:
+                levels[version].sort(key=lambda level: level[2])
+            else:
+                # Longest prefix (smallest shift) first
+                levels[version].sort(key=lambda level: level[0])
+
+        self._levels = {version: tuple(items) for version, items in levels.items()}
+        self._ranked = rank is not None
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, ip: IPAddress) -> bool:
+        return self.lookup(ip) is not None
+
+    def lookup(self, ip: IPAddress, accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        Value of the best network containing ``ip``, or None (ValueError for
+        a bad address). With ``accept``, values it rejects are passed over.
+        """
+        address = ip if isinstance(ip, ipaddress._BaseAddress) else ipaddress.ip_address(ip)
+        levels = self._levels[address.version]
+        if not levels:
+            return None
+        number = int(address)
+
+        if not self._ranked:
+            for shift, table, _ in levels:
+                hit = table.get(number >> shift)
+                if hit is not None and (accept is None or accept(hit[1])):
+                    return hit[1]
+            return None
+
+        best = None
+        for shift, table, level_best in levels:
+            if best is not None and best[0] <= level_best:
+                break
+            hit = table.get(number >> shift)
+            if hit is not None and (best is None or hit[0] < best[0]) and (accept is None or accept(hit[1])):
+                best = hit
+        return best[1] if best is not None else None
+
+
+EMPTY_INDEX = PrefixIndex()
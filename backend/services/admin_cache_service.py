@@ -9,15 +9,25 @@ from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
 
 from ..config.admin_database_config import AdminSessionLocal
+from ..core.cache_manager import cache_manager
+from ..core.pagination import InvalidCursor, SortKey, paginate_query
 from ..models.admin_models import AdminCachedMetrics, AdminCachedUsers
 from .main_server_client import get_main_server_client
 
 logger = logging.getLogger(__name__)
 
+CACHED_USER_ORDER = SortKey.of("admin.cached_users", AdminCachedUsers.email, AdminCachedUsers.user_id)
+
 class AdminCacheService:
-    """Service for managing cached data from main server"""
+    """
+    Service for managing cached data from main server
+
+    The admin database is the durable copy; valid metrics are also kept in
+    the ``admin`` cache manager namespace so hot reads skip the database.
+    """
     
     def __init__(self):
+        self.namespace = cache_manager.namespace("admin")
         self.cache_ttl = {
             "user_list": 300,      # 5 minutes
             "user_metrics": 180,   # 3 minutes
@@ -31,6 +41,11 @@ class AdminCacheService:
         """
         Get cached metrics, refresh if expired or force_refresh is True
         """
+        if not force_refresh:
+            hot = await self.namespace.get(self._metric_key(metric_type))
+            if hot is not None:
+                return hot
+        
         admin_db = AdminSessionLocal()
         try:
             # Check if cached data exists and is valid
@@ -41,9 +56,12 @@ class AdminCacheService:
             
             if cached_metric and not force_refresh:
                 # Check if cache is still valid
-                if datetime.utcnow() < cached_metric.expires_at:
+                remaining = (cached_metric.expires_at - datetime.utcnow()).total_seconds()
+                if remaining > 0:
                     logger.info(f"Using cached data for {metric_type}")
-                    return json.loads(cached_metric.metric_data)
+                    data = json.loads(cached_metric.metric_data)
+                    await self.namespace.set(self._metric_key(metric_type), data, int(remaining) or 1)
+                    return data
                 else:
                     # Mark as invalid
                     cached_metric.is_valid = False
@@ -56,6 +74,9 @@ class AdminCacheService:
             if fresh_data:
                 # Update cache
                 await self._update_cache(admin_db, metric_type, fresh_data)
+                await self.namespace.set(
+                    self._metric_key(metric_type), fresh_data, self.cache_ttl.get(metric_type, 300)
+                )
                 return fresh_data
             else:
                 # If fresh data failed, try to return stale cache as fallback
@@ -70,6 +91,9 @@ class AdminCacheService:
         finally:
             admin_db.close()
     
+    def _metric_key(self, metric_type: str) -> str:
+        return f"admin:metrics:{metric_type}"
+    
     async def _fetch_from_main_server(self, metric_type: str) -> Optional[Dict]:
         """
         Fetch data from main server based on metric type
@@ -187,9 +211,12 @@ class AdminCacheService:
             logger.error(f"Failed to refresh user cache: {e}")
             return False
     
-    async def get_cached_users(self, page: int = 1, limit: int = 50, search: str = None) -> Dict:
+    async def get_cached_users(self, page: int = 1, limit: int = 50, search: str = None, cursor: str = None) -> Dict:
         """
-        Get cached users with pagination and search
+        Get cached users by email with pagination and search
+
+        ``cursor`` (the ``next_cursor`` of the previous result) replaces
+        ``page`` and skips the OFFSET scan.
         """
         admin_db = AdminSessionLocal()
         try:
@@ -202,9 +229,8 @@ class AdminCacheService:
             # Get total count
             total = query.count()
             
-            # Apply pagination
-            offset = (page - 1) * limit
-            users = query.offset(offset).limit(limit).all()
+            result = paginate_query(query, CACHED_USER_ORDER, cursor, limit, offset=(page - 1) * limit)
+            users = result.items
             
             # Format response
             user_list = []
@@ -229,15 +255,18 @@ class AdminCacheService:
                     "total": total,
                     "pages": (total + limit - 1) // limit
                 },
+                "next_cursor": result.next_cursor,
                 "cache_info": {
                     "last_refresh": max([u.cached_at for u in users]).isoformat() if users else None,
                     "needs_sync_count": admin_db.query(AdminCachedUsers).filter(AdminCachedUsers.needs_sync == True).count()
                 }
             }
             
+        except InvalidCursor:
+            raise
         except Exception as e:
             logger.error(f"Failed to get cached users: {e}")
-            return {"users": [], "pagination": {"page": page, "limit": limit, "total": 0, "pages": 0}}
+            return {"users": [], "pagination": {"page": page, "limit": limit, "total": 0, "pages": 0}, "next_cursor": None}
         finally:
             admin_db.close()
     
@@ -245,6 +274,11 @@ class AdminCacheService:
         """
         Invalidate cache entries
         """
+        if metric_type:
+            await self.namespace.delete(self._metric_key(metric_type))
+        else:
+            await self.namespace.clear_pattern(self._metric_key("*"))
+        
         admin_db = AdminSessionLocal()
         try:
             if metric_type:
@@ -294,6 +328,7 @@ class AdminCacheService:
                     "needs_sync": needs_sync_count,
                     "last_refresh": None  # Could add this to track
                 },
+                "hot_cache": self.namespace.get_stats(),
                 "cache_health": {
                     "total_entries": len(metrics_cache) + user_cache_count,
                     "valid_entries": len([c for c in metrics_cache if c.is_valid]) + (user_cache_count - needs_sync_count),
@@ -346,9 +381,9 @@ async def get_cached_user_metrics(force_refresh: bool = False) -> Dict:
     """Get cached user metrics"""
     return await cache_service.get_cached_metrics("user_metrics", force_refresh)
 
-async def get_cached_users(page: int = 1, limit: int = 50, search: str = None) -> Dict:
+async def get_cached_users(page: int = 1, limit: int = 50, search: str = None, cursor: str = None) -> Dict:
     """Get cached users"""
-    return await cache_service.get_cached_users(page, limit, search)
+    return await cache_service.get_cached_users(page, limit, search, cursor)
 
 async def refresh_all_cache():
     """Refresh all cache data"""
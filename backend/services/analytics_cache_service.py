@@ -3,7 +3,6 @@ Analytics Cache Service
 Redis-based caching for analytics endpoints with intelligent cache invalidation
 """
 
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union
@@ -12,9 +11,9 @@ from functools import wraps
 import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config.redis_config import get_redis_client
 from config.settings import settings
-from core.enhanced_cache import EnhancedCache
+from core.cache_manager import cache_manager
+from core.cache_stampede import stampede_guard
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +22,15 @@ class AnalyticsCacheService:
     """
     Redis-based caching service for analytics endpoints
     Provides intelligent caching with automatic invalidation
+
+    Entries live in the ``analytics`` cache manager namespace.
     """
     
     def __init__(self):
-        self.redis_client: Optional[aioredis.Redis] = None
-        self.enhanced_cache = EnhancedCache()
+        self.namespace = cache_manager.namespace("analytics")
         
         # Cache configuration
-        self.default_ttl = 3600  # 1 hour
+        self.default_ttl = self.namespace.default_ttl  # 1 hour
         self.short_ttl = 300     # 5 minutes for real-time data
         self.long_ttl = 86400    # 24 hours for historical data
         
@@ -45,7 +45,7 @@ class AnalyticsCacheService:
             "realtime": "analytics:realtime:",
         }
         
-        # Cache invalidation patterns
+        # Cache invalidation patterns (event -> scopes; each scope is a tag set)
         self.invalidation_patterns = {
             "campaign_created": ["campaign_stats", "user_stats"],
             "campaign_updated": ["campaign_stats"],
@@ -54,16 +54,14 @@ class AnalyticsCacheService:
             "user_activity": ["user_stats", "realtime"],
         }
     
+    @property
+    def redis_client(self) -> Optional[aioredis.Redis]:
+        return self.namespace.redis_client
+
     async def init_client(self):
-        """Initialize Redis client"""
-        if not self.redis_client:
-            try:
-                self.redis_client = await get_redis_client()
-                await self.enhanced_cache.init_redis()
-                logger.info("Analytics cache service initialized successfully")
-            except Exception as e:
-                logger.warning(f"Redis unavailable for analytics caching: {e}")
-                self.redis_client = None
+        """Initialize the shared Redis pool"""
+        if not self.redis_client and await cache_manager.init():
+            logger.info("Analytics cache service initialized successfully")
     
     def _generate_key(self, prefix: str, **kwargs) -> str:
         """Generate cache key from prefix and parameters"""
@@ -74,6 +72,13 @@ class AnalyticsCacheService:
         sorted_params = sorted(kwargs.items())
         param_str = ":".join(f"{k}={v}" for k, v in sorted_params)
         return f"{prefix}{param_str}"
+
+    def _scope_tags(self, scope: str, user_id: Optional[str] = None) -> List[str]:
+        """Tags for an analytics entry: its scope, plus per-user scope and user tags"""
+        tags = [f"analytics:{scope}"]
+        if user_id is not None:
+            tags += [f"analytics:{scope}:user:{user_id}", f"user:{user_id}"]
+        return tags
     
     async def get_cached_analytics(
         self, 
@@ -83,53 +88,37 @@ class AnalyticsCacheService:
         """Get cached analytics data"""
         if not self.redis_client:
             return None
-        
-        try:
-            cached_data = await self.redis_client.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data)
-        except Exception as e:
-            logger.error(f"Error retrieving cached analytics: {e}")
-        
-        return None
+        return await self.namespace.get(cache_key)
     
     async def set_cached_analytics(
         self, 
         cache_key: str, 
         data: Dict[str, Any], 
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
     ) -> bool:
-        """Cache analytics data"""
+        """Cache analytics data, indexing it under ``tags`` for invalidation"""
         if not self.redis_client:
             return False
-        
-        try:
-            ttl = ttl or self.default_ttl
-            await self.redis_client.setex(
-                cache_key,
-                ttl,
-                json.dumps(data, default=str)
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Error caching analytics data: {e}")
-            return False
+        return await self.namespace.set(cache_key, data, ttl or self.default_ttl, tags=tags or ())
     
     async def invalidate_analytics_cache(self, event_type: str, **kwargs):
-        """Invalidate cache based on event type"""
+        """
+        Invalidate cache based on event type.
+
+        Pass ``user_id`` to limit invalidation to that user's entries;
+        otherwise every entry in the affected scopes is dropped.
+        """
         if not self.redis_client:
             return
         
         try:
-            patterns = self.invalidation_patterns.get(event_type, [])
-            for pattern in patterns:
-                prefix = self.prefixes.get(pattern, "")
-                if prefix:
-                    # Find and delete all keys matching the pattern
-                    pattern_keys = await self.redis_client.keys(f"{prefix}*")
-                    if pattern_keys:
-                        await self.redis_client.delete(*pattern_keys)
-                        logger.info(f"Invalidated {len(pattern_keys)} cache keys for {pattern}")
+            user_id = kwargs.get("user_id")
+            for scope in self.invalidation_patterns.get(event_type, []):
+                tag = f"analytics:{scope}:user:{user_id}" if user_id is not None else f"analytics:{scope}"
+                removed = await self.namespace.invalidate_tags(tag)
+                if removed:
+                    logger.info(f"Invalidated {removed} cache keys for {tag}")
         except Exception as e:
             logger.error(f"Error invalidating analytics cache: {e}")
     
@@ -168,7 +157,7 @@ class AnalyticsCacheService:
             date_to=date_to.isoformat() if date_to else None
         )
         
-        return await self.set_cached_analytics(cache_key, data, self.default_ttl)
+        return await self.set_cached_analytics(cache_key, data, self.default_ttl, tags=self._scope_tags("campaign_stats", user_id))
     
     async def get_user_analytics(
         self, 
@@ -197,7 +186,7 @@ class AnalyticsCacheService:
             period=period
         )
         
-        return await self.set_cached_analytics(cache_key, data, self.long_ttl)
+        return await self.set_cached_analytics(cache_key, data, self.long_ttl, tags=self._scope_tags("user_stats", user_id))
     
     async def get_email_analytics(
         self, 
@@ -234,7 +223,7 @@ class AnalyticsCacheService:
             date_to=date_to.isoformat() if date_to else None
         )
         
-        return await self.set_cached_analytics(cache_key, data, self.short_ttl)
+        return await self.set_cached_analytics(cache_key, data, self.short_ttl, tags=self._scope_tags("email_stats", user_id))
     
     async def get_webhook_analytics(
         self, 
@@ -263,7 +252,7 @@ class AnalyticsCacheService:
             webhook_id=webhook_id
         )
         
-        return await self.set_cached_analytics(cache_key, data, self.default_ttl)
+        return await self.set_cached_analytics(cache_key, data, self.default_ttl, tags=self._scope_tags("webhook_stats", user_id))
     
     async def get_system_analytics(self) -> Optional[Dict[str, Any]]:
         """Get cached system analytics"""
@@ -273,7 +262,7 @@ class AnalyticsCacheService:
     async def cache_system_analytics(self, data: Dict[str, Any]) -> bool:
         """Cache system analytics data"""
         cache_key = self.prefixes["system_stats"]
-        return await self.set_cached_analytics(cache_key, data, self.short_ttl)
+        return await self.set_cached_analytics(cache_key, data, self.short_ttl, tags=self._scope_tags("system_stats"))
     
     async def get_realtime_analytics(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get cached real-time analytics"""
@@ -289,7 +278,7 @@ class AnalyticsCacheService:
             self.prefixes["realtime"],
             user_id=user_id
         )
-        return await self.set_cached_analytics(cache_key, data, self.short_ttl)
+        return await self.set_cached_analytics(cache_key, data, self.short_ttl, tags=self._scope_tags("realtime", user_id))
     
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -306,12 +295,21 @@ class AnalyticsCacheService:
                 "total_commands_processed": info.get("total_commands_processed"),
                 "keyspace_hits": info.get("keyspace_hits"),
                 "keyspace_misses": info.get("keyspace_misses"),
-                "hit_rate": self._calculate_hit_rate(info),
+                # Redis-wide figure; "namespace" holds this cache's own counters
+                "keyspace_hit_rate": self._calculate_hit_rate(info),
+                "hit_rate": self._namespace_hit_rate(),
+                "namespace": self.namespace.get_stats(),
             }
         except Exception as e:
             logger.error(f"Error getting cache stats: {e}")
             return {"status": "error", "message": str(e)}
     
+    def _namespace_hit_rate(self) -> float:
+        """Hit rate of analytics lookups only"""
+        stats = self.namespace.stats
+        total = stats['total_requests']
+        return (stats['l2_hits'] / total * 100) if total > 0 else 0.0
+    
     def _calculate_hit_rate(self, info: Dict[str, Any]) -> float:
         """Calculate cache hit rate"""
         hits = info.get("keyspace_hits", 0)
@@ -324,9 +322,18 @@ class AnalyticsCacheService:
 analytics_cache = AnalyticsCacheService()
 
 
-def cache_analytics_result(ttl: Optional[int] = None, cache_key_func: Optional[callable] = None):
+def cache_analytics_result(
+    ttl: Optional[int] = None,
+    cache_key_func: Optional[callable] = None,
+    stale_ttl: int = 0,
+    refresh_beta: float = 0.0,
+):
     """
     Decorator to cache analytics function results
+
+    Concurrent misses are coalesced in-process and across workers (Redis
+    lease). ``stale_ttl`` serves expired results while one caller refreshes
+    them; ``refresh_beta`` enables probabilistic early refresh.
     """
     def decorator(func):
         @wraps(func)
@@ -337,15 +344,27 @@ def cache_analytics_result(ttl: Optional[int] = None, cache_key_func: Optional[c
             else:
                 cache_key = f"analytics:{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
             
-            # Try to get from cache first
-            cached_result = await analytics_cache.get_cached_analytics(cache_key, ttl)
-            if cached_result is not None:
-                return cached_result
+            async def compute():
+                return await func(*args, **kwargs)
+            
+            async def load(key):
+                return await analytics_cache.get_cached_analytics(key, ttl)
             
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await analytics_cache.set_cached_analytics(cache_key, result, ttl)
+            async def store(key, entry, entry_ttl):
+                await analytics_cache.set_cached_analytics(
+                    key, entry, entry_ttl, tags=[f"analytics:fn:{func.__name__}"]
+                )
             
-            return result
+            return await stampede_guard.fetch(
+                cache_key,
+                compute,
+                load=load,
+                store=store,
+                ttl=ttl or analytics_cache.default_ttl,
+                stale_ttl=stale_ttl,
+                beta=refresh_beta,
+                redis_client=analytics_cache.redis_client,
+                name=f"{func.__module__}.{func.__qualname__}",
+            )
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
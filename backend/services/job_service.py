@@ -1,14 +1,49 @@
 import asyncio
+import json
 import uuid
 from datetime import datetime, timedelta
+from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    literal_column,
+    select,
+    text,
+)
 
+from core.database import BulkOperations
 from core.logger import get_logger
+from core.pagination import Page, SortKey, paginate
 from schemas.jobs import Job, JobCreateRequest, JobStatus
 
 logger = get_logger(__name__)
 
+# Columns the status/progress bookkeeping writes (jobs has no ORM model)
+jobs_table = Table(
+    "jobs",
+    MetaData(),
+    Column("id", String, primary_key=True),
+    Column("status", String),
+    Column("started_at", DateTime),
+    Column("completed_at", DateTime),
+    Column("error_message", Text),
+    Column("sent_emails", Integer),
+    Column("failed_emails", Integer),
+    Column("total_emails", Integer),
+    Column("progress", Float),
+    Column("created_at", DateTime),
+)
+
+# Newest first; id breaks ties between jobs created in the same instant
+JOB_ORDER = SortKey.of("jobs", jobs_table.c.created_at, jobs_table.c.id, descending=True)
+
 
 class JobService:
     """Job management service"""
@@ -39,6 +74,48 @@ class JobService:
         job_data = result.fetchone()
         return Job(**dict(job_data))
 
+    async def create_task_job(
+        self, mode: str, config: dict[str, Any], db_connection, total: int = 0
+    ) -> str:
+        """Create the row of a job that is not an email send (imports, exports)"""
+        job_id = str(uuid.uuid4())
+        await db_connection.execute(
+            text(
+                "INSERT INTO jobs (id, status, mode, config, total_emails, sent_emails, failed_emails, progress, created_at) "
+                "VALUES (:job_id, :status, :mode, :config, :total, 0, 0, 0, :created_at)"
+            ),
+            {
+                "job_id": job_id,
+                "status": JobStatus.PENDING,
+                "mode": mode,
+                "config": json.dumps(config, default=str),
+                "total": total,
+                "created_at": datetime.utcnow(),
+            },
+        )
+        return job_id
+
+    async def get_task_job(self, job_id: str, mode: str, db_connection) -> dict[str, Any] | None:
+        """Row of a job created by ``create_task_job``, with ``config`` decoded"""
+        result = await db_connection.execute(
+            text("SELECT * FROM jobs WHERE id = :job_id AND mode = :mode"),
+            {"job_id": job_id, "mode": mode},
+        )
+        row = result.mappings().first()
+        if row is None:
+            return None
+        job = dict(row)
+        if isinstance(job.get("config"), str):
+            job["config"] = json.loads(job["config"])
+        return job
+
+    async def update_job_config(self, job_id: str, config: dict[str, Any], db_connection):
+        """Replace a job's config, e.g. to record its results"""
+        await db_connection.execute(
+            text("UPDATE jobs SET config = :config WHERE id = :job_id"),
+            {"job_id": job_id, "config": json.dumps(config, default=str)},
+        )
+
     async def get_job(self, job_id: str, db_connection) -> Job | None:
         """Get job by ID"""
         result = await db_connection.execute(
@@ -55,22 +132,16 @@ class JobService:
         limit: int = 50,
         offset: int = 0,
         status: JobStatus | None = None,
-    ) -> list[Job]:
-        """List jobs with pagination"""
+        cursor: str | None = None,
+    ) -> Page[Job]:
+        """List jobs newest first, one page after ``cursor`` (or ``offset``)"""
+        query = select(literal_column("*")).select_from(jobs_table)
         if status:
-            query = text(
-                "SELECT * FROM jobs WHERE status = :status ORDER BY created_at DESC LIMIT :limit OFFSET :offset"
-            )
-            params = {"status": status, "limit": limit, "offset": offset}
-        else:
-            query = text(
-                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT :limit OFFSET :offset"
-            )
-            params = {"limit": limit, "offset": offset}
+            query = query.where(jobs_table.c.status == status)
 
-        result = await db_connection.execute(query, params)
-        jobs_data = result.fetchall()
-        return [Job(**dict(job)) for job in jobs_data]
+        page = await paginate(db_connection, query, JOB_ORDER, cursor, limit, offset=offset)
+        page.items = [Job(**job._mapping) for job in page.items]
+        return page
 
     async def update_job_status(
         self,
@@ -80,27 +151,32 @@ class JobService:
         error_message: str | None = None,
     ):
         """Update job status"""
-        params = {"job_id": job_id, "status": status}
-        update_fields = ["status = :status"]
-
-        if status == JobStatus.RUNNING:
-            update_fields.append("started_at = :started_at")
-            params["started_at"] = datetime.utcnow()
-        elif status in [
-            JobStatus.COMPLETED,
-            JobStatus.FAILED,
-            JobStatus.CANCELLED,
-        ]:
-            update_fields.append("completed_at = :completed_at")
-            params["completed_at"] = datetime.utcnow()
-        if error_message:
-            update_fields.append("error_message = :error_message")
-            params["error_message"] = error_message
-
-        query = (
-            f"UPDATE jobs SET {', '.join(update_fields)} WHERE id = :job_id"
+        await self.update_job_statuses(
+            [(job_id, status, error_message)], db_connection
         )
-        await db_connection.execute(text(query), params)
+
+    async def update_job_statuses(
+        self,
+        updates: list[tuple[str, JobStatus, str | None]],
+        db_connection,
+    ):
+        """Update the status of many jobs in batched statements"""
+        now = datetime.utcnow()
+        rows = []
+        for job_id, status, error_message in updates:
+            changes = {"status": status}
+            if status == JobStatus.RUNNING:
+                changes["started_at"] = now
+            elif status in [
+                JobStatus.COMPLETED,
+                JobStatus.FAILED,
+                JobStatus.CANCELLED,
+            ]:
+                changes["completed_at"] = now
+            if error_message:
+                changes["error_message"] = error_message
+            rows.append((job_id, changes))
+        await BulkOperations.bulk_update(db_connection, jobs_table, rows)
 
     async def update_job_progress(
         self,
@@ -111,24 +187,34 @@ class JobService:
         db_connection,
     ):
         """Update job progress"""
-        progress = (
-            (sent_emails + failed_emails) / total_emails
-            if total_emails > 0
-            else 0
-        )
-        await db_connection.execute(
-            text(
-                "UPDATE jobs SET sent_emails = :sent_emails, failed_emails = :failed_emails, total_emails = :total_emails, progress = :progress WHERE id = :job_id"
-            ),
-            {
-                "job_id": job_id,
-                "sent_emails": sent_emails,
-                "failed_emails": failed_emails,
-                "total_emails": total_emails,
-                "progress": progress,
-            },
+        await self.update_jobs_progress(
+            [(job_id, sent_emails, failed_emails, total_emails)], db_connection
         )
 
+    async def update_jobs_progress(
+        self,
+        updates: list[tuple[str, int, int, int]],
+        db_connection,
+    ):
+        """Update the counters of many jobs in batched statements"""
+        rows = [
+            (
+                job_id,
+                {
+                    "sent_emails": sent_emails,
+                    "failed_emails": failed_emails,
+                    "total_emails": total_emails,
+                    "progress": (
+                        (sent_emails + failed_emails) / total_emails
+                        if total_emails > 0
+                        else 0
+                    ),
+                },
+            )
+            for job_id, sent_emails, failed_emails, total_emails in updates
+        ]
+        await BulkOperations.bulk_update(db_connection, jobs_table, rows)
+
     async def cancel_job(self, job_id: str, db_connection) -> bool:
         """Cancel a running job"""
         result = await db_connection.execute(
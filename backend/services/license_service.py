@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.base import User
 from models.plan import Plan, UserPlan
+from services.plan_service import cached_user_lookup, invalidate_user_plan
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,7 @@ class LicenseService:
                 existing_user_plan.updated_at = datetime.now()
 
                 await self.db.commit()
+                await invalidate_user_plan(user_id)
                 logger.info(f"Updated plan {plan_id} for user {user_id}")
 
                 return {
@@ -85,6 +87,7 @@ class LicenseService:
 
                 self.db.add(user_plan)
                 await self.db.commit()
+                await invalidate_user_plan(user_id)
                 logger.info(f"Assigned plan {plan_id} to user {user_id}")
 
                 return {
@@ -106,45 +109,51 @@ class LicenseService:
     async def get_user_license(self, user_id: str) -> dict[str, Any] | None:
         """Get user's current license information"""
         try:
-            # Get user's active plans
-            result = await self.db.execute(
-                select(UserPlan, Plan)
-                .join(Plan, UserPlan.plan_id == Plan.id)
-                .where(UserPlan.user_id == user_id)
-                .order_by(UserPlan.created_at.desc())
+            license_info = await cached_user_lookup(
+                "license", user_id, lambda: self._load_user_license(user_id)
             )
-
-            user_plans = result.fetchall()
-
-            if not user_plans:
-                return None
-
-            # Get the most recent plan
-            user_plan, plan = user_plans[0]
-
-            # Check if trial is expired
-            trial_expired = False
-            if user_plan.is_trial and user_plan.trial_end_date:
-                trial_expired = datetime.now() > user_plan.trial_end_date
-
-            return {
-                "user_plan_id": user_plan.id,
-                "plan_id": plan.id,
-                "plan_name": plan.name,
-                "plan_type": plan.plan_type,
-                "is_trial": user_plan.is_trial,
-                "trial_end_date": user_plan.trial_end_date,
-                "trial_expired": trial_expired,
-                "email_limit": plan.email_limit,
-                "campaign_limit": plan.campaign_limit,
-                "features": plan.features,
-                "created_at": user_plan.created_at,
-                "updated_at": user_plan.updated_at,
-            }
-
         except Exception as e:
             logger.error(f"Failed to get license for user {user_id}: {e}")
             return None
+        # Callers may edit the dict; never hand out the cached copy
+        return dict(license_info) if license_info is not None else None
+
+    async def _load_user_license(self, user_id: str) -> dict[str, Any] | None:
+        # Get user's active plans
+        result = await self.db.execute(
+            select(UserPlan, Plan)
+            .join(Plan, UserPlan.plan_id == Plan.id)
+            .where(UserPlan.user_id == user_id)
+            .order_by(UserPlan.created_at.desc())
+        )
+
+        user_plans = result.fetchall()
+
+        if not user_plans:
+            return None
+
+        # Get the most recent plan
+        user_plan, plan = user_plans[0]
+
+        # Check if trial is expired
+        trial_expired = False
+        if user_plan.is_trial and user_plan.trial_end_date:
+            trial_expired = datetime.now() > user_plan.trial_end_date
+
+        return {
+            "user_plan_id": user_plan.id,
+            "plan_id": plan.id,
+            "plan_name": plan.name,
+            "plan_type": plan.plan_type,
+            "is_trial": user_plan.is_trial,
+            "trial_end_date": user_plan.trial_end_date,
+            "trial_expired": trial_expired,
+            "email_limit": plan.email_limit,
+            "campaign_limit": plan.campaign_limit,
+            "features": plan.features,
+            "created_at": user_plan.created_at,
+            "updated_at": user_plan.updated_at,
+        }
 
     async def check_feature_access(
         self, user_id: str, feature_name: str
@@ -191,6 +200,7 @@ class LicenseService:
 
             await self.db.delete(user_plan)
             await self.db.commit()
+            await invalidate_user_plan(user_id)
 
             logger.info(f"Revoked plan {plan_id} from user {user_id}")
             return True
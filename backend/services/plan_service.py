@@ -7,14 +7,157 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-from sqlalchemy import and_, func, or_, select, update
+from collections.abc import Awaitable, Callable
+
+from fastapi import Depends
+from sqlalchemy import and_, func, inspect, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import settings
+from core.cache_manager import cache_manager
+from core.database import async_session, get_db
+from core.quota_engine import CounterBuffer
+from core.request_context import forget, memoize
 from models.plan import Plan, SessionDevice, UsageCounter, UserPlan
 
 logger = logging.getLogger(__name__)
 
+# Short-lived cross-request copy of plan/license lookups (PLAN_CACHE_TTL)
+_plan_cache = cache_manager.namespace("plans")
+
+
+def _plan_to_dict(plan: Plan | None) -> dict[str, Any] | None:
+    if plan is None:
+        return None
+    return {attr.key: getattr(plan, attr.key) for attr in inspect(Plan).column_attrs}
+
+
+def _plan_from_dict(data: dict[str, Any] | None) -> Plan | None:
+    # Detached copy: read-only, never added to a session
+    return Plan(**data) if data is not None else None
+
+
+async def cached_user_lookup(
+    kind: str,
+    user_id: str,
+    load: Callable[[], Awaitable[Any]],
+    encode: Callable[[Any], Any] = lambda value: value,
+    decode: Callable[[Any], Any] = lambda value: value,
+) -> Any:
+    """
+    Resolve a per-user lookup once per request, then from the shared cache.
+
+    ``load`` runs at most once per request; its result is also kept in the
+    "plans" namespace for ``PLAN_CACHE_TTL`` seconds, so other requests
+    skip the database until the entry expires or the plan changes.
+    """
+
+    async def resolve():
+        key = f"plans:{kind}:{user_id}"
+        if settings.PLAN_CACHE_TTL > 0:
+            cached = await _plan_cache.get(key)
+            if cached is not None:
+                return decode(cached["v"])
+        value = await load()
+        if settings.PLAN_CACHE_TTL > 0:
+            await _plan_cache.set(key, {"v": encode(value)}, settings.PLAN_CACHE_TTL)
+        return value
+
+    return await memoize((kind, str(user_id)), resolve)
+
+
+async def invalidate_user_plan(user_id: str) -> None:
+    """Forget cached plan/license lookups after a plan assignment changes"""
+    forget(("plan", str(user_id)), ("license", str(user_id)))
+    if settings.PLAN_CACHE_TTL > 0:
+        await _plan_cache.delete(f"plans:plan:{user_id}")
+        await _plan_cache.delete(f"plans:license:{user_id}")
+
+
+def _counter_reset_at(counter_type: str, now: datetime) -> datetime:
+    """End of the day or month a usage counter covers"""
+    if "daily" in counter_type:
+        return now.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+    if now.month == 12:
+        return now.replace(
+            year=now.year + 1, month=1, day=1,
+            hour=0, minute=0, second=0, microsecond=0,
+        )
+    return now.replace(
+        month=now.month + 1, day=1,
+        hour=0, minute=0, second=0, microsecond=0,
+    )
+
+
+async def _add_to_counter(
+    db: AsyncSession,
+    user_id: str,
+    counter_type: str,
+    amount: int,
+    reset_at: datetime | None = None,
+) -> None:
+    """
+    Add ``amount`` to the counter of the period ending at ``reset_at``
+    (default: the current period). Caller commits.
+    """
+    now = datetime.utcnow()
+    if reset_at is None:
+        reset_at = _counter_reset_at(counter_type, now)
+
+    # Get existing counter; periods are a day or longer, so this window
+    # holds only the one ending at reset_at
+    existing_counter = await db.scalar(
+        select(UsageCounter.id).where(
+            and_(
+                UsageCounter.user_id == user_id,
+                UsageCounter.counter_type == counter_type,
+                UsageCounter.reset_at > reset_at - timedelta(days=1),
+                UsageCounter.reset_at <= reset_at,
+            )
+        )
+    )
+
+    if existing_counter:
+        await db.execute(
+            update(UsageCounter)
+            .where(UsageCounter.id == existing_counter)
+            .values(
+                current_count=UsageCounter.current_count + amount,
+                updated_at=func.now(),
+            )
+        )
+    else:
+        db.add(
+            UsageCounter(
+                user_id=user_id,
+                counter_type=counter_type,
+                current_count=amount,
+                reset_at=reset_at,
+                period_start=now,
+            )
+        )
+
+
+def _usage_key(user_id: str, counter_type: str, now: datetime) -> tuple[str, str, datetime]:
+    """usage_buffer key: deltas stay with the period they were counted in"""
+    return str(user_id), counter_type, _counter_reset_at(counter_type, now)
+
+
+async def _flush_usage(deltas: dict[tuple[str, str, datetime], int]) -> None:
+    async with async_session() as db:
+        for (user_id, counter_type, reset_at), amount in deltas.items():
+            await _add_to_counter(db, user_id, counter_type, amount, reset_at)
+            # New rows must be visible to the next lookup in this batch
+            await db.flush()
+        await db.commit()
+
+
+# AI usage is counted in memory and written every USAGE_FLUSH_INTERVAL
+# seconds instead of one transaction per call
+usage_buffer = CounterBuffer(_flush_usage, interval=settings.USAGE_FLUSH_INTERVAL)
+
 
 class PlanService:
     """Service to enforce plan limits across SGPT"""
@@ -23,7 +166,16 @@ class PlanService:
         self.db = db_session
 
     async def get_user_plan(self, user_id: str) -> Plan | None:
-        """Get current active plan for user"""
+        """Get current active plan for user (once per request, see cached_user_lookup)"""
+        return await cached_user_lookup(
+            "plan",
+            user_id,
+            lambda: self._load_user_plan(user_id),
+            encode=_plan_to_dict,
+            decode=_plan_from_dict,
+        )
+
+    async def _load_user_plan(self, user_id: str) -> Plan | None:
         result = await self.db.execute(
             select(Plan)
             .join(UserPlan)
@@ -98,12 +250,11 @@ class PlanService:
         }
 
     async def increment_ai_usage(self, user_id: str, tokens_used: int = 0):
-        """Increment AI usage counters after successful request"""
-        await self._increment_counter(user_id, "ai_calls_daily", 1)
+        """Count AI usage after a successful request (written by usage_buffer)"""
+        now = datetime.utcnow()
+        usage_buffer.add(_usage_key(user_id, "ai_calls_daily", now), 1)
         if tokens_used > 0:
-            await self._increment_counter(
-                user_id, "ai_tokens_monthly", tokens_used
-            )
+            usage_buffer.add(_usage_key(user_id, "ai_tokens_monthly", now), tokens_used)
 
     async def check_thread_limit(
         self, user_id: str, requested_threads: int
@@ -321,6 +472,7 @@ class PlanService:
 
         self.db.add(user_plan)
         await self.db.commit()
+        await invalidate_user_plan(user_id)
         logger.info(
             f"Assigned default plan '{default_plan_code}' to user {user_id}"
         )
@@ -339,72 +491,14 @@ class PlanService:
             )
         )
 
-        return counter or 0
+        # Plus what this worker has counted but not written yet
+        return (counter or 0) + usage_buffer.pending(_usage_key(user_id, counter_type, now))
 
     async def _increment_counter(
         self, user_id: str, counter_type: str, amount: int
     ):
-        """Increment usage counter"""
-        now = datetime.utcnow()
-
-        # Determine reset period
-        if "daily" in counter_type:
-            reset_at = now.replace(
-                hour=0, minute=0, second=0, microsecond=0
-            ) + timedelta(days=1)
-        else:  # monthly
-            if now.month == 12:
-                reset_at = now.replace(
-                    year=now.year + 1,
-                    month=1,
-                    day=1,
-                    hour=0,
-                    minute=0,
-                    second=0,
-                    microsecond=0,
-                )
-            else:
-                reset_at = now.replace(
-                    month=now.month + 1,
-                    day=1,
-                    hour=0,
-                    minute=0,
-                    second=0,
-                    microsecond=0,
-                )
-
-        # Get existing counter
-        existing_counter = await self.db.scalar(
-            select(UsageCounter).where(
-                and_(
-                    UsageCounter.user_id == user_id,
-                    UsageCounter.counter_type == counter_type,
-                    UsageCounter.reset_at > now,
-                )
-            )
-        )
-
-        if existing_counter:
-            # Update existing counter
-            await self.db.execute(
-                update(UsageCounter)
-                .where(UsageCounter.id == existing_counter.id)
-                .values(
-                    current_count=UsageCounter.current_count + amount,
-                    updated_at=func.now(),
-                )
-            )
-        else:
-            # Create new counter
-            new_counter = UsageCounter(
-                user_id=user_id,
-                counter_type=counter_type,
-                current_count=amount,
-                reset_at=reset_at,
-                period_start=now,
-            )
-            self.db.add(new_counter)
-
+        """Increment usage counter immediately"""
+        await _add_to_counter(self.db, user_id, counter_type, amount)
         await self.db.commit()
 
     async def _get_reset_time(
@@ -452,6 +546,6 @@ class PlanService:
 
 
 # FastAPI dependency
-async def get_plan_service(db: AsyncSession) -> PlanService:
+async def get_plan_service(db: AsyncSession = Depends(get_db)) -> PlanService:
     """FastAPI dependency to get plan service"""
     return PlanService(db)
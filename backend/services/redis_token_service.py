@@ -3,7 +3,6 @@ Redis-based Token Management Service
 Secure token blacklisting and refresh token management using Redis
 """
 
-import json
 import logging
 from datetime import datetime
 from typing import Any
@@ -12,6 +11,7 @@ from redis import asyncio as aioredis
 
 from config.redis_config import get_redis_client
 from config.settings import settings
+from core.cache_serializer import dumps_text, loads_text
 
 logger = logging.getLogger(__name__)
 
@@ -77,7 +77,7 @@ class RedisTokenService:
                 "reason": "manual_logout",
             }
 
-            await self.redis_client.setex(key, ttl, json.dumps(value))
+            await self.redis_client.setex(key, ttl, dumps_text(value))
             logger.info(f"Token blacklisted successfully, expires in {ttl}s")
             return True
 
@@ -138,7 +138,7 @@ class RedisTokenService:
             }
 
             await self.redis_client.setex(
-                key, self.REFRESH_TOKEN_TTL, json.dumps(value)
+                key, self.REFRESH_TOKEN_TTL, dumps_text(value)
             )
 
             # Also maintain user -> tokens mapping for session management
@@ -172,11 +172,11 @@ class RedisTokenService:
             data = await self.redis_client.get(key)
 
             if data:
-                token_info = json.loads(data)
+                token_info = loads_text(data)
                 # Update last used timestamp
                 token_info["last_used"] = datetime.utcnow().isoformat()
                 await self.redis_client.setex(
-                    key, self.REFRESH_TOKEN_TTL, json.dumps(token_info)
+                    key, self.REFRESH_TOKEN_TTL, dumps_text(token_info)
                 )
                 return token_info
 
@@ -274,7 +274,7 @@ class RedisTokenService:
             # Get current attempts
             data = await self.redis_client.get(key)
             attempts = (
-                json.loads(data)
+                loads_text(data)
                 if data
                 else {"count": 0, "first_attempt": None, "last_attempt": None}
             )
@@ -295,7 +295,7 @@ class RedisTokenService:
 
                 # Store updated attempts
                 await self.redis_client.setex(
-                    key, self.LOGIN_ATTEMPTS_TTL, json.dumps(attempts)
+                    key, self.LOGIN_ATTEMPTS_TTL, dumps_text(attempts)
                 )
 
                 # Check if locked (configurable threshold)
@@ -332,7 +332,7 @@ class RedisTokenService:
             data = await self.redis_client.get(key)
 
             if data:
-                attempts = json.loads(data)
+                attempts = loads_text(data)
                 max_attempts = getattr(settings, "MAX_LOGIN_ATTEMPTS", 5)
                 return attempts.get("count", 0) >= max_attempts
 
@@ -0,0 +1,357 @@
+"""
+Streaming Export
+Server-side cursor exports encoded batch by batch to CSV, NDJSON, JSON or Parquet, gzipped on the fly
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import re
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config.settings import settings
+
+# Optional Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet",
+}
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def _plain(value: Any) -> Any:
+    """JSON-compatible form of a column value"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    value = _plain(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return "" if value is None else value
+
+
+class _CsvEncoder:
+    def __init__(self, names: List[str], include_headers: bool):
+        self.names = names
+        self.include_headers = include_headers
+
+    def begin(self) -> bytes:
+        return self.batch([self.names]) if self.include_headers else b""
+
+    def batch(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([_csv_cell(v) for v in row] for row in rows)
+        return buffer.getvalue().encode("utf-8")
+
+    def end(self) -> bytes:
+        return b""
+
+
+class _NdjsonEncoder:
+    def __init__(self, names: List[str], include_headers: bool):
+        self.names = names
+
+    def begin(self) -> bytes:
+        return b""
+
+    def line(self, row: Sequence[Any]) -> str:
+        return json.dumps({n: _plain(v) for n, v in zip(self.names, row)}, default=str)
+
+    def batch(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return "".join(self.line(row) + "\n" for row in rows).encode("utf-8")
+
+    def end(self) -> bytes:
+        return b""
+
+
+class _JsonArrayEncoder(_NdjsonEncoder):
+    def __init__(self, names: List[str], include_headers: bool):
+        super().__init__(names, include_headers)
+        self.first = True
+
+    def begin(self) -> bytes:
+        return b"["
+
+    def batch(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        if not rows:
+            return b""
+        body = ",\n".join(self.line(row) for row in rows)
+        prefix = "\n" if self.first else ",\n"
+        self.first = False
+        return (prefix + body).encode("utf-8")
+
+    def end(self) -> bytes:
+        return b"\n]\n" if not self.first else b"]\n"
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only stream whose bytes are taken out as they are produced"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    value = _plain(value)
+    return json.dumps(value, default=str) if isinstance(value, (dict, list)) else str(value)
+
+
+def _arrow_type(column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    if python_type is bool:
+        return pa.bool_(), None
+    if python_type is int:
+        return pa.int64(), None
+    if python_type is float:
+        return pa.float64(), None
+    if python_type is datetime:
+        tz = "UTC" if getattr(column.type, "timezone", False) else None
+        return pa.timestamp("us", tz=tz), None
+    if python_type is date:
+        return pa.date32(), None
+    if python_type is str:
+        return pa.string(), None
+    # UUID, Decimal, JSON and anything else travel as text
+    return pa.string(), _text
+
+
+class _ParquetEncoder:
+    """One row group per batch; the footer is written by ``end``"""
+
+    def __init__(self, columns: List[Any], include_headers: bool):
+        if not PARQUET_AVAILABLE:
+            raise ValueError("Parquet export requires pyarrow")
+        types = [_arrow_type(c) for c in columns]
+        self.names = [c.name for c in columns]
+        self.converters = [convert for _, convert in types]
+        self.schema = pa.schema([(name, arrow) for name, (arrow, _) in zip(self.names, types)])
+        self.sink = _DrainableSink()
+        self.writer = pq.ParquetWriter(self.sink, self.schema, compression="snappy")
+
+    def begin(self) -> bytes:
+        return self.sink.drain()
+
+    def batch(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        if rows:
+            arrays = [
+                [convert(row[i]) if convert else row[i] for row in rows]
+                for i, convert in enumerate(self.converters)
+            ]
+            self.writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(arrays, self.schema)],
+                schema=self.schema,
+            ))
+        return self.sink.drain()
+
+    def end(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+class StreamingExporter:
+    """
+    Exports one table through a server-side cursor, a batch at a time.
+
+    Rows are fetched ``batch_size`` at a time (``yield_per``), encoded and
+    handed on before the next fetch, so memory stays flat however large
+    the table is. With ``compress`` the bytes are gzipped as they are
+    produced. ``exported`` counts the rows encoded so far.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        fmt: str = "csv",
+        engine: Optional[AsyncEngine] = None,
+        columns: Optional[Sequence[str]] = None,
+        exclude: Sequence[str] = (),
+        where: Sequence[Any] = (),
+        include_headers: bool = True,
+        compress: bool = False,
+        batch_size: Optional[int] = None,
+    ):
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"Streaming export does not support {fmt} output")
+        if engine is None:
+            from core.engine_registry import engine_registry
+            engine = engine_registry.engine("reporting")
+        self.table = table
+        self.fmt = fmt
+        self.engine = engine
+        self.columns = [
+            c for c in table.columns
+            if (columns is None or c.name in columns) and c.name not in exclude
+        ]
+        self.where = list(where)
+        self.include_headers = include_headers
+        self.compress = compress
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        self.exported = 0
+
+    @property
+    def media_type(self) -> str:
+        return "application/gzip" if self.compress else MEDIA_TYPES[self.fmt]
+
+    @property
+    def extension(self) -> str:
+        return f"{self.fmt}.gz" if self.compress else self.fmt
+
+    def statement(self):
+        stmt = select(*self.columns).where(*self.where)
+        primary_key = list(self.table.primary_key.columns)
+        return stmt.order_by(*primary_key) if primary_key else stmt
+
+    def _encoder(self):
+        names = [c.name for c in self.columns]
+        if self.fmt == "csv":
+            return _CsvEncoder(names, self.include_headers)
+        if self.fmt == "ndjson":
+            return _NdjsonEncoder(names, self.include_headers)
+        if self.fmt == "json":
+            return _JsonArrayEncoder(names, self.include_headers)
+        return _ParquetEncoder(self.columns, self.include_headers)
+
+    async def batches(self) -> AsyncIterator[List[Tuple]]:
+        stmt = self.statement().execution_options(yield_per=self.batch_size)
+        async with self.engine.connect() as conn:
+            result = await conn.stream(stmt)
+            async for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        """The export file, block by block"""
+        encoder = self._encoder()
+        gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if self.compress else None
+
+        def emit(data: bytes) -> bytes:
+            return gzip.compress(data) if gzip and data else data
+
+        block = emit(encoder.begin())
+        if block:
+            yield block
+        async for rows in self.batches():
+            self.exported += len(rows)
+            block = emit(encoder.batch(rows))
+            if block:
+                yield block
+        tail = emit(encoder.end())
+        if gzip:
+            tail += gzip.flush()
+        if tail:
+            yield tail
+
+    async def write_to(
+        self,
+        path: str,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> int:
+        """
+        Write the export to ``path``; ``on_progress(exported)`` runs after each
+        block. The file appears under its final name only once complete.
+        Returns the file size.
+        """
+        partial = f"{path}.part"
+        try:
+            with open(partial, "wb") as f:
+                async for block in self.iter_bytes():
+                    await asyncio.to_thread(f.write, block)
+                    if on_progress is not None:
+                        await on_progress(self.exported)
+            os.replace(partial, path)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+        return os.path.getsize(path)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive ``(start, end)`` of a single ``bytes=`` range within ``size``,
+    None for no (or an unsupported multi-range) header. Raises ValueError
+    when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, end
+
+
+def iter_file_range(path: str, start: int, end: int, block_size: int = 256 * 1024) -> Iterator[bytes]:
+    """Bytes ``start``..``end`` (inclusive) of a file, one block at a time"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
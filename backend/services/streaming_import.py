@@ -0,0 +1,267 @@
+"""
+Streaming Import
+Incremental CSV/JSON parsing loaded chunk by chunk with COPY (PostgreSQL) or executemany
+"""
+
+import asyncio
+import csv
+import json
+import logging
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_TRUE = {"1", "true", "t", "yes", "y", "on"}
+_INSERT_ON_CONFLICT = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def iter_csv_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Rows of a CSV file with a header line, read lazily"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_json_records(
+    path: str, buffer_size: int = 64 * 1024, max_record_bytes: int = 16 * 1024 * 1024
+) -> Iterator[Any]:
+    """
+    Records of a JSON array or of newline-delimited JSON, decoded one at a time.
+
+    Only the current read buffer and the record being decoded are in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8-sig") as f:
+        buffer, pos = "", 0
+        while True:
+            chunk = f.read(buffer_size)
+            buffer, pos = buffer[pos:] + chunk, 0
+            while True:
+                # Array brackets, commas and newlines only separate records
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+                    pos += 1
+                if pos >= len(buffer):
+                    break
+                try:
+                    record, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if not chunk or len(buffer) - pos > max_record_bytes:
+                        raise
+                    break  # record continues in the next read
+                yield record
+            if not chunk:
+                return
+
+
+def iter_file_records(path: str, file_format: str) -> Iterator[Any]:
+    if file_format == "csv":
+        return iter_csv_records(path)
+    if file_format == "json":
+        return iter_json_records(path)
+    raise ValueError(f"Streaming import does not support {file_format} files")
+
+
+def _python_type(column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _coerce(column, value: Any) -> Any:
+    """Convert a parsed value (CSV gives strings) to the column's Python type"""
+    # Empty CSV cells count as missing
+    if value is None or value == "":
+        return None
+    python_type = _python_type(column)
+    if python_type is None:
+        return value
+    if isinstance(value, python_type) and not (python_type is int and isinstance(value, bool)):
+        return value
+    if python_type is bool:
+        return str(value).strip().lower() in _TRUE
+    if python_type in (int, float, Decimal):
+        return python_type(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(str(value))
+    if python_type is date:
+        return date.fromisoformat(str(value))
+    if python_type in (dict, list) and isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _default(column, now: datetime) -> Any:
+    """Python-side value of a column default (COPY does not apply them)"""
+    default = column.default
+    if default is None:
+        return None
+    if default.is_scalar:
+        return default.arg
+    if default.is_callable:
+        return default.arg(None)
+    # now() / CURRENT_TIMESTAMP: the chunk's transaction time, as in the database
+    if getattr(default.arg, "name", "").lower() in ("now", "current_timestamp"):
+        return now if getattr(column.type, "timezone", False) else now.replace(tzinfo=None)
+    return None
+
+
+class StreamingImporter:
+    """
+    Loads records into one table a chunk at a time, committing each chunk.
+
+    Records are pulled from the (blocking) iterator in a worker thread, so at
+    most ``chunk_size`` rows are in memory. PostgreSQL chunks go through
+    asyncpg ``copy_records_to_table``; other databases, and PostgreSQL chunks
+    that hit a duplicate key with ``skip_duplicates``, use an executemany
+    INSERT (``ON CONFLICT DO NOTHING`` when skipping duplicates). Rows written
+    count as inserted and rows the conflict clause dropped as skipped.
+
+    ``field_mappings`` maps column names to source field names. Records that
+    cannot be converted, or that leave a required column empty when
+    ``validate`` is set, are counted as rejected instead of failing the load.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        engine: Optional[AsyncEngine] = None,
+        chunk_size: Optional[int] = None,
+        skip_duplicates: bool = True,
+        validate: bool = True,
+        field_mappings: Optional[Dict[str, str]] = None,
+    ):
+        if engine is None:
+            from core.database import engine
+        self.table = table
+        self.engine = engine
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.skip_duplicates = skip_duplicates
+        self.validate = validate
+        self.source_fields = {source: column for column, source in (field_mappings or {}).items()}
+        self.columns: List[Any] = []
+
+        self.inserted = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.chunks = 0
+
+    async def run(
+        self,
+        records: Iterable[Any],
+        on_progress: Optional[Callable[[int, int, int], Awaitable[None]]] = None,
+    ) -> Dict[str, int]:
+        """Load every record; ``on_progress(inserted, skipped, rejected)`` runs after each chunk"""
+        iterator = iter(records)
+        use_copy = self.engine.dialect.name == "postgresql"
+        async with self.engine.connect() as conn:
+            driver = (await conn.get_raw_connection()).driver_connection if use_copy else None
+            while True:
+                batch = await asyncio.to_thread(lambda: list(islice(iterator, self.chunk_size)))
+                if not batch:
+                    break
+                rows = self._prepare(batch)
+                if rows:
+                    if driver is not None:
+                        inserted = await self._copy_chunk(driver, rows)
+                    else:
+                        inserted = await self._insert_chunk(rows)
+                    self.inserted += inserted
+                    self.skipped += len(rows) - inserted
+                self.chunks += 1
+                if on_progress is not None:
+                    await on_progress(self.inserted, self.skipped, self.rejected)
+        return {
+            "processed": self.inserted + self.skipped,
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+            "chunks": self.chunks,
+        }
+
+    def _prepare(self, batch: List[Any]) -> List[Tuple]:
+        rows = []
+        now = datetime.now(timezone.utc)
+        for record in batch:
+            if not isinstance(record, dict):
+                self.rejected += 1
+                continue
+            mapped = {self.source_fields.get(key, key): value for key, value in record.items()}
+            if not self.columns:
+                self._choose_columns(mapped)
+            try:
+                rows.append(tuple(self._value(column, mapped, now) for column in self.columns))
+            except (TypeError, ValueError) as e:
+                self.rejected += 1
+                logger.debug(f"Rejected {self.table.name} record: {e}")
+        return rows
+
+    def _choose_columns(self, first: Dict[str, Any]) -> None:
+        # Columns in the file, plus the ones SQLAlchemy would fill in (COPY skips
+        # Python-side defaults); server defaults apply to the rest.
+        self.columns = [
+            column for column in self.table.columns
+            if column.name in first or column.default is not None
+        ]
+
+    def _value(self, column, record: Dict[str, Any], now: datetime) -> Any:
+        value = _coerce(column, record[column.name]) if column.name in record else None
+        if value is None:
+            value = _default(column, now)
+        if value is None and self.validate and not column.nullable and column.server_default is None:
+            raise ValueError(f"{column.name} is required")
+        return value
+
+    async def _copy_chunk(self, driver, rows: List[Tuple]) -> int:
+        import asyncpg
+
+        names = [column.name for column in self.columns]
+        # The json/jsonb codecs take text in COPY
+        json_positions = {
+            i for i, column in enumerate(self.columns) if _python_type(column) in (dict, list)
+        }
+        # The insert fallback gets the original rows; its driver encodes JSON itself
+        copy_rows = rows
+        if json_positions:
+            copy_rows = [
+                tuple(
+                    json.dumps(v) if i in json_positions and v is not None and not isinstance(v, str) else v
+                    for i, v in enumerate(row)
+                )
+                for row in rows
+            ]
+        try:
+            async with driver.transaction():
+                await driver.copy_records_to_table(
+                    self.table.name, records=copy_rows, columns=names, schema_name=self.table.schema
+                )
+        except asyncpg.UniqueViolationError:
+            if not self.skip_duplicates:
+                raise
+            return await self._insert_chunk(rows)
+        return len(rows)
+
+    async def _insert_chunk(self, rows: List[Tuple]) -> int:
+        """Insert a chunk and return how many rows were written"""
+        names = [column.name for column in self.columns]
+        params = [dict(zip(names, row)) for row in rows]
+        insert = _INSERT_ON_CONFLICT.get(self.engine.dialect.name)
+        if not (self.skip_duplicates and insert is not None):
+            async with self.engine.begin() as conn:
+                await conn.execute(self.table.insert(), params)
+            return len(rows)
+        # executemany rowcount is not reported by every driver; RETURNING
+        # gives one row per insert the conflict clause let through
+        statement = insert(self.table).on_conflict_do_nothing().returning(self.columns[0])
+        async with self.engine.begin() as conn:
+            result = await conn.execute(statement, params)
+            return len(result.all())
@@ -0,0 +1,92 @@
+"""
+Cache Invalidation Benchmark
+Compares KEYS-based pattern clearing, SCAN+UNLINK and tag-index invalidation
+
+Populates a dedicated Redis database with N cache keys spread over many
+users, then invalidates one user's keys with each strategy while a probe
+task PINGs Redis to measure how long other clients are stalled.
+
+Usage:
+    python -m tests.performance.cache_invalidation_benchmark --keys 1000000 \
+        --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import time
+
+import redis.asyncio as aioredis
+
+from core.cache_tags import RedisTagIndex, scan_unlink
+
+
+async def populate(client, total_keys: int, users: int, index: RedisTagIndex) -> None:
+    pipe = client.pipeline(transaction=False)
+    for i in range(total_keys):
+        user_id = i % users
+        key = f"dashboard:stats:user_id:{user_id}:page:{i}"
+        pipe.setex(key, 3600, "x" * 64)
+        index.stage(pipe, key, [f"user:{user_id}"], 3600)
+        if i % 5000 == 4999:
+            await pipe.execute()
+    await pipe.execute()
+
+
+async def probe(client, stop: asyncio.Event, samples: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.ping()
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.001)
+
+
+async def measure(name: str, client, probe_client, operation) -> None:
+    samples: list = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(probe_client, stop, samples))
+    start = time.perf_counter()
+    removed = await operation()
+    elapsed = (time.perf_counter() - start) * 1000
+    stop.set()
+    await probe_task
+    worst = max(samples) if samples else 0.0
+    print(f"{name:<22} removed={removed:<8} total={elapsed:10.2f}ms  worst_ping={worst:8.2f}ms")
+
+
+async def keys_delete(client, pattern: str) -> int:
+    keys = await client.keys(pattern)
+    return await client.delete(*keys) if keys else 0
+
+
+async def main(redis_url: str, total_keys: int, users: int) -> None:
+    client = aioredis.from_url(redis_url, decode_responses=True)
+    probe_client = aioredis.from_url(redis_url, decode_responses=True)
+    index = RedisTagIndex(prefix="bench:tag:")
+
+    strategies = [
+        ("KEYS + DEL", lambda uid: keys_delete(client, f"*:user_id:{uid}:*")),
+        ("SCAN + UNLINK", lambda uid: scan_unlink(client, f"*:user_id:{uid}:*")),
+        ("tag index", lambda uid: index.invalidate(client, [f"user:{uid}"])),
+    ]
+
+    try:
+        await client.flushdb()
+        print(f"Populating {total_keys} keys across {users} users ...")
+        await populate(client, total_keys, users, index)
+        print(f"dbsize={await client.dbsize()}")
+
+        for user_id, (name, operation) in enumerate(strategies):
+            await measure(name, client, probe_client, lambda: operation(user_id))
+    finally:
+        await client.flushdb()
+        await client.aclose()
+        await probe_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.redis_url, args.keys, args.users))
@@ -0,0 +1,85 @@
+"""
+Cache Serializer Benchmark
+Compares json.dumps(default=str) with the shared cache serializer on dashboard-shaped payloads
+
+Usage:
+    python -m tests.performance.cache_serializer_benchmark --iterations 200
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from core.cache_serializer import CacheSerializer
+
+
+def dashboard_payload(campaigns: int) -> dict:
+    """Shape of the analytics/dashboard responses cached by AnalyticsCacheService"""
+    now = datetime.utcnow()
+    rng = random.Random(42)
+    return {
+        "status": "success",
+        "generated_at": now,
+        "summary": {
+            "campaigns": {"total": campaigns, "active": campaigns // 3},
+            "performance": {"delivery_rate": 85.5, "open_rate": 22.3, "click_rate": 3.8, "bounce_rate": 2.1},
+        },
+        "campaigns": [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "name": f"Campaign {i}",
+                "status": rng.choice(["draft", "running", "paused", "completed"]),
+                "created_at": now - timedelta(days=i),
+                "sent": rng.randint(0, 100_000),
+                "delivered": rng.randint(0, 100_000),
+                "opens": rng.randint(0, 50_000),
+                "clicks": rng.randint(0, 10_000),
+                "open_rate": round(rng.random() * 100, 2),
+                "daily": [
+                    {"date": (now - timedelta(days=d)).date().isoformat(), "sent": rng.randint(0, 5000)}
+                    for d in range(30)
+                ],
+            }
+            for i in range(campaigns)
+        ],
+    }
+
+
+def bench(name: str, dumps, loads, payload, iterations: int) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        data = dumps(payload)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        loads(data)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    print(f"{name:<26} size={len(data):>9}B  encode={encode_us:>9.1f}us  decode={decode_us:>9.1f}us")
+
+
+def main(iterations: int) -> None:
+    variants = [
+        ("json.dumps(default=str)", lambda v: json.dumps(v, default=str), json.loads),
+    ]
+    for codec in ("msgpack", "orjson"):
+        for compression in ("none", "zlib", "zstd"):
+            s = CacheSerializer(codec=codec, compression=compression)
+            variants.append((f"{codec}+{compression}", s.dumps, s.loads))
+
+    for campaigns in (10, 100, 1000):
+        payload = dashboard_payload(campaigns)
+        print(f"\n--- dashboard payload: {campaigns} campaigns ---")
+        for name, dumps, loads in variants:
+            bench(name, dumps, loads, payload, max(1, iterations // max(1, campaigns // 10)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    main(args.iterations)
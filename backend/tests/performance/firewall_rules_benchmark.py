@@ -0,0 +1,109 @@
+"""
+Firewall Rules Benchmark
+check_ip latency with 10k and 100k rules: compiled prefix index versus the old sort-and-scan
+
+Fills an AdvancedFirewall with N random IPv4/IPv6 rules (random priorities,
+prefix lengths /8-/32 and /32-/128) and times rule matching for random
+addresses. The full check_ip path also runs the Redis verdict script (one
+EVALSHA, skipped for recently clean IPs), so it needs a Redis server; use a
+scratch database.
+
+Usage:
+    python -m tests.performance.firewall_rules_benchmark --rules 10000 100000 \
+        --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import random
+import statistics
+import time
+
+import redis.asyncio as aioredis
+
+from security.firewall import AdvancedFirewall, FirewallAction, FirewallRule
+
+
+def random_rule(rng: random.Random, i: int) -> FirewallRule:
+    if rng.random() < 0.8:
+        network = ipaddress.ip_network((rng.getrandbits(32), rng.randint(8, 32)), strict=False)
+    else:
+        network = ipaddress.ip_network((rng.getrandbits(128), rng.randint(32, 128)), strict=False)
+    return FirewallRule(
+        rule_id=f"bench-{i}",
+        name=f"bench rule {i}",
+        ip_range=str(network),
+        action=rng.choice([FirewallAction.BLOCK, FirewallAction.MONITOR]),
+        priority=rng.randint(0, 1000),
+    )
+
+
+def sort_and_scan(rules, ip_address: str):
+    """The matching check_ip used before the prefix index"""
+    ip_obj = ipaddress.ip_address(ip_address)
+    for rule in sorted(rules, key=lambda r: r.priority):
+        if ip_obj in ipaddress.ip_network(rule.ip_range):
+            return rule
+    return None
+
+
+def report(name: str, samples) -> None:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"  {name:<28} mean {statistics.mean(samples) * 1e6:10.1f}us  p99 {p99 * 1e6:10.1f}us")
+
+
+async def bench(client, rule_count: int, lookups: int, scan_lookups: int) -> None:
+    rng = random.Random(rule_count)
+    firewall = AdvancedFirewall(client)
+    firewall.config["rate_limit_threshold"] = 10**9
+    firewall.firewall_rules = {rule.rule_id: rule for rule in (random_rule(rng, i) for i in range(rule_count))}
+
+    start = time.perf_counter()
+    firewall._rebuild_rule_index()
+    print(f"{rule_count} rules, index built in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    ips = [str(ipaddress.ip_address(rng.getrandbits(32))) for _ in range(lookups)]
+
+    samples = []
+    for ip in ips:
+        t = time.perf_counter()
+        await firewall._check_firewall_rules(ip)
+        samples.append(time.perf_counter() - t)
+    report("rule match (index)", samples)
+
+    samples = []
+    rules = list(firewall.firewall_rules.values())
+    for ip in ips[:scan_lookups]:
+        t = time.perf_counter()
+        sort_and_scan(rules, ip)
+        samples.append(time.perf_counter() - t)
+    report("rule match (sort and scan)", samples)
+
+    samples = []
+    for ip in ips:
+        t = time.perf_counter()
+        await firewall.check_ip(ip)
+        samples.append(time.perf_counter() - t)
+    report("check_ip (with Redis)", samples)
+
+
+async def main(rule_counts, lookups: int, scan_lookups: int, redis_url: str) -> None:
+    client = aioredis.from_url(redis_url)
+    try:
+        for rule_count in rule_counts:
+            await bench(client, rule_count, lookups, scan_lookups)
+    finally:
+        await client.flushdb()
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--scan-lookups", type=int, default=20, help="the old scan is slow; fewer samples")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    args = parser.parse_args()
+    asyncio.run(main(args.rules, args.lookups, args.scan_lookups, args.redis_url))
@@ -0,0 +1,94 @@
+"""
+Import-Time Benchmark
+Cold-import cost and peak RSS of app.main with eager and lazy router mounting
+
+Each run starts a fresh interpreter with ``python -X importtime`` and
+LAZY_ROUTERS set, so nothing is shared between runs. Reports the median
+import time, peak RSS, the slowest imports made by app.main, and which of
+the lazily mounted router modules were imported anyway.
+
+Usage:
+    python -m tests.performance.importtime_benchmark --runs 5 --top 15
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Modules behind the lazy router groups in app/main.py
+LAZY_MODULES = (
+    "routers.consolidated.unified_admin_router",
+    "routers.admin_panel_bridge",
+    "routers.ai",
+    "routers.template_builder",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# Wall-clock import time, peak RSS and which lazy-group modules got loaded.
+# (-X importtime misses modules loaded through importlib.import_module.)
+_PROBE = (
+    "import json, resource, sys, time; started = time.perf_counter(); import app.main; "
+    "print(json.dumps([time.perf_counter() - started, "
+    "resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "
+    f"[m for m in {list(LAZY_MODULES)!r} if m in sys.modules]]))"
+)
+
+
+def run_once(lazy: bool) -> Tuple[float, int, List[str], Dict[str, int]]:
+    """(import seconds, peak RSS KiB, lazy modules loaded, cumulative us per app.main import)"""
+    env = {**os.environ, "LAZY_ROUTERS": "true" if lazy else "false", "PYTHONDONTWRITEBYTECODE": "1"}
+    backend = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=backend, env=env, capture_output=True, text=True, check=True,
+    )
+
+    # Direct imports of app.main are indented by two spaces
+    children: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match and match.group(3) == "  ":
+            children[match.group(4)] = children.get(match.group(4), 0) + int(match.group(2))
+
+    seconds, rss_kib, loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return seconds, rss_kib, loaded, children
+
+
+def report(lazy: bool, runs: int, top: int) -> None:
+    totals: List[float] = []
+    rss: List[int] = []
+    per_import: Counter = Counter()
+    loaded: List[str] = []
+    for _ in range(runs):
+        seconds, rss_kib, loaded, children = run_once(lazy)
+        totals.append(seconds)
+        rss.append(rss_kib)
+        per_import.update(children)
+
+    mode = "lazy" if lazy else "eager"
+    print(f"\n--- {mode} routers ({runs} runs) ---")
+    print(f"import app.main  median={statistics.median(totals):.3f}s  "
+          f"min={min(totals):.3f}s  peak RSS={statistics.median(rss) / 1024:.1f}MiB")
+    for name, us in per_import.most_common(top):
+        print(f"  {name:<52} {us / runs / 1000:>9.1f}ms")
+    print(f"  lazy-group modules imported at startup: {', '.join(loaded) or 'none'}")
+
+
+def main(runs: int, top: int) -> None:
+    report(lazy=False, runs=runs, top=top)
+    report(lazy=True, runs=runs, top=top)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.runs, args.top)
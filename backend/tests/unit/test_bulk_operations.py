@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database import BulkOperations
+
+metadata = MetaData()
+items = Table(
+    "items",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("status", String(20)),
+    Column("attempts", Integer),
+)
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_applies_mixed_changes_in_chunks(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bulk.db'}")
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(
+                items.insert(), [{"id": str(i), "status": "queued", "attempts": 0} for i in range(10)]
+            )
+            statements.clear()
+
+            rows = [(str(i), {"status": "sent", "attempts": i}) for i in range(7)]
+            rows.append(("8", {"status": "failed"}))
+            await BulkOperations.bulk_update(conn, items, rows, chunk_size=3)
+
+            result = {
+                row.id: (row.status, row.attempts)
+                for row in await conn.execute(select(items))
+            }
+    finally:
+        await engine.dispose()
+
+    assert result["0"] == ("sent", 0)
+    assert result["6"] == ("sent", 6)
+    assert result["7"] == ("queued", 0)
+    assert result["8"] == ("failed", 0)
+    # 7 rows in chunks of 3, plus one for the other column set
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 4
+
+
+class _RecordingConnection:
+    """Compiles statements for PostgreSQL instead of running them"""
+
+    dialect = postgresql.dialect()
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=self.dialect)))
+
+
+@pytest.mark.asyncio
+async def test_values_strategy_is_one_join_per_chunk_on_postgres():
+    session = _RecordingConnection()
+    rows = [(str(i), {"status": "sent"}) for i in range(5)]
+    await BulkOperations.bulk_update(session, items, rows, chunk_size=2)
+
+    assert len(session.statements) == 3
+    assert "FROM (VALUES" in session.statements[0]
+    assert "items.id = bulk_rows.bulk_pk" in session.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_unknown_columns(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bulk.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            with pytest.raises(ValueError):
+                await BulkOperations.bulk_update(conn, items, [("1", {"nope": 1})])
+    finally:
+        await engine.dispose()
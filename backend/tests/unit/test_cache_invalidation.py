@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from core.cache_invalidation import CacheInvalidationBus
+from core.enhanced_cache import EnhancedCache
+
+
+class RecordingCache:
+    def __init__(self):
+        self.calls = []
+
+    def invalidate_local(self, keys=(), patterns=(), tags=(), clear_all=False):
+        self.calls.append((list(keys), list(patterns), list(tags), clear_all))
+
+
+def test_remote_message_is_dispatched_to_listeners():
+    bus = CacheInvalidationBus(channel="test")
+    listener = RecordingCache()
+    bus.register(listener)
+    bus._handle_message(json.dumps({"origin": "other", "keys": ["k1"], "tags": ["user:1"]}))
+    assert listener.calls == [(["k1"], [], ["user:1"], False)]
+
+
+def test_own_messages_are_ignored():
+    bus = CacheInvalidationBus(channel="test")
+    listener = RecordingCache()
+    bus.register(listener)
+    bus._handle_message(json.dumps({"origin": bus.instance_id, "keys": ["k1"]}))
+    assert listener.calls == []
+
+
+def test_publish_is_noop_when_bus_not_started():
+    bus = CacheInvalidationBus(channel="test")
+    bus.publish(keys=["k1"])
+    assert bus.get_stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_enhanced_cache_applies_remote_invalidation():
+    c = EnhancedCache()
+    await c.set("user:id:1", {"a": 1}, 60, tags=["user:1"])
+    await c.set("campaign_stats:id:9", {"b": 2}, 60)
+    await c.set("other", 3, 60)
+
+    c.invalidate_local(tags=["user:1"], patterns=["campaign*"])
+    assert await c.get("user:id:1") is None
+    assert await c.get("campaign_stats:id:9") is None
+    assert await c.get("other") == 3
+
+    c.invalidate_local(clear_all=True)
+    assert await c.get("other") is None
+
+
+def test_backfill_deriver_matches_write_time_tags():
+    from core.cache_tags import default_tag_deriver, entity_tags
+    from services.analytics_cache_service import AnalyticsCacheService
+
+    assert default_tag_deriver("user:id:42") == ["user:42"]
+    assert default_tag_deriver("campaign_stats:id:9") == ["campaign:9"]
+    assert default_tag_deriver("dash:user_id:7") == entity_tags({"user_id": "7"})
+
+    svc = AnalyticsCacheService()
+    key = svc._generate_key(svc.prefixes["user_stats"], user_id="u1", period="30d")
+    assert default_tag_deriver(key) == sorted(svc._scope_tags("user_stats", "u1"))
+
+
+def test_tag_writes_carry_member_expiry():
+    from core.cache_tags import TAG_ADD_LUA, RedisTagIndex
+
+    class RecordingPipe:
+        def __init__(self):
+            self.calls = []
+
+        def eval(self, script, numkeys, *args):
+            self.calls.append((script, numkeys) + args)
+
+    pipe = RecordingPipe()
+    RedisTagIndex(prefix="t:").stage(pipe, "user:id:1", ["user:1", "campaign:2"], ttl=60)
+    RedisTagIndex(prefix="t:").stage(pipe, "user:perm", ["user:1"])
+
+    (script, numkeys, tag_key, member, expires_at, now), second, third = pipe.calls
+    assert script == TAG_ADD_LUA and numkeys == 1
+    assert (tag_key, member, expires_at - now) == ("t:user:1", "user:id:1", 60000)
+    assert second[2] == "t:campaign:2"
+    assert third[2:5] == ("t:user:1", "user:perm", "inf")
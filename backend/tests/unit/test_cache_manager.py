@@ -0,0 +1,35 @@
+import pytest
+
+from core.cache_manager import CacheManager, CachePolicy
+from core.l1_cache import BoundedL1Cache
+
+
+def test_namespaces_are_singletons_with_their_own_policy():
+    manager = CacheManager(policies={"a": CachePolicy(ttl=60, l1_max_items=2)})
+    a = manager.namespace("a")
+    assert manager.namespace("a") is a
+    assert a.default_ttl == 60 and a.l1.maxsize == 2
+
+    b = manager.namespace("b", l1_max_items=0)
+    assert b.l1 is None
+    assert set(manager.get_stats()["namespaces"]) == {"a", "b"}
+    assert manager.get_stats()["redis"] == {"connected": False}
+
+
+@pytest.mark.asyncio
+async def test_namespace_without_redis_serves_from_l1():
+    ns = CacheManager().namespace("t", CachePolicy(ttl=60, l1_max_items=10))
+    assert await ns.set("k", {"v": 1}, tags=["user:1"]) is True
+    assert await ns.get("k") == {"v": 1}
+    assert await ns.invalidate_tags("user:1") == 0
+    assert await ns.get("k") is None
+    assert ns.get_stats()["l1_hits"] == 1
+
+
+def test_fifo_eviction_ignores_reads():
+    c = BoundedL1Cache(maxsize=2, max_bytes=10_000, eviction="fifo")
+    c.set("a", 1, size=1)
+    c.set("b", 2, size=1)
+    assert c.get("a") == 1
+    c.set("c", 3, size=1)
+    assert "a" not in c and "b" in c
@@ -0,0 +1,46 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import msgpack
+import pytest
+
+from core.cache_serializer import CacheSerializer, MAGIC
+
+
+@pytest.mark.parametrize("codec", ["msgpack", "orjson"])
+def test_round_trip(codec):
+    s = CacheSerializer(codec=codec, compression="none")
+    value = {"campaigns": [{"id": 1, "rate": 0.25, "name": "x"}], "total": 3, "ok": True}
+    data = s.dumps(value)
+    assert data[0] == MAGIC
+    assert s.loads(data) == value
+
+
+def test_msgpack_preserves_types():
+    s = CacheSerializer(codec="msgpack", compression="none")
+    value = {
+        "at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "day": date(2025, 1, 2),
+        "amount": Decimal("10.50"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "tags": {"a", "b"},
+    }
+    assert s.loads(s.dumps(value)) == value
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd"])
+def test_large_payloads_are_compressed(compression):
+    s = CacheSerializer(codec="msgpack", compression=compression, compression_threshold=256)
+    value = {"rows": [{"campaign": "spring sale", "sent": i} for i in range(500)]}
+    data = s.dumps(value)
+    assert data[3] != ord("n")
+    assert len(data) < len(msgpack.packb(value))
+    assert s.loads(data) == value
+
+
+def test_legacy_entries_still_read():
+    assert CacheSerializer(legacy="json").loads(json.dumps({"a": 1})) == {"a": 1}
+    assert CacheSerializer(legacy="json").loads(json.dumps({"a": 1}).encode()) == {"a": 1}
+    assert CacheSerializer(legacy="msgpack").loads(msgpack.packb({"a": 1})) == {"a": 1}
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from core.cache_stampede import StampedeGuard, should_refresh_early, unwrap_entry, wrap_entry
+
+
+class DictStore:
+    def __init__(self):
+        self.data = {}
+
+    async def load(self, key):
+        return self.data.get(key)
+
+    async def store(self, key, entry, ttl):
+        self.data[key] = entry
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    guard = StampedeGuard()
+    backend = DictStore()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*[
+        guard.fetch("k", compute, backend.load, backend.store, ttl=60) for _ in range(20)
+    ])
+    assert calls == 1
+    assert all(r == {"value": 42} for r in results)
+    assert unwrap_entry(backend.data["k"])[0] == {"value": 42}
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing():
+    guard = StampedeGuard()
+    backend = DictStore()
+    entry = wrap_entry("old", ttl=60, compute_seconds=0.1)
+    entry["fresh_until"] = time.time() - 1
+    backend.data["k"] = entry
+
+    async def compute():
+        return "new"
+
+    assert await guard.fetch("k", compute, backend.load, backend.store, ttl=60, stale_ttl=30) == "old"
+    await asyncio.sleep(0.01)
+    assert unwrap_entry(backend.data["k"])[0] == "new"
+
+
+@pytest.mark.asyncio
+async def test_waits_for_other_process_holding_lease():
+    class LeaseHeldRedis:
+        async def set(self, *args, **kwargs):
+            return None
+
+    guard = StampedeGuard(poll_interval=0.005, wait_timeout=1.0)
+    backend = DictStore()
+
+    async def other_worker():
+        await asyncio.sleep(0.02)
+        backend.data["k"] = wrap_entry("from-other", ttl=60, compute_seconds=0.1)
+
+    async def compute():
+        raise AssertionError("should not recompute while the lease is held")
+
+    asyncio.create_task(other_worker())
+    value = await guard.fetch(
+        "k", compute, backend.load, backend.store, ttl=60, redis_client=LeaseHeldRedis()
+    )
+    assert value == "from-other"
+
+
+def test_legacy_values_and_early_refresh():
+    assert unwrap_entry({"plain": 1}) == ({"plain": 1}, None, 0.0)
+    now = time.time()
+    assert should_refresh_early(now + 3600, delta=0.01, beta=0.0, now=now) is False
+    assert should_refresh_early(now - 1, delta=0.01, beta=1.0, now=now) is True
+
+
+@pytest.mark.asyncio
+async def test_fetch_records_hit_stale_and_miss(monkeypatch):
+    import core.cache_stampede as cache_stampede
+
+    class Recorder:
+        def __init__(self):
+            self.results = []
+
+        def record_function(self, function, result, seconds):
+            self.results.append((function, result))
+
+    recorder = Recorder()
+    monkeypatch.setattr(cache_stampede, "cache_metrics", recorder)
+    guard = StampedeGuard()
+    backend = DictStore()
+
+    async def compute():
+        return "v"
+
+    await guard.fetch("k", compute, backend.load, backend.store, ttl=60, name="fn")
+    await guard.fetch("k", compute, backend.load, backend.store, ttl=60, name="fn")
+    backend.data["k"] = wrap_entry("old", ttl=-1, compute_seconds=0.01)
+    await guard.fetch("k", compute, backend.load, backend.store, ttl=60, stale_ttl=60, name="fn")
+    assert recorder.results == [("fn", "miss"), ("fn", "hit"), ("fn", "stale")]
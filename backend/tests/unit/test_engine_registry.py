@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.engine_registry import EngineRegistry, PoolConfig, TimedQueuePool
+
+
+@pytest.mark.asyncio
+async def test_timed_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    pool = engine.sync_engine.pool
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            # The only connection is checked out, so a second checkout times out
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+        await engine.dispose()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    stats = engine.sync_engine.pool.wait_stats
+    assert engine.sync_engine.pool is not pool
+    assert stats.checkouts == 3 and stats.timeouts == 1
+    assert stats.max_wait >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_registry_shares_engines_and_prewarms(tmp_path):
+    registry = EngineRegistry()
+    registry.register(PoolConfig(name="oltp", url=f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", prewarm=3))
+    try:
+        assert registry.engine("oltp") is registry.engine("oltp")
+        assert registry.sessionmaker("oltp") is registry.sessionmaker("oltp")
+        assert await registry.prewarm("oltp") == 3
+        assert registry.engine("oltp").sync_engine.pool.checkedin() == 3
+
+        with pytest.raises(ValueError):
+            registry.register(PoolConfig(name="oltp", url="sqlite+aiosqlite://"))
+        with pytest.raises(KeyError):
+            registry.engine("reporting")
+        assert set(registry.pool_metrics()) == {"oltp"}
+    finally:
+        await registry.dispose()
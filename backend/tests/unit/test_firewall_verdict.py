@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from security.firewall import AdvancedFirewall, FirewallAction, FirewallRule
+
+
+class ScriptedVerdict:
+    """Stands in for the registered Lua script; records every call"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.replies.pop(0) if self.replies else [0, "", 1]
+
+
+def firewall_with(script: ScriptedVerdict) -> AdvancedFirewall:
+    firewall = AdvancedFirewall(None)
+    firewall._verdict_script = script
+    return firewall
+
+
+@pytest.mark.asyncio
+async def test_clean_ip_is_answered_locally_and_counted_later():
+    script = ScriptedVerdict([0, "", 1])
+    firewall = firewall_with(script)
+
+    for _ in range(3):
+        assert (await firewall.check_ip("198.51.100.7"))[0] == FirewallAction.ALLOW
+    assert len(script.calls) == 1 and firewall.stats.local_verdicts == 2
+
+    # Once the entry expires the skipped requests are flushed in one increment
+    firewall._clean_ips["198.51.100.7"][0] = 0
+    await firewall.check_ip("198.51.100.7")
+    assert script.calls[-1][1][0] == 3
+
+
+@pytest.mark.asyncio
+async def test_busy_ip_is_not_cached():
+    threshold = AdvancedFirewall(None).config["rate_limit_threshold"]
+    script = ScriptedVerdict([0, "", threshold], [0, "", threshold])
+    firewall = firewall_with(script)
+
+    await firewall.check_ip("198.51.100.8")
+    await firewall.check_ip("198.51.100.8")
+    assert len(script.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_block_from_redis_is_mirrored_locally():
+    payload = json.dumps({
+        "ip_address": "198.51.100.9", "reason": "rate_limit", "blocked_at": datetime.now().isoformat(),
+        "duration": 3600, "block_count": 1, "threat_level": "medium",
+        "details": {"requests_per_minute": 1001}, "auto_blocked": True,
+    })
+    script = ScriptedVerdict([2, payload, 1001])
+    firewall = firewall_with(script)
+
+    action, reason = await firewall.check_ip("198.51.100.9")
+    assert action == FirewallAction.BLOCK and "1001" in reason
+    assert "198.51.100.9" in firewall.blocked_ips
+
+    # Already blocked: answered from memory
+    assert (await firewall.check_ip("198.51.100.9"))[0] == FirewallAction.BLOCK
+    assert len(script.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_fails_open():
+    class Broken:
+        async def __call__(self, keys, args):
+            raise ConnectionError("down")
+
+    firewall = AdvancedFirewall(None)
+    firewall._verdict_script = Broken()
+    assert (await firewall.check_ip("198.51.100.10"))[0] == FirewallAction.ALLOW
+
+
+@pytest.mark.asyncio
+async def test_expired_rule_is_passed_over_while_the_index_rebuilds():
+    firewall = AdvancedFirewall(None)
+    now = datetime.now()
+    rules = [
+        FirewallRule("temp", "temporary", "203.0.113.0/24", FirewallAction.DROP, 1, expires_at=now + timedelta(hours=1)),
+        FirewallRule("wide", "permanent", "203.0.0.0/16", FirewallAction.MONITOR, 5),
+    ]
+    firewall.firewall_rules = {rule.rule_id: rule for rule in rules}
+    firewall._rebuild_rule_index()
+    assert (await firewall._check_firewall_rules("203.0.113.5"))[0] == FirewallAction.DROP
+
+    rules[0].expires_at = now - timedelta(seconds=1)
+    firewall._rules_expire_at = rules[0].expires_at
+    action, reason = await firewall._check_firewall_rules("203.0.113.5")
+    assert action == FirewallAction.MONITOR and reason == "Rule: permanent"
+
+    # One rebuild is scheduled, however many checks see the stale index
+    task = firewall._recompile_task
+    await firewall._check_firewall_rules("203.0.113.6")
+    assert firewall._recompile_task is task
+    await task
+    assert firewall._rules_expire_at is None and len(firewall._rule_index) == 1
@@ -0,0 +1,64 @@
+import ipaddress
+import random
+
+import pytest
+
+from security.ip_index import PrefixIndex
+
+
+def test_longest_prefix_wins_without_rank():
+    index = PrefixIndex([("10.0.0.0/8", "wide"), ("10.1.0.0/16", "narrow"), ("10.1.2.3", "host"), ("2001:db8::/32", "v6")])
+
+    assert index.lookup("10.1.2.3") == "host"
+    assert index.lookup("10.1.9.9") == "narrow"
+    assert index.lookup("10.200.0.1") == "wide"
+    assert index.lookup("2001:db8::1") == "v6"
+    assert "11.0.0.1" not in index and "::1" not in index
+    assert len(index) == 4
+
+
+def test_lowest_rank_wins_regardless_of_prefix_length():
+    index = PrefixIndex(
+        [("10.0.0.0/8", (1, "wide")), ("10.1.0.0/16", (5, "narrow")), ("10.1.2.0/24", (0, "host")),
+         ("10.1.0.0/16", (3, "duplicate"))],
+        rank=lambda entry: entry[0],
+    )
+
+    assert index.lookup("10.1.2.3") == (0, "host")
+    assert index.lookup("10.1.3.3") == (1, "wide")
+    assert index.lookup(ipaddress.ip_address("10.9.0.1")) == (1, "wide")
+    assert len(index) == 3
+
+
+def test_matches_a_linear_scan(request):
+    rng = random.Random(request.node.name)
+    networks = [
+        ipaddress.ip_network((rng.getrandbits(32), rng.randint(4, 32)), strict=False) for _ in range(2000)
+    ]
+    entries = [(str(net), (rng.randint(0, 50), i)) for i, net in enumerate(networks)]
+    index = PrefixIndex(entries, rank=lambda entry: entry)
+
+    for _ in range(500):
+        ip = ipaddress.ip_address(rng.getrandbits(32))
+        matches = [value for net, (_, value) in zip(networks, entries) if ip in net]
+        assert index.lookup(ip) == (min(matches) if matches else None)
+
+
+def test_invalid_address_raises():
+    with pytest.raises(ValueError):
+        PrefixIndex([("10.0.0.0/8", True)]).lookup("not-an-ip")
+
+
+def test_rejected_values_are_passed_over():
+    index = PrefixIndex(
+        [("10.0.0.0/8", (1, "wide")), ("10.1.0.0/16", (0, "expired")), ("10.1.2.0/24", (2, "host"))],
+        rank=lambda entry: entry[0],
+    )
+    live = lambda entry: entry[1] != "expired"
+
+    assert index.lookup("10.1.2.3") == (0, "expired")
+    assert index.lookup("10.1.2.3", live) == (1, "wide")
+    assert index.lookup("10.2.0.1", live) == (1, "wide")
+    assert PrefixIndex([("10.1.0.0/16", "narrow"), ("10.0.0.0/8", "wide")]).lookup(
+        "10.1.0.1", lambda value: value != "narrow"
+    ) == "wide"
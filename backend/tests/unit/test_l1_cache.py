@@ -0,0 +1,44 @@
+import time
+
+from core.l1_cache import BoundedL1Cache
+
+
+def test_evicts_least_recently_used_when_full():
+    c = BoundedL1Cache(maxsize=2, max_bytes=10_000)
+    c.set("a", 1, size=1)
+    c.set("b", 2, size=1)
+    assert c.get("a") == 1  # "b" is now the LRU entry
+    c.set("c", 3, size=1)
+    assert "b" not in c
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.get_stats()["evictions"] == 1
+
+
+def test_byte_budget_is_enforced():
+    c = BoundedL1Cache(maxsize=100, max_bytes=100, max_entry_bytes=60)
+    c.set("a", "x", size=40)
+    c.set("b", "y", size=40)
+    c.set("c", "z", size=40)
+    assert c.current_bytes <= 100
+    assert "a" not in c
+
+
+def test_oversized_entry_is_rejected():
+    c = BoundedL1Cache(maxsize=10, max_bytes=100, max_entry_bytes=10)
+    assert c.set("big", "v", size=50) is False
+    assert "big" not in c
+    assert c.get_stats()["rejections"] == 1
+
+
+def test_entry_ttl_is_capped_and_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    c = BoundedL1Cache(default_ttl=300)
+    c.set("short", 1, ttl=5)
+    c.set("long", 2, ttl=3600)
+    now[0] += 6
+    assert c.get("short") is None
+    assert c.get("long") == 2
+    now[0] += 300
+    assert c.get("long") is None
+    assert c.get_stats()["expirations"] == 2
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from core.cache_manager import CacheManager, CachePolicy
+from core.l1_snapshot import L1SnapshotStore
+
+
+def _manager():
+    return CacheManager(policies={"ns": CachePolicy(ttl=60, l1_max_items=100, l1_ttl=60)})
+
+
+def test_snapshot_round_trip_keeps_types_tags_and_recency(tmp_path):
+    source = _manager()
+    l1 = source.namespace("ns").l1
+    l1.set("a", {"at": datetime(2025, 1, 1)}, 30, tags=["user:1"])
+    l1.set("b", [1, 2], 30)
+    l1.get("a")  # "a" is now the hottest entry
+
+    path = str(tmp_path / "l1.snap")
+    assert L1SnapshotStore(source, path=path).write() == 2
+
+    target = _manager()
+    assert L1SnapshotStore(target, path=path).restore() == 2
+    restored = target.namespace("ns").l1
+    assert restored.get("a") == {"at": datetime(2025, 1, 1)}
+    assert [k for k, *_ in restored.hottest()] == ["a", "b"]
+    assert restored.invalidate_tags(["user:1"]) == 1
+
+
+def test_snapshot_from_other_version_is_ignored(tmp_path):
+    source = _manager()
+    source.namespace("ns").l1.set("a", 1, 30)
+    path = str(tmp_path / "l1.snap")
+    L1SnapshotStore(source, path=path, version="old").write()
+
+    store = L1SnapshotStore(_manager(), path=path, version="new")
+    assert store.restore() == 0
+    assert store.get_stats()["rejected"] == 1
+
+
+def test_stale_snapshot_is_ignored(tmp_path):
+    source = _manager()
+    source.namespace("ns").l1.set("a", 1, 30)
+    path = str(tmp_path / "l1.snap")
+    L1SnapshotStore(source, path=path).write()
+    assert L1SnapshotStore(_manager(), path=path, max_age=-1).restore() == 0
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+import core.observability as observability
+from core.request_context import request_scope
+
+
+def _points(reader, name):
+    for resource_metrics in reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                if metric.name == name:
+                    return list(metric.data.data_points)
+    return []
+
+
+def test_cache_metrics_carry_the_request_endpoint(monkeypatch):
+    reader = InMemoryMetricReader()
+    monkeypatch.setattr(
+        observability, "meter", MeterProvider(metric_readers=[reader]).get_meter("test")
+    )
+    metrics = observability.CacheMetrics()
+
+    scope = {"method": "GET", "path": "/api/v1/users/7", "route": SimpleNamespace(path="/api/v1/users/{id}")}
+    with request_scope(scope):
+        metrics.record_function("load_user", "hit", 0.001)
+    metrics.record_function("load_user", "miss", 0.01)
+
+    endpoints = {
+        (point.attributes["endpoint"], point.attributes["result"])
+        for point in _points(reader, "cache.function.calls")
+    }
+    assert endpoints == {("GET /api/v1/users/{id}", "hit"), ("background", "miss")}
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.pagination import (
+    InvalidCursor,
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    paginate_items,
+)
+
+metadata = MetaData()
+events = Table(
+    "events",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String(20)),
+    Column("created_at", DateTime),
+)
+NEWEST_FIRST = SortKey.of("events", events.c.created_at, events.c.id, descending=True)
+
+START = datetime(2026, 1, 1)
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        # Pairs of rows share a timestamp, so the id tiebreaker matters
+        await conn.execute(
+            events.insert(),
+            [{"id": i, "kind": "even" if i % 2 == 0 else "odd", "created_at": START + timedelta(minutes=i // 2)}
+             for i in range(1, 12)],
+        )
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+def test_cursor_round_trips_typed_values_and_rejects_tampering():
+    values = [START, 7]
+    cursor = encode_cursor("events", values)
+    assert decode_cursor("events", cursor) == values
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor("other-listing", cursor)
+    body, sig = cursor.split(".")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("events", f"{body}x.{sig}")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("events", "not a cursor")
+
+
+@pytest.mark.asyncio
+async def test_pages_walk_every_row_once_in_order(session):
+    stmt = select(events.c.id, events.c.created_at)
+    seen, cursor = [], None
+    while True:
+        page = await paginate(session, stmt, NEWEST_FIRST, cursor, limit=4)
+        seen.extend(row.id for row in page.items)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+
+    assert seen == [11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+    assert page.headers() == {}
+
+
+@pytest.mark.asyncio
+async def test_filters_and_mixed_directions(session):
+    oldest_first_by_kind = SortKey("events.kind", (events.c.kind, events.c.id), (False, True))
+    stmt = select(events.c.id, events.c.kind).where(events.c.id > 6)
+
+    first = await paginate(session, stmt, oldest_first_by_kind, limit=3)
+    second = await paginate(session, stmt, oldest_first_by_kind, first.next_cursor, limit=3)
+
+    assert [r.id for r in first.items] == [10, 8, 11]
+    assert [r.id for r in second.items] == [9, 7]
+    assert second.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_offset_serves_legacy_callers_and_still_issues_a_cursor(session):
+    stmt = select(events.c.id, events.c.created_at)
+    by_offset = await paginate(session, stmt, NEWEST_FIRST, limit=3, offset=3)
+    # A cursor replaces the offset rather than adding to it
+    by_cursor = await paginate(session, stmt, NEWEST_FIRST, by_offset.next_cursor, limit=3, offset=3)
+
+    assert [r.id for r in by_offset.items] == [8, 7, 6]
+    assert [r.id for r in by_cursor.items] == [5, 4, 3]
+    assert by_offset.headers() == {"X-Next-Cursor": by_offset.next_cursor}
+
+
+def test_paginate_items_matches_database_cursors():
+    items = [{"id": i, "score": i % 3} for i in range(7)]
+    key = lambda item: (item["score"], item["id"])
+
+    first = paginate_items(items, "scores", key, limit=4, descending=True)
+    second = paginate_items(items, "scores", key, first.next_cursor, limit=4, descending=True)
+
+    assert [i["id"] for i in first.items + second.items] == [5, 2, 4, 1, 6, 3, 0]
+    assert second.next_cursor is None and first.estimated_total == 7
+    assert second.headers() == {"X-Estimated-Total": "7"}
+
+    skipped = paginate_items(items, "scores", key, limit=4, descending=True, offset=4)
+    assert [i["id"] for i in skipped.items] == [6, 3, 0]
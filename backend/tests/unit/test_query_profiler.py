@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.query_profiler import BACKGROUND, QueryProfiler, fingerprint
+from core.request_context import request_scope
+
+metadata = MetaData()
+users = Table("users", metadata, Column("id", Integer, primary_key=True), Column("email", String(50)))
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        (
+            "SELECT * FROM users WHERE email = 'a@b.com' AND id = 42",
+            "SELECT * FROM users WHERE email = ? AND id = ?",
+        ),
+        (
+            "SELECT users.id FROM users\n  WHERE users.id IN ($1::UUID, $2::UUID, $3::UUID) LIMIT $4::INTEGER",
+            "SELECT users.id FROM users WHERE users.id IN (...) LIMIT ?",
+        ),
+        ("INSERT INTO t1 (a, b) VALUES (?, ?), (?, ?), (?, ?)", "INSERT INTO t1 (a, b) VALUES (...)"),
+        ("UPDATE jobs SET progress=%(progress)s WHERE id = %(id)s", "UPDATE jobs SET progress=? WHERE id = ?"),
+        ("SELECT CAST(x AS TEXT)::text FROM v2 WHERE y = :y", "SELECT CAST(x AS TEXT)::text FROM v2 WHERE y = ?"),
+    ],
+)
+def test_fingerprint_normalizes_literals(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+@pytest.mark.asyncio
+async def test_profiler_aggregates_per_endpoint_and_flags_n_plus_one(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+    profiler = QueryProfiler(n_plus_one_threshold=5)
+    profiler.attach(engine.sync_engine)
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/users"}
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(users.insert(), [{"id": i, "email": f"u{i}@example.com"} for i in range(8)])
+
+        for _ in range(2):
+            with request_scope(scope):
+                async with engine.connect() as conn:
+                    ids = (await conn.execute(select(users.c.id))).scalars().all()
+                    for user_id in ids:
+                        await conn.execute(select(users.c.email).where(users.c.id == user_id))
+    finally:
+        profiler.detach()
+        await engine.dispose()
+
+    report = profiler.report(endpoint="GET /api/v1/users", sort="count")
+    per_user = report["statements"][0]
+    assert per_user["count"] == 16
+    assert per_user["fingerprint"].endswith("WHERE users.id = ?")
+    assert per_user["p95_ms"] <= per_user["max_ms"]
+    assert [row["count"] for row in report["statements"]] == [16, 2]
+
+    suspect, = report["n_plus_one"]
+    assert suspect["fingerprint"] == per_user["fingerprint"]
+    assert suspect["requests"] == 2 and suspect["max_per_request"] == 8
+
+    # Setup statements ran outside any request
+    assert any(row["endpoint"] == BACKGROUND for row in profiler.report()["statements"])
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_does_not_leave_its_start_behind(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+    profiler = QueryProfiler()
+    profiler.attach(engine.sync_engine)
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(Exception):
+                await conn.exec_driver_sql("SELECT * FROM missing_table")
+            await conn.exec_driver_sql("SELECT 1")
+            assert not conn.sync_connection.info.get("query_profiler_start")
+    finally:
+        profiler.detach()
+        await engine.dispose()
+
+    fingerprints = [row["fingerprint"] for row in profiler.report()["statements"]]
+    assert "SELECT ?" in fingerprints
+    assert not any("missing_table" in key for key in fingerprints)
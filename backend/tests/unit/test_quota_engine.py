@@ -0,0 +1,74 @@
+import pytest
+
+from core.quota_engine import CONCURRENCY, CounterBuffer, Limit, QuotaEngine
+
+
+class ScriptRedis:
+    """register_script stand-in that answers like QUOTA_LUA"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def register_script(self, source):
+        async def script(keys, args):
+            self.calls.append((keys, args))
+            return self.reply
+
+        return script
+
+
+TREE = [
+    Limit("global", "all", 0),  # disabled
+    Limit("plan", "basic:u1", 600),
+    Limit("user", "u1", 50, 120, CONCURRENCY),
+    Limit("endpoint", "1.2.3.4:/api/v1/ai", 30),
+]
+
+
+@pytest.mark.asyncio
+async def test_tree_is_one_script_call_with_disabled_levels_skipped():
+    redis = ScriptRedis([1, 1, 599, 0, 100, 1, 49, 0, 0, 1, 3, 0, 54000])
+    decision = await QuotaEngine(redis).evaluate(TREE)
+
+    assert len(redis.calls) == 1
+    keys, args = redis.calls[0]
+    assert keys == ["quota:rate:plan:basic:u1", "quota:concurrency:user:u1", "quota:rate:endpoint:1.2.3.4:/api/v1/ai"]
+    assert args[2:] == ["r", 600, 60000, "c", 50, 120000, "r", 30, 60000]
+    assert decision.allowed and decision.lease == args[1]
+    assert decision.tightest[0].scope == "endpoint"
+    assert decision.result_for("endpoint").reset_after == 54
+
+
+@pytest.mark.asyncio
+async def test_denied_tree_reports_the_slowest_limit_and_holds_no_lease():
+    redis = ScriptRedis([0, 0, 0, 2000, 60000, 1, 49, 0, 0, 0, 0, 9000, 60000])
+    decision = await QuotaEngine(redis).evaluate(TREE)
+
+    assert not decision.allowed and decision.lease is None
+    limit, result = decision.denied
+    assert limit.scope == "endpoint" and result.retry_after == 9
+
+
+@pytest.mark.asyncio
+async def test_counter_buffer_batches_and_retries():
+    batches, failures = [], [ConnectionError("db down")]
+
+    async def flush(deltas):
+        if failures:
+            raise failures.pop()
+        batches.append(dict(deltas))
+
+    buffer = CounterBuffer(flush, interval=3600)
+    buffer.add(("u1", "ai_calls_daily"), 1)
+    buffer.add(("u1", "ai_calls_daily"), 1)
+    buffer.add(("u1", "ai_tokens_monthly"), 250)
+    assert buffer.pending(("u1", "ai_calls_daily")) == 2
+
+    await buffer.flush()  # fails, deltas kept
+    assert batches == [] and buffer.pending(("u1", "ai_tokens_monthly")) == 250
+
+    buffer.add(("u1", "ai_calls_daily"), 1)
+    await buffer.stop()
+    assert batches == [{("u1", "ai_calls_daily"): 3, ("u1", "ai_tokens_monthly"): 250}]
+    assert buffer.pending(("u1", "ai_calls_daily")) == 0
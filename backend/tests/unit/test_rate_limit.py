@@ -0,0 +1,120 @@
+import pytest
+
+from core.rate_limit import CircuitBreaker, LocalRateLimiter, RateLimiter, gcra
+
+
+def test_gcra_allows_a_burst_then_spaces_requests():
+    tat, results = None, []
+    for _ in range(6):
+        result, new_tat = gcra(tat, now=0.0, limit=5, window=60.0)
+        results.append(result)
+        tat = new_tat if new_tat is not None else tat
+
+    assert [r.allowed for r in results] == [True] * 5 + [False]
+    assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+    denied = results[-1]
+    assert denied.retry_after == pytest.approx(12.0) and denied.reset_after == pytest.approx(60.0)
+
+    # One emission interval later exactly one more request fits
+    result, _ = gcra(tat, now=12.0, limit=5, window=60.0)
+    assert result.allowed and result.remaining == 0
+
+
+def test_gcra_recovers_fully_after_the_window():
+    _, tat = gcra(None, now=0.0, limit=10, window=60.0, cost=10)
+    result, _ = gcra(tat, now=60.0, limit=10, window=60.0)
+    assert result.allowed and result.remaining == 9
+
+
+def test_denied_headers_carry_retry_after():
+    result, _ = gcra(60.0, now=0.0, limit=5, window=60.0)
+    headers = result.headers(60)
+    assert headers["X-RateLimit-Remaining"] == "0"
+    assert headers["Retry-After"] == "12" and headers["X-RateLimit-Reset"] == "60"
+
+
+class ScriptRedis:
+    """register_script stand-in that answers like GCRA_LUA"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def register_script(self, source):
+        async def script(keys, args, client=None):
+            self.calls.append((keys, args))
+            if isinstance(self.reply, Exception):
+                raise self.reply
+            return self.reply
+
+        return script
+
+
+@pytest.mark.asyncio
+async def test_check_reports_reset_and_retry_after():
+    redis = ScriptRedis([0, 0, 1500, 60000])
+    result = await RateLimiter(redis).check("ip:1.2.3.4", limit=10, window=60)
+
+    assert not result.allowed and result.retry_after == 1.5 and result.reset_after == 60
+    keys, args = redis.calls[0]
+    assert keys == ["rate_limit:gcra:ip:1.2.3.4"] and args == [6000.0, 60000, 1]
+    assert await RateLimiter(redis).is_allowed("ip:1.2.3.4", 10) == (False, 0)
+
+
+@pytest.mark.asyncio
+async def test_check_allows_when_redis_fails():
+    result = await RateLimiter(ScriptRedis(ConnectionError("down"))).check("k", limit=5)
+    assert result.allowed and result.remaining == 5
+
+
+def test_local_limiter_matches_gcra():
+    limiter = LocalRateLimiter()
+    results = [limiter.check("ip:1.2.3.4", 3, 60, now=0.0) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert limiter.check("ip:1.2.3.4", 3, 60, now=20.0).allowed
+
+
+def test_local_limiter_evicts_least_recently_used_keys():
+    limiter = LocalRateLimiter(max_keys=2)
+    limiter.check("a", 1, 60, now=0.0)
+    limiter.check("b", 1, 60, now=0.0)
+    limiter.check("a", 1, 60, now=1.0)  # denied, but "a" is now the most recent
+    limiter.check("c", 1, 60, now=2.0)
+
+    assert len(limiter) == 2 and limiter.evictions == 1
+    assert limiter.check("b", 1, 60, now=3.0).allowed  # forgotten, full allowance again
+    assert not limiter.check("c", 1, 60, now=3.0).allowed
+
+
+def test_local_limiter_byte_cap_and_clear():
+    limiter = LocalRateLimiter(max_bytes=10 * LocalRateLimiter.ENTRY_OVERHEAD)
+    for i in range(1000):
+        limiter.check(f"ip:10.0.{i // 256}.{i % 256}", 60, 60, now=0.0)
+
+    kept = len(limiter)
+    assert 0 < kept < 10 and limiter.bytes <= limiter.max_bytes
+    assert limiter.clear() == kept and limiter.bytes == 0 and len(limiter) == 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_only_on_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    async def fail():
+        raise ConnectionError("down")
+
+    async def succeed():
+        return "ok"
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+        assert await breaker.call(succeed) == "ok"
+    assert breaker.state == "closed" and breaker.failure_count == 0
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+    assert breaker.state == "open"
+    with pytest.raises(Exception, match="open"):
+        await breaker.call(succeed)
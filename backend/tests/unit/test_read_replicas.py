@@ -0,0 +1,87 @@
+import math
+import shutil
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+
+from core.engine_registry import EngineRegistry, PoolConfig
+from core.read_replicas import PRIMARY, ReplicaRouter, client_identity
+from core.request_context import request_scope
+
+metadata = MetaData()
+notes = Table("notes", metadata, Column("id", Integer, primary_key=True), Column("body", String(50)))
+
+SCOPE = {"type": "http", "headers": [(b"authorization", b"Bearer token-1")], "client": ("10.0.0.1", 1234)}
+
+
+@asynccontextmanager
+async def replicated(tmp_path):
+    """Primary plus a SQLite copy serving as its replica"""
+    primary_path, replica_path = tmp_path / "primary.db", tmp_path / "replica.db"
+    registry = EngineRegistry()
+    registry.register(PoolConfig(name=PRIMARY, url=f"sqlite+aiosqlite:///{primary_path}"))
+    async with registry.engine(PRIMARY).begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(notes.insert(), [{"id": 1, "body": "replicated"}])
+    shutil.copy(primary_path, replica_path)
+    registry.register(PoolConfig(name="replica_0", url=f"sqlite+aiosqlite:///{replica_path}"))
+
+    router = ReplicaRouter(registry, ["replica_0"], max_lag=5, check_interval=60, pin_seconds=30)
+    router.watch_writes(registry.engine(PRIMARY))
+    try:
+        yield registry, router
+    finally:
+        await registry.dispose()
+
+
+async def _read_bodies(registry, pool):
+    async with registry.sessionmaker(pool)() as session:
+        return (await session.execute(select(notes.c.body).order_by(notes.c.id))).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_writes_pin_the_client_to_the_primary(tmp_path):
+    async with replicated(tmp_path) as (registry, router):
+        identity = client_identity(SCOPE)
+
+        pool = await router.route(identity)
+        assert pool == "replica_0"
+        assert await _read_bodies(registry, pool) == ["replicated"]
+
+        with request_scope(SCOPE):
+            async with registry.engine(PRIMARY).begin() as conn:
+                await conn.execute(notes.insert(), [{"id": 2, "body": "fresh"}])
+
+        # The writer reads its own row from the primary; other clients still use the replica
+        pool = await router.route(identity)
+        assert pool == PRIMARY
+        assert await _read_bodies(registry, pool) == ["replicated", "fresh"]
+        assert await router.route(client_identity({"headers": [], "client": ("10.0.0.2", 1)})) == "replica_0"
+        assert router.stats == {"replica": 2, "primary_pinned": 1, "primary_lagging": 0}
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_unreachable_replicas_fall_back_to_the_primary(tmp_path, monkeypatch):
+    async with replicated(tmp_path) as (_registry, router):
+        checks = []
+
+        async def measure(engine):
+            checks.append(engine)
+            return 12.0 if len(checks) == 1 else math.inf
+
+        monkeypatch.setattr(router, "_measure_lag", measure)
+        assert await router.route() == PRIMARY
+        assert await router.route() == PRIMARY
+        # The lag is cached for check_interval
+        assert len(checks) == 1
+
+        router.check_interval = 0
+        assert await router.route() == PRIMARY
+        assert len(checks) == 2 and router.stats["primary_lagging"] == 3
+
+
+@pytest.mark.asyncio
+async def test_no_replicas_means_primary():
+    router = ReplicaRouter(EngineRegistry(), [])
+    assert await router.route("anyone") == PRIMARY
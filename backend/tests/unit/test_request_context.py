@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.request_context import forget, memoize, request_scope
+from services.plan_service import PlanService
+from utils.plan_decorators import require_plan_feature, require_plan_tier
+
+
+@pytest.mark.asyncio
+async def test_memoize_runs_loader_once_per_request():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return "plan"
+
+    with request_scope() as context:
+        results = await asyncio.gather(*(memoize(("plan", "u1"), loader) for _ in range(3)))
+        assert results == ["plan"] * 3
+        assert len(calls) == 1
+        assert context.stats == {'hits': 2, 'misses': 1}
+
+        forget(("plan", "u1"))
+        await memoize(("plan", "u1"), loader)
+        assert len(calls) == 2
+
+    # Outside a request every call goes to the loader
+    await memoize(("plan", "u1"), loader)
+    await memoize(("plan", "u1"), loader)
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_memoize_does_not_remember_failures():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("db down")
+        return "ok"
+
+    with request_scope():
+        with pytest.raises(RuntimeError):
+            await memoize("key", flaky)
+        assert await memoize("key", flaky) == "ok"
+
+
+class _CountingSession:
+    def __init__(self, plan):
+        self.plan = plan
+        self.queries = 0
+
+    async def execute(self, _statement):
+        self.queries += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: self.plan)
+
+
+@pytest.mark.asyncio
+async def test_stacked_plan_checks_share_one_query(monkeypatch):
+    monkeypatch.setattr("services.plan_service.settings.PLAN_CACHE_TTL", 0)
+    plan = SimpleNamespace(code="premium", name="Premium", allowed_functions=["exports"])
+    db = _CountingSession(plan)
+
+    @require_plan_tier("premium")
+    @require_plan_feature("exports")
+    async def endpoint(current_user, plan_service):
+        return await plan_service.get_user_plan(current_user.id)
+
+    with request_scope():
+        result = await endpoint(
+            current_user=SimpleNamespace(id="u1"), plan_service=PlanService(db)
+        )
+
+    assert result is plan
+    assert db.queries == 1
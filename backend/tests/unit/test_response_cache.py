@@ -0,0 +1,41 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.response_cache import PrecompiledResponse, ResponseCache, etag_matches
+
+
+def test_etag_weak_comparison():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"x", "abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+
+
+def test_precompiled_variants_and_304():
+    app = FastAPI()
+    responses = ResponseCache(min_compression_size=10)
+    entry = responses.put("/p", {"items": ["x" * 20] * 50})
+
+    @app.middleware("http")
+    async def l0(request, call_next):
+        return responses.respond(request.url.path, request) or await call_next(request)
+
+    client = TestClient(app)
+    r = client.get("/p", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["etag"] == entry.etag
+    assert r.json() == {"items": ["x" * 20] * 50}
+    assert gzip.decompress(entry.gzip_body) == entry.body
+
+    r = client.get("/p", headers={"If-None-Match": entry.etag})
+    assert r.status_code == 304 and r.content == b""
+    assert responses.get_stats()["not_modified"] == 1
+
+
+def test_identity_when_encoding_refused():
+    entry = PrecompiledResponse(b"a" * 1000)
+    assert entry.select("gzip;q=0, identity")[1] is None
+    assert entry.select("gzip, deflate")[1] == "gzip"
+
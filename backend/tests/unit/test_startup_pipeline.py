@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from core.startup_pipeline import StartupPipeline
+
+
+class MarkerRedis:
+    """Just enough of redis.asyncio for leases and markers (no expiry)"""
+
+    def __init__(self):
+        self.data = {}
+        self.renewals = 0
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if self.data.get(key) != token.encode():
+            return 0
+        if "pexpire" in script:
+            self.renewals += 1
+        else:
+            del self.data[key]
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_overlap_and_order_is_kept():
+    events = []
+
+    async def step(name, delay):
+        events.append(f"{name}:start")
+        await asyncio.sleep(delay)
+        events.append(f"{name}:end")
+
+    pipeline = StartupPipeline(budget=5)
+    pipeline.add("a", lambda: step("a", 0.05))
+    pipeline.add("b", lambda: step("b", 0.05))
+    pipeline.add("c", lambda: step("c", 0), after=("a", "b"))
+    report = await pipeline.run()
+
+    assert events[:2] == ["a:start", "b:start"]
+    assert events.index("c:start") > max(events.index("a:end"), events.index("b:end"))
+    assert report["total_ms"] < 100
+    assert all(r["status"] == "ok" for r in report["steps"].values())
+
+
+@pytest.mark.asyncio
+async def test_budget_cancels_slow_steps_and_failures_are_reported():
+    async def boom():
+        raise RuntimeError("no db")
+
+    async def returns_false():
+        return False
+
+    pipeline = StartupPipeline(budget=0.05)
+    pipeline.add("slow", lambda: asyncio.sleep(1))
+    pipeline.add("boom", boom)
+    pipeline.add("false", returns_false)
+    pipeline.add("after_slow", lambda: asyncio.sleep(0), after=("slow",))
+    steps = (await pipeline.run())["steps"]
+
+    assert steps["slow"]["status"] == "timeout"
+    assert steps["boom"] == {**steps["boom"], "status": "failed", "error": "no db"}
+    assert steps["false"]["status"] == "failed"
+    # Its dependency gave up, so it never ran
+    assert steps["after_slow"]["status"] == "failed"
+    assert "slow" in steps["after_slow"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_failed_dependencies_skip_but_wait_for_does_not():
+    ran = []
+
+    async def record(name):
+        ran.append(name)
+
+    pipeline = StartupPipeline(budget=5)
+    pipeline.add("redis", lambda: asyncio.sleep(0, result=False))
+    pipeline.add("tables", lambda: record("tables"), wait_for=("redis",))
+    pipeline.add("columns", lambda: record("columns"), after=("redis",))
+    steps = (await pipeline.run())["steps"]
+
+    assert ran == ["tables"]
+    assert steps["tables"]["status"] == "ok" and steps["columns"]["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_leader_keeps_its_lease_past_the_budget():
+    redis = MarkerRedis()
+    finished = asyncio.Event()
+
+    async def migrate():
+        await asyncio.sleep(0.15)
+        finished.set()
+
+    pipeline = StartupPipeline(budget=0.05, redis=lambda: redis, lease_ttl=0.06)
+    pipeline.add("migrations", migrate, marker="schema", fingerprint="head-1")
+    steps = (await pipeline.run())["steps"]
+
+    assert steps["migrations"]["status"] == "timeout"
+    # Still running and still the leader, with the lease renewed
+    assert "startup:schema:leader" in redis.data
+    await asyncio.wait_for(finished.wait(), 1)
+    await asyncio.sleep(0.01)
+    assert redis.renewals >= 1
+    assert redis.data == {"startup:schema": b"head-1"}
+
+
+@pytest.mark.asyncio
+async def test_marker_step_runs_on_one_worker_only():
+    redis = MarkerRedis()
+    runs = []
+
+    async def migrate():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+
+    def worker():
+        pipeline = StartupPipeline(budget=5, redis=lambda: redis, poll_interval=0.01)
+        pipeline.add("migrations", migrate, marker="schema", fingerprint="head-1")
+        return pipeline
+
+    workers = [worker() for _ in range(4)]
+    reports = await asyncio.gather(*(w.run() for w in workers))
+
+    assert len(runs) == 1
+    statuses = sorted(r["steps"]["migrations"]["status"] for r in reports)
+    assert statuses == ["cached", "cached", "cached", "ok"]
+    assert redis.data == {"startup:schema": b"head-1"}
+
+    # A new head revision runs the step again
+    pipeline = StartupPipeline(budget=5, redis=lambda: redis)
+    pipeline.add("migrations", migrate, marker="schema", fingerprint="head-2")
+    await pipeline.run()
+    assert len(runs) == 2
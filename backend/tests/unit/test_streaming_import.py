@@ -0,0 +1,111 @@
+import json
+import uuid
+
+import pytest
+from sqlalchemy import JSON, Boolean, Column, DateTime, Integer, MetaData, String, Table, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from services.streaming_import import StreamingImporter, iter_csv_records, iter_json_records
+
+metadata = MetaData()
+contacts = Table(
+    "contacts",
+    metadata,
+    Column("id", String(36), primary_key=True, default=lambda: str(uuid.uuid4())),
+    Column("email", String(255), nullable=False, unique=True),
+    Column("score", Integer),
+    Column("active", Boolean, nullable=False, default=True),
+    Column("created_at", DateTime, default=func.now()),
+)
+
+
+@pytest.mark.parametrize("layout", ["array", "ndjson"])
+def test_json_records_are_decoded_across_read_boundaries(tmp_path, layout):
+    records = [{"email": f"user{i}@example.com", "tags": ["a", "b"], "note": "x" * i} for i in range(50)]
+    path = tmp_path / "records.json"
+    if layout == "array":
+        path.write_text(json.dumps(records, indent=2))
+    else:
+        path.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+
+    assert list(iter_json_records(str(path), buffer_size=7)) == records
+
+
+def test_truncated_json_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('[{"email": "a@example.com"}, {"email": ')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(str(path), buffer_size=8))
+
+
+@pytest.mark.asyncio
+async def test_import_commits_per_chunk_and_rejects_bad_rows(tmp_path):
+    path = tmp_path / "contacts.csv"
+    lines = ["mail,score,active"]
+    lines += [f"user{i}@example.com,{i},{'true' if i % 2 else 'false'}" for i in range(9)]
+    lines += [",5,true", "bad@example.com,not-a-number,true", "user0@example.com,1,true"]
+    path.write_text("\n".join(lines) + "\n")
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import.db'}")
+    progress = []
+
+    async def on_progress(inserted, skipped, rejected):
+        progress.append((inserted, skipped, rejected))
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+        importer = StreamingImporter(
+            contacts, engine=engine, chunk_size=4, field_mappings={"email": "mail"}
+        )
+        result = await importer.run(iter_csv_records(str(path)), on_progress=on_progress)
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(contacts).order_by(contacts.c.score))).all()
+    finally:
+        await engine.dispose()
+
+    # Missing email and a non-numeric score are rejected; the duplicate is skipped
+    assert result == {"processed": 10, "inserted": 9, "skipped": 1, "rejected": 2, "chunks": 3}
+    assert progress == [(4, 0, 0), (8, 0, 0), (9, 1, 2)]
+    assert len(rows) == 9
+    assert rows[3].email == "user3@example.com" and rows[3].active is True
+    assert rows[4].active is False
+    assert all(row.id and row.created_at for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_copy_duplicate_fallback_inserts_unencoded_json():
+    asyncpg = pytest.importorskip("asyncpg")
+    tagged = Table("tagged", MetaData(), Column("id", Integer, primary_key=True), Column("tags", JSON))
+
+    class Driver:
+        copied = None
+
+        def transaction(self):
+            return self
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def copy_records_to_table(self, table, records, columns, schema_name):
+            self.copied = records
+            raise asyncpg.UniqueViolationError("duplicate key")
+
+    inserted = []
+
+    async def insert_chunk(rows):
+        inserted.extend(rows)
+        return len(rows)
+
+    importer = StreamingImporter(tagged, engine=object())
+    importer.columns = list(tagged.columns)
+    importer._insert_chunk = insert_chunk
+    driver = Driver()
+
+    assert await importer._copy_chunk(driver, [(1, ["a", "b"])]) == 1
+    assert driver.copied == [(1, '["a", "b"]')]
+    assert inserted == [(1, ["a", "b"])]
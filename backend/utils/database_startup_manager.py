@@ -8,6 +8,8 @@ Handles all database operations in one go during startup:
 - Performance optimization
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
@@ -37,6 +39,8 @@ class DatabaseStartupManager:
         self.errors: list[dict[str, Any]] = []
         self.fixes_applied: list[dict[str, Any]] = []
         self.migration_status: dict[str, Any] = {}
+        # Set once the schema snapshot built (or matched) the database
+        self.snapshot_applied = False
 
     def log_operation(
         self,
@@ -131,6 +135,10 @@ class DatabaseStartupManager:
 
     async def check_and_create_tables(self) -> bool:
         """Check for missing tables and create them"""
+        if settings.SCHEMA_SNAPSHOT and (
+            self.snapshot_applied or await self.load_schema_snapshot()
+        ):
+            return True
         try:
             async with engine.begin() as conn:
                 # Get existing tables
@@ -166,6 +174,26 @@ class DatabaseStartupManager:
             )
             return False
 
+    async def load_schema_snapshot(self) -> bool:
+        """Build/skip the schema from the checked-in snapshot; False means introspect instead"""
+        from utils.schema_snapshot import apply_snapshot
+
+        try:
+            outcome = await apply_snapshot(engine)
+        except Exception as e:
+            self.log_operation(
+                "Schema Snapshot", "WARNING", "Snapshot could not be applied", str(e)
+            )
+            return False
+        if outcome == "loaded":
+            self.log_operation("Schema Snapshot", "SUCCESS", "Schema created from snapshot")
+        elif outcome == "current":
+            self.log_operation("Schema Snapshot", "SUCCESS", "Schema matches snapshot, skipping checks")
+        else:
+            self.log_operation("Schema Snapshot", "WARNING", f"Snapshot not used ({outcome})")
+        self.snapshot_applied = outcome in ("loaded", "current")
+        return self.snapshot_applied
+
     async def check_and_fix_columns(self) -> bool:
         """Check for missing columns and add them"""
         # Skipping automatic column alterations to avoid unsafe schema drift.
@@ -208,25 +236,8 @@ class DatabaseStartupManager:
                 "sqlalchemy.url", settings.DATABASE_URL
             )
 
-            # Get current revision
-            try:
-                current_rev = command.current(alembic_cfg)
-                self.log_operation(
-                    "Migration Status",
-                    "SUCCESS",
-                    f"Current revision: {current_rev}",
-                )
-            except:
-                current_rev = "None"
-                self.log_operation(
-                    "Migration Status", "WARNING", "No current revision found"
-                )
-
-            # Run upgrade to head
-            command.upgrade(alembic_cfg, "head")
-            self.log_operation(
-                "Migration Upgrade", "SUCCESS", "Upgraded to latest revision"
-            )
+            # Alembic is synchronous; keep the event loop free for other startup steps
+            await asyncio.to_thread(self._upgrade_to_head, command, alembic_cfg)
 
             return True
         except Exception as e:
@@ -235,6 +246,39 @@ class DatabaseStartupManager:
             )
             return False
 
+    def _upgrade_to_head(self, command, alembic_cfg) -> None:
+        # Get current revision
+        try:
+            current_rev = command.current(alembic_cfg)
+            self.log_operation(
+                "Migration Status",
+                "SUCCESS",
+                f"Current revision: {current_rev}",
+            )
+        except:
+            current_rev = "None"
+            self.log_operation(
+                "Migration Status", "WARNING", "No current revision found"
+            )
+
+        # Run upgrade to head
+        command.upgrade(alembic_cfg, "head")
+        self.log_operation(
+            "Migration Upgrade", "SUCCESS", "Upgraded to latest revision"
+        )
+
+    def schema_fingerprint(self) -> str:
+        """Database identity plus Alembic head revision(s), read from the scripts"""
+        database = hashlib.sha1(settings.DATABASE_URL.encode()).hexdigest()[:12]
+        try:
+            from alembic.config import Config
+            from alembic.script import ScriptDirectory
+
+            heads = ScriptDirectory.from_config(Config("alembic.ini")).get_heads()
+            return f"{database}:{','.join(sorted(heads))}"
+        except Exception:
+            return f"{database}:unversioned"
+
     async def check_data_integrity(self) -> bool:
         """Check data integrity and fix common issues"""
         try:
@@ -3,14 +3,46 @@ Plan-based feature access control decorators
 Enforces plan limits and feature access across the application
 """
 
+import inspect
 from collections.abc import Callable
 from functools import wraps
+from typing import Any
 
 from fastapi import HTTPException
 
 from services.plan_service import PlanService
 
 
+def _user_id(user: Any) -> Any:
+    return user.get("id") if isinstance(user, dict) else getattr(user, "id", None)
+
+
+def _resolve_dependencies(
+    func: Callable, args: tuple, kwargs: dict
+) -> tuple[Any, PlanService | None]:
+    """
+    Find ``current_user`` and ``plan_service`` among the endpoint arguments.
+
+    Plan lookups made through ``plan_service`` are memoized per request, so
+    stacked decorators and the endpoint body share one plan query.
+    """
+    current_user = kwargs.get("current_user")
+    plan_service = kwargs.get("plan_service")
+
+    # If not passed by keyword (FastAPI injection), bind the signature
+    if current_user is None or plan_service is None:
+        bound_args = inspect.signature(func).bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        current_user = bound_args.arguments.get("current_user")
+        plan_service = bound_args.arguments.get("plan_service")
+
+    if _user_id(current_user) is None:
+        current_user = None
+    if not isinstance(plan_service, PlanService):
+        plan_service = None
+    return current_user, plan_service
+
+
 def require_plan_feature(feature_name: str):
     """
     Decorator to enforce plan-based feature access
@@ -24,40 +56,9 @@ def require_plan_feature(feature_name: str):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Extract current_user and plan_service from dependencies
-            current_user = None
-            plan_service = None
-
-            # Look for dependencies in kwargs (FastAPI dependency injection)
-            for key, value in kwargs.items():
-                if (
-                    key == "current_user"
-                    and isinstance(value, dict)
-                    and "id" in value
-                ):
-                    current_user = value
-                elif key == "plan_service" and isinstance(value, PlanService):
-                    plan_service = value
-
-            # If not found in kwargs, try to find in function signature
-            if not current_user or not plan_service:
-                import inspect
-
-                sig = inspect.signature(func)
-                bound_args = sig.bind(*args, **kwargs)
-                bound_args.apply_defaults()
-
-                for param_name, param_value in bound_args.arguments.items():
-                    if (
-                        param_name == "current_user"
-                        and isinstance(param_value, dict)
-                        and "id" in param_value
-                    ):
-                        current_user = param_value
-                    elif param_name == "plan_service" and isinstance(
-                        param_value, PlanService
-                    ):
-                        plan_service = param_value
+            current_user, plan_service = _resolve_dependencies(
+                func, args, kwargs
+            )
 
             if not current_user:
                 raise HTTPException(
@@ -69,7 +70,7 @@ def require_plan_feature(feature_name: str):
                     status_code=500, detail="Plan service not available"
                 )
 
-            user_id = current_user.id
+            user_id = _user_id(current_user)
             has_feature = await plan_service.user_has_feature(
                 user_id, feature_name
             )
@@ -113,38 +114,9 @@ def require_plan_tier(minimum_tier: str):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Extract dependencies similar to require_plan_feature
-            current_user = None
-            plan_service = None
-
-            for key, value in kwargs.items():
-                if (
-                    key == "current_user"
-                    and isinstance(value, dict)
-                    and "id" in value
-                ):
-                    current_user = value
-                elif key == "plan_service" and isinstance(value, PlanService):
-                    plan_service = value
-
-            if not current_user or not plan_service:
-                import inspect
-
-                sig = inspect.signature(func)
-                bound_args = sig.bind(*args, **kwargs)
-                bound_args.apply_defaults()
-
-                for param_name, param_value in bound_args.arguments.items():
-                    if (
-                        param_name == "current_user"
-                        and isinstance(param_value, dict)
-                        and "id" in param_value
-                    ):
-                        current_user = param_value
-                    elif param_name == "plan_service" and isinstance(
-                        param_value, PlanService
-                    ):
-                        plan_service = param_value
+            current_user, plan_service = _resolve_dependencies(
+                func, args, kwargs
+            )
 
             if not current_user:
                 raise HTTPException(
@@ -156,7 +128,7 @@ def require_plan_tier(minimum_tier: str):
                     status_code=500, detail="Plan service not available"
                 )
 
-            user_id = current_user.id
+            user_id = _user_id(current_user)
             plan = await plan_service.get_user_plan(user_id)
 
             if not plan:
@@ -216,37 +188,9 @@ def require_quota(quota_type: str, amount: int = 1):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            current_user = None
-            plan_service = None
-
-            for key, value in kwargs.items():
-                if (
-                    key == "current_user"
-                    and isinstance(value, dict)
-                    and "id" in value
-                ):
-                    current_user = value
-                elif key == "plan_service" and isinstance(value, PlanService):
-                    plan_service = value
-
-            if not current_user or not plan_service:
-                import inspect
-
-                sig = inspect.signature(func)
-                bound_args = sig.bind(*args, **kwargs)
-                bound_args.apply_defaults()
-
-                for param_name, param_value in bound_args.arguments.items():
-                    if (
-                        param_name == "current_user"
-                        and isinstance(param_value, dict)
-                        and "id" in param_value
-                    ):
-                        current_user = param_value
-                    elif param_name == "plan_service" and isinstance(
-                        param_value, PlanService
-                    ):
-                        plan_service = param_value
+            current_user, plan_service = _resolve_dependencies(
+                func, args, kwargs
+            )
 
             if not current_user:
                 raise HTTPException(
@@ -258,7 +202,7 @@ def require_quota(quota_type: str, amount: int = 1):
                     status_code=500, detail="Plan service not available"
                 )
 
-            user_id = current_user.id
+            user_id = _user_id(current_user)
 
             # Check quota based on type
             if quota_type == "ai_calls_daily":
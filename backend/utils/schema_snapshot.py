@@ -0,0 +1,190 @@
+"""
+Schema Snapshot
+Checked-in DDL image of the models, keyed by a hash of the migrations and model metadata
+
+Development and test boots load ``migrations/snapshots/<dialect>.sql`` into an
+empty database instead of introspecting it table by table, and skip the schema
+work entirely on later boots once the stored hash matches. A snapshot whose hash
+no longer matches the code is ignored, so a stale file only costs the old path.
+
+Regenerate after changing models or migrations:
+    python -m utils.schema_snapshot --dialect sqlite --dialect postgresql
+"""
+
+import argparse
+import glob
+import hashlib
+import importlib
+import logging
+import os
+import pkgutil
+import sys
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_mock_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import models
+from core.database import Base
+
+logger = logging.getLogger(__name__)
+
+# Register every table, including modules models/__init__ does not import,
+# so the hash does not depend on what the caller happened to import first
+for _module in pkgutil.iter_modules(models.__path__):
+    try:
+        importlib.import_module(f"models.{_module.name}")
+    except ImportError as e:
+        logger.debug(f"Schema snapshot skipped models.{_module.name}: {e}")
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(BACKEND_ROOT, "migrations", "snapshots")
+MARKER_TABLE = "schema_snapshot"
+
+_HASH_HEADER = "-- schema-hash: "
+_SEPARATOR = ";\n\n"
+
+
+def snapshot_path(dialect: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{dialect}.sql")
+
+
+def _alembic_heads() -> List[str]:
+    try:
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+
+        config = Config(os.path.join(BACKEND_ROOT, "alembic.ini"))
+        config.set_main_option("script_location", os.path.join(BACKEND_ROOT, "migrations"))
+        return sorted(ScriptDirectory.from_config(config).get_heads())
+    except Exception:
+        return []
+
+
+def schema_hash(dialect: str) -> str:
+    """Hash of the dialect, every migration script and the model table definitions"""
+    digest = hashlib.sha256(dialect.encode())
+    for path in sorted(glob.glob(os.path.join(BACKEND_ROOT, "migrations", "versions", "*.py"))):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    for table in Base.metadata.sorted_tables:
+        digest.update(table.name.encode())
+        for column in table.columns:
+            digest.update(
+                f"{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}:"
+                f"{column.server_default is not None}:{sorted(fk.target_fullname for fk in column.foreign_keys)}".encode()
+            )
+        digest.update(repr(sorted(index.name or "" for index in table.indexes)).encode())
+    return digest.hexdigest()[:16]
+
+
+def render_snapshot(dialect: str) -> str:
+    """DDL that ``Base.metadata.create_all`` would emit on an empty database"""
+    statements: List[str] = []
+    engine = create_mock_engine(
+        f"{dialect}://",
+        lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=engine.dialect)).strip()),
+    )
+    Base.metadata.create_all(engine, checkfirst=False)
+
+    # Stamp the migration head(s) so Alembic treats the database as current
+    heads = _alembic_heads()
+    if heads:
+        statements.append(
+            "CREATE TABLE alembic_version (\n\tversion_num VARCHAR(32) NOT NULL,\n"
+            "\tCONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)\n)"
+        )
+        statements.extend(f"INSERT INTO alembic_version (version_num) VALUES ('{head}')" for head in heads)
+
+    header = f"{_HASH_HEADER}{schema_hash(dialect)}\n-- Generated by utils/schema_snapshot.py; do not edit.\n\n"
+    return header + "".join(statement + _SEPARATOR for statement in statements)
+
+
+def read_snapshot(dialect: str) -> Optional[Tuple[str, List[str]]]:
+    """(hash, statements) of the checked-in snapshot, or None if there is none"""
+    try:
+        with open(snapshot_path(dialect), encoding="utf-8") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None
+    header, _, body = content.partition("\n")
+    if not header.startswith(_HASH_HEADER):
+        return None
+    statements = []
+    for chunk in body.split(_SEPARATOR):
+        lines = [line for line in chunk.splitlines() if not line.startswith("--")]
+        statement = "\n".join(lines).strip()
+        if statement:
+            statements.append(statement)
+    return header[len(_HASH_HEADER):].strip(), statements
+
+
+async def apply_snapshot(engine: AsyncEngine) -> str:
+    """
+    Bring an empty database to the snapshot schema.
+
+    Returns ``"current"`` when the database was already built from this
+    snapshot, ``"loaded"`` after building it, and ``"missing"``, ``"stale"``
+    or ``"not_empty"`` when the caller has to fall back to introspection.
+    """
+    dialect = engine.dialect.name
+    snapshot = read_snapshot(dialect)
+    if snapshot is None:
+        return "missing"
+    expected, statements = snapshot
+    if expected != schema_hash(dialect):
+        logger.warning(
+            f"Schema snapshot for {dialect} is stale; run `python -m utils.schema_snapshot --dialect {dialect}`"
+        )
+        return "stale"
+
+    async with engine.begin() as conn:
+        tables = set(await conn.run_sync(lambda sync_conn: sync_conn.dialect.get_table_names(sync_conn)))
+        if MARKER_TABLE in tables:
+            stored = (await conn.execute(text(f"SELECT hash FROM {MARKER_TABLE}"))).scalar()
+            return "current" if stored == expected else "stale"
+        if tables:
+            # Built some other way (migrations, create_all); leave it alone
+            return "not_empty"
+
+        statements = statements + [
+            f"CREATE TABLE {MARKER_TABLE} (hash VARCHAR(64) NOT NULL)",
+            f"INSERT INTO {MARKER_TABLE} (hash) VALUES ('{expected}')",
+        ]
+        if dialect == "sqlite":
+            # pysqlite autocommits (and syncs) every DDL statement; run them as one script
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.executescript(
+                "BEGIN;\n" + "".join(statement + ";\n" for statement in statements) + "COMMIT;"
+            )
+        else:
+            for statement in statements:
+                await conn.exec_driver_sql(statement)
+    return "loaded"
+
+
+def main(dialects: List[str], check: bool) -> int:
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    outdated = []
+    for dialect in dialects:
+        current = read_snapshot(dialect)
+        if current is not None and current[0] == schema_hash(dialect):
+            print(f"{snapshot_path(dialect)}: up to date")
+            continue
+        if check:
+            outdated.append(dialect)
+            print(f"{snapshot_path(dialect)}: out of date")
+            continue
+        with open(snapshot_path(dialect), "w", encoding="utf-8") as f:
+            f.write(render_snapshot(dialect))
+        print(f"{snapshot_path(dialect)}: written")
+    return 1 if outdated else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dialect", action="append", choices=("sqlite", "postgresql"))
+    parser.add_argument("--check", action="store_true", help="exit 1 if a snapshot is out of date")
+    args = parser.parse_args()
+    sys.exit(main(args.dialect or ["sqlite", "postgresql"], args.check))
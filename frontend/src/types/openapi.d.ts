@@ -12479,6 +12479,7 @@ export interface operations {
                 limit?: number;
                 offset?: number;
                 status?: components["schemas"]["JobStatus"] | null;
+                cursor?: string | null;
             };
             header?: never;
             path?: never;